@@ -0,0 +1,348 @@
+"""
+Benchmark for the TWS HTTP connection pool settings.
+
+Serves synthetic TWS job records from a local mock server with a simulated
+per-request latency and replays the fan-out of ``get_job_status_batch``
+(one request per job, all concurrent) against differently tuned clients.
+For each client it reports the latency of the first (cold) fan-out, the
+median of the following (warm) ones and the TCP connections the server
+accepted. The HTTP/2 scenario uses prior-knowledge h2c because the mock
+server runs without TLS, and only runs when the ``h2`` package is installed.
+
+Run with ``PYTHONPATH=. python benchmarks/http_pool_benchmark.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from resync.core.pools.base_pool import ConnectionPoolConfig
+from resync.core.pools.http_pool import (
+    HTTP2_AVAILABLE,
+    HTTPConnectionPool,
+    _StreamLimitedTransport,
+)
+from resync.services.synthetic_tws import (
+    LatencyProfile,
+    SyntheticPlanConfig,
+    SyntheticTWSEnvironment,
+)
+
+
+class MockTWSServer:
+    """
+    Minimal HTTP/1.1 (and, with ``h2``, h2c) server for TWS job lookups.
+
+    ``GET /twsd/job/<name>`` returns the job record after a latency sampled
+    from ``latency``; ``GET /_stats`` returns the number of accepted
+    connections. Every new connection is delayed by ``handshake_seconds``
+    to stand in for the TLS handshake with the real TWS server, which
+    loopback connections don't pay.
+    """
+
+    def __init__(
+        self,
+        environment: SyntheticTWSEnvironment,
+        latency: LatencyProfile,
+        handshake_seconds: float = 0.0,
+    ) -> None:
+        self.environment = environment
+        self.latency = latency
+        self.handshake_seconds = handshake_seconds
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.url = ""
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _body(self, path: str) -> bytes:
+        if path == "/_stats":
+            return json.dumps({"connections": self.connections}).encode("utf-8")
+        await self.latency.apply()
+        job = self.environment.get_job(path.rsplit("/", 1)[-1]) or {}
+        return json.dumps(job).encode("utf-8")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            await asyncio.sleep(self.handshake_seconds)
+            preface = await reader.readexactly(3)
+            if preface == b"PRI":
+                await self._handle_h2(preface, reader, writer)
+            else:
+                await self._handle_http1(preface, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_http1(
+        self, prefix: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # HTTP/1.1 without pipelining: one request at a time per connection
+        while True:
+            head = prefix + await reader.readuntil(b"\r\n\r\n")
+            prefix = b""
+            method, path, _ = head.split(b"\r\n", 1)[0].decode().split(" ", 2)
+            body = await self._body(path)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + (b"" if method == "HEAD" else body)
+            )
+            await writer.drain()
+
+    async def _handle_h2(
+        self, prefix: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        conn = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        lock = asyncio.Lock()
+
+        async def respond(stream_id: int, method: str, path: str) -> None:
+            body = await self._body(path)
+            async with lock:
+                conn.send_headers(
+                    stream_id,
+                    [
+                        (":status", "200"),
+                        ("content-type", "application/json"),
+                        ("content-length", str(len(body))),
+                    ],
+                    end_stream=method == "HEAD",
+                )
+                if method != "HEAD":
+                    conn.send_data(stream_id, body, end_stream=True)
+                writer.write(conn.data_to_send())
+                await writer.drain()
+
+        data = prefix
+        while True:
+            data += await reader.read(65536)
+            if not data:
+                return
+            async with lock:
+                events = conn.receive_data(data)
+                writer.write(conn.data_to_send())
+            data = b""
+            for event in events:
+                if isinstance(event, h2.events.RequestReceived):
+                    headers = dict(event.headers)
+                    asyncio.ensure_future(
+                        respond(event.stream_id, headers[":method"], headers[":path"])
+                    )
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+
+
+def _serve(
+    config: SyntheticPlanConfig, latency: LatencyProfile, handshake_seconds: float, urls: Any
+) -> None:
+    async def serve() -> None:
+        server = MockTWSServer(SyntheticTWSEnvironment(config), latency, handshake_seconds)
+        await server.start()
+        urls.put(server.url)
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+class MockTWSServerProcess:
+    """Runs a :class:`MockTWSServer` in a child process so it doesn't share the
+    client's event loop and CPU time."""
+
+    def __init__(
+        self, config: SyntheticPlanConfig, latency: LatencyProfile, handshake_seconds: float
+    ) -> None:
+        self._urls: Any = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_serve,
+            args=(config, latency, handshake_seconds, self._urls),
+            daemon=True,
+        )
+        self.url = ""
+
+    def __enter__(self) -> "MockTWSServerProcess":
+        self._process.start()
+        self.url = self._urls.get(timeout=60)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._process.terminate()
+        self._process.join()
+
+    async def connections(self) -> int:
+        async with httpx.AsyncClient(base_url=self.url) as client:
+            return (await client.get("/_stats")).json()["connections"] - 1
+
+
+class HTTPPoolBenchmark:
+    """Benchmark for fan-out requests through differently tuned HTTP clients."""
+
+    def __init__(
+        self,
+        fanout: int = 200,
+        rounds: int = 5,
+        latency_ms: float = 20.0,
+        handshake_ms: float = 30.0,
+    ) -> None:
+        """
+        Initialize the benchmark.
+
+        Args:
+            fanout: Concurrent requests per round (jobs in the batch)
+            rounds: Fan-out rounds per scenario; the first one is cold
+            latency_ms: Median simulated server latency per request
+            handshake_ms: Simulated setup cost of every new connection
+        """
+        self.fanout = fanout
+        self.rounds = rounds
+        self.handshake_seconds = handshake_ms / 1000
+        self.plan = SyntheticPlanConfig(num_jobs=fanout, num_workstations=10)
+        self.latency = LatencyProfile(median_seconds=latency_ms / 1000, sigma=0.3, seed=7)
+        self.job_names = [job["name"] for job in SyntheticTWSEnvironment(self.plan).jobs]
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    async def _run_scenario(
+        self,
+        name: str,
+        open_client: Callable[[str], Awaitable[httpx.AsyncClient]],
+    ) -> None:
+        with MockTWSServerProcess(self.plan, self.latency, self.handshake_seconds) as server:
+            client = await open_client(server.url)
+            prewarmed = await server.connections()
+            try:
+                durations: List[float] = []
+                for _ in range(self.rounds):
+                    start = time.perf_counter()
+                    responses = await asyncio.gather(
+                        *(client.get(f"/twsd/job/{job}") for job in self.job_names)
+                    )
+                    durations.append(time.perf_counter() - start)
+                    assert all(r.status_code == 200 for r in responses)
+            finally:
+                await client.aclose()
+            connections = await server.connections()
+
+        warm = durations[1:] or durations
+        self.results[name] = {
+            "cold_ms": durations[0] * 1000,
+            "warm_median_ms": statistics.median(warm) * 1000,
+            "prewarmed_connections": prewarmed,
+            "connections": connections,
+        }
+
+    async def run_all_benchmarks(self) -> None:
+        """Run every client configuration against a fresh mock server."""
+
+        async def httpx_defaults(url: str) -> httpx.AsyncClient:
+            return httpx.AsyncClient(base_url=url)
+
+        async def pool(url: str, max_size: int = 100, **tuning: Any) -> httpx.AsyncClient:
+            http_pool = HTTPConnectionPool(
+                ConnectionPoolConfig(pool_name="tws_http", min_size=10, max_size=max_size),
+                url,
+                **tuning,
+            )
+            await http_pool.initialize()
+            assert http_pool._client is not None
+            return http_pool._client
+
+        await self._run_scenario("httpx_defaults", httpx_defaults)
+        # Previous pool: 10 keep-alive connections for up to 100 in flight
+        await self._run_scenario("pool_previous", lambda url: pool(url, keepalive_expiry=300))
+        # Connection limit per host equal to the keep-alive pool, pre-warmed
+        await self._run_scenario(
+            "pool_bounded",
+            lambda url: pool(
+                url,
+                max_size=20,
+                keepalive_expiry=25,
+                max_keepalive_connections=20,
+                prewarm_connections=20,
+            ),
+        )
+
+        if not HTTP2_AVAILABLE:
+            print("Skipping HTTP/2 scenario: the 'h2' package is not installed")
+            return
+
+        async def h2c(url: str) -> httpx.AsyncClient:
+            transport = httpx.AsyncHTTPTransport(
+                http1=False,
+                http2=True,
+                limits=httpx.Limits(max_connections=20, keepalive_expiry=25),
+            )
+            client = httpx.AsyncClient(
+                base_url=url, transport=_StreamLimitedTransport(transport, 100)
+            )
+            await client.head("")
+            return client
+
+        await self._run_scenario("http2", h2c)
+
+    def print_results(self) -> None:
+        """Print benchmark results."""
+        print(
+            f"\nFan-out of {self.fanout} requests x {self.rounds} rounds, "
+            f"~{self.latency.median_seconds * 1000:.0f} ms server latency, "
+            f"{self.handshake_seconds * 1000:.0f} ms per new connection"
+        )
+        print("-" * 78)
+        print(
+            f"{'Client':<16} | {'Cold (ms)':<10} | {'Warm p50 (ms)':<14} | "
+            f"{'Pre-warmed':<10} | {'TCP connections':<15}"
+        )
+        print("-" * 78)
+        for name, result in self.results.items():
+            print(
+                f"{name:<16} | {result['cold_ms']:<10.1f} | {result['warm_median_ms']:<14.1f} | "
+                f"{result['prewarmed_connections']:<10} | {result['connections']:<15}"
+            )
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fanout", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--handshake-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    print("Starting HTTP pool benchmark...")
+    benchmark = HTTPPoolBenchmark(
+        fanout=args.fanout,
+        rounds=args.rounds,
+        latency_ms=args.latency_ms,
+        handshake_ms=args.handshake_ms,
+    )
+    asyncio.run(benchmark.run_all_benchmarks())
+    benchmark.print_results()
+
+
+if __name__ == "__main__":
+    main()
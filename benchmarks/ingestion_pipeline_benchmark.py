@@ -0,0 +1,164 @@
+"""
+Benchmark for bulk knowledge base ingestion.
+
+Ingests the files in ``benchmark_files/`` with the previous one-file-at-a-time
+loop (reader on the event loop, one ``add_content`` awaited per chunk) and
+with :class:`IngestionPipeline` at several process counts. The knowledge
+graph is simulated: every ``add_content`` call sleeps ``--store-latency-ms``
+to stand in for the round-trip to the graph store.
+
+Run with ``PYTHONPATH=. python benchmarks/ingestion_pipeline_benchmark.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+from resync.core.file_ingestor import FILE_READERS, chunk_text
+from resync.core.ingestion_pipeline import (
+    IngestionPipeline,
+    IngestionPipelineMetrics,
+    PipelineStats,
+    discover_files,
+)
+
+
+class SimulatedKnowledgeGraph:
+    """Knowledge graph whose writes take a fixed latency."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.chunks = 0
+
+    async def add_content(self, content: str, metadata: Dict[str, Any]) -> None:
+        await asyncio.sleep(self.latency)
+        self.chunks += 1
+
+
+class IngestionPipelineBenchmark:
+    """Benchmark for sequential vs pipelined file ingestion."""
+
+    def __init__(
+        self,
+        directory: Path,
+        processes: List[int],
+        store_latency_ms: float = 2.0,
+        repeats: int = 3,
+    ) -> None:
+        """
+        Initialize the benchmark.
+
+        Args:
+            directory: Directory with the files to ingest
+            processes: Pipeline process counts to run
+            store_latency_ms: Simulated latency of each knowledge graph write
+            repeats: Number of timed runs per strategy
+        """
+        self.directory = directory
+        self.processes = processes
+        self.latency = store_latency_ms / 1000
+        self.repeats = repeats
+        self.files = discover_files([directory], knowledge_base_only=False)
+        self.results: Dict[str, Dict[str, float]] = {}
+        self.stats: Dict[str, PipelineStats] = {}
+
+    async def _sequential(self, graph: SimulatedKnowledgeGraph) -> None:
+        """The loop previously run by ``load_existing_rag_documents``."""
+        for file_path in self.files:
+            content = FILE_READERS[file_path.suffix.lower()](file_path)
+            chunks = list(chunk_text(content))
+            for i, chunk in enumerate(chunks):
+                metadata = {
+                    "source_file": file_path.name,
+                    "chunk_index": i + 1,
+                    "total_chunks": len(chunks),
+                }
+                await graph.add_content(content=chunk, metadata=metadata)
+
+    def _time(
+        self, name: str, func: Callable[[SimulatedKnowledgeGraph], Awaitable[Any]]
+    ) -> None:
+        durations = []
+        for _ in range(self.repeats):
+            graph = SimulatedKnowledgeGraph(self.latency)
+            start = time.perf_counter()
+            result = asyncio.run(func(graph))
+            durations.append(time.perf_counter() - start)
+            if isinstance(result, PipelineStats):
+                self.stats[name] = result
+        self.results[name] = {
+            "median_s": statistics.median(durations),
+            "min_s": min(durations),
+            "chunks": graph.chunks,
+        }
+
+    def run_all_benchmarks(self) -> None:
+        """Run the sequential loop and the pipeline on the same files."""
+        self._time("sequential", self._sequential)
+        for processes in self.processes:
+            pipeline_kwargs = {"processes": processes, "metrics": IngestionPipelineMetrics()}
+
+            async def _pipeline(graph: SimulatedKnowledgeGraph, kwargs=pipeline_kwargs):
+                pipeline = IngestionPipeline(graph, **kwargs)
+                return await pipeline.run([self.directory], knowledge_base_only=False)
+
+            self._time(f"pipeline_p{processes}", _pipeline)
+
+    def print_results(self) -> None:
+        """Print benchmark results."""
+        print(
+            f"\nIngesting {len(self.files)} files from {self.directory} "
+            f"({os.cpu_count()} CPUs, {self.latency * 1000:.1f} ms per write)"
+        )
+        print("-" * 72)
+        print(f"{'Strategy':<15} | {'Median (s)':<12} | {'Min (s)':<12} | {'Chunks':<8}")
+        print("-" * 72)
+        baseline = self.results["sequential"]["median_s"]
+        for name, result in self.results.items():
+            print(
+                f"{name:<15} | {result['median_s']:<12.3f} | {result['min_s']:<12.3f} | "
+                f"{result['chunks']:<8} ({baseline / result['median_s']:.1f}x)"
+            )
+        for name, stats in self.stats.items():
+            print(f"\n{name} stages (last run)")
+            print(
+                f"{'Stage':<12} | {'Items':<7} | {'Busy (s)':<9} | "
+                f"{'Items/s':<9} | {'Max queue':<9}"
+            )
+            for stage_name, stage in stats.stages.items():
+                print(
+                    f"{stage_name:<12} | {stage.items:<7} | {stage.busy_seconds:<9.3f} | "
+                    f"{stage.throughput:<9.1f} | {stage.max_queue_depth:<9}"
+                )
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=Path, default=Path("benchmark_files"))
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--store-latency-ms", type=float, default=2.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print("Starting ingestion pipeline benchmark...")
+    benchmark = IngestionPipelineBenchmark(
+        args.files,
+        args.processes,
+        store_latency_ms=args.store_latency_ms,
+        repeats=args.repeats,
+    )
+    benchmark.run_all_benchmarks()
+    benchmark.print_results()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Recall@k evaluation of dense, BM25 and hybrid (BM25 + vector, RRF) retrieval.
+
+The corpus is the documents in ``benchmark_files/`` (read with the
+``FileIngestor`` readers) plus synthetic TWS runbook notes, one per job of
+a :class:`SyntheticTWSEnvironment` plan. Every query names exact
+identifiers of one document (a JSON record id, or a job name and its
+``AWSBHT...`` message code) and is answered correctly if that document is
+among the top ``k`` results.
+
+Documents are ingested into an in-memory :class:`LocalVectorStore` with the
+default :class:`EmbeddingService`: OpenAI embeddings when
+``OPENAI_API_KEY`` is set, otherwise the deterministic (non-semantic)
+local embedder.
+
+Run with ``PYTHONPATH=. python benchmarks/rag_hybrid_recall.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from resync.core.file_ingestor import read_docx, read_excel, read_json, read_pdf
+from resync.RAG.microservice.core.dedup import KnownHashIndex
+from resync.RAG.microservice.core.embedding_service import EmbeddingService
+from resync.RAG.microservice.core.ingest import IngestService
+from resync.RAG.microservice.core.lexical import BM25Index
+from resync.RAG.microservice.core.local_store import LocalVectorStore
+from resync.RAG.microservice.core.retriever import RagRetriever
+from resync.services.synthetic_tws import SyntheticPlanConfig, SyntheticTWSEnvironment
+
+READERS = {".pdf": read_pdf, ".docx": read_docx, ".xlsx": read_excel, ".json": read_json}
+
+
+def benchmark_file_corpus(directory: Path) -> Tuple[Dict[str, str], List[Tuple[str, str]]]:
+    """Documents of ``directory`` and one identifier query per JSON record."""
+    docs: Dict[str, str] = {}
+    queries: List[Tuple[str, str]] = []
+    for path in sorted(directory.iterdir()):
+        reader = READERS.get(path.suffix)
+        if reader is None:
+            continue
+        docs[path.name] = reader(path)
+        if path.suffix == ".json":
+            record = json.loads(path.read_text(encoding="utf-8"))
+            queries.append((f"Where is record {record['id']} described?", path.name))
+    return docs, queries
+
+
+def runbook_corpus(num_jobs: int) -> Tuple[Dict[str, str], List[Tuple[str, str]]]:
+    """One runbook note and one troubleshooting query per synthetic job."""
+    environment = SyntheticTWSEnvironment(
+        SyntheticPlanConfig(num_jobs=num_jobs, num_workstations=max(1, num_jobs // 20))
+    )
+    docs: Dict[str, str] = {}
+    queries: List[Tuple[str, str]] = []
+    for n, job in enumerate(environment.jobs):
+        code = f"AWSBHT{n % 1000:03d}E"
+        doc_id = f"runbook_{job['name']}"
+        docs[doc_id] = (
+            f"Runbook for job {job['name']} of job stream {job['job_stream']} "
+            f"on workstation {job['workstation']}. When the job ends in ABEND "
+            f"with message {code}, check that the workstation is linked, "
+            "review the job log and rerun the job from the Dynamic Workload Console."
+        )
+        queries.append((f"How do I fix {job['name']} failing with {code}?", doc_id))
+    return docs, queries
+
+
+async def evaluate(
+    docs: Dict[str, str], queries: List[Tuple[str, str]], ks: List[int]
+) -> Dict[str, Dict[int, float]]:
+    embedder = EmbeddingService()
+    store = LocalVectorStore()
+    lexical = BM25Index()
+    ingest = IngestService(
+        embedder, store, known_hashes=KnownHashIndex(), lexical_index=lexical
+    )
+    for doc_id, text in docs.items():
+        await ingest.ingest_document(
+            tenant="benchmark", doc_id=doc_id, source=doc_id, text=text, ts_iso=""
+        )
+
+    dense = RagRetriever(embedder, store)
+    hybrid = RagRetriever(embedder, store, lexical_index=lexical)
+    searches = {
+        "dense": dense.retrieve,
+        "bm25": lexical.search,
+        "hybrid": hybrid.retrieve,
+    }
+    top = max(ks)
+    results: Dict[str, Dict[int, float]] = {}
+    for name, search in searches.items():
+        found = {k: 0 for k in ks}
+        for query, doc_id in queries:
+            hits = await search(query, top)
+            ranked = [h["payload"]["doc_id"] for h in hits]
+            for k in ks:
+                found[k] += doc_id in ranked[:k]
+        results[name] = {k: found[k] / len(queries) for k in ks}
+    return results
+
+
+def main() -> None:
+    """Run the evaluation."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=Path, default=Path("benchmark_files"))
+    parser.add_argument("--synthetic-jobs", type=int, default=200)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 5, 10])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    docs, queries = benchmark_file_corpus(args.files)
+    runbook_docs, runbook_queries = runbook_corpus(args.synthetic_jobs)
+    docs.update(runbook_docs)
+    queries += runbook_queries
+
+    results = asyncio.run(evaluate(docs, queries, args.k))
+    print(f"\nRecall@k over {len(queries)} queries, {len(docs)} documents")
+    print("-" * 50)
+    print(f"{'Retriever':<10} | " + " | ".join(f"{'@' + str(k):<8}" for k in args.k))
+    print("-" * 50)
+    for name, recall in results.items():
+        print(f"{name:<10} | " + " | ".join(f"{recall[k]:<8.3f}" for k in args.k))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark for the RAG retriever re-ranking step.
+
+Re-ranks ``top_k`` synthetic hits carrying ``dim``-dimensional vectors (as
+returned by Qdrant with ``with_vectors=True``) with the previous
+pure-Python cosine sort, the NumPy re-ranker and MMR selection.
+
+Run with ``PYTHONPATH=. python benchmarks/rag_rerank_benchmark.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from resync.RAG.microservice.core.rerank import rerank_hits
+
+
+def python_rerank(query: List[float], hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The re-ranking previously inlined in ``RagRetriever.retrieve``."""
+
+    def cos(a: List[float], b: List[float]) -> float:
+        da = math.sqrt(sum(x * x for x in a))
+        db = math.sqrt(sum(x * x for x in b))
+        if da == 0 or db == 0:
+            return 0.0
+        return sum(x * y for x, y in zip(a, b)) / (da * db)
+
+    return sorted(hits, key=lambda h: cos(query, h.get("vector") or []), reverse=True)
+
+
+class RerankBenchmark:
+    """Benchmark for re-ranking retrieved hits."""
+
+    def __init__(self, top_k: int = 50, dim: int = 1536, repeats: int = 50) -> None:
+        """
+        Initialize the benchmark.
+
+        Args:
+            top_k: Number of hits to re-rank
+            dim: Embedding dimension
+            repeats: Number of timed runs per strategy
+        """
+        self.top_k = top_k
+        self.dim = dim
+        self.repeats = repeats
+        rng = np.random.default_rng(42)
+        self.query = rng.normal(size=dim).tolist()
+        self.hits = [
+            {"id": str(i), "score": 0.0, "vector": rng.normal(size=dim).tolist()}
+            for i in range(top_k)
+        ]
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    def _time(self, name: str, func: Callable[[], List[Dict[str, Any]]]) -> None:
+        durations = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+        self.results[name] = {
+            "median_ms": statistics.median(durations) * 1000,
+            "min_ms": min(durations) * 1000,
+        }
+
+    def run_all_benchmarks(self) -> None:
+        """Run every strategy against the same hits."""
+        query, hits = self.query, self.hits
+        expected = [h["id"] for h in python_rerank(query, hits)]
+        assert [h["id"] for h in rerank_hits(query, hits)] == expected
+
+        self._time("python", lambda: python_rerank(query, hits))
+        self._time("numpy", lambda: rerank_hits(query, hits))
+        self._time("numpy_mmr_10", lambda: rerank_hits(query, hits, mmr_k=10))
+
+    def print_results(self) -> None:
+        """Print benchmark results."""
+        print(f"\nRe-ranking top_k={self.top_k} hits of dim {self.dim}")
+        print("-" * 56)
+        print(f"{'Strategy':<15} | {'Median (ms)':<15} | {'Min (ms)':<15}")
+        print("-" * 56)
+        baseline = self.results["python"]["median_ms"]
+        for name, result in self.results.items():
+            print(
+                f"{name:<15} | {result['median_ms']:<15.3f} | {result['min_ms']:<15.3f} "
+                f"({baseline / result['median_ms']:.1f}x)"
+            )
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    print("Starting RAG re-rank benchmark...")
+    benchmark = RerankBenchmark(top_k=args.top_k, dim=args.dim, repeats=args.repeats)
+    benchmark.run_all_benchmarks()
+    benchmark.print_results()
+
+
+if __name__ == "__main__":
+    main()
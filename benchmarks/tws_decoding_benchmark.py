@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable
+
+from resync.models.tws import JobStatus
+from resync.models.tws_bulk import decode_model_list
+from resync.services.synthetic_tws import SyntheticPlanConfig, SyntheticTWSEnvironment
+
+
+class TWSDecodingBenchmark:
+    """
+    Benchmark for decoding large TWS job lists into Pydantic models.
+
+    Compares the historical per-item construction (``response.json()``
+    followed by ``JobStatus(**job)`` in a loop) with bulk ``TypeAdapter``
+    validation and the trusted-source construction path.
+    """
+
+    def __init__(self, num_jobs: int = 100_000, repeats: int = 5) -> None:
+        """
+        Initialize the benchmark.
+
+        Args:
+            num_jobs: Number of jobs in the synthetic response
+            repeats: Number of timed runs per strategy
+        """
+        self.num_jobs = num_jobs
+        self.repeats = repeats
+        environment = SyntheticTWSEnvironment(
+            SyntheticPlanConfig(num_jobs=num_jobs, num_workstations=2000)
+        )
+        self.payload = json.dumps(environment.jobs).encode("utf-8")
+        self.results: dict[str, dict[str, Any]] = {}
+
+    def _time(self, name: str, func: Callable[[], list[JobStatus]]) -> None:
+        durations = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            jobs = func()
+            durations.append(time.perf_counter() - start)
+            assert len(jobs) == self.num_jobs
+        median = statistics.median(durations)
+        self.results[name] = {
+            "median_ms": median * 1000,
+            "min_ms": min(durations) * 1000,
+            "jobs_per_second": self.num_jobs / median if median > 0 else 0,
+        }
+
+    def run_all_benchmarks(self) -> None:
+        """Run every decoding strategy against the same payload."""
+        payload = self.payload
+        self._time(
+            "per_item", lambda: [JobStatus(**job) for job in json.loads(payload)]
+        )
+        self._time("type_adapter", lambda: decode_model_list(JobStatus, payload))
+        self._time(
+            "trusted",
+            lambda: decode_model_list(JobStatus, payload, trusted=True),
+        )
+
+    def print_results(self) -> None:
+        """Print benchmark results."""
+        print(f"\nDecoding {self.num_jobs} jobs ({len(self.payload) / 1e6:.1f} MB)")
+        print("-" * 70)
+        print(f"{'Strategy':<15} | {'Median (ms)':<15} | {'Min (ms)':<15} | {'Jobs/sec':<15}")
+        print("-" * 70)
+        baseline = self.results["per_item"]["median_ms"]
+        for name, result in self.results.items():
+            print(
+                f"{name:<15} | {result['median_ms']:<15.1f} | {result['min_ms']:<15.1f} | "
+                f"{result['jobs_per_second']:<15.0f} ({baseline / result['median_ms']:.2f}x)"
+            )
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print("Starting TWS decoding benchmark...")
+    benchmark = TWSDecodingBenchmark(num_jobs=args.jobs, repeats=args.repeats)
+    benchmark.run_all_benchmarks()
+    benchmark.print_results()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,15 @@ Core components of the Qdrant-only RAG microservice.
 Exports all public interfaces and implementations for easy import.
 """
 
+from .dedup import KnownHashIndex
+from .embedding_cache import EmbeddingCache
 from .embedding_service import EmbeddingService
 from .ingest import IngestService
+from .lexical import BM25Index
 from .interfaces import Embedder
 from .interfaces import Retriever
 from .interfaces import VectorStore
+from .local_store import LocalVectorStore
 from .retriever import RagRetriever
 from .vector_store import QdrantVectorStore
 from .vector_store import get_default_store
@@ -19,7 +23,11 @@ __all__ = [
     "Retriever",
     "EmbeddingService",
     "QdrantVectorStore",
+    "LocalVectorStore",
     "get_default_store",
     "RagRetriever",
     "IngestService",
+    "KnownHashIndex",
+    "EmbeddingCache",
+    "BM25Index",
 ]
\ No newline at end of file
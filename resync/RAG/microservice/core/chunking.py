@@ -3,11 +3,17 @@ Token-aware text chunking utility for RAG systems.
 
 Splits text into overlapping chunks based on token count, respecting sentence boundaries.
 Uses tiktoken if available; falls back to heuristic-based splitting.
+
+Chunking is streaming: :func:`chunk_stream` consumes text piece by piece
+(file lines, PDF pages, log records), splits it into sentences as they
+complete and counts tokens per sentence, so neither the whole document nor
+its token list is ever held at once.
 """
 
 from __future__ import annotations
 
 import re
+from collections import deque
 from typing import Iterable
 from typing import Iterator
 
@@ -21,18 +27,111 @@ except ImportError:
     _HAS_TIKTOKEN = False
     _ENC = None
 
+# Fim de sentença (.!? seguido de espaço) ou parágrafo (linha em branco)
+_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+_WHITESPACE = re.compile(r"\s+")
+# Texto sem nenhum fim de sentença (ex.: logs) é cortado neste tamanho
+_MAX_PENDING_CHARS = 65536
+# Caracteres por token na heurística sem tiktoken
+_CHARS_PER_TOKEN = 4
+
 
 def _tokens_len(s: str) -> int:
     """Estimate token count for a string."""
     if _HAS_TIKTOKEN and _ENC:
         return len(_ENC.encode(s))
-    return max(1, len(s) // 4)  # rough approximation
+    return max(1, len(s) // _CHARS_PER_TOKEN)  # rough approximation
 
 
 def _split_sentences(text: str) -> list[str]:
     """Split text into sentences based on punctuation."""
-    text = re.sub(r"\s+", " ", text).strip()
-    return re.split(r"(?<=[.!?])\s+", text) if text else []
+    return list(_iter_sentences([text]))
+
+
+def _iter_sentences(pieces: Iterable[str]) -> Iterator[str]:
+    """Whitespace-normalised sentences of the concatenated ``pieces``."""
+    tail = ""
+    for piece in pieces:
+        if not piece:
+            continue
+        # o que já estava em tail não tem fronteira, exceto no espaço final
+        scan_from = len(tail.rstrip())
+        tail += piece
+        start = 0
+        for match in _BOUNDARY.finditer(tail, scan_from):
+            sentence = _WHITESPACE.sub(" ", tail[start : match.start()]).strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+        tail = tail[start:]
+        while len(tail) > _MAX_PENDING_CHARS:
+            cut = tail.rfind(" ", 0, _MAX_PENDING_CHARS)
+            cut = cut if cut > 0 else _MAX_PENDING_CHARS
+            sentence = _WHITESPACE.sub(" ", tail[:cut]).strip()
+            if sentence:
+                yield sentence
+            tail = tail[cut:]
+    sentence = _WHITESPACE.sub(" ", tail).strip()
+    if sentence:
+        yield sentence
+
+
+def _split_long(sentence: str, max_tokens: int) -> Iterator[tuple[str, int]]:
+    """``(piece, tokens)`` pairs of at most ``max_tokens`` tokens each."""
+    if _HAS_TIKTOKEN and _ENC:
+        tokens = _ENC.encode(sentence)
+        if len(tokens) <= max_tokens:
+            yield sentence, len(tokens)
+            return
+        for start in range(0, len(tokens), max_tokens):
+            window = tokens[start : start + max_tokens]
+            yield _ENC.decode(window), len(window)
+        return
+
+    tokens = _tokens_len(sentence)
+    if tokens <= max_tokens:
+        yield sentence, tokens
+        return
+    width = max_tokens * _CHARS_PER_TOKEN
+    while sentence:
+        cut = sentence.rfind(" ", 0, width + 1) if len(sentence) > width else -1
+        cut = cut if cut > 0 else width
+        piece, sentence = sentence[:cut].strip(), sentence[cut:].strip()
+        if piece:
+            yield piece, _tokens_len(piece)
+
+
+def chunk_stream(
+    pieces: Iterable[str], max_tokens: int = 512, overlap_tokens: int = 64
+) -> Iterator[str]:
+    """
+    Chunk a text stream in a token-aware way, respecting sentence boundaries.
+
+    Consecutive chunks share their trailing sentences up to
+    ``overlap_tokens`` tokens; sentences longer than ``max_tokens`` are
+    split on their own.
+    """
+    buf: deque[tuple[str, int]] = deque()
+    cur = 0
+    for sentence in _iter_sentences(pieces):
+        for piece, tokens in _split_long(sentence, max_tokens):
+            if cur + tokens > max_tokens and buf:
+                yield " ".join(s for s, _ in buf)
+                # Preserve trailing sentences as overlap
+                keep: deque[tuple[str, int]] = deque()
+                kept = 0
+                for s, n in reversed(buf):
+                    if kept + n > overlap_tokens:
+                        break
+                    keep.appendleft((s, n))
+                    kept += n
+                while keep and kept + tokens > max_tokens:
+                    kept -= keep.popleft()[1]
+                buf, cur = keep, kept
+            buf.append((piece, tokens))
+            cur += tokens
+    if buf:
+        yield " ".join(s for s, _ in buf)
 
 
 def chunk_text(
@@ -43,30 +142,4 @@ def chunk_text(
     """
     if not text:
         return iter(())
-
-    if _HAS_TIKTOKEN and _ENC:
-        tokens = _ENC.encode(text)
-        start = 0
-        while start < len(tokens):
-            end = min(start + max_tokens, len(tokens))
-            chunk = _ENC.decode(tokens[start:end])
-            yield chunk
-            start = max(0, end - overlap_tokens)
-        return
-
-    # Fallback: sentence-based chunking
-    sents = _split_sentences(text)
-    buf: list[str] = []
-    cur = 0
-    for s in sents:
-        t = _tokens_len(s)
-        if cur + t > max_tokens and buf:
-            yield " ".join(buf)
-            # Preserve last sentence as overlap
-            last = buf[-1]
-            buf = [last]
-            cur = _tokens_len(last)
-        buf.append(s)
-        cur += t
-    if buf:
-        yield " ".join(buf)
\ No newline at end of file
+    return chunk_stream([text], max_tokens=max_tokens, overlap_tokens=overlap_tokens)
@@ -19,19 +19,54 @@ def _bool(env: str, default: bool = False) -> bool:
 
 @dataclass(frozen=True)
 class RagConfig:
+    # "qdrant" ou "local" (LocalVectorStore embutido, sem servidor)
+    vector_backend: str = os.getenv("RAG_VECTOR_BACKEND", "qdrant")
+    local_store_dir: str | None = os.getenv("RAG_LOCAL_STORE_DIR")
+    local_ivf_threshold: int = int(os.getenv("RAG_LOCAL_IVF_THRESHOLD", "20000"))
+    local_ivf_nprobe: int = int(os.getenv("RAG_LOCAL_IVF_NPROBE", "8"))
     qdrant_url: str = os.getenv("QDRANT_URL", "http://localhost:6333")
     qdrant_api_key: str | None = os.getenv("QDRANT_API_KEY")
+    qdrant_prefer_grpc: bool = _bool("QDRANT_PREFER_GRPC", True)
+    qdrant_grpc_port: int = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+    # upserts: pontos por requisição e requisições em voo
+    upsert_batch_size: int = int(os.getenv("QDRANT_UPSERT_BATCH", "256"))
+    upsert_concurrency: int = int(os.getenv("QDRANT_UPSERT_CONCURRENCY", "4"))
     collection_write: str = os.getenv("QDRANT_COLLECTION", "knowledge_v1")
     collection_read: str = os.getenv(
         "RAG_COLLECTION_READ", os.getenv("QDRANT_COLLECTION", "knowledge_v1")
     )
     embed_model: str = os.getenv("EMBED_MODEL", "text-embedding-3-small")
     embed_dim: int = int(os.getenv("EMBED_DIM", "1536"))
+    # requisições de embedding: concorrência e limites por requisição
+    embed_concurrency: int = int(os.getenv("EMBED_CONCURRENCY", "4"))
+    embed_batch_size: int = int(os.getenv("EMBED_BATCH_SIZE", "256"))
+    embed_batch_tokens: int = int(os.getenv("EMBED_BATCH_TOKENS", "100000"))
+    # cache persistente de embeddings (SQLite); desativado se vazio
+    embed_cache_path: str | None = os.getenv("EMBED_CACHE_PATH")
+    embed_cache_dtype: str = os.getenv("EMBED_CACHE_DTYPE", "float16")
     max_top_k: int = int(os.getenv("RAG_MAX_TOPK", "50"))
     ef_search_base: int = int(os.getenv("RAG_EF_SEARCH_BASE", "64"))
     ef_search_max: int = int(os.getenv("RAG_EF_SEARCH_MAX", "128"))
     max_neighbors: int = int(os.getenv("RAG_MAX_NEIGHBORS", "32"))
     enable_rerank: bool = _bool("RAG_RERANKER_ON", False)
+    # MMR: diversidade do contexto (candidatos = top_k * fetch_factor)
+    enable_mmr: bool = _bool("RAG_MMR_ON", False)
+    mmr_lambda: float = float(os.getenv("RAG_MMR_LAMBDA", "0.5"))
+    mmr_fetch_factor: int = int(os.getenv("RAG_MMR_FETCH_FACTOR", "4"))
+    # busca híbrida: BM25 + vetorial fundidos por RRF
+    enable_hybrid: bool = _bool("RAG_HYBRID_ON", False)
+    rrf_k: int = int(os.getenv("RAG_RRF_K", "60"))
+    lexical_index_dir: str | None = os.getenv("RAG_LEXICAL_INDEX_DIR")
+    # caches de consulta: embedding (LRU) e resultado (TTL curto)
+    enable_query_cache: bool = _bool("RAG_QUERY_CACHE_ON", False)
+    query_embed_cache_size: int = int(os.getenv("RAG_QUERY_EMBED_CACHE_SIZE", "1024"))
+    retrieval_cache_ttl: float = float(os.getenv("RAG_RETRIEVAL_CACHE_TTL", "30"))
+    retrieval_cache_size: int = int(os.getenv("RAG_RETRIEVAL_CACHE_SIZE", "512"))
+    # processos para chunking/hash na ingestão em lote (0 = no processo atual)
+    ingest_processes: int = int(os.getenv("RAG_INGEST_PROCESSES", "0"))
+    # hashes por consulta de dedup (MatchAny) e diretório do índice local
+    dedup_batch_size: int = int(os.getenv("RAG_DEDUP_BATCH", "256"))
+    dedup_index_dir: str | None = os.getenv("RAG_DEDUP_INDEX_DIR")
 
 
 CFG = RagConfig()
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Local index of chunk hashes already stored in the vector store.
+
+Deduplication used to ask Qdrant about every chunk. :class:`KnownHashIndex`
+remembers the SHA-256 of every chunk that was upserted or found in the
+store, so re-ingesting known content never leaves the process; only
+unknown hashes are checked remotely, in batches.
+
+The index only holds hashes known to exist, so a hit is authoritative while
+a miss still needs the remote check (other writers may have stored the
+chunk). Digests are kept as raw 32-byte values and, when a path is given,
+appended to a file so the index survives restarts. Call :meth:`clear` after
+deleting or recreating the collection.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Iterable
+from typing import Optional
+
+from .config import CFG
+
+logger = logging.getLogger(__name__)
+
+_DIGEST_SIZE = 32
+
+
+class KnownHashIndex:
+    """
+    Set of chunk SHA-256 hashes (hex) known to be in the vector store,
+    optionally persisted to an append-only file of raw digests.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._digests: set[bytes] = set()
+        self._pending: list[bytes] = []
+        if path:
+            self._load(path)
+
+    @classmethod
+    def for_collection(
+        cls, collection: str, directory: Optional[str] = None
+    ) -> "KnownHashIndex":
+        """Index persisted under ``directory`` (``RAG_DEDUP_INDEX_DIR``), if set."""
+        directory = directory if directory is not None else CFG.dedup_index_dir
+        if not directory:
+            return cls()
+        os.makedirs(directory, exist_ok=True)
+        return cls(os.path.join(directory, f"{collection}.sha256"))
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+        except FileNotFoundError:
+            return
+        usable = len(data) - len(data) % _DIGEST_SIZE
+        if usable != len(data):
+            # registro parcial de uma escrita interrompida
+            logger.warning("Ignoring truncated record at the end of %s", path)
+        self._digests = {
+            data[i : i + _DIGEST_SIZE] for i in range(0, usable, _DIGEST_SIZE)
+        }
+        logger.info("Loaded %d known chunk hashes from %s", len(self._digests), path)
+
+    def __contains__(self, sha256: str) -> bool:
+        return bytes.fromhex(sha256) in self._digests
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def add_many(self, sha256s: Iterable[str]) -> None:
+        """Record hashes as stored; persisted on the next :meth:`flush`."""
+        for sha in sha256s:
+            digest = bytes.fromhex(sha)
+            if digest not in self._digests:
+                self._digests.add(digest)
+                self._pending.append(digest)
+
+    def flush(self) -> None:
+        """Append hashes added since the last flush to the index file."""
+        if not self.path or not self._pending:
+            self._pending.clear()
+            return
+        with open(self.path, "ab") as fh:
+            fh.write(b"".join(self._pending))
+        self._pending.clear()
+
+    def clear(self) -> None:
+        """Forget every hash, including the persisted ones."""
+        self._digests.clear()
+        self._pending.clear()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,127 @@
+"""
+Persistent content-addressed cache of embeddings.
+
+Re-ingesting an edited document re-embedded every chunk, and boilerplate
+shared by many documents was embedded again for each one. The cache keys
+vectors by ``(model, sha256 of the normalised text)``, so any text embedded
+once with a model is never sent to the provider again.
+
+Vectors are stored in SQLite as raw float16 (or float32) blobs in a
+``WITHOUT ROWID`` table, about 3 KB per 1536-dim vector in float16. All
+SQLite calls run in the default executor to keep the event loop free.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Iterable
+from typing import Optional
+
+import numpy as np
+
+from .config import CFG
+
+logger = logging.getLogger(__name__)
+
+# Stay below SQLite's limit of host parameters per statement
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    sha256 BLOB NOT NULL,
+    dtype TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (model, sha256)
+) WITHOUT ROWID
+"""
+
+
+def _to_thread(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of the normalised text, as used for chunk deduplication."""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    SQLite blob store of embeddings keyed by model and content hash.
+    """
+
+    def __init__(self, path: str = ":memory:", dtype: str = "float16"):
+        if dtype not in ("float16", "float32"):
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+        self.path = path
+        self.dtype = dtype
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get_many_sync(self, model: str, hashes: Iterable[str]) -> dict[str, list[float]]:
+        """Return the cached vectors among ``hashes`` as ``{sha256: vector}``."""
+        keys = [bytes.fromhex(h) for h in dict.fromkeys(hashes)]
+        found: dict[str, list[float]] = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[start : start + _LOOKUP_BATCH]
+                rows = self._conn.execute(
+                    "SELECT sha256, dtype, vector FROM embeddings "
+                    f"WHERE model = ? AND sha256 IN ({','.join('?' * len(batch))})",
+                    (model, *batch),
+                ).fetchall()
+                for sha, dtype, blob in rows:
+                    vector = np.frombuffer(blob, dtype=dtype).astype(np.float32)
+                    found[sha.hex()] = vector.tolist()
+        return found
+
+    def put_many_sync(self, model: str, items: Iterable[tuple[str, list[float]]]) -> None:
+        """Store ``(sha256, vector)`` pairs; existing entries are kept."""
+        rows = [
+            (model, bytes.fromhex(sha), self.dtype, np.asarray(vec, self.dtype).tobytes())
+            for sha, vec in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO embeddings (model, sha256, dtype, vector) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+
+    async def get_many(self, model: str, hashes: Iterable[str]) -> dict[str, list[float]]:
+        return await _to_thread(self.get_many_sync, model, list(hashes))
+
+    async def put_many(self, model: str, items: Iterable[tuple[str, list[float]]]) -> None:
+        await _to_thread(self.put_many_sync, model, list(items))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def get_default_cache(
+    path: Optional[str] = None, dtype: Optional[str] = None
+) -> Optional[EmbeddingCache]:
+    """Cache configured by ``EMBED_CACHE_PATH``/``EMBED_CACHE_DTYPE``, or None."""
+    path = path or CFG.embed_cache_path
+    if not path:
+        return None
+    logger.info("Using embedding cache at %s", path)
+    return EmbeddingCache(path, dtype or CFG.embed_cache_dtype)
@@ -2,23 +2,129 @@
 Embedding service for generating vector embeddings using OpenAI or deterministic fallback.
 
 Supports batch embedding with fallback to SHA-256 hash-based vectors for development.
+Batches are split by total token count as well as by size, dispatched to the
+provider with bounded concurrency through the async client, and retried with
+exponential backoff under a retry budget shared by every service. With an
+:class:`~.embedding_cache.EmbeddingCache`, only texts not embedded before with
+the same model reach the provider.
 """
 
+from __future__ import annotations
+
+import asyncio
 import hashlib
 import os
 from typing import List
+from typing import Optional
+from typing import Protocol
 
+from .chunking import _tokens_len
 from .config import CFG
+from .embedding_cache import EmbeddingCache
+from .embedding_cache import content_hash
+from .embedding_cache import get_default_cache
 from .interfaces import Embedder
+from .monitoring import embed_cache_total
+from .retry import RetryBudget
+from .retry import retry_with_backoff
 
 # Optional imports
 # OpenAI (production)
 try:
-    from openai import OpenAI  # openai>=1.x
+    import openai
+    from openai import AsyncOpenAI  # openai>=1.x
 
     _HAS_OPENAI = True
+    _RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (
+        openai.APIConnectionError,
+        openai.APITimeoutError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+        ConnectionError,
+        TimeoutError,
+    )
 except ImportError:
     _HAS_OPENAI = False
+    _RETRYABLE_ERRORS = (ConnectionError, TimeoutError)
+
+# orçamento de retries compartilhado por todas as instâncias do serviço
+_RETRY_BUDGET = RetryBudget()
+
+
+# pylint: disable=too-few-public-methods
+class EmbeddingProvider(Protocol):
+    """
+    Backend that embeds one request worth of texts.
+    """
+
+    model: str
+
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]: ...
+
+
+class OpenAIEmbeddingProvider:
+    """
+    Embeddings from the OpenAI API through the async client.
+    """
+
+    def __init__(self, api_key: str, model: str = CFG.embed_model) -> None:
+        self.model = model
+        # retries ficam a cargo do EmbeddingService (backoff + retry budget)
+        self._client = AsyncOpenAI(api_key=api_key, max_retries=0)
+
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        resp = await self._client.embeddings.create(model=self.model, input=texts)
+        return [d.embedding for d in resp.data]
+
+
+class LocalEmbedder:
+    """
+    Local stand-in provider for development, CI and tests.
+
+    Produces deterministic hash-based vectors (not semantic, but stable) and
+    can simulate the provider round trip with ``latency`` seconds per call.
+    ``calls`` and ``max_in_flight`` record how requests were dispatched.
+    """
+
+    model = "local-sha256"
+
+    def __init__(self, dim: int = CFG.embed_dim, latency: float = 0.0) -> None:
+        self.dim = dim
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return [self._hash_vec(t) for t in texts]
+        finally:
+            self.in_flight -= 1
+
+    def _hash_vec(self, text: str) -> List[float]:
+        """
+        Generate a deterministic embedding vector from text using SHA-256 hash.
+
+        The hash is spread across the embedding dimension.
+
+        Args:
+            text: Input text to hash.
+
+        Returns:
+            List[float]: Deterministic embedding vector.
+        """
+        dim = self.dim
+        buf = [0.0] * dim
+        h = hashlib.sha256(text.encode("utf-8")).digest()
+        # espalha 32 bytes ao longo do vetor
+        for i, b in enumerate(h):
+            buf[(i * 64) % dim] = b / 255.0
+        return buf
 
 
 class EmbeddingService(Embedder):
@@ -26,16 +132,52 @@ class EmbeddingService(Embedder):
     Service for generating text embeddings using OpenAI or deterministic fallback.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        provider: Optional[EmbeddingProvider] = None,
+        *,
+        max_concurrency: int = CFG.embed_concurrency,
+        max_batch_size: int = CFG.embed_batch_size,
+        max_batch_tokens: int = CFG.embed_batch_tokens,
+        retries: int = 3,
+        retry_base_delay: float = 0.5,
+        cache: Optional[EmbeddingCache] = None,
+    ) -> None:
         """
         Initialize the embedding service.
 
-        Uses OpenAI if API key is set; otherwise, uses deterministic hash-based fallback.
+        Uses OpenAI if API key is set; otherwise, uses the deterministic
+        :class:`LocalEmbedder`.
+
+        Args:
+            provider: Embedding backend; chosen from the environment if omitted.
+            max_concurrency: Provider requests in flight at once, shared by
+                every caller of this service.
+            max_batch_size: Maximum texts per provider request.
+            max_batch_tokens: Maximum total tokens per provider request.
+            retries: Retries per request on transient provider errors.
+            retry_base_delay: First backoff delay in seconds; doubles per retry.
+            cache: Embedding cache; defaults to ``EMBED_CACHE_PATH`` if set.
         """
-        self._use_openai = _HAS_OPENAI and bool(os.getenv("OPENAI_API_KEY"))
-        self._client = (
-            OpenAI(api_key=os.getenv("OPENAI_API_KEY")) if self._use_openai else None
-        )
+        if provider is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if _HAS_OPENAI and api_key:
+                provider = OpenAIEmbeddingProvider(api_key)
+            else:
+                # Fallback determinístico para dev/CI (não semântico, mas estável)
+                provider = LocalEmbedder()
+        self.provider = provider
+        self.cache = cache if cache is not None else get_default_cache()
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.retries = retries
+        self.retry_base_delay = retry_base_delay
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._retry_budget = _RETRY_BUDGET
+
+    @property
+    def model(self) -> str:
+        return self.provider.model
 
     async def embed(self, text: str) -> List[float]:
         """
@@ -53,7 +195,11 @@ class EmbeddingService(Embedder):
         """
         Embed a batch of text strings into vectors.
 
-        Uses OpenAI if available; otherwise, uses deterministic hash-based fallback.
+        Cached texts are served from the cache. The others (each distinct
+        text once) are split into provider requests of at most
+        ``max_batch_size`` texts and ``max_batch_tokens`` tokens, which run
+        concurrently (up to ``max_concurrency``); the result keeps the input
+        order.
 
         Args:
             texts: List of input texts to embed.
@@ -61,29 +207,63 @@ class EmbeddingService(Embedder):
         Returns:
             List[List[float]]: List of embedding vectors.
         """
-        if self._use_openai:
-            resp = self._client.embeddings.create(model=CFG.embed_model, input=texts)  # type: ignore[union-attr]
-            return [d.embedding for d in resp.data]  # type: ignore[attr-defined]
-        # Fallback determinístico para dev/CI (não semântico, mas estável)
-        return [self._hash_vec(t) for t in texts]
+        if not texts:
+            return []
+        if self.cache is None:
+            return await self._embed_uncached(texts)
 
-    def _hash_vec(self, text: str) -> List[float]:
-        """
-        Generate a deterministic embedding vector from text using SHA-256 hash.
+        hashes = [content_hash(t) for t in texts]
+        vectors = await self.cache.get_many(self.model, hashes)
+        embed_cache_total.labels(result="hit").inc(
+            sum(1 for h in hashes if h in vectors)
+        )
+        missing = {h: t for h, t in zip(hashes, texts) if h not in vectors}
+        if missing:
+            embed_cache_total.labels(result="miss").inc(len(missing))
+            new = await self._embed_uncached(list(missing.values()))
+            fresh = dict(zip(missing, new))
+            await self.cache.put_many(self.model, fresh.items())
+            vectors.update(fresh)
+        return [vectors[h] for h in hashes]
 
-        This is a fallback for development/CI environments where OpenAI is not available.
-        The hash is spread across the embedding dimension.
+    async def _embed_uncached(self, texts: List[str]) -> List[List[float]]:
+        batches = self._split_batches(texts)
+        tasks = [asyncio.ensure_future(self._embed_request(b)) for b in batches]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return [vec for batch in results for vec in batch]
 
-        Args:
-            text: Input text to hash.
+    def _split_batches(self, texts: List[str]) -> List[List[str]]:
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for text in texts:
+            tokens = _tokens_len(text)
+            if current and (
+                len(current) >= self.max_batch_size
+                or current_tokens + tokens > self.max_batch_tokens
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
 
-        Returns:
-            List[float]: Deterministic embedding vector.
-        """
-        dim = CFG.embed_dim
-        buf = [0.0] * dim
-        h = hashlib.sha256(text.encode("utf-8")).digest()
-        # espalha 32 bytes ao longo do vetor
-        for i, b in enumerate(h):
-            buf[(i * 64) % dim] = b / 255.0
-        return buf
\ No newline at end of file
+    async def _embed_request(self, texts: List[str]) -> List[List[float]]:
+        async def _call() -> List[List[float]]:
+            async with self._slots:
+                return await self.provider.embed_texts(texts)
+
+        return await retry_with_backoff(
+            _call,
+            retries=self.retries,
+            base_delay=self.retry_base_delay,
+            cap=10.0,
+            retry_on=_RETRYABLE_ERRORS,
+            budget=self._retry_budget,
+        )
@@ -2,41 +2,124 @@
 Idempotent document ingestion service for RAG systems.
 
 Handles chunking, deduplication by SHA-256, batch embedding, and upsert to Qdrant.
-Integrates Prometheus metrics for observability.
+Integrates Prometheus metrics for observability. Bulk ingestion can shard
+documents across a process pool for chunking and hashing.
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 from typing import Iterable
 
-from .chunking import chunk_text
+from .chunking import chunk_stream
 from .config import CFG
+from .dedup import KnownHashIndex
 from .interfaces import Embedder
 from .interfaces import VectorStore
+from .lexical import BM25Index
+from .lexical import get_lexical_index
 from .monitoring import embed_seconds
 from .monitoring import jobs_total
 from .monitoring import upsert_seconds
+from .retrieval_cache import bump_graph_version
 
 logger = logging.getLogger(__name__)
 
+CHUNK_MAX_TOKENS = 512
+CHUNK_OVERLAP_TOKENS = 64
+
+
+def prepare_chunks(text: str | Iterable[str]) -> tuple[list[str], list[str]]:
+    """
+    Chunk a document (a string or a stream of text pieces) and hash each
+    normalised chunk; runs in worker processes for bulk ingestion.
+
+    Returns:
+        The normalised chunks and their SHA-256 hex digests.
+    """
+    pieces = [text] if isinstance(text, str) else text
+    chunks: list[str] = []
+    shas: list[str] = []
+    for ck in chunk_stream(
+        pieces, max_tokens=CHUNK_MAX_TOKENS, overlap_tokens=CHUNK_OVERLAP_TOKENS
+    ):
+        ck_norm = ck.strip()
+        chunks.append(ck_norm)
+        shas.append(hashlib.sha256(ck_norm.encode("utf-8")).hexdigest())
+    return chunks, shas
+
 
 class IngestService:
     """
     Ingestão idempotente:
     - chunking "token-aware"
-    - dedup por sha256 do chunk normalizado
-    - embed em lote com batch fixo
+    - dedup por sha256 do chunk normalizado (índice local + consulta em lote)
+    - embed em lote com batch fixo, vários lotes em paralelo
     - upsert no Qdrant com payload completo
+    - índice lexical (BM25) da coleção de leitura atualizado junto, se a
+      busca híbrida estiver ativa (inclusive com chunks pulados pelo dedup)
     """
 
-    def __init__(self, embedder: Embedder, store: VectorStore, batch_size: int = 128):
+    def __init__(
+        self,
+        embedder: Embedder,
+        store: VectorStore,
+        batch_size: int = 128,
+        known_hashes: KnownHashIndex | None = None,
+        max_concurrency: int = CFG.embed_concurrency,
+        lexical_index: BM25Index | None = None,
+    ):
         self.embedder = embedder
         self.store = store
         self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        if known_hashes is None:
+            known_hashes = KnownHashIndex.for_collection(CFG.collection_read)
+        self.known_hashes = known_hashes
+        if lexical_index is None and CFG.enable_hybrid:
+            lexical_index = get_lexical_index(CFG.collection_read)
+        self.lexical_index = lexical_index
+
+    async def _existing_hashes(self, shas: list[str]) -> set[str]:
+        """
+        Hashes already stored: local index first, then a single batched
+        lookup for the rest.
+        """
+        unknown = [sha for sha in shas if sha not in self.known_hashes]
+        existing = set(shas) - set(unknown)
+        if unknown:
+            found = await self.store.existing_sha256(
+                unknown, collection=CFG.collection_read
+            )
+            self.known_hashes.add_many(found)
+            existing |= found
+        return existing
+
+    async def _index_stored_chunks(self, shas: set[str]) -> None:
+        """
+        Add chunks already stored (skipped by dedup) that the BM25 index
+        lacks, under the id and payload of the stored point, so lexical and
+        vector hits of a chunk fuse into one.
+        """
+        missing = self.lexical_index.missing_sha256(shas)
+        if not missing:
+            return
+        points = await self.store.points_by_sha256(
+            list(missing), collection=CFG.collection_read
+        )
+        # pontos gravados antes do payload ter "text" ficam para o backfill
+        points = [p for p in points if p["payload"].get("text")]
+        if points:
+            self.lexical_index.add_many(
+                [p["id"] for p in points],
+                [p["payload"]["text"] for p in points],
+                [p["payload"] for p in points],
+            )
 
     async def ingest_document(
         self,
@@ -44,28 +127,117 @@ class IngestService:
         tenant: str,
         doc_id: str,
         source: str,
-        text: str,
+        text: str | Iterable[str],
+        ts_iso: str,
+        tags: list[str] | None = None,
+        graph_version: int = 1,
+    ) -> int:
+        """
+        Ingest one document; ``text`` may also be an iterable of text pieces
+        (pages, lines), which is chunked as it is consumed.
+        """
+        normalized, shas = prepare_chunks(text)
+        return await self._store_chunks(
+            normalized,
+            shas,
+            tenant=tenant,
+            doc_id=doc_id,
+            source=source,
+            ts_iso=ts_iso,
+            tags=tags,
+            graph_version=graph_version,
+        )
+
+    async def ingest_documents(
+        self, documents: Iterable[dict[str, Any]], processes: int | None = None
+    ) -> int:
+        """
+        Ingest many documents, chunking and hashing them in a process pool.
+
+        Each document is a dict of :meth:`ingest_document` keyword arguments
+        (``text`` must be a string). Up to ``2 * processes`` documents are
+        chunked ahead while earlier ones are deduplicated, embedded and
+        stored one at a time in completion order, so duplicate chunks across
+        documents are still stored once.
+
+        Args:
+            documents: Documents to ingest
+            processes: Worker processes (``RAG_INGEST_PROCESSES``); 0 or 1
+                chunks in-process
+
+        Returns:
+            The number of chunks stored.
+        """
+        processes = CFG.ingest_processes if processes is None else processes
+        if processes <= 1:
+            total = 0
+            for doc in documents:
+                total += await self.ingest_document(**doc)
+            return total
+
+        loop = asyncio.get_running_loop()
+        total = 0
+        pool = ProcessPoolExecutor(max_workers=processes)
+
+        async def _prepare(doc: dict[str, Any]):
+            prepared = await loop.run_in_executor(pool, prepare_chunks, doc["text"])
+            return doc, prepared
+
+        pending: set[asyncio.Future] = set()
+        try:
+            docs = iter(documents)
+            while True:
+                # janela limitada: no máximo 2 documentos por processo em voo
+                for doc in docs:
+                    pending.add(asyncio.ensure_future(_prepare(doc)))
+                    if len(pending) >= 2 * processes:
+                        break
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for fut in done:
+                    doc, (normalized, shas) = fut.result()
+                    meta = {k: v for k, v in doc.items() if k != "text"}
+                    total += await self._store_chunks(normalized, shas, **meta)
+        finally:
+            # não bloqueia o event loop esperando os workers encerrarem
+            for fut in pending:
+                fut.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+        return total
+
+    async def _store_chunks(
+        self,
+        normalized: list[str],
+        shas: list[str],
+        *,
+        tenant: str,
+        doc_id: str,
+        source: str,
         ts_iso: str,
         tags: list[str] | None = None,
         graph_version: int = 1,
     ) -> int:
-        chunks = list(chunk_text(text, max_tokens=512, overlap_tokens=64))
-        if not chunks:
+        if not normalized:
             return 0
 
+        # dedup duro por sha256 (índice local + consulta por payload em lote)
+        existing = await self._existing_hashes(shas)
+
+        if self.lexical_index is not None:
+            await self._index_stored_chunks(existing)
+
         ids: list[str] = []
         payloads: list[dict[str, Any]] = []
         texts_for_embed: list[str] = []
 
-        for i, ck in enumerate(chunks):
-            ck_norm = ck.strip()
-            sha = hashlib.sha256(ck_norm.encode("utf-8")).hexdigest()
-            # dedup duro por sha256 (consulta por payload)
-            exists = await self.store.exists_by_sha256(
-                sha, collection=CFG.collection_read
-            )
-            if exists:
+        for i, (ck_norm, sha) in enumerate(zip(normalized, shas)):
+            if sha in existing:
                 continue
+            # chunks repetidos no mesmo documento entram uma vez só
+            existing.add(sha)
             chunk_id = f"{doc_id}#c{i:06d}"
             ids.append(chunk_id)
             payloads.append(
@@ -80,29 +252,61 @@ class IngestService:
                     "neighbors": [],
                     "graph_version": graph_version,
                     "sha256": sha,
+                    "text": ck_norm,
                 }
             )
             texts_for_embed.append(ck_norm)
 
         if not ids:
+            self.known_hashes.flush()
+            if self.lexical_index is not None:
+                self.lexical_index.flush()
             logger.info("No new chunks to ingest (dedup hit) doc_id=%s", doc_id)
             return 0
 
-        # embed em lotes
-        total_upsert = 0
+        # embed + upsert em lotes, até max_concurrency lotes em paralelo
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def _process(start: int) -> int:
+            end = start + self.batch_size
+            batch_texts = texts_for_embed[start:end]
+            async with slots:
+                with embed_seconds.time():
+                    vecs = await self.embedder.embed_batch(batch_texts)
+                with upsert_seconds.time():
+                    await self.store.upsert_batch(
+                        ids=ids[start:end],
+                        vectors=vecs,
+                        payloads=payloads[start:end],
+                        collection=CFG.collection_write,
+                    )
+            # os índices locais (dedup e BM25) espelham a coleção de leitura
+            if CFG.collection_write == CFG.collection_read:
+                self.known_hashes.add_many(p["sha256"] for p in payloads[start:end])
+                if self.lexical_index is not None:
+                    self.lexical_index.add_many(
+                        ids[start:end], batch_texts, payloads[start:end]
+                    )
+            return len(batch_texts)
+
         t0 = time.perf_counter()
-        for start in range(0, len(texts_for_embed), self.batch_size):
-            batch_texts = texts_for_embed[start : start + self.batch_size]
-            with embed_seconds.time():
-                vecs = await self.embedder.embed_batch(batch_texts)
-            with upsert_seconds.time():
-                await self.store.upsert_batch(
-                    ids=ids[start : start + self.batch_size],
-                    vectors=vecs,
-                    payloads=payloads[start : start + self.batch_size],
-                    collection=CFG.collection_write,
-                )
-            total_upsert += len(batch_texts)
+        tasks = [
+            asyncio.ensure_future(_process(start))
+            for start in range(0, len(ids), self.batch_size)
+        ]
+        try:
+            counts = await asyncio.gather(*tasks)
+        finally:
+            # um lote com erro cancela os demais em vez de deixá-los rodando
+            for task in tasks:
+                task.cancel()
+        total_upsert = sum(counts)
+        self.known_hashes.flush()
+        if self.lexical_index is not None:
+            self.lexical_index.flush()
+        # invalida resultados de busca em cache (o retriever usa collection_read)
+        for collection in {CFG.collection_write, CFG.collection_read}:
+            bump_graph_version(collection)
 
         jobs_total.labels(status="ingested").inc()
         logger.info(
@@ -26,6 +26,7 @@ class VectorStore(Protocol):
     Protocol for storing and retrieving vector embeddings with metadata.
     """
 
+    async def initialize(self) -> None: ...
     async def upsert_batch(
         self,
         ids: list[str],
@@ -46,6 +47,15 @@ class VectorStore(Protocol):
     async def exists_by_sha256(
         self, sha256: str, collection: str | None = None
     ) -> bool: ...
+    async def existing_sha256(
+        self, sha256s: list[str], collection: str | None = None
+    ) -> set[str]: ...
+    async def points_by_sha256(
+        self, sha256s: list[str], collection: str | None = None
+    ) -> list[dict[str, Any]]: ...
+    async def scroll(
+        self, collection: str | None = None, offset: Any = None, limit: int = 256
+    ) -> tuple[list[dict[str, Any]], Any]: ...
 
 
 # pylint: disable=too-few-public-methods
@@ -0,0 +1,253 @@
+"""
+BM25 lexical index maintained next to the vector store.
+
+TWS questions are full of exact identifiers (job and workstation names,
+message codes such as ``AWSBHT001E``) that dense embeddings match poorly.
+:class:`BM25Index` keeps an inverted index of the ingested chunks so the
+retriever can run a lexical search alongside the vector search and fuse
+both rankings (see :func:`~.rerank.reciprocal_rank_fusion`).
+
+Identifiers are kept whole by the tokenizer, and compound identifiers
+(``WS01#DAILY_LOAD``) are also indexed by their parts. When a path is
+given, every indexed chunk is appended to a JSON-lines file (term
+frequencies and payload) and replayed on startup.
+
+The index mirrors the collection retrieval reads (``collection_read``).
+:func:`backfill_lexical_index` fills it from the chunk text stored in the
+payloads, e.g. after turning ``RAG_HYBRID_ON`` on for an existing collection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from .config import CFG
+from .interfaces import VectorStore
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[\w#@$.-]*\w", re.UNICODE)
+_PART_SEPARATORS = re.compile(r"[#@$._-]+")
+
+
+def _to_thread(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased terms of ``text``; compound identifiers also yield their parts."""
+    terms: List[str] = []
+    for token in _TOKEN.findall(text.lower()):
+        terms.append(token)
+        parts = [p for p in _PART_SEPARATORS.split(token) if p]
+        if len(parts) > 1:
+            terms.extend(parts)
+    return terms
+
+
+def _matches(payload: Dict[str, Any], key: str, value: Any) -> bool:
+    field = payload.get(key)
+    return value in field if isinstance(field, (list, tuple, set)) else field == value
+
+
+class BM25Index:
+    """
+    Okapi BM25 over ingested chunks, with the same equality filters as the
+    vector store (a list payload such as ``tags`` matches if it contains the
+    value).
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.2, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[str, tuple[Counter, int, Dict[str, Any]]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        # chunks indexados por sha256 do payload
+        self._shas: Counter = Counter()
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        if path:
+            self._load(path)
+
+    @classmethod
+    def for_collection(
+        cls, collection: str, directory: Optional[str] = None
+    ) -> "BM25Index":
+        """Index persisted under ``directory`` (``RAG_LEXICAL_INDEX_DIR``), if set."""
+        directory = directory if directory is not None else CFG.lexical_index_dir
+        if not directory:
+            return cls()
+        os.makedirs(directory, exist_ok=True)
+        return cls(os.path.join(directory, f"{collection}.bm25.jsonl"))
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        # registro parcial de uma escrita interrompida
+                        logger.warning("Ignoring truncated record in %s", path)
+                        continue
+                    self._set(rec["id"], Counter(rec["tf"]), rec["payload"])
+        except FileNotFoundError:
+            return
+        logger.info("Loaded %d lexical index entries from %s", len(self._docs), path)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docs
+
+    def missing_sha256(self, sha256s: Iterable[str]) -> set[str]:
+        """Hashes of ``sha256s`` with no indexed chunk."""
+        with self._lock:
+            return {sha for sha in sha256s if not self._shas[sha]}
+
+    def _set(self, doc_id: str, tf: Counter, payload: Dict[str, Any]) -> None:
+        previous = self._docs.get(doc_id)
+        if previous is not None:
+            for term in previous[0]:
+                self._postings[term].pop(doc_id, None)
+            self._total_length -= previous[1]
+            self._shas[previous[2].get("sha256")] -= 1
+        length = sum(tf.values())
+        self._docs[doc_id] = (tf, length, payload)
+        self._total_length += length
+        self._shas[payload.get("sha256")] += 1
+        for term, count in tf.items():
+            self._postings.setdefault(term, {})[doc_id] = count
+
+    def add_many(
+        self, ids: Iterable[str], texts: Iterable[str], payloads: Iterable[Dict[str, Any]]
+    ) -> None:
+        """Index (or re-index) chunks; persisted on the next :meth:`flush`."""
+        with self._lock:
+            for doc_id, text, payload in zip(ids, texts, payloads):
+                tf = Counter(tokenize(text))
+                self._set(doc_id, tf, payload)
+                if self.path:
+                    self._pending.append(
+                        json.dumps({"id": doc_id, "tf": tf, "payload": payload})
+                    )
+
+    def flush(self) -> None:
+        """Append chunks indexed since the last flush to the index file."""
+        with self._lock:
+            if not self.path or not self._pending:
+                self._pending.clear()
+                return
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write("\n".join(self._pending) + "\n")
+            self._pending.clear()
+
+    def search_sync(
+        self, query: str, top_k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Top ``top_k`` chunks by BM25 score, as ``{"id", "score", "payload"}``."""
+        conditions = [(k, v) for k, v in (filters or {}).items() if v is not None]
+        with self._lock:
+            n = len(self._docs)
+            if not n or top_k <= 0:
+                return []
+            avg_length = self._total_length / n
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    length = self._docs[doc_id][1]
+                    norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (
+                        tf + norm
+                    )
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            out: List[Dict[str, Any]] = []
+            for doc_id, score in ranked:
+                payload = self._docs[doc_id][2]
+                if all(_matches(payload, k, v) for k, v in conditions):
+                    out.append({"id": doc_id, "score": score, "payload": payload})
+                    if len(out) == top_k:
+                        break
+            return out
+
+    async def search(
+        self, query: str, top_k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        return await _to_thread(self.search_sync, query, top_k, filters)
+
+
+_indexes: Dict[str, BM25Index] = {}
+
+
+def get_lexical_index(collection: str) -> BM25Index:
+    """Return the shared lexical index of ``collection`` (ingest and retrieval)."""
+    index = _indexes.get(collection)
+    if index is None:
+        index = _indexes[collection] = BM25Index.for_collection(collection)
+    return index
+
+
+async def backfill_lexical_index(
+    store: VectorStore,
+    index: Optional[BM25Index] = None,
+    collection: Optional[str] = None,
+    batch_size: int = 256,
+) -> int:
+    """
+    Index the chunks of ``collection`` (default ``collection_read``) that
+    are not in its lexical index yet, scrolling the store and reading the
+    chunk text from the payloads.
+
+    Returns:
+        The number of chunks indexed.
+    """
+    collection = collection or CFG.collection_read
+    if index is None:
+        index = get_lexical_index(collection)
+    added = without_text = 0
+    offset = None
+    while True:
+        points, offset = await store.scroll(
+            collection=collection, offset=offset, limit=batch_size
+        )
+        # pontos gravados antes do payload ter "text" não têm o que indexar
+        new = [p for p in points if p["id"] not in index and p["payload"].get("text")]
+        without_text += sum(1 for p in points if not p["payload"].get("text"))
+        if new:
+            await _to_thread(
+                index.add_many,
+                [p["id"] for p in new],
+                [p["payload"]["text"] for p in new],
+                [p["payload"] for p in new],
+            )
+            added += len(new)
+        if offset is None:
+            break
+    await _to_thread(index.flush)
+    if without_text:
+        logger.warning(
+            "Skipped %d chunks without payload text in %s", without_text, collection
+        )
+    logger.info("Backfilled %d chunks into the lexical index of %s", added, collection)
+    return added
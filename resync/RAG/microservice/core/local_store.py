@@ -0,0 +1,427 @@
+"""
+In-process vector store backed by memory-mapped float32 matrices.
+
+:class:`LocalVectorStore` implements the :class:`~.interfaces.VectorStore`
+protocol without a Qdrant server, for tests, benchmarks and single-node
+deployments. Each collection keeps:
+
+- ``vectors.f32``: unit-norm float32 rows, memory-mapped and grown by doubling;
+- ``payloads.jsonl``: one ``{"row", "id", "payload"}`` record per upsert
+  (the last record of a row wins when the collection is reopened).
+
+Search is exact (one matrix-vector product) until a collection reaches
+``ivf_threshold`` vectors; larger collections build an IVF index (spherical
+k-means centroids) and only score the rows of the ``nprobe`` closest lists.
+Filters are the same equality matches as :class:`~.vector_store.QdrantVectorStore`
+(a list payload such as ``tags`` matches if it contains the value); they are
+turned into a row mask before scoring, from inverted indexes for ``tenant``,
+``doc_id``, ``tags`` and ``sha256``. Without a ``path`` everything stays in
+memory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import math
+import os
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import numpy as np
+
+from .config import CFG
+from .interfaces import VectorStore
+
+logger = logging.getLogger(__name__)
+
+# Campos com índice invertido (os mesmos índices de payload do Qdrant)
+_INDEXED_FIELDS = ("tenant", "doc_id", "tags", "sha256")
+_INITIAL_CAPACITY = 1024
+# Linhas por bloco ao atribuir vetores aos centróides
+_ASSIGN_BLOCK = 65536
+
+
+def _to_thread(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def _values(value: Any) -> list[Any]:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _matches(payload: Dict[str, Any], key: str, value: Any) -> bool:
+    return value in _values(payload.get(key))
+
+
+class _IVFIndex:
+    """
+    Inverted-file index: rows are assigned to the closest of ``nlist``
+    centroids and a query only scores the rows of its ``nprobe`` closest.
+    """
+
+    def __init__(self, centroids: np.ndarray, assignment: np.ndarray):
+        self.centroids = centroids
+        self.assignment = assignment
+        self.built_rows = len(assignment)
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, iterations: int = 10, seed: int = 0) -> "_IVFIndex":
+        n = len(matrix)
+        nlist = max(1, int(math.sqrt(n)))
+        rng = np.random.default_rng(seed)
+        # k-means esférico numa amostra; depois atribui todas as linhas
+        sample = matrix[rng.choice(n, size=min(n, nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            filled = np.bincount(labels, minlength=nlist) > 0
+            centroids[filled] = _normalize(sums[filled])
+        index = cls(centroids, np.empty(0, dtype=np.int32))
+        index.assignment = index.assign(matrix)
+        index.built_rows = n
+        return index
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), _ASSIGN_BLOCK):
+            block = vectors[start : start + _ASSIGN_BLOCK]
+            labels[start : start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        return labels
+
+    def update(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Assign new or overwritten rows to their closest centroid."""
+        if len(rows) and rows.max() >= len(self.assignment):
+            grown = np.zeros(rows.max() + 1, dtype=np.int32)
+            grown[: len(self.assignment)] = self.assignment
+            self.assignment = grown
+        self.assignment[rows] = self.assign(vectors)
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        return np.isin(self.assignment, probes)
+
+
+class _Collection:
+    """Vectors, payloads and indexes of one collection (not thread-safe)."""
+
+    def __init__(self, dim: int, path: Optional[str] = None):
+        self.dim = dim
+        self.path = path
+        self.size = 0
+        self.ids: List[str] = []
+        self.payloads: List[Dict[str, Any]] = []
+        self.rows: Dict[str, int] = {}
+        self.postings: Dict[tuple[str, Any], set[int]] = {}
+        self.ivf: Optional[_IVFIndex] = None
+        self._payload_log = None
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._load()
+            self._payload_log = open(
+                os.path.join(path, "payloads.jsonl"), "a", encoding="utf-8"
+            )
+        else:
+            self.matrix = np.zeros((_INITIAL_CAPACITY, dim), dtype=np.float32)
+
+    # -- armazenamento -------------------------------------------------
+    def _vectors_file(self) -> str:
+        return os.path.join(self.path, "vectors.f32")
+
+    def _map(self, capacity: int) -> None:
+        nbytes = capacity * self.dim * 4
+        with open(self._vectors_file(), "ab") as fh:
+            if os.path.getsize(self._vectors_file()) < nbytes:
+                fh.truncate(nbytes)
+        self.matrix = np.memmap(
+            self._vectors_file(), dtype=np.float32, mode="r+", shape=(capacity, self.dim)
+        )
+
+    def _load(self) -> None:
+        records: Dict[int, tuple[str, Dict[str, Any]]] = {}
+        log = os.path.join(self.path, "payloads.jsonl")
+        if os.path.exists(log):
+            with open(log, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        # registro parcial de uma escrita interrompida
+                        logger.warning("Ignoring truncated record in %s", log)
+                        continue
+                    records[rec["row"]] = (rec["id"], rec["payload"])
+        self.size = max(records, default=-1) + 1
+        self.ids = [""] * self.size
+        self.payloads = [{} for _ in range(self.size)]
+        for row, (point_id, payload) in records.items():
+            self._set_row(row, point_id, payload)
+        existing = (
+            os.path.getsize(self._vectors_file())
+            if os.path.exists(self._vectors_file())
+            else 0
+        )
+        capacity = max(_INITIAL_CAPACITY, self.size, existing // (self.dim * 4))
+        self._map(capacity)
+        if self.size:
+            logger.info("Loaded %d vectors from %s", self.size, self.path)
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self.matrix)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        if self.path:
+            self.matrix.flush()
+            self._map(capacity)
+        else:
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[: len(self.matrix)] = self.matrix
+            self.matrix = grown
+
+    def _set_row(self, row: int, point_id: str, payload: Dict[str, Any]) -> None:
+        if row < len(self.ids) and self.ids[row]:
+            for key in _INDEXED_FIELDS:
+                for value in _values(self.payloads[row].get(key)):
+                    self.postings.get((key, value), set()).discard(row)
+        self.ids[row] = point_id
+        self.payloads[row] = payload
+        self.rows[point_id] = row
+        for key in _INDEXED_FIELDS:
+            if key in payload:
+                for value in _values(payload[key]):
+                    self.postings.setdefault((key, value), set()).add(row)
+
+    def upsert(
+        self, ids: List[str], vectors: List[List[float]], payloads: List[Dict[str, Any]]
+    ) -> None:
+        rows = []
+        for point_id in ids:
+            row = self.rows.get(point_id)
+            if row is None:
+                row = self.rows[point_id] = self.size
+                self.size += 1
+                self.ids.append("")
+                self.payloads.append({})
+            rows.append(row)
+        self._reserve(self.size)
+        rows_arr = np.asarray(rows, dtype=np.int64)
+        unit = _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim))
+        self.matrix[rows_arr] = unit
+        for row, point_id, payload in zip(rows, ids, payloads):
+            self._set_row(row, point_id, payload)
+        if self.ivf is not None:
+            self.ivf.update(rows_arr, unit)
+        if self._payload_log is not None:
+            self.matrix.flush()
+            self._payload_log.write(
+                "".join(
+                    json.dumps({"row": r, "id": i, "payload": p}) + "\n"
+                    for r, i, p in zip(rows, ids, payloads)
+                )
+            )
+            self._payload_log.flush()
+
+    # -- busca ---------------------------------------------------------
+    def mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Boolean row mask for ``filters``, or None when nothing is filtered."""
+        conditions = [(k, v) for k, v in (filters or {}).items() if v is not None]
+        if not conditions:
+            return None
+        mask = np.ones(self.size, dtype=bool)
+        for key, value in conditions:
+            if key in _INDEXED_FIELDS:
+                rows = np.fromiter(self.postings.get((key, value), ()), dtype=np.int64)
+                selected = np.zeros(self.size, dtype=bool)
+                selected[rows] = True
+            else:
+                selected = np.fromiter(
+                    (_matches(p, key, value) for p in self.payloads),
+                    dtype=bool,
+                    count=self.size,
+                )
+            mask &= selected
+        return mask
+
+    def search(
+        self,
+        vector: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        ivf_threshold: int,
+        nprobe: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        query = _normalize(np.asarray(vector, dtype=np.float32))
+        if top_k <= 0 or not self.size:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        mask = self.mask(filters)
+        candidates = self.size if mask is None else int(mask.sum())
+        if candidates >= ivf_threshold:
+            # reconstrói o IVF quando a coleção dobrou desde a última construção
+            if self.ivf is None or self.size >= 2 * self.ivf.built_rows:
+                self.ivf = _IVFIndex.build(self.matrix[: self.size])
+            probe = self.ivf.candidates(query, nprobe)
+            mask = probe if mask is None else mask & probe
+        if mask is None:
+            scores = self.matrix[: self.size] @ query
+            rows = np.arange(self.size)
+        else:
+            rows = np.flatnonzero(mask)
+            scores = self.matrix[rows] @ query
+        if len(rows) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            rows, scores = rows[best], scores[best]
+        order = np.argsort(-scores, kind="stable")
+        return rows[order], scores[order]
+
+    def close(self) -> None:
+        if self._payload_log is not None:
+            self.matrix.flush()
+            self._payload_log.close()
+            self._payload_log = None
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Embedded vector store with exact or IVF search over memory-mapped
+    float32 matrices; a drop-in replacement for ``QdrantVectorStore``.
+    Blocking work runs outside the event loop.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        collection: Optional[str] = None,
+        dim: int = CFG.embed_dim,
+        ivf_threshold: int = CFG.local_ivf_threshold,
+        nprobe: int = CFG.local_ivf_nprobe,
+    ):
+        self.path = path
+        self._collection_default = collection or CFG.collection_write
+        self._dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._collections: Dict[str, _Collection] = {}
+        self._lock = threading.RLock()
+
+    async def initialize(self) -> None:
+        """Open the default collection (same bootstrap as ``QdrantVectorStore``)."""
+        await _to_thread(self._open, self._collection_default)
+
+    def _open(self, collection: str) -> None:
+        with self._lock:
+            self._get(collection)
+
+    def _get(self, collection: str) -> _Collection:
+        col = self._collections.get(collection)
+        if col is None:
+            col_path = os.path.join(self.path, collection) if self.path else None
+            col = self._collections[collection] = _Collection(self._dim, col_path)
+        return col
+
+    def _upsert_sync(self, collection, ids, vectors, payloads) -> None:
+        with self._lock:
+            self._get(collection).upsert(ids, vectors, payloads)
+
+    async def upsert_batch(
+        self,
+        ids: List[str],
+        vectors: List[List[float]],
+        payloads: List[Dict[str, Any]],
+        collection: Optional[str] = None,
+    ) -> None:
+        col = collection or self._collection_default
+        await _to_thread(self._upsert_sync, col, ids, vectors, payloads)
+
+    def _query_sync(
+        self, collection, vector, top_k, filters, ef_search, with_vectors
+    ) -> List[Dict[str, Any]]:
+        # ef_search do Qdrant vira nprobe (64 -> 8 listas)
+        nprobe = max(self.nprobe, (ef_search or 0) // 8)
+        with self._lock:
+            col = self._get(collection)
+            rows, scores = col.search(vector, top_k, filters, self.ivf_threshold, nprobe)
+            out: List[Dict[str, Any]] = []
+            for row, score in zip(rows.tolist(), scores.tolist()):
+                item = {"id": col.ids[row], "score": score, "payload": col.payloads[row]}
+                if with_vectors:
+                    item["vector"] = col.matrix[row].tolist()
+                out.append(item)
+            return out
+
+    async def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        collection: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        with_vectors: bool = False,
+    ) -> List[Dict[str, Any]]:
+        col = collection or CFG.collection_read
+        return await _to_thread(
+            self._query_sync, col, vector, top_k, filters, ef_search, with_vectors
+        )
+
+    async def count(self, collection: Optional[str] = None) -> int:
+        with self._lock:
+            return self._get(collection or CFG.collection_read).size
+
+    async def exists_by_sha256(
+        self, sha256: str, collection: Optional[str] = None
+    ) -> bool:
+        return bool(await self.existing_sha256([sha256], collection))
+
+    async def existing_sha256(
+        self, sha256s: List[str], collection: Optional[str] = None
+    ) -> set[str]:
+        with self._lock:
+            postings = self._get(collection or CFG.collection_read).postings
+            return {h for h in sha256s if postings.get(("sha256", h))}
+
+    async def points_by_sha256(
+        self, sha256s: List[str], collection: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            col = self._get(collection or CFG.collection_read)
+            rows = sorted(
+                row
+                for sha in set(sha256s)
+                for row in col.postings.get(("sha256", sha), ())
+            )
+            return [{"id": col.ids[row], "payload": col.payloads[row]} for row in rows]
+
+    async def scroll(
+        self, collection: Optional[str] = None, offset: Any = None, limit: int = 256
+    ) -> tuple[List[Dict[str, Any]], Any]:
+        """Points of rows ``offset`` to ``offset + limit`` and the next offset."""
+        start = offset or 0
+        with self._lock:
+            col = self._get(collection or CFG.collection_read)
+            end = min(start + limit, col.size)
+            points = [
+                {"id": col.ids[row], "payload": col.payloads[row]}
+                for row in range(start, end)
+                if col.ids[row]
+            ]
+            return points, (end if end < col.size else None)
+
+    def close(self) -> None:
+        """Flush and close the files of every open collection."""
+        with self._lock:
+            for col in self._collections.values():
+                col.close()
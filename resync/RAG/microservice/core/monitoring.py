@@ -11,6 +11,14 @@ upsert_seconds = Histogram("rag_upsert_seconds", "Latency for vector upserts")
 query_seconds = Histogram("rag_query_seconds", "Latency for vector queries")
 
 jobs_total = Counter("rag_jobs_total", "RAG jobs", ["status"])
+embed_cache_total = Counter(
+    "rag_embed_cache_total", "Embedding cache lookups", ["result"]
+)
+query_cache_total = Counter(
+    "rag_query_cache_total",
+    "Query embedding/retrieval cache lookups",
+    ["cache", "result"],
+)
 collection_vectors = Gauge(
     "rag_collection_vectors", "Vectors in current read collection"
 )
\ No newline at end of file
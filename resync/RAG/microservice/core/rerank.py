@@ -0,0 +1,130 @@
+"""
+Vectorized re-ranking and Maximal Marginal Relevance (MMR) selection.
+
+Hits returned with their vectors are stacked into one float32 matrix, so
+the cosine similarity against the query is a single matrix-vector product
+instead of a Python loop per hit and dimension. MMR then picks hits that
+are relevant to the query but not redundant with the ones already picked,
+so the LLM context isn't filled with near-duplicate chunks. Rankings from
+different searches (vector and BM25) are merged with reciprocal rank fusion.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from typing import Sequence
+
+import numpy as np
+
+
+def _unit_rows(vectors: Sequence[Sequence[float] | None], dim: int) -> np.ndarray:
+    """Stack vectors as unit-norm float32 rows; missing ones become zeros."""
+    if all(vec is not None and len(vec) == dim for vec in vectors):
+        # caminho comum: uma única conversão para todos os vetores
+        matrix = np.array(vectors, dtype=np.float32).reshape(len(vectors), dim)
+    else:
+        matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+        for i, vec in enumerate(vectors):
+            if vec is not None and len(vec) == dim:
+                matrix[i] = vec
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+
+def _unit(vector: Sequence[float]) -> np.ndarray:
+    q = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(q)
+    return q / norm if norm > 0 else q
+
+
+def cosine_scores(
+    query: Sequence[float], vectors: Sequence[Sequence[float] | None]
+) -> np.ndarray:
+    """
+    Cosine similarity of each vector to the query.
+
+    Vectors that are missing or have a different dimension score 0.
+    """
+    q = _unit(query)
+    return _unit_rows(vectors, len(q)) @ q
+
+
+def mmr_select(
+    query: Sequence[float],
+    vectors: Sequence[Sequence[float] | None],
+    k: int,
+    lambda_mult: float = 0.5,
+) -> list[int]:
+    """
+    Indices of ``k`` vectors chosen by Maximal Marginal Relevance.
+
+    Each step picks the candidate maximizing
+    ``lambda_mult * sim(query, d) - (1 - lambda_mult) * max sim(d, selected)``;
+    ``lambda_mult=1`` is plain relevance order, lower values favour diversity.
+
+    Returns:
+        Indices into ``vectors`` in selection order.
+    """
+    q = _unit(query)
+    docs = _unit_rows(vectors, len(q))
+    relevance = docs @ q
+    k = min(k, len(docs))
+    selected: list[int] = []
+    # maior similaridade de cada candidato com os já escolhidos
+    redundancy = np.full(len(docs), -np.inf, dtype=np.float32)
+    available = np.ones(len(docs), dtype=bool)
+    for _ in range(k):
+        if selected:
+            scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        else:
+            scores = relevance.copy()
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, docs @ docs[best], out=redundancy)
+    return selected
+
+
+def rerank_hits(
+    query: Sequence[float],
+    hits: list[dict[str, Any]],
+    *,
+    mmr_k: int | None = None,
+    lambda_mult: float = 0.5,
+) -> list[dict[str, Any]]:
+    """
+    Re-rank hits carrying a ``vector`` by cosine similarity to the query.
+
+    With ``mmr_k``, return the ``mmr_k`` hits chosen by :func:`mmr_select`
+    instead of all hits in similarity order.
+    """
+    if not hits:
+        return hits
+    vectors = [h.get("vector") for h in hits]
+    if mmr_k is not None:
+        return [hits[i] for i in mmr_select(query, vectors, mmr_k, lambda_mult)]
+    # ordenação estável, como o sort anterior
+    order = np.argsort(-cosine_scores(query, vectors), kind="stable")
+    return [hits[i] for i in order]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[list[dict[str, Any]]], k: int = 60
+) -> list[dict[str, Any]]:
+    """
+    Merge rankings by Reciprocal Rank Fusion.
+
+    Each hit scores ``sum(1 / (k + rank))`` over the rankings it appears in
+    (rank starting at 1), so scores from different searches never need to be
+    compared. Hits are matched by ``id``; the first ranking's copy of a hit
+    is kept, with ``score`` replaced by the fused score.
+    """
+    fused: dict[str, float] = {}
+    first: dict[str, dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, start=1):
+            fused[hit["id"]] = fused.get(hit["id"], 0.0) + 1.0 / (k + rank)
+            first.setdefault(hit["id"], hit)
+    order = sorted(fused, key=fused.__getitem__, reverse=True)
+    return [{**first[i], "score": fused[i]} for i in order]
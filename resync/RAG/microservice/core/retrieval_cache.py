@@ -0,0 +1,171 @@
+"""
+Caches for repeated retrieval queries.
+
+The same questions ("status do job X") are asked all day, and each one used
+to embed the query and run a full vector search again. Two in-process
+caches avoid that:
+
+- :class:`QueryEmbeddingCache`: LRU of query vectors by model and
+  normalised query text;
+- :class:`RetrievalResultCache`: short-TTL LRU of retrieval results keyed
+  by query, filters, ``top_k`` and the collection's graph version.
+
+The graph version of a collection is bumped by ``IngestService`` whenever
+it writes chunks (:func:`bump_graph_version`), so cached results of a
+collection stop matching as soon as its content changes. The version lives
+in the memory of each process: with several workers, an ingest run by one
+of them does not invalidate the others' caches, which keep serving stale
+results for up to ``RAG_RETRIEVAL_CACHE_TTL`` seconds.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+
+from .config import CFG
+from .monitoring import query_cache_total
+
+_graph_versions: Dict[str, int] = {}
+_graph_versions_lock = threading.Lock()
+
+
+def graph_version(collection: str) -> int:
+    """Current graph version of ``collection`` in this process."""
+    return _graph_versions.get(collection, 0)
+
+
+def bump_graph_version(collection: str) -> int:
+    """Mark ``collection`` as changed; returns its new graph version."""
+    with _graph_versions_lock:
+        version = _graph_versions.get(collection, 0) + 1
+        _graph_versions[collection] = version
+    return version
+
+
+def _copy_hit(hit: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of ``hit`` and its payload, without the (large) vector."""
+    copied = {k: v for k, v in hit.items() if k != "vector"}
+    if isinstance(copied.get("payload"), dict):
+        copied["payload"] = dict(copied["payload"])
+    return copied
+
+
+def normalize_query(query: str) -> str:
+    """Case-folded query with whitespace collapsed."""
+    return " ".join(query.split()).casefold()
+
+
+class _LRU:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class QueryEmbeddingCache:
+    """
+    LRU cache of query embeddings by ``(model, normalised query)``.
+    """
+
+    def __init__(self, max_entries: int = CFG.query_embed_cache_size):
+        self._lru = _LRU(max_entries)
+
+    def get(self, model: str, query: str) -> Optional[List[float]]:
+        vector = self._lru.get((model, normalize_query(query)))
+        result = "miss" if vector is None else "hit"
+        query_cache_total.labels(cache="embedding", result=result).inc()
+        return vector
+
+    def put(self, model: str, query: str, vector: List[float]) -> None:
+        self._lru.put((model, normalize_query(query)), vector)
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+
+class RetrievalResultCache:
+    """
+    Short-TTL LRU cache of retrieval results.
+
+    Entries are keyed by normalised query, filters, ``top_k``, collection and
+    the collection's graph version, so they are never served after an
+    ingest into the collection by this process. Hits are stored without
+    their vectors; callers get copies of the hits and their payloads, and
+    must not mutate values nested deeper in the payload.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = CFG.retrieval_cache_ttl,
+        max_entries: int = CFG.retrieval_cache_size,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._lru = _LRU(max_entries)
+
+    @staticmethod
+    def key(
+        query: str, filters: Optional[Dict[str, Any]], top_k: int, collection: str
+    ) -> Hashable:
+        """
+        Cache key for a retrieval; take it before searching so results are
+        stored under the graph version they were computed from.
+        """
+        flt = json.dumps(filters or {}, sort_keys=True, default=str)
+        return (
+            normalize_query(query),
+            flt,
+            top_k,
+            collection,
+            graph_version(collection),
+        )
+
+    def get(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        entry = self._lru.get(key)
+        if entry is None or time.monotonic() >= entry[0]:
+            query_cache_total.labels(cache="retrieval", result="miss").inc()
+            return None
+        query_cache_total.labels(cache="retrieval", result="hit").inc()
+        # cópia rasa dos hits e payloads: quem chama pode alterá-los
+        return [_copy_hit(hit) for hit in entry[1]]
+
+    def put(self, key: Hashable, hits: List[Dict[str, Any]]) -> None:
+        hits = [_copy_hit(hit) for hit in hits]
+        self._lru.put(key, (time.monotonic() + self.ttl_seconds, hits))
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def __len__(self) -> int:
+        return len(self._lru)
@@ -1,54 +1,118 @@
 from __future__ import annotations
 
+import asyncio
 import math
 from typing import Any
-from typing import Dict
-from typing import List
-from typing import Optional
 
 from .config import CFG
 from .interfaces import Embedder
 from .interfaces import Retriever
 from .interfaces import VectorStore
+from .lexical import BM25Index
+from .lexical import get_lexical_index
 from .monitoring import query_seconds
+from .rerank import reciprocal_rank_fusion
+from .rerank import rerank_hits
+from .retrieval_cache import QueryEmbeddingCache
+from .retrieval_cache import RetrievalResultCache
 
 
 class RagRetriever(Retriever):
-    def __init__(self, embedder: Embedder, store: VectorStore):
+    def __init__(
+        self,
+        embedder: Embedder,
+        store: VectorStore,
+        *,
+        enable_rerank: bool = CFG.enable_rerank,
+        enable_mmr: bool = CFG.enable_mmr,
+        mmr_lambda: float = CFG.mmr_lambda,
+        mmr_fetch_factor: int = CFG.mmr_fetch_factor,
+        enable_hybrid: bool = CFG.enable_hybrid,
+        lexical_index: BM25Index | None = None,
+        rrf_k: int = CFG.rrf_k,
+        enable_cache: bool = CFG.enable_query_cache,
+        embedding_cache: QueryEmbeddingCache | None = None,
+        result_cache: RetrievalResultCache | None = None,
+    ):
         self.embedder = embedder
         self.store = store
+        self.enable_rerank = enable_rerank
+        self.enable_mmr = enable_mmr
+        self.mmr_lambda = mmr_lambda
+        self.mmr_fetch_factor = mmr_fetch_factor
+        if enable_hybrid and lexical_index is None:
+            lexical_index = get_lexical_index(CFG.collection_read)
+        self.lexical_index = lexical_index
+        self.rrf_k = rrf_k
+        if enable_cache:
+            embedding_cache = embedding_cache or QueryEmbeddingCache()
+            result_cache = result_cache or RetrievalResultCache()
+        self.embedding_cache = embedding_cache
+        self.result_cache = result_cache
 
     async def retrieve(
         self, query: str, top_k: int = 10, filters: dict[str, Any] | None = None
     ) -> list[dict[str, Any]]:
         top_k = min(top_k, CFG.max_top_k)
-        vec = await self.embedder.embed(query)
-        ef = CFG.ef_search_base + int(math.log2(max(10, top_k)) * 8)
+        if self.result_cache is None:
+            return await self._search(query, top_k, filters)
+
+        key = self.result_cache.key(query, filters, top_k, CFG.collection_read)
+        hits = self.result_cache.get(key)
+        if hits is None:
+            hits = await self._search(query, top_k, filters)
+            self.result_cache.put(key, hits)
+        return hits
+
+    async def _search(
+        self, query: str, top_k: int, filters: dict[str, Any] | None
+    ) -> list[dict[str, Any]]:
+        if self.lexical_index is None:
+            return await self._vector_search(query, top_k, filters)
+
+        # híbrido: busca vetorial e BM25 em paralelo, fundidas por RRF
+        dense, lexical = await asyncio.gather(
+            self._vector_search(query, top_k, filters),
+            self.lexical_index.search(query, top_k, filters),
+        )
+        return reciprocal_rank_fusion([dense, lexical], k=self.rrf_k)[:top_k]
+
+    async def _embed_query(self, query: str) -> list[float]:
+        if self.embedding_cache is None:
+            return await self.embedder.embed(query)
+        model = getattr(self.embedder, "model", "")
+        vec = self.embedding_cache.get(model, query)
+        if vec is None:
+            vec = await self.embedder.embed(query)
+            self.embedding_cache.put(model, query, vec)
+        return vec
+
+    async def _vector_search(
+        self, query: str, top_k: int, filters: dict[str, Any] | None
+    ) -> list[dict[str, Any]]:
+        # MMR escolhe top_k entre mais candidatos
+        fetch_k = top_k * self.mmr_fetch_factor if self.enable_mmr else top_k
+        vec = await self._embed_query(query)
+        ef = CFG.ef_search_base + int(math.log2(max(10, fetch_k)) * 8)
         ef = min(ef, CFG.ef_search_max)
         with query_seconds.time():
             hits = await self.store.query(
                 vector=vec,
-                top_k=top_k,
+                top_k=fetch_k,
                 collection=CFG.collection_read,
                 filters=filters,
                 ef_search=ef,
-                with_vectors=False if not CFG.enable_rerank else True,
+                with_vectors=self.enable_rerank or self.enable_mmr,
             )
-        if not CFG.enable_rerank:
+        if not (self.enable_rerank or self.enable_mmr):
             return hits
 
-        # Re-rank leve (cosine com vetor do Qdrant, caso retornado)
+        # Re-rank (cosine com vetor do Qdrant, caso retornado) e/ou MMR
         if hits and "vector" in hits[0]:
-
-            def cos(a: List[float], b: List[float]) -> float:
-                import math
-
-                da = math.sqrt(sum(x * x for x in a))
-                db = math.sqrt(sum(x * x for x in b))
-                if da == 0 or db == 0:
-                    return 0.0
-                return sum(x * y for x, y in zip(a, b)) / (da * db)
-
-            q = vec
-            hits.sort(key=lambda h: cos(q, h.get("vector") or []), reverse=True)
-        return hits
+            return rerank_hits(
+                vec,
+                hits,
+                mmr_k=top_k if self.enable_mmr else None,
+                lambda_mult=self.mmr_lambda,
+            )
+        return hits[:top_k]
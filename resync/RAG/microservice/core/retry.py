@@ -0,0 +1,76 @@
+"""
+Retry with exponential backoff for calls to the embedding provider.
+
+The microservice runs on its own, so it keeps this small helper instead of
+importing the main application's resilience module. A :class:`RetryBudget`
+caps retries at a fraction of the request volume, so a provider that is
+browning out does not get a multiple of its normal load.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RetryBudget:
+    """
+    Token bucket: each request deposits ``ratio`` tokens (up to
+    ``max_tokens``) and each retry spends one.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def record_request(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_acquire_retry(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+async def retry_with_backoff(
+    op: Callable[[], Awaitable[T]],
+    *,
+    retries: int = 3,
+    base_delay: float = 0.5,
+    cap: float = 10.0,
+    retry_on: tuple[type[BaseException], ...] = (Exception,),
+    budget: Optional[RetryBudget] = None,
+) -> T:
+    """
+    Run ``op``, retrying ``retry_on`` errors with capped exponential backoff
+    and full jitter while ``budget`` (if any) has tokens left.
+    """
+    if budget is not None:
+        budget.record_request()
+    attempt = 0
+    while True:
+        try:
+            return await op()
+        except retry_on as e:
+            attempt += 1
+            if attempt > retries:
+                raise
+            if budget is not None and not budget.try_acquire_retry():
+                logger.warning("retry budget exhausted err=%s", type(e).__name__)
+                raise
+            delay = random.uniform(0, min(cap, base_delay * (2 ** (attempt - 1))))
+            logger.warning(
+                "retry attempt=%s delay=%.3fs err=%s", attempt, delay, type(e).__name__
+            )
+            await asyncio.sleep(delay)
@@ -1,13 +1,15 @@
 """
 Qdrant-based vector store implementation for RAG.
 
-Provides async-safe upsert, query, and deduplication with payload indexing.
+Provides async upsert, query, and deduplication with payload indexing over
+the async Qdrant client (gRPC when ``QDRANT_PREFER_GRPC`` is on). Large
+upserts are split into batches that are sent concurrently without waiting
+for indexing, followed by one acknowledged batch as a barrier.
 """
 
 from __future__ import annotations
 
 import asyncio
-import functools
 import logging
 from typing import Any
 from typing import Dict
@@ -21,25 +23,21 @@ logger = logging.getLogger(__name__)
 
 # Optional imports - defer error until actual usage
 try:
-    from qdrant_client import QdrantClient
+    from qdrant_client import AsyncQdrantClient
     from qdrant_client.http import models as qm
     QDRANT_AVAILABLE = True
 except ImportError:
-    QdrantClient = None
+    AsyncQdrantClient = None
     qm = None
     QDRANT_AVAILABLE = False
 
 
-def _to_thread(fn, *args, **kwargs):
-    loop = asyncio.get_running_loop()
-    return loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
-
-
 class QdrantVectorStore(VectorStore):
     """
-    Encapsula operações de upsert/query no Qdrant com criação automática da coleção,
-    índices de payload e filtros. Todas as chamadas do client (bloqueantes) são
-    executadas fora do event loop.
+    Encapsula operações de upsert/query no Qdrant (client assíncrono) com
+    criação da coleção, índices de payload e filtros. Chame
+    :meth:`initialize` antes do primeiro uso; coleções de escrita ainda não
+    criadas são criadas no primeiro upsert.
     """
 
     def __init__(
@@ -48,32 +46,61 @@ class QdrantVectorStore(VectorStore):
         api_key: Optional[str] = None,
         collection: Optional[str] = None,
         dim: int = CFG.embed_dim,
+        *,
+        prefer_grpc: bool = CFG.qdrant_prefer_grpc,
+        upsert_batch_size: int = CFG.upsert_batch_size,
+        upsert_concurrency: int = CFG.upsert_concurrency,
     ):
         if not QDRANT_AVAILABLE:
             raise RuntimeError("qdrant-client is required. pip install qdrant-client")
 
-        self._client = QdrantClient(
-            url or CFG.qdrant_url, api_key=api_key or CFG.qdrant_api_key, timeout=60.0
+        self._client = AsyncQdrantClient(
+            url or CFG.qdrant_url,
+            api_key=api_key or CFG.qdrant_api_key,
+            prefer_grpc=prefer_grpc,
+            grpc_port=CFG.qdrant_grpc_port,
+            timeout=60,
         )
         self._collection_default = collection or CFG.collection_write
         self._dim = dim
-        self._ensure_collection(self._collection_default)
+        self.upsert_batch_size = upsert_batch_size
+        # limite de lotes em voo, compartilhado por todos os upserts
+        self._upsert_slots = asyncio.Semaphore(upsert_concurrency)
+        self._ready: set[str] = set()
+        self._ready_lock = asyncio.Lock()
 
-    def _ensure_collection(self, collection: str) -> None:
-        try:
-            self._client.get_collection(collection)
+    async def initialize(self) -> None:
+        """Create the default collection and its payload indexes if missing."""
+        await self._ensure_collection(self._collection_default)
+
+    async def _ensure_collection(self, collection: str) -> None:
+        if collection in self._ready:
             return
-        except Exception:  # pylint: disable=broad-exception-caught
-            pass
-        logger.info("Creating Qdrant collection: %s", collection)
-        _to_thread(
-            self._client.recreate_collection,
-            collection_name=collection,
-            vectors_config=qm.VectorParams(size=self._dim, distance=qm.Distance.COSINE),
-            optimizers_config=qm.OptimizersConfigDiff(default_segment_number=2),
-            hnsw_config=qm.HnswConfigDiff(m=16, ef_construct=256),
-            shard_number=1,
-        )
+        async with self._ready_lock:
+            if collection in self._ready:
+                return
+            if not await self._client.collection_exists(collection):
+                logger.info("Creating Qdrant collection: %s", collection)
+                try:
+                    await self._client.create_collection(
+                        collection_name=collection,
+                        vectors_config=qm.VectorParams(
+                            size=self._dim, distance=qm.Distance.COSINE
+                        ),
+                        optimizers_config=qm.OptimizersConfigDiff(
+                            default_segment_number=2
+                        ),
+                        hnsw_config=qm.HnswConfigDiff(m=16, ef_construct=256),
+                        shard_number=1,
+                    )
+                except Exception:  # pylint: disable=broad-exception-caught
+                    # outra instância criou a coleção ao mesmo tempo
+                    if not await self._client.collection_exists(collection):
+                        raise
+                await self._create_payload_indexes(collection)
+            self._ready.add(collection)
+
+    async def _create_payload_indexes(self, collection: str) -> None:
         # payload indexes (best-effort)
         for key, schema in [
             ("tenant", qm.PayloadSchemaType.KEYWORD),
@@ -84,7 +111,7 @@ class QdrantVectorStore(VectorStore):
             ("sha256", qm.PayloadSchemaType.KEYWORD),
         ]:
             try:
-                self._client.create_payload_index(
+                await self._client.create_payload_index(
                     collection, field_name=key, field_schema=schema
                 )
             except Exception:  # pylint: disable=broad-exception-caught
@@ -98,14 +125,33 @@ class QdrantVectorStore(VectorStore):
         payloads: List[Dict[str, Any]],
         collection: Optional[str] = None,
     ) -> None:
+        """
+        Upsert points in batches of ``upsert_batch_size``.
+
+        All batches but the last are sent concurrently (up to
+        ``upsert_concurrency`` in flight) with ``wait=False``; the last one
+        is sent with ``wait=True`` once they are acknowledged. Qdrant applies
+        updates in order, so when it returns every batch has been applied.
+        """
         col = collection or self._collection_default
+        await self._ensure_collection(col)
         points = [
             qm.PointStruct(id=i, vector=v, payload=p)
             for i, v, p in zip(ids, vectors, payloads)
         ]
-        await _to_thread(
-            self._client.upsert, collection_name=col, points=points, wait=True
-        )
+        if not points:
+            return
+        size = self.upsert_batch_size
+        batches = [points[start : start + size] for start in range(0, len(points), size)]
+        *pipelined, barrier = batches
+        await asyncio.gather(*(self._upsert(col, b, wait=False) for b in pipelined))
+        await self._upsert(col, barrier, wait=True)
+
+    async def _upsert(self, collection: str, points: list, wait: bool) -> None:
+        async with self._upsert_slots:
+            await self._client.upsert(
+                collection_name=collection, points=points, wait=wait
+            )
 
     def _to_filter(self, filters: Optional[Dict[str, Any]]) -> Optional[qm.Filter]:
         if not filters:
@@ -134,8 +180,7 @@ class QdrantVectorStore(VectorStore):
                 CFG.ef_search_max,
             )
         )
-        res = await _to_thread(
-            self._client.search,
+        res = await self._client.search(
             collection_name=col,
             query_vector=vector,
             limit=top_k,
@@ -154,7 +199,7 @@ class QdrantVectorStore(VectorStore):
 
     async def count(self, collection: Optional[str] = None) -> int:
         col = collection or CFG.collection_read
-        info = await _to_thread(self._client.get_collection, col)
+        info = await self._client.get_collection(col)
         return int(info.vectors_count or 0)
 
     async def exists_by_sha256(
@@ -165,8 +210,7 @@ class QdrantVectorStore(VectorStore):
             must=[qm.FieldCondition(key="sha256", match=qm.MatchValue(value=sha256))]
         )
         # scroll é mais barato do que search para checagem exata
-        res, _ = await _to_thread(
-            self._client.scroll,
+        res, _ = await self._client.scroll(
             collection_name=col,
             scroll_filter=flt,
             limit=1,
@@ -174,6 +218,92 @@ class QdrantVectorStore(VectorStore):
         )
         return bool(res)
 
+    async def existing_sha256(
+        self, sha256s: List[str], collection: Optional[str] = None
+    ) -> set[str]:
+        """
+        Return the subset of ``sha256s`` already stored, with one scroll
+        (``MatchAny``) per ``CFG.dedup_batch_size`` hashes instead of one per
+        chunk.
+        """
+        col = collection or CFG.collection_read
+        found: set[str] = set()
+        unique = list(dict.fromkeys(sha256s))
+        for start in range(0, len(unique), CFG.dedup_batch_size):
+            batch = unique[start : start + CFG.dedup_batch_size]
+            flt = qm.Filter(
+                must=[qm.FieldCondition(key="sha256", match=qm.MatchAny(any=batch))]
+            )
+            missing = set(batch)
+            offset = None
+            while True:
+                res, offset = await self._client.scroll(
+                    collection_name=col,
+                    scroll_filter=flt,
+                    limit=len(batch),
+                    offset=offset,
+                    with_payload=["sha256"],
+                    with_vectors=False,
+                )
+                missing.difference_update(p.payload["sha256"] for p in res if p.payload)
+                # pontos repetidos do mesmo hash podem empurrar outros para a próxima página
+                if offset is None or not missing:
+                    break
+            found.update(h for h in batch if h not in missing)
+        return found
+
+    async def points_by_sha256(
+        self, sha256s: List[str], collection: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Stored points (``{"id", "payload"}``) whose ``sha256`` is in ``sha256s``."""
+        col = collection or CFG.collection_read
+        points: List[Dict[str, Any]] = []
+        unique = list(dict.fromkeys(sha256s))
+        for start in range(0, len(unique), CFG.dedup_batch_size):
+            batch = unique[start : start + CFG.dedup_batch_size]
+            flt = qm.Filter(
+                must=[qm.FieldCondition(key="sha256", match=qm.MatchAny(any=batch))]
+            )
+            offset = None
+            while True:
+                res, offset = await self._client.scroll(
+                    collection_name=col,
+                    scroll_filter=flt,
+                    limit=len(batch),
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+                points.extend({"id": str(p.id), "payload": p.payload or {}} for p in res)
+                if offset is None:
+                    break
+        return points
+
+    async def scroll(
+        self, collection: Optional[str] = None, offset: Any = None, limit: int = 256
+    ) -> tuple[List[Dict[str, Any]], Any]:
+        """
+        One page of points (``{"id", "payload"}``, no vectors) and the offset
+        of the next page, ``None`` after the last one.
+        """
+        col = collection or CFG.collection_read
+        res, next_offset = await self._client.scroll(
+            collection_name=col,
+            limit=limit,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False,
+        )
+        points = [{"id": str(p.id), "payload": p.payload or {}} for p in res]
+        return points, next_offset
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+def get_default_store() -> VectorStore:
+    if CFG.vector_backend == "local":
+        from .local_store import LocalVectorStore
 
-def get_default_store() -> QdrantVectorStore:
+        return LocalVectorStore(CFG.local_store_dir)
     return QdrantVectorStore()
\ No newline at end of file
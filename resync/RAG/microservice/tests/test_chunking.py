@@ -0,0 +1,80 @@
+"""
+Unit tests for streaming chunking and process-parallel ingestion.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from resync.RAG.microservice.core.chunking import _tokens_len, chunk_stream, chunk_text
+from resync.RAG.microservice.core.dedup import KnownHashIndex
+from resync.RAG.microservice.core.embedding_service import EmbeddingService, LocalEmbedder
+from resync.RAG.microservice.core.ingest import IngestService
+from resync.RAG.microservice.core.interfaces import VectorStore
+
+TEXT = " ".join(
+    f"Job JOB{i:04d} on workstation WS{i % 7:02d} ended with status ABEND{i % 3}."
+    for i in range(200)
+)
+
+
+def test_stream_matches_whole_text():
+    pieces = [TEXT[i : i + 37] for i in range(0, len(TEXT), 37)]
+    assert list(chunk_stream(pieces, max_tokens=64, overlap_tokens=16)) == list(
+        chunk_text(TEXT, max_tokens=64, overlap_tokens=16)
+    )
+
+
+def test_chunks_respect_limits_sentences_and_overlap():
+    chunks = list(chunk_text(TEXT, max_tokens=64, overlap_tokens=16))
+
+    assert len(chunks) > 1
+    assert all(_tokens_len(ck) <= 64 for ck in chunks)
+    assert all(ck.startswith("Job ") and ck.endswith(".") for ck in chunks)
+    # a última sentença de um chunk abre o seguinte
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert nxt.startswith(prev.rsplit(". ", 1)[-1])
+
+
+def test_long_text_without_boundaries_is_split():
+    chunks = list(chunk_text("word " * 2000, max_tokens=100, overlap_tokens=10))
+    assert len(chunks) > 1
+    assert all(_tokens_len(ck) <= 100 for ck in chunks)
+
+
+@pytest.mark.asyncio
+async def test_ingest_documents_in_process_pool():
+    docs = [
+        {"tenant": "t", "doc_id": f"d{i}", "source": "s", "text": TEXT, "ts_iso": ""}
+        for i in range(3)
+    ] + [{"tenant": "t", "doc_id": "other", "source": "s", "text": "Other doc.", "ts_iso": ""}]
+    results = []
+    for processes in (0, 2):
+        store = AsyncMock(spec=VectorStore)
+        store.existing_sha256.return_value = set()
+        service = IngestService(
+            EmbeddingService(LocalEmbedder(dim=8)), store, known_hashes=KnownHashIndex()
+        )
+        results.append(await service.ingest_documents(docs, processes=processes))
+
+    # documentos iguais: os chunks entram uma vez só
+    assert results[0] == results[1] == len(list(chunk_text(TEXT))) + 1
+
+
+@pytest.mark.asyncio
+async def test_ingest_documents_pool_failure_propagates():
+    docs = [
+        {"tenant": "t", "doc_id": f"d{i}", "source": "s", "text": f"Doc {i}.", "ts_iso": ""}
+        for i in range(6)
+    ]
+    store = AsyncMock(spec=VectorStore)
+    store.existing_sha256.return_value = set()
+    store.upsert_batch.side_effect = RuntimeError("store down")
+    service = IngestService(
+        EmbeddingService(LocalEmbedder(dim=8)), store, known_hashes=KnownHashIndex()
+    )
+
+    with pytest.raises(RuntimeError, match="store down"):
+        await service.ingest_documents(docs, processes=2)
+    # os documentos ainda na janela não seguem para o store
+    assert store.upsert_batch.await_count == 1
@@ -0,0 +1,48 @@
+"""
+Unit tests for EmbeddingCache.
+"""
+
+import numpy as np
+import pytest
+
+from resync.RAG.microservice.core.embedding_cache import EmbeddingCache, content_hash
+from resync.RAG.microservice.core.embedding_service import EmbeddingService, LocalEmbedder
+
+
+@pytest.mark.asyncio
+async def test_cached_texts_skip_provider():
+    provider = LocalEmbedder(dim=8)
+    service = EmbeddingService(provider, cache=EmbeddingCache(dtype="float32"))
+
+    first = await service.embed_batch(["a", "b", "a"])
+    assert provider.calls == 1
+    second = await service.embed_batch(["b", " a ", "c"])
+
+    assert provider.calls == 2  # only "c" was sent
+    assert first[0] == first[2]
+    assert np.allclose(second[1], first[0])
+    assert np.allclose(second[0], first[1])
+    assert second[2] == provider._hash_vec("c")
+
+
+@pytest.mark.asyncio
+async def test_cache_persists_and_is_keyed_by_model(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    cache = EmbeddingCache(path)
+    await cache.put_many("model-a", [(content_hash("text"), [0.5, 0.25])])
+    cache.close()
+
+    reopened = EmbeddingCache(path)
+    assert await reopened.get_many("model-a", [content_hash("text")]) == {
+        content_hash("text"): [0.5, 0.25]
+    }
+    assert await reopened.get_many("model-b", [content_hash("text")]) == {}
+
+
+def test_float16_roundtrip():
+    cache = EmbeddingCache(dtype="float16")
+    vector = np.random.default_rng(0).uniform(-1, 1, 1536).tolist()
+    cache.put_many_sync("m", [(content_hash("x"), vector)])
+
+    stored = cache.get_many_sync("m", [content_hash("x")])[content_hash("x")]
+    assert np.allclose(stored, vector, atol=1e-3)
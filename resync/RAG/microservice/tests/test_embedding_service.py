@@ -0,0 +1,135 @@
+"""
+Unit tests for EmbeddingService.
+"""
+
+import asyncio
+import subprocess
+import sys
+from unittest.mock import AsyncMock
+
+import pytest
+
+from resync.RAG.microservice.core.dedup import KnownHashIndex
+from resync.RAG.microservice.core.embedding_service import EmbeddingService, LocalEmbedder
+from resync.RAG.microservice.core.ingest import IngestService
+from resync.RAG.microservice.core.interfaces import VectorStore
+
+
+class FlakyEmbedder(LocalEmbedder):
+    def __init__(self, failures):
+        super().__init__(dim=8)
+        self.failures = failures
+
+    async def embed_texts(self, texts):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("provider unavailable")
+        return await super().embed_texts(texts)
+
+
+@pytest.mark.asyncio
+async def test_batches_limited_by_size_and_tokens():
+    provider = LocalEmbedder(dim=8)
+    service = EmbeddingService(provider, max_batch_size=3, max_batch_tokens=10)
+    # ~5 tokens each with the heuristic (or tiktoken) counter
+    texts = [f"word{i} " * 5 for i in range(6)]
+
+    vectors = await service.embed_batch(texts)
+
+    assert vectors == [provider._hash_vec(t) for t in texts]
+    assert provider.calls >= 3
+    for batch in service._split_batches(texts):
+        assert len(batch) <= 3
+
+
+@pytest.mark.asyncio
+async def test_requests_run_with_bounded_concurrency():
+    provider = LocalEmbedder(dim=8, latency=0.01)
+    service = EmbeddingService(provider, max_concurrency=3, max_batch_size=1)
+
+    await service.embed_batch([f"text {i}" for i in range(10)])
+
+    assert provider.calls == 10
+    assert provider.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried():
+    provider = FlakyEmbedder(failures=2)
+    service = EmbeddingService(provider, retries=3, retry_base_delay=0.01)
+    service._retry_budget.tokens = service._retry_budget.max_tokens
+
+    assert len(await service.embed("hello")) == 8
+
+
+@pytest.mark.asyncio
+async def test_ingest_batches_run_concurrently():
+    provider = LocalEmbedder(dim=8, latency=0.01)
+    embedder = EmbeddingService(provider, max_concurrency=4)
+    store = AsyncMock(spec=VectorStore)
+    store.existing_sha256.side_effect = lambda shas, collection: set()
+    service = IngestService(
+        embedder, store, batch_size=1, known_hashes=KnownHashIndex(), max_concurrency=4
+    )
+    text = " ".join(f"Sentence number {i} has some words." for i in range(400))
+
+    count = await service.ingest_document(
+        tenant="t", doc_id="doc", source="s", text=text, ts_iso="2025-10-18T00:00:00Z"
+    )
+
+    assert count == store.upsert_batch.await_count > 1
+    assert provider.max_in_flight > 1
+
+
+class FailingBatchEmbedder(LocalEmbedder):
+    """Fails at once on texts containing "boom"; other requests stay in flight."""
+
+    def __init__(self):
+        super().__init__(dim=8, latency=0.5)
+        self.cancelled = 0
+
+    async def embed_texts(self, texts):
+        if any("boom" in t for t in texts):
+            raise ValueError("bad batch")
+        try:
+            return await super().embed_texts(texts)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+@pytest.mark.asyncio
+async def test_failed_ingest_batch_cancels_the_others():
+    provider = FailingBatchEmbedder()
+    store = AsyncMock(spec=VectorStore)
+    store.existing_sha256.side_effect = lambda shas, collection: set()
+    service = IngestService(
+        EmbeddingService(provider, max_concurrency=4, cache=None),
+        store,
+        batch_size=1,
+        known_hashes=KnownHashIndex(),
+        max_concurrency=4,
+    )
+
+    with pytest.raises(ValueError, match="bad batch"):
+        await service._store_chunks(
+            ["chunk one", "boom", "chunk three"],
+            [c * 64 for c in "abc"],
+            tenant="t",
+            doc_id="doc",
+            source="s",
+            ts_iso="",
+        )
+    await asyncio.sleep(0)
+
+    assert provider.cancelled == 2
+    assert provider.in_flight == 0
+    store.upsert_batch.assert_not_called()
+
+
+def test_embedding_service_does_not_import_the_main_app():
+    code = (
+        "import sys, resync.RAG.microservice.core.embedding_service; "
+        "assert 'resync.core.resilience' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
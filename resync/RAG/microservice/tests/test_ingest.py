@@ -9,6 +9,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from resync.RAG.microservice.core.dedup import KnownHashIndex
 from resync.RAG.microservice.core.ingest import IngestService
 from resync.RAG.microservice.core.interfaces import Embedder, VectorStore
 from resync.RAG.microservice.core.config import CFG
@@ -25,6 +26,7 @@ def mock_embedder():
 def mock_vector_store():
     store = AsyncMock(spec=VectorStore)
     store.exists_by_sha256.side_effect = lambda sha, collection: False  # Simulate no dedup
+    store.existing_sha256.side_effect = lambda shas, collection: set()
     store.upsert_batch = AsyncMock()
     store.count = AsyncMock(return_value=0)
     return store
@@ -66,13 +68,13 @@ async def test_ingest_with_chunks(ingest_service, mock_embedder, mock_vector_sto
 @pytest.mark.asyncio
 async def test_ingest_with_deduplication(ingest_service, mock_embedder, mock_vector_store):
     # Simulate one chunk already exists
-    def mock_exists(sha, collection):
+    duplicate = hashlib.sha256("This is a test".encode("utf-8")).hexdigest()
+
+    def mock_existing(shas, collection):
         # First chunk (hash of "This is a test") is duplicate
-        if sha == hashlib.sha256("This is a test".encode("utf-8")).hexdigest():
-            return True
-        return False
+        return {sha for sha in shas if sha == duplicate}
 
-    mock_vector_store.exists_by_sha256.side_effect = mock_exists
+    mock_vector_store.existing_sha256.side_effect = mock_existing
 
     text = "This is a test. This is a test document."
     result = await ingest_service.ingest_document(
@@ -85,6 +87,29 @@ async def test_ingest_with_deduplication(ingest_service, mock_embedder, mock_vec
 
     assert result == 1  # Only one new chunk
     assert mock_vector_store.upsert_batch.call_count == 1
+    # All chunk hashes are checked in one batched lookup
+    assert mock_vector_store.existing_sha256.await_count == 1
+    mock_vector_store.exists_by_sha256.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_known_hashes_skip_remote_lookup(mock_embedder, mock_vector_store, tmp_path):
+    path = str(tmp_path / "knowledge_v1.sha256")
+    service = IngestService(
+        mock_embedder, mock_vector_store, known_hashes=KnownHashIndex(path)
+    )
+    text = "This is a test. This is a test document."
+    document = dict(tenant="test", doc_id="doc1", source="test", ts_iso="2025-10-18T00:00:00Z")
+
+    assert await service.ingest_document(text=text, **document) > 0
+    mock_vector_store.existing_sha256.reset_mock()
+
+    # The persisted index answers for a fresh service, without asking the store
+    again = IngestService(
+        mock_embedder, mock_vector_store, known_hashes=KnownHashIndex(path)
+    )
+    assert await again.ingest_document(text=text, **document) == 0
+    mock_vector_store.existing_sha256.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -100,4 +125,25 @@ async def test_ingest_metrics_called(ingest_service, mock_embedder, mock_vector_
 
     # Verify metrics were incremented
     assert ingest_service.store.upsert_seconds.time.called
-    assert ingest_service.store.embed_seconds.time.called
\ No newline at end of file
+    assert ingest_service.store.embed_seconds.time.called
+
+@pytest.mark.asyncio
+async def test_known_hashes_track_read_collection_only(
+    mock_embedder, mock_vector_store, monkeypatch
+):
+    from dataclasses import replace
+
+    from resync.RAG.microservice.core import ingest
+
+    cfg = replace(CFG, collection_write="knowledge_v2", collection_read="knowledge_v1")
+    monkeypatch.setattr(ingest, "CFG", cfg)
+    known = KnownHashIndex()
+    service = IngestService(mock_embedder, mock_vector_store, known_hashes=known)
+
+    await service.ingest_document(
+        tenant="test", doc_id="doc1", source="test", text="Only in v2.", ts_iso=""
+    )
+
+    # o chunk foi gravado na v2; o índice da v1 não pode marcá-lo como existente
+    assert mock_vector_store.upsert_batch.await_count == 1
+    assert len(known) == 0
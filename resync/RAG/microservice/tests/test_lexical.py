@@ -0,0 +1,129 @@
+"""
+Unit tests for the BM25 index and hybrid retrieval.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from resync.RAG.microservice.core.dedup import KnownHashIndex
+from resync.RAG.microservice.core.ingest import IngestService
+from resync.RAG.microservice.core.interfaces import Embedder, VectorStore
+from resync.RAG.microservice.core.lexical import (
+    BM25Index,
+    backfill_lexical_index,
+    tokenize,
+)
+from resync.RAG.microservice.core.local_store import LocalVectorStore
+from resync.RAG.microservice.core.rerank import reciprocal_rank_fusion
+from resync.RAG.microservice.core.retriever import RagRetriever
+
+
+def _index(path=None):
+    index = BM25Index(path)
+    index.add_many(
+        ["a", "b", "c"],
+        [
+            "Job DAILY_LOAD on WS01 ended with AWSBHT001E",
+            "Workstation WS02 is unlinked",
+            "Job DAILY_LOAD completed successfully on WS02",
+        ],
+        [{"tenant": "t1"}, {"tenant": "t1"}, {"tenant": "t2", "tags": ["ok"]}],
+    )
+    return index
+
+
+def test_tokenize_keeps_identifiers_and_parts():
+    terms = tokenize("WS01#DAILY_LOAD failed: AWSBHT001E.")
+    assert "ws01#daily_load" in terms
+    assert {"ws01", "daily", "load", "awsbht001e"} <= set(terms)
+
+
+def test_search_ranks_exact_identifier_and_filters():
+    index = _index()
+
+    hits = index.search_sync("why AWSBHT001E?", top_k=3)
+    assert [h["id"] for h in hits] == ["a"]
+
+    hits = index.search_sync("DAILY_LOAD", top_k=3, filters={"tags": "ok"})
+    assert [h["id"] for h in hits] == ["c"]
+
+
+def test_reindex_and_persistence(tmp_path):
+    path = str(tmp_path / "idx.jsonl")
+    index = _index(path)
+    index.add_many(["b"], ["Workstation WS02 linked again"], [{"tenant": "t1"}])
+    index.flush()
+
+    reopened = BM25Index(path)
+    assert len(reopened) == 3
+    assert reopened.search_sync("unlinked", top_k=3) == []
+    assert reopened.search_sync("linked", top_k=3)[0]["id"] == "b"
+
+
+def test_rrf_rewards_agreement():
+    fused = reciprocal_rank_fusion(
+        [[{"id": "x"}, {"id": "y"}], [{"id": "y"}, {"id": "z"}]], k=60
+    )
+    assert [h["id"] for h in fused] == ["y", "x", "z"]
+    assert fused[0]["score"] == pytest.approx(1 / 62 + 1 / 61)
+
+
+@pytest.mark.asyncio
+async def test_hybrid_retrieval_finds_lexical_matches():
+    embedder = AsyncMock(spec=Embedder)
+    embedder.embed.return_value = [0.1] * 4
+    store = AsyncMock(spec=VectorStore)
+    store.query.return_value = [{"id": "b", "score": 0.9, "payload": {}}]
+    retriever = RagRetriever(embedder, store, lexical_index=_index())
+
+    results = await retriever.retrieve("AWSBHT001E", top_k=2)
+
+    assert {h["id"] for h in results} == {"a", "b"}
+    assert store.query.called
+
+
+@pytest.mark.asyncio
+async def test_backfill_indexes_existing_collection():
+    store = LocalVectorStore(dim=4)
+    await store.upsert_batch(
+        ids=["p1", "p2", "p3"],
+        vectors=[[1.0, 0, 0, 0], [0, 1.0, 0, 0], [0, 0, 1.0, 0]],
+        payloads=[
+            {"tenant": "t", "sha256": "1", "text": "Job PAYROLL abended with AWSBHT001E"},
+            {"tenant": "t", "sha256": "2", "text": "Workstation WS02 is linked"},
+            # gravado antes do payload ter o texto
+            {"tenant": "t", "sha256": "3"},
+        ],
+        collection="kb",
+    )
+    index = BM25Index()
+    index.add_many(["p2"], ["Workstation WS02 is linked"], [{"sha256": "2"}])
+
+    added = await backfill_lexical_index(store, index, collection="kb", batch_size=2)
+
+    assert added == 1
+    assert len(index) == 2
+    assert [h["id"] for h in index.search_sync("AWSBHT001E", top_k=3)] == ["p1"]
+
+
+@pytest.mark.asyncio
+async def test_ingest_indexes_deduplicated_chunks_missing_from_bm25():
+    embedder = AsyncMock(spec=Embedder)
+    embedder.embed_batch.side_effect = lambda texts: [[0.1] * 4 for _ in texts]
+    store = LocalVectorStore(dim=4)
+    # o chunk já foi gravado (antes do híbrido) por outro documento
+    first = IngestService(embedder, store, known_hashes=KnownHashIndex(), lexical_index=None)
+    document = dict(tenant="t", source="s", ts_iso="")
+    assert await first.ingest_document(doc_id="orig", text="Job PAYROLL failed.", **document)
+
+    index = BM25Index()
+    service = IngestService(embedder, store, known_hashes=KnownHashIndex(), lexical_index=index)
+    assert await service.ingest_document(doc_id="copy", text="Job PAYROLL failed.", **document) == 0
+
+    # indexado com o id e o payload do ponto gravado, não os do documento atual
+    assert len(index) == 1
+    hit = index.search_sync("payroll", top_k=1)[0]
+    assert hit["id"] == "orig#c000000"
+    assert hit["payload"]["doc_id"] == "orig"
+    assert await backfill_lexical_index(store, index) == 0
@@ -0,0 +1,66 @@
+"""
+Unit tests for LocalVectorStore.
+"""
+
+import numpy as np
+import pytest
+
+from resync.RAG.microservice.core.local_store import LocalVectorStore
+
+
+def _vectors(n, dim=16, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+@pytest.mark.asyncio
+async def test_exact_search_and_filters():
+    store = LocalVectorStore(collection="c", dim=16)
+    vectors = _vectors(50)
+    payloads = [
+        {"tenant": "a" if i % 2 else "b", "doc_id": f"d{i % 5}", "tags": [f"t{i % 3}"]}
+        for i in range(50)
+    ]
+    await store.upsert_batch([str(i) for i in range(50)], vectors.tolist(), payloads, "c")
+
+    hits = await store.query(vectors[7].tolist(), top_k=3, collection="c")
+    assert hits[0]["id"] == "7"
+    assert hits[0]["score"] == pytest.approx(1.0, abs=1e-5)
+    assert [h["score"] for h in hits] == sorted((h["score"] for h in hits), reverse=True)
+
+    filtered = await store.query(
+        vectors[7].tolist(), top_k=50, collection="c", filters={"tenant": "b", "tags": "t0"}
+    )
+    assert filtered and all(
+        h["payload"]["tenant"] == "b" and "t0" in h["payload"]["tags"] for h in filtered
+    )
+    assert len(filtered) == sum(1 for p in payloads if p["tenant"] == "b" and "t0" in p["tags"])
+
+
+@pytest.mark.asyncio
+async def test_upsert_overwrites_and_persists(tmp_path):
+    store = LocalVectorStore(str(tmp_path), collection="c", dim=4)
+    await store.upsert_batch(["x", "y"], [[1, 0, 0, 0], [0, 1, 0, 0]],
+                             [{"sha256": "h1"}, {"sha256": "h2"}], "c")
+    await store.upsert_batch(["x"], [[0, 0, 1, 0]], [{"sha256": "h3"}], "c")
+    store.close()
+
+    reopened = LocalVectorStore(str(tmp_path), collection="c", dim=4)
+    assert await reopened.count("c") == 2
+    assert await reopened.existing_sha256(["h1", "h2", "h3"], "c") == {"h2", "h3"}
+    hits = await reopened.query([0, 0, 1, 0], top_k=1, collection="c", with_vectors=True)
+    assert hits[0]["id"] == "x"
+    assert hits[0]["vector"] == [0.0, 0.0, 1.0, 0.0]
+
+
+@pytest.mark.asyncio
+async def test_ivf_search_finds_nearest():
+    store = LocalVectorStore(collection="c", dim=16, ivf_threshold=1000, nprobe=4)
+    vectors = _vectors(3000, seed=1)
+    await store.upsert_batch([str(i) for i in range(3000)], vectors.tolist(),
+                             [{} for _ in range(3000)], "c")
+
+    found = 0
+    for i in range(0, 3000, 100):
+        hits = await store.query(vectors[i].tolist(), top_k=1, collection="c")
+        found += hits[0]["id"] == str(i)
+    assert found == 30  # o próprio vetor está sempre na lista mais próxima
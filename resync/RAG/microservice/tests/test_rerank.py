@@ -0,0 +1,66 @@
+"""
+Unit tests for vectorized re-ranking and MMR.
+"""
+
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from resync.RAG.microservice.core.interfaces import Embedder, VectorStore
+from resync.RAG.microservice.core.rerank import cosine_scores, mmr_select, rerank_hits
+from resync.RAG.microservice.core.retriever import RagRetriever
+
+
+def test_cosine_scores_match_reference():
+    rng = np.random.default_rng(0)
+    query = rng.normal(size=64).tolist()
+    vectors = rng.normal(size=(10, 64)).tolist() + [None, [0.0] * 64]
+
+    scores = cosine_scores(query, vectors)
+
+    q = np.asarray(query)
+    for vec, score in zip(vectors[:10], scores):
+        expected = np.dot(q, vec) / (np.linalg.norm(q) * np.linalg.norm(vec))
+        assert score == pytest.approx(expected, abs=1e-5)
+    assert scores[10] == 0.0 and scores[11] == 0.0
+
+
+def test_rerank_hits_orders_by_similarity():
+    hits = [
+        {"id": "far", "vector": [0.0, 1.0]},
+        {"id": "near", "vector": [1.0, 0.1]},
+        {"id": "none"},
+    ]
+    assert [h["id"] for h in rerank_hits([1.0, 0.0], hits)] == ["near", "far", "none"]
+
+
+def test_mmr_skips_near_duplicates():
+    query = [1.0, 0.0, 0.0]
+    vectors = [
+        [1.0, 0.1, 0.0],
+        [1.0, 0.11, 0.0],  # quase igual ao primeiro
+        [0.7, 0.0, 0.7],
+    ]
+    assert mmr_select(query, vectors, k=2, lambda_mult=0.5) == [0, 2]
+    assert mmr_select(query, vectors, k=2, lambda_mult=1.0) == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_retriever_mmr_fetches_candidates():
+    embedder = AsyncMock(spec=Embedder)
+    embedder.embed.return_value = [1.0, 0.0, 0.0]
+    store = AsyncMock(spec=VectorStore)
+    store.query.return_value = [
+        {"id": "a", "vector": [1.0, 0.1, 0.0]},
+        {"id": "a-copy", "vector": [1.0, 0.11, 0.0]},
+        {"id": "b", "vector": [0.7, 0.0, 0.7]},
+    ]
+    retriever = RagRetriever(embedder, store, enable_mmr=True, mmr_fetch_factor=3)
+
+    results = await retriever.retrieve("query", top_k=2)
+
+    kwargs = store.query.call_args.kwargs
+    assert kwargs["top_k"] == 6
+    assert kwargs["with_vectors"] is True
+    assert [h["id"] for h in results] == ["a", "b"]
@@ -0,0 +1,114 @@
+"""
+Unit tests for the query embedding and retrieval result caches.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from resync.RAG.microservice.core.config import CFG
+from resync.RAG.microservice.core.dedup import KnownHashIndex
+from resync.RAG.microservice.core.embedding_service import EmbeddingService, LocalEmbedder
+from resync.RAG.microservice.core.ingest import IngestService
+from resync.RAG.microservice.core.interfaces import VectorStore
+from resync.RAG.microservice.core.retrieval_cache import RetrievalResultCache
+from resync.RAG.microservice.core.retriever import RagRetriever
+
+
+@pytest.fixture
+def store():
+    store = AsyncMock(spec=VectorStore)
+    store.query.return_value = [{"id": "1", "score": 0.9, "payload": {}}]
+    store.existing_sha256.return_value = set()
+    return store
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_served_from_cache(store):
+    embedder = AsyncMock(wraps=EmbeddingService(LocalEmbedder(dim=8)))
+    retriever = RagRetriever(embedder, store, enable_cache=True)
+
+    first = await retriever.retrieve("Status do job X", top_k=3)
+    second = await retriever.retrieve("  status do JOB x ", top_k=3)
+
+    assert first == second
+    assert embedder.embed.await_count == 1
+    assert store.query.await_count == 1
+
+    # outros filtros: nova busca, mas o embedding da consulta é reaproveitado
+    await retriever.retrieve("status do job x", top_k=3, filters={"tenant": "a"})
+    assert embedder.embed.await_count == 1
+    assert store.query.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_ingest_invalidates_cached_results(store):
+    embedder = EmbeddingService(LocalEmbedder(dim=8))
+    retriever = RagRetriever(embedder, store, enable_cache=True)
+    ingest = IngestService(embedder, store, known_hashes=KnownHashIndex())
+
+    await retriever.retrieve("status do job x", top_k=3)
+    await ingest.ingest_document(
+        tenant="t", doc_id="d", source="s", text="novo conteúdo", ts_iso=""
+    )
+    await retriever.retrieve("status do job x", top_k=3)
+
+    assert store.query.await_count == 2
+
+
+def test_results_expire_after_ttl(monkeypatch):
+    cache = RetrievalResultCache(ttl_seconds=10)
+    now = [100.0]
+    monkeypatch.setattr(
+        "resync.RAG.microservice.core.retrieval_cache.time.monotonic", lambda: now[0]
+    )
+    key = cache.key("q", None, 5, CFG.collection_read)
+    cache.put(key, [{"id": "1"}])
+
+    assert cache.get(key) == [{"id": "1"}]
+    now[0] += 10
+    assert cache.get(key) is None
+
+
+def test_cached_hits_are_not_shared_with_callers():
+    cache = RetrievalResultCache(ttl_seconds=10)
+    key = cache.key("q", None, 5, CFG.collection_read)
+    hits = [{"id": "1", "score": 0.9, "payload": {"doc_id": "a"}}]
+    cache.put(key, hits)
+    hits[0]["score"] = 0.0
+    hits[0]["payload"]["doc_id"] = "b"
+
+    served = cache.get(key)
+    served[0]["payload"]["doc_id"] = "c"
+    served[0]["score"] = 1.0
+
+    assert cache.get(key) == [{"id": "1", "score": 0.9, "payload": {"doc_id": "a"}}]
+
+
+def test_cached_hits_drop_vectors():
+    cache = RetrievalResultCache(ttl_seconds=10)
+    key = cache.key("q", None, 5, CFG.collection_read)
+    cache.put(key, [{"id": "1", "score": 0.9, "payload": {}, "vector": [0.1] * 8}])
+
+    assert cache.get(key) == [{"id": "1", "score": 0.9, "payload": {}}]
+
+
+@pytest.mark.asyncio
+async def test_ingest_into_write_collection_invalidates_read_results(store, monkeypatch):
+    from dataclasses import replace
+
+    from resync.RAG.microservice.core import ingest as ingest_module
+
+    cfg = replace(CFG, collection_write="knowledge_next")
+    monkeypatch.setattr(ingest_module, "CFG", cfg)
+    embedder = EmbeddingService(LocalEmbedder(dim=8))
+    retriever = RagRetriever(embedder, store, enable_cache=True)
+    ingest = IngestService(embedder, store, known_hashes=KnownHashIndex())
+
+    await retriever.retrieve("status do job x", top_k=3)
+    await ingest.ingest_document(
+        tenant="t", doc_id="d", source="s", text="outro conteúdo", ts_iso=""
+    )
+    await retriever.retrieve("status do job x", top_k=3)
+
+    assert store.query.await_count == 2
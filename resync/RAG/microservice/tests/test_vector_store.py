@@ -0,0 +1,41 @@
+"""
+Unit tests for QdrantVectorStore bootstrap and pipelined upserts.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytest.importorskip("qdrant_client")
+
+from resync.RAG.microservice.core.vector_store import QdrantVectorStore  # noqa: E402
+
+
+@pytest.fixture
+def store():
+    store = QdrantVectorStore(
+        url="http://localhost:6333", collection="c", dim=4, upsert_batch_size=2
+    )
+    store._client = AsyncMock()
+    store._client.collection_exists.return_value = False
+    return store
+
+
+@pytest.mark.asyncio
+async def test_initialize_creates_collection_once(store):
+    await store.initialize()
+    await store.initialize()
+    await store.upsert_batch(["1"], [[0.1] * 4], [{}], collection="c")
+
+    store._client.create_collection.assert_awaited_once()
+    assert store._client.create_payload_index.await_count == 6
+
+
+@pytest.mark.asyncio
+async def test_upsert_pipelines_batches_with_final_barrier(store):
+    ids = [str(i) for i in range(5)]
+    await store.upsert_batch(ids, [[0.1] * 4] * 5, [{}] * 5, collection="c")
+
+    calls = store._client.upsert.await_args_list
+    assert [len(c.kwargs["points"]) for c in calls] == [2, 2, 1]
+    assert [c.kwargs["wait"] for c in calls] == [False, False, True]
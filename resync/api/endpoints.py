@@ -15,11 +15,27 @@ The endpoints are organized into logical groups:
 from __future__ import annotations
 
 import logging
+import uuid
 from typing import Any
 from urllib.parse import unquote
 
-from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, status
-from fastapi.responses import PlainTextResponse, RedirectResponse, Response
+from fastapi import (
+    APIRouter,
+    Depends,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import (
+    PlainTextResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from pydantic import BaseModel, Field
 from starlette.responses import HTMLResponse
 
@@ -32,7 +48,10 @@ def _get_alerting_system():
     """Lazy import of alerting_system."""
     from resync.core.alerting import alerting_system
     return alerting_system
+from resync.core.http_tracing import http_latency_metrics
+from resync.core.ingestion_pipeline import ingestion_pipeline_metrics
 from resync.core.interfaces import IAgentManager, ITWSClient
+from resync.core.job_log_store import JobLogRange
 from resync.core.llm_wrapper import optimized_llm  # type: ignore[attr-defined]
 from resync.core.metrics import runtime_metrics  # type: ignore[attr-defined]
 from resync.core.rate_limiter import (  # type: ignore[attr-defined]
@@ -41,11 +60,15 @@ from resync.core.rate_limiter import (  # type: ignore[attr-defined]
 )
 
 # Import new monitoring and observability components
+from resync.core.resilience import generate_retry_budget_prometheus_metrics
 from resync.core.runbooks import runbook_registry
+from resync.core.status_feed import get_status_feed_publisher
 from resync.core.tws_monitor import tws_monitor  # type: ignore[attr-defined]
+from resync.core.websocket_pool_manager import get_websocket_pool_manager
 
 # Import CQRS components
 from resync.cqrs.dispatcher import dispatcher
+from resync.cqrs.metrics import cqrs_metrics
 from resync.cqrs.queries import (
     CheckTWSConnectionQuery,
     GetEventLogQuery,
@@ -59,6 +82,7 @@ from resync.cqrs.queries import (
     GetResourceUsageQuery,
     GetWorkstationsStatusQuery,
 )
+from resync.cqrs.query_cache import query_result_cache
 from resync.settings import settings
 
 # Import monitoring endpoints
@@ -335,6 +359,63 @@ async def get_job_log(
         raise handle_api_error(e, "TWS job log retrieval")
 
 
+@api_router.get("/status/jobs/{job_id}/log/stream")
+@public_rate_limit
+async def stream_job_log(
+    request: Request,
+    job_id: str,
+    tail: int | None = Query(
+        default=None, ge=1, le=100_000, description="Return only the last N lines"
+    ),
+    start_line: int | None = Query(
+        default=None, ge=0, description="First line to return (zero-based)"
+    ),
+    end_line: int | None = Query(
+        default=None, ge=0, description="Line to stop before (exclusive)"
+    ),
+    start_byte: int | None = Query(
+        default=None, ge=0, description="First byte to return"
+    ),
+    end_byte: int | None = Query(
+        default=None, ge=0, description="Byte to stop before (exclusive)"
+    ),
+    tws_client: ITWSClient = tws_client_dependency,
+) -> StreamingResponse:
+    """
+    Stream log content for a specific TWS job execution as plain text.
+
+    Supports a byte range, a line range or the last N lines; only the cached
+    log segments covering the requested range are read.
+    """
+    try:
+        log_range = JobLogRange(
+            start_byte=start_byte,
+            end_byte=end_byte,
+            start_line=start_line,
+            end_line=end_line,
+            tail=tail,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        chunks = tws_client.stream_job_log(job_id, log_range)
+        # Pull the first chunk eagerly so fetch errors map to an HTTP error
+        # instead of a truncated 200 response
+        first_chunk = await anext(chunks, "")
+    except Exception as e:
+        logger.error("Failed to stream TWS job log: %s", e, exc_info=True)
+        raise handle_api_error(e, "TWS job log streaming")
+
+    async def _body():
+        if first_chunk:
+            yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(_body(), media_type="text/plain; charset=utf-8")
+
+
 @api_router.get("/status/plan")
 @public_rate_limit
 async def get_plan_details(
@@ -464,6 +545,41 @@ async def get_performance_metrics(
         raise handle_api_error(e, "TWS performance metrics retrieval")
 
 
+@api_router.websocket("/status/feed")
+async def status_change_feed(
+    websocket: WebSocket,
+    last_seq: int | None = Query(
+        default=None, ge=0, description="Last sequence number applied by the client"
+    ),
+    tws_client: ITWSClient = tws_client_dependency,
+) -> None:
+    """
+    Push workstation and job status changes over WebSocket.
+
+    The first message is a full ``status_snapshot``, or, when reconnecting
+    with ``last_seq``, a ``status_delta`` with only the missed changes.
+    Subsequent messages are ``status_delta`` messages.
+    """
+    pool_manager = await get_websocket_pool_manager()
+    publisher = get_status_feed_publisher(tws_client)
+    client_id = f"status-feed-{uuid.uuid4().hex}"
+
+    await pool_manager.connect(websocket, client_id)
+    if pool_manager.get_connection_info(client_id) is None:
+        # Rejected because the pool is at capacity
+        return
+    try:
+        await publisher.subscribe(client_id, last_seq)
+        while True:
+            # Clients don't send anything; this waits for the disconnect
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        publisher.unsubscribe(client_id)
+        await pool_manager.disconnect(client_id)
+
+
 # --- Health Check Endpoints ---
 @api_router.get("/health/app", summary="Check Application Health")
 @public_rate_limit
@@ -623,7 +739,15 @@ def get_metrics(request: Request) -> str:
     """
     Returns application metrics in Prometheus text exposition format.
     """
-    return runtime_metrics.generate_prometheus_metrics()
+    sections = (
+        runtime_metrics.generate_prometheus_metrics(),
+        cqrs_metrics.generate_prometheus_metrics(),
+        query_result_cache.generate_prometheus_metrics(),
+        generate_retry_budget_prometheus_metrics(),
+        http_latency_metrics.generate_prometheus_metrics(),
+        ingestion_pipeline_metrics.generate_prometheus_metrics(),
+    )
+    return "\n".join(section for section in sections if section)
 
 
 @api_router.post("/chat", response_model=ChatResponse)
@@ -305,6 +305,7 @@ class AgentManager:
         """Discover available tools for agents."""
         try:
             from resync.tool_definitions.tws_tools import (
+                tws_dependency_tool,
                 tws_status_tool,
                 tws_troubleshooting_tool,
             )
@@ -312,6 +313,10 @@ class AgentManager:
             return {
                 "get_tws_status": tws_status_tool.get_tws_status,
                 "analyze_tws_failures": tws_troubleshooting_tool.analyze_failures,
+                "get_upstream_jobs": tws_dependency_tool.get_upstream_jobs,
+                "get_downstream_jobs": tws_dependency_tool.get_downstream_jobs,
+                "whats_blocking_job": tws_dependency_tool.whats_blocking,
+                "get_dependency_critical_path": tws_dependency_tool.get_critical_path,
             }
         except ImportError as e:
             logger.warning(f"Could not import TWS tools: {e}")
@@ -387,7 +392,14 @@ class AgentManager:
                             role="TWS Troubleshooting Specialist",
                             goal="Help users identify and resolve TWS system issues",
                             backstory="I am an expert AI assistant specialized in IBM Workload Automation (TWS) troubleshooting and system monitoring.",
-                            tools=["get_tws_status", "analyze_tws_failures"],
+                            tools=[
+                                "get_tws_status",
+                                "analyze_tws_failures",
+                                "get_upstream_jobs",
+                                "get_downstream_jobs",
+                                "whats_blocking_job",
+                                "get_dependency_critical_path",
+                            ],
                             model_name="tongyi-deepresearch",
                             temperature=0.7,
                             memory=True,
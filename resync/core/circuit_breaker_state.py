@@ -0,0 +1,248 @@
+"""
+Circuit breaker state shared across worker processes.
+
+Each uvicorn worker has its own :class:`~resync.core.resilience.CircuitBreakerManager`,
+so with N workers a dead backend is discovered N times, and each worker
+sends ``fail_max`` failing requests before its breaker opens. A
+:class:`BreakerStateStore` passed to the manager lets breakers with the
+same name share their state instead:
+
+- failures from all workers count towards one threshold within a window;
+- a breaker opened by one worker blocks calls in every worker;
+- after the recovery timeout exactly one worker gets to send the probe.
+
+:class:`RedisBreakerStateStore` keeps the state in Redis, and every
+transition is a single Lua script, so transitions are atomic. Reads are
+cached locally for ``cache_ttl`` seconds and successful calls only write
+when they end a failure streak, so the happy path makes no network calls.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from redis.asyncio import Redis as AsyncRedis
+
+logger = logging.getLogger(__name__)
+
+# How long a worker trusts its cached copy of a breaker's shared state
+DEFAULT_STATE_CACHE_TTL = 1.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class SharedBreakerState:
+    """A breaker's shared state; ``open_until`` is a Unix timestamp."""
+
+    state: str = CLOSED
+    open_until: float = 0.0
+
+    def blocks_calls(self, now: Optional[float] = None) -> bool:
+        """True while calls must be rejected without asking the backend."""
+        if self.state == CLOSED:
+            return False
+        return (time.time() if now is None else now) < self.open_until
+
+
+_CLOSED_STATE = SharedBreakerState()
+
+
+class BreakerStateStore(ABC):
+    """
+    Locally cached view of shared breaker state.
+
+    Subclasses implement the ``_fetch``/``_record_*``/``_acquire_probe``
+    primitives against the shared backend.
+    """
+
+    def __init__(self, cache_ttl: float = DEFAULT_STATE_CACHE_TTL) -> None:
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[str, Tuple[SharedBreakerState, float]] = {}
+
+    def _remember(self, name: str, state: SharedBreakerState) -> SharedBreakerState:
+        self._cache[name] = (state, time.monotonic())
+        return state
+
+    async def get_state(self, name: str) -> SharedBreakerState:
+        """Return the breaker's state, from the local cache when fresh."""
+        cached = self._cache.get(name)
+        if cached is not None and time.monotonic() - cached[1] < self.cache_ttl:
+            return cached[0]
+        return self._remember(name, await self._fetch(name))
+
+    async def record_failure(
+        self, name: str, threshold: int, recovery_timeout: float, window: float
+    ) -> SharedBreakerState:
+        """
+        Count a failure and open the breaker once ``threshold`` failures
+        happened within ``window`` seconds (or a probe failed).
+        """
+        state = await self._record_failure(name, threshold, recovery_timeout, window)
+        return self._remember(name, state)
+
+    async def record_success(self, name: str) -> SharedBreakerState:
+        """Reset the failure count and close a half-open breaker."""
+        return self._remember(name, await self._record_success(name))
+
+    async def try_acquire_probe(self, name: str, recovery_timeout: float) -> bool:
+        """
+        Atomically move an expired open breaker to half-open.
+
+        Returns:
+            True if this caller may send the probe request. The probe lease
+            expires after ``recovery_timeout`` in case the prober dies.
+        """
+        acquired = await self._acquire_probe(name, recovery_timeout)
+        if acquired:
+            self._remember(
+                name, SharedBreakerState(HALF_OPEN, time.time() + recovery_timeout)
+            )
+        else:
+            self._cache.pop(name, None)
+        return acquired
+
+    @abstractmethod
+    async def _fetch(self, name: str) -> SharedBreakerState:
+        """Read the breaker's state from the shared backend."""
+
+    @abstractmethod
+    async def _record_failure(
+        self, name: str, threshold: int, recovery_timeout: float, window: float
+    ) -> SharedBreakerState:
+        """Atomically count a failure in the shared backend."""
+
+    @abstractmethod
+    async def _record_success(self, name: str) -> SharedBreakerState:
+        """Atomically record a success in the shared backend."""
+
+    @abstractmethod
+    async def _acquire_probe(self, name: str, recovery_timeout: float) -> bool:
+        """Atomically take the half-open probe lease in the shared backend."""
+
+
+# KEYS[1]: state hash, KEYS[2]: failure counter
+# ARGV: threshold, recovery_timeout, window
+_RECORD_FAILURE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+local failures = redis.call('INCR', KEYS[2])
+if failures == 1 then
+    redis.call('EXPIRE', KEYS[2], math.ceil(tonumber(ARGV[3])))
+end
+if state == 'half_open' or (state == 'closed' and failures >= tonumber(ARGV[1])) then
+    state = 'open'
+    redis.call('HSET', KEYS[1], 'state', state, 'open_until', tostring(now + tonumber(ARGV[2])))
+    redis.call('DEL', KEYS[2])
+end
+return {state, redis.call('HGET', KEYS[1], 'open_until') or '0'}
+"""
+
+# A success only closes a half-open breaker; late successes from calls that
+# started before the breaker opened must not close it.
+_RECORD_SUCCESS_LUA = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+redis.call('DEL', KEYS[2])
+if state == 'half_open' then
+    state = 'closed'
+    redis.call('HSET', KEYS[1], 'state', state, 'open_until', '0')
+end
+return {state, redis.call('HGET', KEYS[1], 'open_until') or '0'}
+"""
+
+# ARGV: probe lease (recovery_timeout)
+_ACQUIRE_PROBE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+local open_until = tonumber(redis.call('HGET', KEYS[1], 'open_until') or '0')
+if state ~= 'closed' and now >= open_until then
+    redis.call('HSET', KEYS[1], 'state', 'half_open', 'open_until', tostring(now + tonumber(ARGV[1])))
+    return 1
+end
+return 0
+"""
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class RedisBreakerStateStore(BreakerStateStore):
+    """Breaker state in Redis hashes, with Lua scripts for every transition."""
+
+    def __init__(
+        self,
+        redis_url: str,
+        key_prefix: str = "resync:circuit_breaker",
+        cache_ttl: float = DEFAULT_STATE_CACHE_TTL,
+        client: Optional[AsyncRedis] = None,
+    ) -> None:
+        super().__init__(cache_ttl)
+        self.key_prefix = key_prefix
+        self.client = client or AsyncRedis.from_url(redis_url)
+        self._record_failure_script = self.client.register_script(_RECORD_FAILURE_LUA)
+        self._record_success_script = self.client.register_script(_RECORD_SUCCESS_LUA)
+        self._acquire_probe_script = self.client.register_script(_ACQUIRE_PROBE_LUA)
+
+    def _keys(self, name: str) -> list:
+        base = f"{self.key_prefix}:{name}"
+        return [base, f"{base}:failures"]
+
+    @staticmethod
+    def _state(result) -> SharedBreakerState:
+        state, open_until = result
+        return SharedBreakerState(_decode(state), float(_decode(open_until)))
+
+    async def _fetch(self, name: str) -> SharedBreakerState:
+        state, open_until = await self.client.hmget(
+            self._keys(name)[0], "state", "open_until"
+        )
+        if state is None:
+            return _CLOSED_STATE
+        return SharedBreakerState(_decode(state), float(_decode(open_until or 0)))
+
+    async def _record_failure(
+        self, name: str, threshold: int, recovery_timeout: float, window: float
+    ) -> SharedBreakerState:
+        result = await self._record_failure_script(
+            keys=self._keys(name), args=[threshold, recovery_timeout, window]
+        )
+        return self._state(result)
+
+    async def _record_success(self, name: str) -> SharedBreakerState:
+        return self._state(await self._record_success_script(keys=self._keys(name)))
+
+    async def _acquire_probe(self, name: str, recovery_timeout: float) -> bool:
+        result = await self._acquire_probe_script(
+            keys=self._keys(name), args=[recovery_timeout]
+        )
+        return bool(int(result))
+
+
+_store: Optional[BreakerStateStore] = None
+
+
+def get_breaker_state_store() -> Optional[BreakerStateStore]:
+    """
+    Return the shared breaker state store, or None when sharing is disabled
+    (``APP_CIRCUIT_BREAKER_SHARED_STATE``).
+    """
+    global _store
+    from resync.settings import settings
+
+    if not settings.circuit_breaker_shared_state:
+        return None
+    if _store is None:
+        _store = RedisBreakerStateStore(
+            settings.redis_url,
+            cache_ttl=settings.circuit_breaker_state_cache_ttl,
+        )
+    return _store
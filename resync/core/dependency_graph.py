@@ -0,0 +1,434 @@
+"""
+In-memory job dependency DAG for the whole TWS plan.
+
+``get_job_dependencies`` returns one job's direct neighbours per call, so
+walking upstream from a failed job costs one TWS round trip per hop. This
+module keeps the dependency graph of the entire plan in memory instead:
+
+- jobs are mapped to dense integer IDs and edges are stored as compact
+  ``array('i')`` adjacency lists in both directions;
+- the graph is refreshed incrementally by diffing a fresh plan snapshot
+  against the stored edges, so unchanged jobs are not touched and IDs stay
+  stable until removed jobs are compacted away;
+- upstream/downstream closures, "what's blocking X" and longest-path
+  (critical path) queries run locally in milliseconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Job statuses that no longer block their dependents
+DONE_STATUSES = frozenset(
+    {"SUCC", "SUCCESS", "COMPLETED", "DONE", "CANCEL", "CANCELLED"}
+)
+
+# Default interval between plan snapshot refreshes (5 minutes)
+DEFAULT_REFRESH_INTERVAL = 300.0
+
+
+class JobDependencyGraph:
+    """
+    Mutable dependency DAG over integer job IDs.
+
+    ``predecessors`` of a job are the jobs it depends on; ``successors`` are
+    the jobs depending on it. Removed jobs keep their ID (marked dead) until
+    they outnumber the live jobs; then :meth:`compact` renumbers the live
+    jobs densely and bumps ``version``, so IDs are only stable within one
+    version.
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._preds: List[array] = []
+        self._succs: List[array] = []
+        self._durations = array("d")
+        self._alive = bytearray()
+        self._edges = 0
+        self.version = 0
+        self._topo: Optional[Tuple[int, array]] = None
+        self._longest: Optional[Tuple[int, array, array]] = None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, job: str) -> bool:
+        return job in self.index
+
+    @property
+    def edge_count(self) -> int:
+        return self._edges
+
+    def _id(self, job: str) -> int:
+        node = self.index.get(job)
+        if node is None:
+            node = len(self.names)
+            self.names.append(job)
+            self.index[job] = node
+            self._preds.append(array("i"))
+            self._succs.append(array("i"))
+            self._durations.append(1.0)
+            self._alive.append(1)
+        return node
+
+    def _require(self, job: str) -> int:
+        node = self.index.get(job)
+        if node is None:
+            raise KeyError(f"Job {job} is not in the dependency graph")
+        return node
+
+    def set_dependencies(
+        self,
+        job: str,
+        predecessors: Iterable[str],
+        duration: Optional[float] = None,
+    ) -> bool:
+        """
+        Replace the direct dependencies of ``job``.
+
+        Unknown predecessors are added as jobs. Returns True if the edges or
+        the duration changed.
+        """
+        node = self._id(job)
+        new = {self._id(pred) for pred in predecessors if pred != job}
+        old = set(self._preds[node])
+        changed = new != old
+        if changed:
+            for pred in old - new:
+                self._succs[pred].remove(node)
+            for pred in new - old:
+                self._succs[pred].append(node)
+            self._preds[node] = array("i", sorted(new))
+            self._edges += len(new) - len(old)
+        if duration is not None and self._durations[node] != duration:
+            self._durations[node] = duration
+            changed = True
+        if changed:
+            self.version += 1
+        return changed
+
+    def remove_job(self, job: str) -> None:
+        """Remove a job and all of its edges."""
+        node = self.index.pop(job, None)
+        if node is None:
+            return
+        for pred in self._preds[node]:
+            self._succs[pred].remove(node)
+        for succ in self._succs[node]:
+            self._preds[succ].remove(node)
+        self._edges -= len(self._preds[node]) + len(self._succs[node])
+        self._preds[node] = array("i")
+        self._succs[node] = array("i")
+        self._alive[node] = 0
+        self.version += 1
+        if 2 * len(self.index) < len(self.names):
+            self.compact()
+
+    def compact(self) -> int:
+        """
+        Drop the IDs of removed jobs and renumber the live ones densely.
+
+        Returns:
+            The number of IDs reclaimed.
+        """
+        live = [node for node in range(len(self.names)) if self._alive[node]]
+        reclaimed = len(self.names) - len(live)
+        if not reclaimed:
+            return 0
+        remap = array("i", [-1]) * len(self.names)
+        for new, old in enumerate(live):
+            remap[old] = new
+        # the remap keeps relative order, so adjacency lists stay sorted
+        self._preds = [array("i", (remap[p] for p in self._preds[old])) for old in live]
+        self._succs = [array("i", (remap[s] for s in self._succs[old])) for old in live]
+        self._durations = array("d", (self._durations[old] for old in live))
+        self.names = [self.names[old] for old in live]
+        self.index = {name: node for node, name in enumerate(self.names)}
+        self._alive = bytearray(b"\x01") * len(live)
+        self._topo = None
+        self._longest = None
+        self.version += 1
+        return reclaimed
+
+    def apply_snapshot(
+        self,
+        graph: Mapping[str, Iterable[str]],
+        durations: Optional[Mapping[str, float]] = None,
+    ) -> int:
+        """
+        Bring the graph in line with a full plan snapshot.
+
+        Only jobs whose dependencies (or durations) differ are touched, and
+        jobs missing from the snapshot are removed.
+
+        Returns:
+            The number of jobs added, changed or removed.
+        """
+        durations = durations or {}
+        changed = 0
+        for job, predecessors in graph.items():
+            if self.set_dependencies(job, predecessors, durations.get(job)):
+                changed += 1
+        # Predecessors referenced by the snapshot count as present jobs
+        referenced = {pred for preds in graph.values() for pred in preds}
+        for job in [name for name in self.index if name not in graph]:
+            if job not in referenced:
+                self.remove_job(job)
+                changed += 1
+        return changed
+
+    def predecessors(self, job: str) -> List[str]:
+        """Return the direct dependencies of ``job``."""
+        names = self.names
+        return [names[pred] for pred in self._preds[self._require(job)]]
+
+    def successors(self, job: str) -> List[str]:
+        """Return the jobs directly depending on ``job``."""
+        names = self.names
+        return [names[succ] for succ in self._succs[self._require(job)]]
+
+    def _closure(
+        self, start: int, adjacency: List[array], max_depth: Optional[int]
+    ) -> List[int]:
+        seen = bytearray(len(self.names))
+        seen[start] = 1
+        result: List[int] = []
+        frontier = [start]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for neighbour in adjacency[node]:
+                    if not seen[neighbour]:
+                        seen[neighbour] = 1
+                        next_frontier.append(neighbour)
+            result.extend(next_frontier)
+            frontier = next_frontier
+        return result
+
+    def upstream(self, job: str, max_depth: Optional[int] = None) -> List[str]:
+        """Return every job ``job`` transitively depends on, nearest first."""
+        names = self.names
+        return [
+            names[node]
+            for node in self._closure(self._require(job), self._preds, max_depth)
+        ]
+
+    def downstream(self, job: str, max_depth: Optional[int] = None) -> List[str]:
+        """Return every job transitively depending on ``job``, nearest first."""
+        names = self.names
+        return [
+            names[node]
+            for node in self._closure(self._require(job), self._succs, max_depth)
+        ]
+
+    def blocking(
+        self,
+        job: str,
+        statuses: Mapping[str, str],
+        done_statuses: Iterable[str] = DONE_STATUSES,
+    ) -> Dict[str, Any]:
+        """
+        Find the unfinished upstream jobs preventing ``job`` from running.
+
+        The walk stops at finished jobs, since nothing above them can block.
+        ``root_causes`` are blockers whose own dependencies are all finished,
+        i.e. the jobs to look at first (usually ABEND or held jobs).
+        """
+        done = {status.upper() for status in done_statuses}
+        names = self.names
+
+        def _is_done(node: int) -> bool:
+            return statuses.get(names[node], "").upper() in done
+
+        start = self._require(job)
+        seen = bytearray(len(names))
+        seen[start] = 1
+        blockers: List[int] = []
+        queue = deque(self._preds[start])
+        for node in queue:
+            seen[node] = 1
+        while queue:
+            node = queue.popleft()
+            if _is_done(node):
+                continue
+            blockers.append(node)
+            for pred in self._preds[node]:
+                if not seen[pred]:
+                    seen[pred] = 1
+                    queue.append(pred)
+
+        root_causes = [
+            node
+            for node in blockers
+            if all(_is_done(pred) for pred in self._preds[node])
+        ]
+        return {
+            "job_id": job,
+            "blocking": [
+                {"job": names[node], "status": statuses.get(names[node], "UNKNOWN")}
+                for node in blockers
+            ],
+            "root_causes": [
+                {"job": names[node], "status": statuses.get(names[node], "UNKNOWN")}
+                for node in root_causes
+            ],
+        }
+
+    def topological_order(self) -> array:
+        """Return live job IDs in dependency order (cached per version)."""
+        if self._topo is not None and self._topo[0] == self.version:
+            return self._topo[1]
+
+        alive = self._alive
+        indegree = array("i", (len(preds) for preds in self._preds))
+        order = array("i")
+        queue = deque(
+            node for node in range(len(self.names)) if alive[node] and not indegree[node]
+        )
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for succ in self._succs[node]:
+                indegree[succ] -= 1
+                if not indegree[succ]:
+                    queue.append(succ)
+        if len(order) < len(self.index):
+            logger.warning(
+                "Dependency graph has cycles; %d jobs excluded from ordering",
+                len(self.index) - len(order),
+            )
+        self._topo = (self.version, order)
+        return order
+
+    def _longest_paths(self) -> Tuple[array, array]:
+        if self._longest is not None and self._longest[0] == self.version:
+            return self._longest[1], self._longest[2]
+
+        size = len(self.names)
+        finish = array("d", bytes(8 * size))
+        best_pred = array("i", [-1]) * size
+        durations = self._durations
+        preds = self._preds
+        for node in self.topological_order():
+            best = 0.0
+            for pred in preds[node]:
+                if finish[pred] > best:
+                    best = finish[pred]
+                    best_pred[node] = pred
+            finish[node] = best + durations[node]
+        self._longest = (self.version, finish, best_pred)
+        return finish, best_pred
+
+    def critical_path(self, target: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return the longest (by duration) dependency chain.
+
+        Args:
+            target: End the path at this job; defaults to the job finishing
+                last in the whole plan
+
+        Returns:
+            ``{"path": [job, ...], "duration": seconds}``, ordered from the
+            first job to the last.
+        """
+        if not self.index:
+            return {"path": [], "duration": 0.0}
+        finish, best_pred = self._longest_paths()
+        if target is not None:
+            node = self._require(target)
+        else:
+            node = max(self.index.values(), key=finish.__getitem__)
+        total = finish[node]
+        path: List[int] = []
+        while node != -1:
+            path.append(node)
+            node = best_pred[node]
+        path.reverse()
+        return {"path": [self.names[node] for node in path], "duration": total}
+
+
+class DependencyGraphService:
+    """
+    Keeps a :class:`JobDependencyGraph` in sync with the TWS plan.
+
+    The plan snapshot comes from ``tws_client.get_plan_dependency_graph()``
+    and is re-applied incrementally at most every ``refresh_interval``
+    seconds. Concurrent callers share one refresh.
+    """
+
+    def __init__(
+        self, tws_client: Any, refresh_interval: float = DEFAULT_REFRESH_INTERVAL
+    ) -> None:
+        self.tws_client = tws_client
+        self.refresh_interval = refresh_interval
+        self.graph = JobDependencyGraph()
+        self._refreshed_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def get_graph(self, force_refresh: bool = False) -> JobDependencyGraph:
+        """Return the graph, refreshing it from TWS if it is stale."""
+        if not force_refresh and not self._is_stale():
+            return self.graph
+        async with self._lock:
+            if force_refresh or self._is_stale():
+                await self._refresh()
+        return self.graph
+
+    def _is_stale(self) -> bool:
+        return (
+            self._refreshed_at is None
+            or time.monotonic() - self._refreshed_at >= self.refresh_interval
+        )
+
+    async def _refresh(self) -> None:
+        started = time.perf_counter()
+        snapshot = await self.tws_client.get_plan_dependency_graph()
+        changed = self.graph.apply_snapshot(
+            snapshot.dependency_graph, snapshot.durations
+        )
+        self._refreshed_at = time.monotonic()
+        logger.info(
+            "Dependency graph refreshed: %d jobs, %d edges, %d changed in %.1f ms",
+            len(self.graph),
+            self.graph.edge_count,
+            changed,
+            (time.perf_counter() - started) * 1000,
+        )
+
+    async def upstream(self, job_id: str, max_depth: Optional[int] = None) -> List[str]:
+        return (await self.get_graph()).upstream(job_id, max_depth)
+
+    async def downstream(
+        self, job_id: str, max_depth: Optional[int] = None
+    ) -> List[str]:
+        return (await self.get_graph()).downstream(job_id, max_depth)
+
+    async def blocking(self, job_id: str) -> Dict[str, Any]:
+        graph = await self.get_graph()
+        jobs = await self.tws_client.get_jobs_status()
+        statuses = {job.name: job.status for job in jobs}
+        return graph.blocking(job_id, statuses)
+
+    async def critical_path(self, target: Optional[str] = None) -> Dict[str, Any]:
+        return (await self.get_graph()).critical_path(target)
+
+
+_services: Dict[int, DependencyGraphService] = {}
+
+
+def get_dependency_graph_service(tws_client: Any) -> DependencyGraphService:
+    """Return the shared dependency graph service for ``tws_client``."""
+    service = _services.get(id(tws_client))
+    if service is None or service.tws_client is not tws_client:
+        service = _services[id(tws_client)] = DependencyGraphService(tws_client)
+    return service
@@ -0,0 +1,201 @@
+"""
+Incremental, time-indexed local store for TWS event log entries.
+
+``get_event_log(last_hours=24)`` used to download the full window on every
+call even though only the last few minutes are new. This module keeps the
+events already seen in an append-only, timestamp-sorted index so that:
+
+- only events newer than the high-water mark (the *watermark*) need to be
+  fetched from TWS;
+- ``last_hours`` queries are answered from local data once the window has
+  been loaded;
+- time-range and event-type filters use binary search over per-type indexes
+  instead of scanning every stored event.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from resync.models.tws import Event
+
+logger = logging.getLogger(__name__)
+
+# Default retention for stored events (7 days)
+DEFAULT_RETENTION_SECONDS = 7 * 24 * 3600
+
+# Default upper bound on the number of stored events
+DEFAULT_MAX_EVENTS = 500_000
+
+
+def _epoch(value: datetime) -> float:
+    """Convert an event timestamp to epoch seconds."""
+    return value.timestamp()
+
+
+class _TimeIndex:
+    """Events sorted by timestamp with a parallel list of epoch keys."""
+
+    __slots__ = ("keys", "events")
+
+    def __init__(self) -> None:
+        self.keys: List[float] = []
+        self.events: List[Event] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: float, event: Event) -> None:
+        if not self.keys or key >= self.keys[-1]:
+            # Fast path: events almost always arrive in time order
+            self.keys.append(key)
+            self.events.append(event)
+            return
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.events.insert(position, event)
+
+    def slice(self, start: Optional[float], end: Optional[float]) -> List[Event]:
+        lo = 0 if start is None else bisect_left(self.keys, start)
+        hi = len(self.keys) if end is None else bisect_right(self.keys, end)
+        return self.events[lo:hi]
+
+    def trim_before(self, cutoff: float) -> List[Event]:
+        position = bisect_left(self.keys, cutoff)
+        if position == 0:
+            return []
+        dropped = self.events[:position]
+        del self.keys[:position]
+        del self.events[:position]
+        return dropped
+
+
+class EventLogStore:
+    """
+    Append-only event store indexed by timestamp and event type.
+
+    The store also tracks which time window it holds *completely*
+    (``covered_since``): a query for the last N hours can only be answered
+    locally if the store has been filled from at least that far back.
+    """
+
+    def __init__(
+        self,
+        retention_seconds: float = DEFAULT_RETENTION_SECONDS,
+        max_events: int = DEFAULT_MAX_EVENTS,
+    ) -> None:
+        if max_events <= 0:
+            raise ValueError("max_events must be a positive integer")
+        self.retention_seconds = retention_seconds
+        self.max_events = max_events
+        self._all = _TimeIndex()
+        self._by_type: Dict[str, _TimeIndex] = {}
+        self._seen: Dict[Tuple[str, ...], float] = {}
+        self.watermark: Optional[float] = None
+        self.covered_since: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    @staticmethod
+    def _identity(event: Event) -> Tuple[str, ...]:
+        if event.event_id:
+            return (event.event_id,)
+        # Events without an ID are deduplicated on their content
+        return (event.timestamp.isoformat(), event.event_type, event.message)
+
+    def covers(self, since: float) -> bool:
+        """Return True if every event newer than ``since`` is stored locally."""
+        return self.covered_since is not None and self.covered_since <= since
+
+    def mark_covered(self, since: float, until: float) -> None:
+        """
+        Record that all events in ``[since, until]`` have been loaded.
+
+        ``until`` becomes the new watermark if it is ahead of the current one.
+        """
+        if self.covered_since is None or since < self.covered_since:
+            self.covered_since = since
+        if self.watermark is None or until > self.watermark:
+            self.watermark = until
+
+    def append(self, events: Iterable[Event]) -> int:
+        """
+        Add events to the store, skipping ones already stored.
+
+        Returns:
+            The number of new events stored.
+        """
+        added = 0
+        for event in events:
+            identity = self._identity(event)
+            if identity in self._seen:
+                continue
+            key = _epoch(event.timestamp)
+            self._seen[identity] = key
+            self._all.add(key, event)
+            index = self._by_type.get(event.event_type)
+            if index is None:
+                index = self._by_type[event.event_type] = _TimeIndex()
+            index.add(key, event)
+            added += 1
+        if added:
+            self._enforce_limits()
+        return added
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        event_types: Optional[Sequence[str]] = None,
+    ) -> List[Event]:
+        """
+        Return stored events in ``[start, end]`` ordered by timestamp.
+
+        Args:
+            start: Lower bound in epoch seconds (inclusive), or None
+            end: Upper bound in epoch seconds (inclusive), or None
+            event_types: Only return events of these types
+        """
+        if not event_types:
+            return self._all.slice(start, end)
+
+        slices = [
+            self._by_type[event_type].slice(start, end)
+            for event_type in dict.fromkeys(event_types)
+            if event_type in self._by_type
+        ]
+        if len(slices) <= 1:
+            return slices[0] if slices else []
+        return list(heapq.merge(*slices, key=lambda event: event.timestamp))
+
+    def last_hours(
+        self, hours: float, event_types: Optional[Sequence[str]] = None
+    ) -> List[Event]:
+        """Return events from the last ``hours`` hours."""
+        return self.query(start=time.time() - hours * 3600, event_types=event_types)
+
+    def _enforce_limits(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        if len(self._all) > self.max_events:
+            # Drop the oldest events beyond the size bound
+            cutoff = max(cutoff, self._all.keys[len(self._all) - self.max_events])
+        if not self._all.keys or self._all.keys[0] >= cutoff:
+            return
+
+        for event in self._all.trim_before(cutoff):
+            self._seen.pop(self._identity(event), None)
+        for event_type in list(self._by_type):
+            index = self._by_type[event_type]
+            index.trim_before(cutoff)
+            if not index:
+                del self._by_type[event_type]
+        # Data older than the cutoff is gone, so the complete window shrinks
+        if self.covered_since is not None and self.covered_since < cutoff:
+            self.covered_since = cutoff
+        logger.debug("Event log store trimmed to %d events", len(self._all))
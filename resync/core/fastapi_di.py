@@ -33,6 +33,11 @@ from resync.core.knowledge_graph import AsyncKnowledgeGraph
 from resync.core.structured_logger import get_logger
 from resync.core.teams_integration import TeamsIntegration, get_teams_integration
 from resync.services.mock_tws_service import MockTWSClient
+from resync.services.synthetic_tws import (
+    LatencyProfile,
+    SyntheticPlanConfig,
+    SyntheticTWSEnvironment,
+)
 from resync.services.tws_service import OptimizedTWSClient
 from resync.settings import settings
 
@@ -51,7 +56,22 @@ def get_tws_client_factory():
     """
     if settings.TWS_MOCK_MODE:
         logger.info("TWS_MOCK_MODE is enabled. Creating MockTWSClient.")
-        return MockTWSClient()
+        latency = LatencyProfile(
+            median_seconds=settings.tws_mock_latency_median_ms / 1000.0,
+            sigma=settings.tws_mock_latency_sigma,
+            spike_probability=settings.tws_mock_latency_spike_probability,
+            error_rate=settings.tws_mock_error_rate,
+        )
+        if settings.tws_mock_synthetic_jobs:
+            environment = SyntheticTWSEnvironment(
+                SyntheticPlanConfig(
+                    num_jobs=settings.tws_mock_synthetic_jobs,
+                    num_workstations=settings.tws_mock_synthetic_workstations,
+                    seed=settings.tws_mock_synthetic_seed,
+                )
+            )
+            return MockTWSClient(environment=environment, latency=latency)
+        return MockTWSClient(latency=latency)
     else:
         logger.info("Creating OptimizedTWSClient.")
         return OptimizedTWSClient(
@@ -61,6 +81,7 @@ def get_tws_client_factory():
             password=settings.TWS_PASSWORD,
             engine_name=settings.TWS_ENGINE_NAME,
             engine_owner=settings.TWS_ENGINE_OWNER,
+            trusted_payloads=settings.tws_trusted_payloads,
         )
 
 
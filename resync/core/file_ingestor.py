@@ -1,6 +1,7 @@
 # resync/core/file_ingestor.py
 from __future__ import annotations
 
+import asyncio
 import os
 import re
 import shutil
@@ -397,20 +398,12 @@ def read_docx(file_path: Path) -> str:
 def read_excel(file_path: Path) -> str:
     """Extracts text from an XLSX file, iterating through all sheets and cells."""
     logger.info("reading_excel_file", file_path=str(file_path))
-    text_parts = []
     try:
         workbook = openpyxl.load_workbook(file_path, read_only=True)
-        for sheetname in workbook.sheetnames:
-            sheet = workbook[sheetname]
-            text_parts.append(f"Sheet: {sheetname}\n")
-            for row in sheet.iter_rows():
-                row_texts = []
-                for cell in row:
-                    if cell.value is not None:
-                        row_texts.append(str(cell.value))
-                if row_texts:
-                    text_parts.append(" | ".join(row_texts))
-        return "\n".join(text_parts)
+        return "\n".join(
+            _excel_sheet_text(workbook[sheetname], sheetname)
+            for sheetname in workbook.sheetnames
+        )
     except FileNotFoundError as e:
         logger.error("excel_file_not_found", file_path=str(file_path), error=str(e))
         return ""
@@ -437,6 +430,169 @@ def read_excel(file_path: Path) -> str:
         raise FileProcessingError(f"Failed to process Excel file {file_path}") from e
 
 
+def _excel_sheet_text(sheet, sheetname: str) -> str:
+    """Text of one worksheet: a ``Sheet:`` header and one line per row."""
+    text_parts = [f"Sheet: {sheetname}\n"]
+    for row in sheet.iter_rows():
+        row_texts = []
+        for cell in row:
+            if cell.value is not None:
+                row_texts.append(str(cell.value))
+        if row_texts:
+            text_parts.append(" | ".join(row_texts))
+    return "\n".join(text_parts)
+
+
+# --- Partial Readers (page/sheet-parallel extraction) --- #
+
+
+def count_pdf_pages(file_path: Path) -> int:
+    """Returns the number of pages of a PDF file."""
+    return len(pypdf.PdfReader(file_path).pages)
+
+
+def read_pdf_pages(file_path: Path, start: int, stop: int) -> str:
+    """
+    Extracts text from pages ``start`` to ``stop - 1`` of a PDF file.
+
+    Joining the results for consecutive page ranges gives the same text as
+    :func:`read_pdf`.
+    """
+    logger.debug("reading_pdf_pages", file_path=str(file_path), start=start, stop=stop)
+    try:
+        reader = pypdf.PdfReader(file_path)
+        pages = reader.pages[start:stop]
+        return "".join(text for text in (page.extract_text() for page in pages) if text)
+    except (FileNotFoundError, PermissionError) as e:
+        logger.error("pdf_file_not_accessible", file_path=str(file_path), error=str(e))
+        return ""
+    except (pypdf.errors.PdfReadError, ValueError) as e:
+        logger.error("pdf_read_error", file_path=str(file_path), error=str(e))
+        return ""
+    except Exception as e:  # Catch any other pypdf or system errors
+        logger.critical(
+            "unexpected_error_reading_pdf_pages",
+            file_path=str(file_path),
+            start=start,
+            stop=stop,
+            error=str(e),
+            exc_info=True,
+        )
+        raise FileProcessingError(f"Failed to process PDF {file_path}") from e
+
+
+def list_excel_sheets(file_path: Path) -> list[str]:
+    """Returns the sheet names of an XLSX file."""
+    workbook = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def read_excel_sheet(file_path: Path, sheetname: str) -> str:
+    """
+    Extracts text from one sheet of an XLSX file.
+
+    Joining the results for all sheets with newlines gives the same text as
+    :func:`read_excel`.
+    """
+    logger.debug("reading_excel_sheet", file_path=str(file_path), sheet=sheetname)
+    try:
+        workbook = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            return _excel_sheet_text(workbook[sheetname], sheetname)
+        finally:
+            workbook.close()
+    except (FileNotFoundError, PermissionError) as e:
+        logger.error(
+            "excel_file_not_accessible", file_path=str(file_path), error=str(e)
+        )
+        return ""
+    except (InvalidFileException, KeyError, ValueError) as e:
+        logger.error("invalid_excel_sheet", file_path=str(file_path), error=str(e))
+        return ""
+    except Exception as e:  # Catch other potential library or system errors
+        logger.critical(
+            "unexpected_error_reading_excel_sheet",
+            file_path=str(file_path),
+            sheet=sheetname,
+            error=str(e),
+            exc_info=True,
+        )
+        raise FileProcessingError(f"Failed to process Excel file {file_path}") from e
+
+
+FILE_READERS = {
+    ".pdf": read_pdf,
+    ".docx": read_docx,
+    ".xlsx": read_excel,
+    ".md": read_md,
+    ".json": read_json,
+    ".txt": read_txt,
+    ".doc": read_doc,
+    ".xls": read_xls,
+}
+
+
+async def add_chunk_to_graph(
+    knowledge_graph: IKnowledgeGraph,
+    file_path: Path,
+    chunk: str,
+    chunk_index: int,
+    total_chunks: int,
+) -> bool:
+    """
+    Adds one chunk of a file to the knowledge graph.
+
+    Errors are logged, not raised, so the other chunks of the file are still
+    processed.
+
+    Returns:
+        True if the chunk was stored, False otherwise
+    """
+    try:
+        metadata = {
+            "source_file": str(file_path.name),
+            "chunk_index": chunk_index,
+            "total_chunks": total_chunks,
+        }
+        await knowledge_graph.add_content(content=chunk, metadata=metadata)
+        return True
+    except KnowledgeGraphError as e:
+        logger.error(
+            "knowledge_graph_error_adding_chunk",
+            chunk_index=chunk_index,
+            file_path=str(file_path),
+            error=str(e),
+            exc_info=True,
+        )
+    except ValueError as e:
+        logger.error(
+            "value_error_adding_chunk",
+            chunk_index=chunk_index,
+            file_path=str(file_path),
+            error=str(e),
+            exc_info=True,
+        )
+    except TypeError as e:
+        logger.error(
+            "type_error_adding_chunk",
+            chunk_index=chunk_index,
+            file_path=str(file_path),
+            error=str(e),
+            exc_info=True,
+        )
+    except Exception:
+        logger.critical(
+            "critical_unhandled_error_adding_chunk",
+            chunk_index=chunk_index,
+            file_path=str(file_path),
+            exc_info=True,
+        )
+    return False
+
+
 # --- Main Ingestion Logic --- #
 
 
@@ -456,16 +612,7 @@ class FileIngestor(IFileIngestor):
         """
         self.knowledge_graph = knowledge_graph
         self.rag_directory = settings.BASE_DIR / "rag"
-        self.file_readers = {
-            ".pdf": read_pdf,
-            ".docx": read_docx,
-            ".xlsx": read_excel,
-            ".md": read_md,
-            ".json": read_json,
-            ".txt": read_txt,
-            ".doc": read_doc,
-            ".xls": read_xls,
-        }
+        self.file_readers = dict(FILE_READERS)
         # Ensure the RAG directory exists
         self.rag_directory.mkdir(exist_ok=True)
         logger.info("file_ingestor_initialized", rag_directory=str(self.rag_directory))
@@ -542,8 +689,9 @@ class FileIngestor(IFileIngestor):
             logger.warning("unsupported_file_type", file_extension=file_ext)
             return False
 
-        # Read the file content
-        content = reader(file_path)
+        # Read the file content off the event loop
+        loop = asyncio.get_running_loop()
+        content = await loop.run_in_executor(None, reader, file_path)
         if not content:
             logger.warning("no_content_extracted", file_path=str(file_path))
             return False
@@ -552,47 +700,10 @@ class FileIngestor(IFileIngestor):
         chunks = list(chunk_text(content))
         chunk_count = 0
         for i, chunk in enumerate(chunks):
-            try:
-                metadata = {
-                    "source_file": str(file_path.name),
-                    "chunk_index": i + 1,
-                    "total_chunks": len(chunks),
-                }
-                # Here we add the chunk to the knowledge graph
-                await self.knowledge_graph.add_content(content=chunk, metadata=metadata)
+            if await add_chunk_to_graph(
+                self.knowledge_graph, file_path, chunk, i + 1, len(chunks)
+            ):
                 chunk_count += 1
-            except KnowledgeGraphError as e:
-                logger.error(
-                    "knowledge_graph_error_adding_chunk",
-                    chunk_index=i + 1,
-                    file_path=str(file_path),
-                    error=str(e),
-                    exc_info=True,
-                )
-            except ValueError as e:
-                logger.error(
-                    "value_error_adding_chunk",
-                    chunk_index=i + 1,
-                    file_path=str(file_path),
-                    error=str(e),
-                    exc_info=True,
-                )
-            except TypeError as e:
-                logger.error(
-                    "type_error_adding_chunk",
-                    chunk_index=i + 1,
-                    file_path=str(file_path),
-                    error=str(e),
-                    exc_info=True,
-                )
-            except Exception:
-                logger.critical(
-                    "critical_unhandled_error_adding_chunk",
-                    chunk_index=i + 1,
-                    file_path=str(file_path),
-                    exc_info=True,
-                )
-                # We don't re-raise here to allow processing of other chunks
 
         logger.info(
             "successfully_ingested_chunks",
@@ -603,52 +714,33 @@ class FileIngestor(IFileIngestor):
         return chunk_count > 0
 
 
-async def load_existing_rag_documents(file_ingestor: IFileIngestor) -> int:
+async def load_existing_rag_documents(file_ingestor: FileIngestor) -> int:
     """
     Load all existing documents from RAG directories into the knowledge graph.
 
+    Files are discovered, extracted, chunked and stored by an
+    :class:`~resync.core.ingestion_pipeline.IngestionPipeline`.
+
     Args:
         file_ingestor: The file ingestor instance
 
     Returns:
         Number of documents processed
     """
-    processed_count = 0
-
-    # Process all knowledge base directories
-    for knowledge_dir in settings.KNOWLEDGE_BASE_DIRS:
-        knowledge_path = settings.BASE_DIR / knowledge_dir
-
-        if not knowledge_path.exists():
-            logger.warning(
-                "knowledge_base_directory_not_found", knowledge_path=str(knowledge_path)
-            )
-            continue
+    # import tardio: ingestion_pipeline importa este módulo
+    from resync.core.ingestion_pipeline import IngestionPipeline
 
+    knowledge_paths = [
+        settings.BASE_DIR / knowledge_dir for knowledge_dir in settings.KNOWLEDGE_BASE_DIRS
+    ]
+    for knowledge_path in knowledge_paths:
         logger.info(
             "processing_knowledge_base_directory", knowledge_path=str(knowledge_path)
         )
 
-        # Walk through all files in the directory tree
-        for file_path in knowledge_path.rglob("*"):
-            if file_path.is_file() and not file_path.name.startswith("."):
-                # Check if file is in protected directories (should be processed)
-                if is_path_in_knowledge_base(file_path):
-                    try:
-                        logger.info(
-                            "loading_existing_document", filename=file_path.name
-                        )
-                        await file_ingestor.ingest_file(file_path)
-                        processed_count += 1
-                    except FileProcessingError as e:
-                        logger.error(
-                            "failed_to_process_document",
-                            file_path=str(file_path),
-                            error=str(e),
-                            exc_info=True,
-                        )
-                else:
-                    logger.debug("skipping_protected_file", file_path=str(file_path))
+    pipeline = IngestionPipeline(file_ingestor.knowledge_graph)
+    stats = await pipeline.run(knowledge_paths)
+    processed_count = stats.files
 
     logger.info("loaded_existing_rag_documents", processed_count=processed_count)
     return processed_count
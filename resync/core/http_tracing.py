@@ -0,0 +1,170 @@
+"""
+Connection-level latency breakdown for outbound HTTP requests.
+
+A slow TWS or LLM call only shows up as one total duration, which doesn't
+tell connection setup, TLS, pool contention and server time apart.
+:func:`instrument_client` installs an httpx ``request`` event hook that
+attaches an httpcore ``trace`` extension to every request. Each request
+records these phases per target host into fixed-bucket histograms:
+
+- ``pool_wait``: from sending the request until the pool hands out a
+  connection (first connect or send event);
+- ``connect``: TCP connect, only for new connections;
+- ``tls``: TLS handshake, only for new TLS connections;
+- ``ttfb``: from sending the request headers to receiving the response
+  headers (server time plus one network round trip);
+- ``body_read``: reading the response body.
+
+Metrics are exported in Prometheus text format by the ``/metrics`` endpoint.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+# Latency histogram buckets in seconds; finer at the low end than the
+# handler buckets because connection phases are usually sub-millisecond
+DEFAULT_PHASE_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+PHASES = ("pool_wait", "connect", "tls", "ttfb", "body_read")
+
+# httpcore trace steps (``<prefix>.<step>.<started|complete|failed>``) timed
+# from their own start event
+_STEP_PHASES = {
+    "connect_tcp": "connect",
+    "connect_unix_socket": "connect",
+    "start_tls": "tls",
+    "receive_response_body": "body_read",
+}
+
+# The first of these events marks the end of the pool wait
+_CONNECTION_ACQUIRED_STEPS = frozenset(
+    {"connect_tcp", "connect_unix_socket", "send_request_headers"}
+)
+
+
+class _PhaseStats:
+    __slots__ = ("bucket_counts", "total", "count")
+
+    def __init__(self, bucket_count: int) -> None:
+        # One extra slot for the +Inf bucket
+        self.bucket_counts = [0] * (bucket_count + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class HTTPLatencyMetrics:
+    """Per-host, per-phase latency histograms for outbound HTTP."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_PHASE_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._stats: Dict[Tuple[str, str], _PhaseStats] = {}
+
+    def observe(self, host: str, phase: str, seconds: float) -> None:
+        """Record one phase duration for ``host``."""
+        stats = self._stats.get((host, phase))
+        if stats is None:
+            stats = self._stats[(host, phase)] = _PhaseStats(len(self.buckets))
+        stats.count += 1
+        stats.total += seconds
+        stats.bucket_counts[bisect_left(self.buckets, seconds)] += 1
+
+    def get_snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return call counts and mean durations as ``{host: {phase: ...}}``."""
+        snapshot: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (host, phase), stats in self._stats.items():
+            snapshot.setdefault(host, {})[phase] = {
+                "count": stats.count,
+                "mean_ms": stats.total / stats.count * 1000 if stats.count else 0.0,
+            }
+        return snapshot
+
+    def generate_prometheus_metrics(self) -> str:
+        """Generate metrics in Prometheus text exposition format."""
+        if not self._stats:
+            return ""
+        metric = "resync_http_client_phase_duration_seconds"
+        lines: List[str] = [
+            f"# HELP {metric} Outbound HTTP latency by target host and phase",
+            f"# TYPE {metric} histogram",
+        ]
+        for (host, phase), stats in sorted(self._stats.items()):
+            labels = f'host="{host}",phase="{phase}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, stats.bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {stats.count}')
+            lines.append(f"{metric}_sum{{{labels}}} {stats.total}")
+            lines.append(f"{metric}_count{{{labels}}} {stats.count}")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Drop all collected metrics."""
+        self._stats.clear()
+
+
+class _RequestTrace:
+    """httpcore ``trace`` callback timing the phases of one request."""
+
+    __slots__ = ("metrics", "host", "sent_at", "started", "acquired")
+
+    def __init__(self, metrics: HTTPLatencyMetrics, host: str) -> None:
+        self.metrics = metrics
+        self.host = host
+        self.sent_at = time.perf_counter()
+        self.started: Dict[str, float] = {}
+        self.acquired = False
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        _, step, stage = event_name.rsplit(".", 2)
+
+        if stage == "started":
+            if not self.acquired and step in _CONNECTION_ACQUIRED_STEPS:
+                self.acquired = True
+                self.metrics.observe(self.host, "pool_wait", now - self.sent_at)
+            self.started[step] = now
+            return
+
+        if stage != "complete":
+            return
+        if step == "receive_response_headers":
+            started = self.started.get("send_request_headers")
+            if started is not None:
+                self.metrics.observe(self.host, "ttfb", now - started)
+            return
+        phase = _STEP_PHASES.get(step)
+        started = self.started.get(step)
+        if phase is not None and started is not None:
+            self.metrics.observe(self.host, phase, now - started)
+
+
+def instrument_client(
+    client: httpx.AsyncClient, metrics: Optional[HTTPLatencyMetrics] = None
+) -> httpx.AsyncClient:
+    """
+    Record the latency breakdown of every request sent by ``client``.
+
+    Requests that already carry a ``trace`` extension are left alone.
+
+    Returns:
+        The same client, for chaining.
+    """
+    metrics = metrics or http_latency_metrics
+
+    async def _attach_trace(request: httpx.Request) -> None:
+        request.extensions.setdefault("trace", _RequestTrace(metrics, request.url.host))
+
+    client.event_hooks["request"].append(_attach_trace)
+    return client
+
+
+# Global outbound HTTP latency metrics
+http_latency_metrics = HTTPLatencyMetrics()
@@ -0,0 +1,471 @@
+"""
+Staged pipeline for bulk ingestion of knowledge base files.
+
+Loading the knowledge base used to read, chunk and store one file at a time,
+with the synchronous PDF/DOCX/XLSX readers running on the event loop.
+:class:`IngestionPipeline` splits the work into four stages connected by
+bounded queues, so a slow stage makes the earlier ones wait instead of
+piling up extracted text in memory:
+
+1. discovery: walks the knowledge base directories for supported files;
+2. extraction: reads files in a process pool; PDFs are split into page
+   ranges and workbooks into sheets, extracted in parallel and joined in
+   order, so the text is the same as the single-file readers produce;
+3. chunking: splits the text with :func:`~resync.core.file_ingestor.chunk_text`;
+4. storage: adds chunks to the knowledge graph in batches, with a bounded
+   number of ``add_content`` calls in flight.
+
+Each run returns per-stage item counts, busy time, throughput and queue
+high-water marks (:class:`PipelineStats`); totals across runs are exported
+in Prometheus text format by the ``/metrics`` endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from resync.core.exceptions import FileProcessingError
+from resync.core.file_ingestor import (
+    FILE_READERS,
+    add_chunk_to_graph,
+    chunk_text,
+    count_pdf_pages,
+    is_path_in_knowledge_base,
+    list_excel_sheets,
+    read_excel_sheet,
+    read_pdf_pages,
+)
+from resync.core.interfaces import IKnowledgeGraph
+from resync.core.structured_logger import get_logger
+from resync.settings import settings
+
+logger = get_logger(__name__)
+
+STAGES = ("discovery", "extraction", "chunking", "storage")
+
+# Menor faixa de páginas por tarefa: abrir o PDF em cada processo tem custo
+_MIN_PDF_PAGES_PER_UNIT = 8
+
+_DONE = object()
+
+# An extraction unit: a picklable reader and its arguments
+ExtractionUnit = Tuple[Callable[..., str], Tuple[Any, ...]]
+
+
+def extraction_units(file_path: Path, max_units: int) -> Tuple[str, List[ExtractionUnit]]:
+    """
+    Split the extraction of a file into at most ``max_units`` independent units.
+
+    PDFs are split into page ranges and XLSX workbooks into sheets; other
+    formats are a single unit with the regular reader. Runs in a worker
+    process, since listing pages or sheets means parsing the file.
+
+    Returns:
+        The separator joining the unit texts, and the units in document order
+    """
+    ext = file_path.suffix.lower()
+    try:
+        if ext == ".pdf" and max_units > 1:
+            pages = count_pdf_pages(file_path)
+            step = max(_MIN_PDF_PAGES_PER_UNIT, math.ceil(pages / max_units))
+            return "", [
+                (read_pdf_pages, (file_path, start, start + step))
+                for start in range(0, pages, step)
+            ]
+        if ext == ".xlsx" and max_units > 1:
+            sheets = list_excel_sheets(file_path)
+            return "\n", [(read_excel_sheet, (file_path, name)) for name in sheets]
+    except Exception as e:
+        # o leitor do arquivo inteiro registra o erro da forma usual
+        logger.debug("extraction_units_fallback", file_path=str(file_path), error=str(e))
+    return "", [(FILE_READERS[ext], (file_path,))]
+
+
+def _run_unit(unit: ExtractionUnit) -> str:
+    reader, args = unit
+    return reader(*args)
+
+
+def discover_files(
+    roots: Iterable[Path], knowledge_base_only: bool = True
+) -> List[Path]:
+    """
+    Supported, non-hidden files under ``roots`` (files or directories).
+
+    With ``knowledge_base_only``, files outside the knowledge base
+    directories are skipped.
+    """
+    files: List[Path] = []
+    for root in roots:
+        if not root.exists():
+            logger.warning("knowledge_base_directory_not_found", knowledge_path=str(root))
+            continue
+        candidates = [root] if root.is_file() else sorted(root.rglob("*"))
+        for file_path in candidates:
+            if (
+                not file_path.is_file()
+                or file_path.name.startswith(".")
+                or file_path.suffix.lower() not in FILE_READERS
+            ):
+                continue
+            if knowledge_base_only and not is_path_in_knowledge_base(file_path):
+                logger.debug("skipping_file_outside_knowledge_base", file_path=str(file_path))
+                continue
+            files.append(file_path)
+    return files
+
+
+@dataclass
+class StageStats:
+    """Counters of one pipeline stage during a run."""
+
+    items: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds from the stage's first item to its last."""
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Items per second over the stage's elapsed time."""
+        return self.items / self.elapsed if self.elapsed > 0 else 0.0
+
+    def track(self, begin: float, items: int = 1) -> None:
+        """Record ``items`` processed in work started at ``begin`` (monotonic)."""
+        now = time.monotonic()
+        self.started = begin if self.started is None else min(self.started, begin)
+        self.finished = now
+        self.busy_seconds += now - begin
+        self.items += items
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "items": self.items,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 6),
+            "elapsed_seconds": round(self.elapsed, 6),
+            "throughput": round(self.throughput, 3),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+@dataclass
+class PipelineStats:
+    """Result of one pipeline run."""
+
+    files: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    stages: Dict[str, StageStats] = field(
+        default_factory=lambda: {name: StageStats() for name in STAGES}
+    )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "chunks": self.chunks,
+            "elapsed_seconds": round(self.elapsed_seconds, 6),
+            "stages": {name: stats.as_dict() for name, stats in self.stages.items()},
+        }
+
+
+# (metric name, Prometheus type, StageStats attribute, help text)
+_STAGE_METRICS = (
+    (
+        "resync_ingestion_stage_items_total",
+        "counter",
+        "items",
+        "Items processed by ingestion pipeline stage",
+    ),
+    (
+        "resync_ingestion_stage_errors_total",
+        "counter",
+        "errors",
+        "Items that failed in ingestion pipeline stage",
+    ),
+    (
+        "resync_ingestion_stage_busy_seconds_total",
+        "counter",
+        "busy_seconds",
+        "Seconds spent working by ingestion pipeline stage",
+    ),
+    (
+        "resync_ingestion_stage_queue_depth_max",
+        "gauge",
+        "max_queue_depth",
+        "Input queue high-water mark of ingestion pipeline stage (last run)",
+    ),
+)
+
+
+class IngestionPipelineMetrics:
+    """Per-stage totals over all pipeline runs of this process."""
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.totals: Dict[str, StageStats] = {name: StageStats() for name in STAGES}
+        self.last_run: Optional[PipelineStats] = None
+
+    def record(self, stats: PipelineStats) -> None:
+        self.runs += 1
+        self.last_run = stats
+        for name, stage in stats.stages.items():
+            total = self.totals[name]
+            total.items += stage.items
+            total.errors += stage.errors
+            total.busy_seconds += stage.busy_seconds
+            total.max_queue_depth = stage.max_queue_depth
+
+    def generate_prometheus_metrics(self) -> str:
+        """Generate metrics in Prometheus text exposition format."""
+        if not self.runs:
+            return ""
+        lines: List[str] = []
+        for metric, kind, attr, help_text in _STAGE_METRICS:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, stats in self.totals.items():
+                lines.append(f'{metric}{{stage="{name}"}} {getattr(stats, attr)}')
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Drop all collected metrics."""
+        self.runs = 0
+        self.totals = {name: StageStats() for name in STAGES}
+        self.last_run = None
+
+
+ingestion_pipeline_metrics = IngestionPipelineMetrics()
+
+
+class IngestionPipeline:
+    """
+    Discovery → extraction → chunking → storage, connected by bounded queues.
+    """
+
+    def __init__(
+        self,
+        knowledge_graph: IKnowledgeGraph,
+        *,
+        processes: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        storage_batch_size: Optional[int] = None,
+        storage_concurrency: Optional[int] = None,
+        metrics: Optional[IngestionPipelineMetrics] = None,
+    ):
+        """
+        Args:
+            knowledge_graph: Knowledge graph the chunks are added to
+            processes: Extraction worker processes (0 = one per CPU); with 1,
+                files are extracted in a thread, without a process pool
+            queue_size: Capacity of each queue between stages
+            storage_batch_size: Chunks stored per batch
+            storage_concurrency: ``add_content`` calls in flight per batch
+            metrics: Collector the run statistics are recorded in
+        """
+        processes = (
+            settings.ingestion_pipeline_processes if processes is None else processes
+        )
+        self.knowledge_graph = knowledge_graph
+        self.processes = processes or os.cpu_count() or 1
+        self.queue_size = queue_size or settings.ingestion_pipeline_queue_size
+        self.storage_batch_size = (
+            storage_batch_size or settings.ingestion_pipeline_storage_batch_size
+        )
+        self.storage_concurrency = (
+            storage_concurrency or settings.ingestion_pipeline_storage_concurrency
+        )
+        self.metrics = metrics if metrics is not None else ingestion_pipeline_metrics
+
+    async def run(
+        self, roots: Iterable[Path], *, knowledge_base_only: bool = True
+    ) -> PipelineStats:
+        """
+        Ingest all supported files under ``roots``.
+
+        Args:
+            roots: Files or directories to ingest
+            knowledge_base_only: Skip files outside the knowledge base directories
+
+        Returns:
+            Statistics of the run; ``files`` counts files with at least one
+            chunk stored.
+        """
+        stats = PipelineStats()
+        started = time.monotonic()
+        files: asyncio.Queue = asyncio.Queue(self.queue_size)
+        texts: asyncio.Queue = asyncio.Queue(self.queue_size)
+        chunks: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        pool: Optional[Executor] = None
+        if self.processes > 1:
+            pool = ProcessPoolExecutor(max_workers=self.processes)
+        # um arquivo por processo em extração, mais um na fila do pool
+        extractors = 2 * self.processes if pool else 1
+        tasks = [
+            asyncio.create_task(
+                self._discover(list(roots), knowledge_base_only, files, extractors, stats)
+            ),
+            *(
+                asyncio.create_task(self._extract(pool, files, texts, stats))
+                for _ in range(extractors)
+            ),
+            asyncio.create_task(self._chunk(texts, chunks, extractors, stats)),
+            asyncio.create_task(self._store(chunks, stats)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        stats.elapsed_seconds = time.monotonic() - started
+        self.metrics.record(stats)
+        logger.info("ingestion_pipeline_finished", **stats.as_dict())
+        return stats
+
+    @staticmethod
+    async def _put(queue: asyncio.Queue, item: Any, stage: StageStats) -> None:
+        await queue.put(item)
+        stage.max_queue_depth = max(stage.max_queue_depth, queue.qsize())
+
+    async def _discover(
+        self,
+        roots: List[Path],
+        knowledge_base_only: bool,
+        out: asyncio.Queue,
+        consumers: int,
+        stats: PipelineStats,
+    ) -> None:
+        stage = stats.stages["discovery"]
+        loop = asyncio.get_running_loop()
+        for root in roots:
+            begin = time.monotonic()
+            found = await loop.run_in_executor(
+                None, discover_files, [root], knowledge_base_only
+            )
+            stage.track(begin, len(found))
+            for file_path in found:
+                await self._put(out, file_path, stats.stages["extraction"])
+        for _ in range(consumers):
+            await out.put(_DONE)
+
+    async def _extract(
+        self,
+        pool: Optional[Executor],
+        inbox: asyncio.Queue,
+        out: asyncio.Queue,
+        stats: PipelineStats,
+    ) -> None:
+        stage = stats.stages["extraction"]
+        loop = asyncio.get_running_loop()
+        while (file_path := await inbox.get()) is not _DONE:
+            begin = time.monotonic()
+            try:
+                if pool is None:
+                    reader = FILE_READERS[file_path.suffix.lower()]
+                    text = await loop.run_in_executor(None, reader, file_path)
+                else:
+                    separator, units = await loop.run_in_executor(
+                        pool, extraction_units, file_path, self.processes
+                    )
+                    parts = await asyncio.gather(
+                        *(loop.run_in_executor(pool, _run_unit, unit) for unit in units)
+                    )
+                    text = separator.join(parts)
+            except FileProcessingError as e:
+                stage.errors += 1
+                logger.error(
+                    "failed_to_process_document",
+                    file_path=str(file_path),
+                    error=str(e),
+                    exc_info=True,
+                )
+                continue
+            stage.track(begin)
+            if not text:
+                logger.warning("no_content_extracted", file_path=str(file_path))
+                continue
+            await self._put(out, (file_path, text), stats.stages["chunking"])
+        await out.put(_DONE)
+
+    async def _chunk(
+        self,
+        inbox: asyncio.Queue,
+        out: asyncio.Queue,
+        producers: int,
+        stats: PipelineStats,
+    ) -> None:
+        stage = stats.stages["chunking"]
+        while producers:
+            item = await inbox.get()
+            if item is _DONE:
+                producers -= 1
+                continue
+            file_path, text = item
+            begin = time.monotonic()
+            file_chunks = list(chunk_text(text))
+            stage.track(begin, len(file_chunks))
+            for index, chunk in enumerate(file_chunks, start=1):
+                await self._put(
+                    out,
+                    (file_path, chunk, index, len(file_chunks)),
+                    stats.stages["storage"],
+                )
+        await out.put(_DONE)
+
+    async def _store(self, inbox: asyncio.Queue, stats: PipelineStats) -> None:
+        stage = stats.stages["storage"]
+        semaphore = asyncio.Semaphore(self.storage_concurrency)
+        stored: Dict[Path, int] = {}
+
+        async def _add(item: Tuple[Path, str, int, int]) -> bool:
+            async with semaphore:
+                return await add_chunk_to_graph(self.knowledge_graph, *item)
+
+        async def _flush(batch: List[Tuple[Path, str, int, int]]) -> None:
+            begin = time.monotonic()
+            results = await asyncio.gather(*(_add(item) for item in batch))
+            stage.track(begin, sum(results))
+            stage.errors += results.count(False)
+            for (file_path, _, index, total), ok in zip(batch, results):
+                stored[file_path] = stored.get(file_path, 0) + ok
+                if index == total:
+                    logger.info(
+                        "successfully_ingested_chunks",
+                        chunk_count=stored[file_path],
+                        total_chunks=total,
+                        file_path=str(file_path),
+                    )
+
+        batch: List[Tuple[Path, str, int, int]] = []
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                break
+            batch.append(item)
+            # grava quando o lote enche ou quando não há mais nada pronto
+            if len(batch) >= self.storage_batch_size or inbox.empty():
+                await _flush(batch)
+                batch = []
+        if batch:
+            await _flush(batch)
+        stats.files = sum(1 for count in stored.values() if count)
+        stats.chunks = stage.items
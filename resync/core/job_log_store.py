@@ -0,0 +1,306 @@
+"""
+Segmented storage and ranged reads for TWS job logs.
+
+Job logs can be several megabytes long, while callers usually only need the
+tail or a handful of lines around an error. Instead of caching a log as one
+large string, this module splits it into fixed-size byte segments stored
+under separate cache keys plus a small manifest describing the log. Ranged
+reads (bytes, lines or "tail N lines") only load the segments they touch.
+"""
+
+from __future__ import annotations
+
+import codecs
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default segment size for cached job logs (64 KiB)
+DEFAULT_SEGMENT_SIZE = 64 * 1024
+
+# Default TTL for cached job log segments (10 minutes)
+DEFAULT_LOG_TTL_SECONDS = 600
+
+
+@dataclass(frozen=True)
+class JobLogRange:
+    """
+    Describes which part of a job log should be returned.
+
+    At most one selector may be used at a time:
+
+    - ``start_byte``/``end_byte``: half-open byte range ``[start, end)``
+    - ``start_line``/``end_line``: half-open, zero-based line range
+    - ``tail``: the last ``tail`` lines of the log
+
+    An empty range selects the whole log.
+    """
+
+    start_byte: Optional[int] = None
+    end_byte: Optional[int] = None
+    start_line: Optional[int] = None
+    end_line: Optional[int] = None
+    tail: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        selectors = [
+            self.start_byte is not None or self.end_byte is not None,
+            self.start_line is not None or self.end_line is not None,
+            self.tail is not None,
+        ]
+        if sum(selectors) > 1:
+            raise ValueError(
+                "Only one of byte range, line range or tail may be specified"
+            )
+        for name in ("start_byte", "end_byte", "start_line", "end_line", "tail"):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} must be non-negative")
+
+    @property
+    def is_full(self) -> bool:
+        """Return True if the range selects the whole log."""
+        return (
+            self.start_byte is None
+            and self.end_byte is None
+            and self.start_line is None
+            and self.end_line is None
+            and self.tail is None
+        )
+
+
+class SegmentedJobLogStore:
+    """
+    Stores job logs as fixed-size byte segments in an async key/value cache.
+
+    The cache only needs ``get``/``set``/``delete`` coroutines, which matches
+    :class:`resync.core.cache_hierarchy.CacheHierarchy`.
+
+    Layout for a job ``J``::
+
+        job_log:J:meta        -> {"size", "segment_size", "segments", "line_counts"}
+        job_log:J:seg:<n>     -> bytes of segment n
+    """
+
+    def __init__(
+        self,
+        cache: Any,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        ttl_seconds: Optional[int] = DEFAULT_LOG_TTL_SECONDS,
+        key_prefix: str = "job_log",
+    ) -> None:
+        if segment_size <= 0:
+            raise ValueError("segment_size must be a positive integer")
+        self.cache = cache
+        self.segment_size = segment_size
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    def _meta_key(self, job_id: str) -> str:
+        return f"{self.key_prefix}:{job_id}:meta"
+
+    def _segment_key(self, job_id: str, index: int) -> str:
+        return f"{self.key_prefix}:{job_id}:seg:{index}"
+
+    async def get_manifest(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the manifest for a cached log, or None if it is not cached."""
+        manifest = await self.cache.get(self._meta_key(job_id))
+        return manifest if isinstance(manifest, dict) else None
+
+    async def _read_segment(self, job_id: str, index: int) -> bytes:
+        segment = await self.cache.get(self._segment_key(job_id, index))
+        if segment is None:
+            # A segment was evicted independently of its manifest; callers
+            # treat this the same as a cache miss.
+            raise KeyError(f"Missing segment {index} for job log {job_id}")
+        return segment
+
+    async def write(
+        self, job_id: str, chunks: AsyncIterable[bytes]
+    ) -> Dict[str, Any]:
+        """
+        Consume ``chunks`` and store them as fixed-size segments.
+
+        Only one segment is buffered at a time, so arbitrarily large logs can
+        be stored without holding them fully in memory.
+
+        Returns:
+            The manifest written for the log.
+        """
+        buffer = bytearray()
+        index = 0
+        size = 0
+        line_counts: List[int] = []
+
+        async def _flush(data: bytes) -> None:
+            nonlocal index
+            await self.cache.set(
+                self._segment_key(job_id, index), data, ttl_seconds=self.ttl_seconds
+            )
+            line_counts.append(data.count(b"\n"))
+            index += 1
+
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            size += len(chunk)
+            buffer.extend(chunk)
+            while len(buffer) >= self.segment_size:
+                await _flush(bytes(buffer[: self.segment_size]))
+                del buffer[: self.segment_size]
+
+        if buffer or index == 0:
+            await _flush(bytes(buffer))
+
+        manifest = {
+            "size": size,
+            "segment_size": self.segment_size,
+            "segments": index,
+            "line_counts": line_counts,
+        }
+        # Manifest is written last so readers never observe partial logs
+        await self.cache.set(
+            self._meta_key(job_id), manifest, ttl_seconds=self.ttl_seconds
+        )
+        return manifest
+
+    async def write_text(self, job_id: str, text: str) -> Dict[str, Any]:
+        """Store an already materialised log string."""
+        data = text.encode("utf-8")
+
+        async def _chunks() -> AsyncIterator[bytes]:
+            for offset in range(0, len(data), self.segment_size):
+                yield data[offset : offset + self.segment_size]
+
+        return await self.write(job_id, _chunks())
+
+    async def invalidate(self, job_id: str) -> None:
+        """Remove a cached log and all of its segments."""
+        manifest = await self.get_manifest(job_id)
+        await self.cache.delete(self._meta_key(job_id))
+        if manifest:
+            for index in range(manifest["segments"]):
+                await self.cache.delete(self._segment_key(job_id, index))
+
+    async def read(
+        self, job_id: str, log_range: Optional[JobLogRange] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yield the selected part of a cached log as decoded text chunks.
+
+        Raises:
+            KeyError: If the log (or one of its segments) is not cached.
+        """
+        manifest = await self.get_manifest(job_id)
+        if manifest is None:
+            raise KeyError(f"Job log {job_id} is not cached")
+
+        log_range = log_range or JobLogRange()
+        if log_range.tail is not None:
+            start, end = await self._tail_offsets(job_id, manifest, log_range.tail)
+        elif log_range.start_line is not None or log_range.end_line is not None:
+            start, end = await self._line_offsets(
+                job_id, manifest, log_range.start_line or 0, log_range.end_line
+            )
+        else:
+            start = log_range.start_byte or 0
+            end = log_range.end_byte
+
+        async for text in self._read_bytes(job_id, manifest, start, end):
+            yield text
+
+    async def _read_bytes(
+        self,
+        job_id: str,
+        manifest: Dict[str, Any],
+        start: int,
+        end: Optional[int],
+    ) -> AsyncIterator[str]:
+        size = manifest["size"]
+        segment_size = manifest["segment_size"]
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
+
+        # Segment boundaries may split multi-byte characters
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        first = start // segment_size
+        last = (end - 1) // segment_size
+        for index in range(first, last + 1):
+            segment = await self._read_segment(job_id, index)
+            seg_start = index * segment_size
+            lo = max(start - seg_start, 0)
+            hi = min(end - seg_start, len(segment))
+            text = decoder.decode(segment[lo:hi])
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    async def _tail_offsets(
+        self, job_id: str, manifest: Dict[str, Any], lines: int
+    ) -> tuple[int, int]:
+        """Find the byte offset where the last ``lines`` lines begin."""
+        size = manifest["size"]
+        if lines == 0 or size == 0:
+            return size, size
+
+        segment_size = manifest["segment_size"]
+        # A trailing newline terminates the last line rather than starting a new one
+        last_segment = await self._read_segment(job_id, manifest["segments"] - 1)
+        skip_final_newline = last_segment.endswith(b"\n")
+        remaining = lines + (1 if skip_final_newline else 0)
+
+        for index in range(manifest["segments"] - 1, -1, -1):
+            if manifest["line_counts"][index] < remaining:
+                remaining -= manifest["line_counts"][index]
+                continue
+            segment = (
+                last_segment
+                if index == manifest["segments"] - 1
+                else await self._read_segment(job_id, index)
+            )
+            pos = len(segment)
+            for _ in range(remaining):
+                pos = segment.rfind(b"\n", 0, pos)
+            return index * segment_size + pos + 1, size
+        return 0, size
+
+    async def _line_offsets(
+        self,
+        job_id: str,
+        manifest: Dict[str, Any],
+        start_line: int,
+        end_line: Optional[int],
+    ) -> tuple[int, Optional[int]]:
+        """Translate a zero-based line range into byte offsets."""
+        start = await self._offset_of_line(job_id, manifest, start_line)
+        end = (
+            None
+            if end_line is None
+            else await self._offset_of_line(job_id, manifest, end_line)
+        )
+        return start, end
+
+    async def _offset_of_line(
+        self, job_id: str, manifest: Dict[str, Any], line: int
+    ) -> int:
+        """Return the byte offset where zero-based ``line`` begins."""
+        if line == 0:
+            return 0
+        segment_size = manifest["segment_size"]
+        # Line ``n`` begins right after the ``n``-th newline
+        remaining = line
+        for index, count in enumerate(manifest["line_counts"]):
+            if count < remaining:
+                remaining -= count
+                continue
+            segment = await self._read_segment(job_id, index)
+            pos = -1
+            for _ in range(remaining):
+                pos = segment.find(b"\n", pos + 1)
+            return index * segment_size + pos + 1
+        return manifest["size"]
@@ -5,28 +5,135 @@ Separated to follow Single Responsibility Principle.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Optional
+from typing import Any, AsyncIterator, Callable, Optional
 
 import httpx
 
 from resync.core.exceptions import TWSConnectionError
+from resync.core.http_tracing import instrument_client
 from resync.core.pools.base_pool import ConnectionPool, ConnectionPoolConfig
 
 # --- Logging Setup ---
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401  # HTTP/2 support for httpx (``httpx[http2]``)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees its stream slot once closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class _StreamLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Caps the requests in flight over a multiplexed HTTP/2 transport.
+
+    httpcore only honours the stream limit advertised by the server, so a
+    fan-out of hundreds of requests would be pushed onto the connection at
+    once. A slot is held from sending the request until the response body
+    is closed.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_streams: int) -> None:
+        self._transport = transport
+        self._slots = asyncio.Semaphore(max_streams)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self._slots.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._slots.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, self._slots.release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
 
 class HTTPConnectionPool(ConnectionPool[httpx.AsyncClient]):
-    """HTTP connection pool for external API calls."""
+    """
+    HTTP connection pool for external API calls.
+
+    The pool targets a single host, so ``config.max_size`` is the per-host
+    connection limit. With ``http2`` enabled (requires the ``h2`` package)
+    requests are multiplexed over few connections, at most
+    ``max_concurrent_streams`` at a time; ``prewarm_connections`` opens
+    connections at startup so the first fan-out doesn't pay for TCP/TLS
+    setup.
+    """
 
     def __init__(
-        self, config: ConnectionPoolConfig, base_url: str, **client_kwargs: Any
+        self,
+        config: ConnectionPoolConfig,
+        base_url: str,
+        *,
+        http2: bool = False,
+        max_concurrent_streams: int = 100,
+        keepalive_expiry: Optional[float] = None,
+        max_keepalive_connections: Optional[int] = None,
+        prewarm_connections: int = 0,
+        **client_kwargs: Any,
     ) -> None:
+        """
+        Args:
+            config: Pool sizes and timeouts
+            base_url: Base URL of the target host
+            http2: Negotiate HTTP/2 when the ``h2`` package is installed
+            max_concurrent_streams: Requests in flight at once over HTTP/2
+            keepalive_expiry: Seconds an idle connection is kept; defaults to
+                ``config.idle_timeout``. Keep it below the server's keep-alive
+                timeout so the client never reuses a connection being closed.
+            max_keepalive_connections: Idle connections kept open; defaults to
+                ``max(config.min_size, 10)``
+            prewarm_connections: Connections to open during initialization
+            **client_kwargs: Extra ``httpx.AsyncClient`` arguments
+        """
         super().__init__(config)
         self.base_url = base_url
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning(
+                "HTTP/2 requested for pool '%s' but the 'h2' package is not "
+                "installed; falling back to HTTP/1.1",
+                config.pool_name,
+            )
+            http2 = False
+        self.http2 = http2
+        self.max_concurrent_streams = max_concurrent_streams
+        self.keepalive_expiry = (
+            keepalive_expiry if keepalive_expiry is not None else config.idle_timeout
+        )
+        self.max_keepalive_connections = (
+            max_keepalive_connections
+            if max_keepalive_connections is not None
+            else max(config.min_size, 10)
+        )
+        self.prewarm_connections = prewarm_connections
         self.client_kwargs = client_kwargs
         self._client: Optional[httpx.AsyncClient] = None
 
@@ -36,8 +143,8 @@ class HTTPConnectionPool(ConnectionPool[httpx.AsyncClient]):
             # Configure httpx client with connection pooling
             limits = httpx.Limits(
                 max_connections=self.config.max_size,
-                max_keepalive_connections=max(self.config.min_size, 10),
-                keepalive_expiry=self.config.idle_timeout,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
             )
 
             timeout = httpx.Timeout(
@@ -47,7 +154,13 @@ class HTTPConnectionPool(ConnectionPool[httpx.AsyncClient]):
                 pool=self.config.connection_timeout,
             )
 
-            transport = httpx.AsyncHTTPTransport(limits=limits, trust_env=True)
+            transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+                limits=limits, http2=self.http2, trust_env=True
+            )
+            if self.http2:
+                transport = _StreamLimitedTransport(
+                    transport, self.max_concurrent_streams
+                )
 
             # Create the httpx client with connection pooling
             self._client = httpx.AsyncClient(
@@ -56,9 +169,15 @@ class HTTPConnectionPool(ConnectionPool[httpx.AsyncClient]):
                 transport=transport,
                 **self.client_kwargs,
             )
+            # Per-host pool wait/connect/TLS/TTFB/body latency histograms
+            instrument_client(self._client)
+
+            if self.prewarm_connections > 0:
+                await self._prewarm()
 
             logger.info(
                 f"HTTP connection pool '{self.config.pool_name}' initialized with {self.config.min_size}-{self.config.max_size} connections"
+                f" ({'HTTP/2' if self.http2 else 'HTTP/1.1'})"
             )
         except Exception as e:
             logger.error(f"Failed to setup HTTP connection pool: {e}")
@@ -66,6 +185,37 @@ class HTTPConnectionPool(ConnectionPool[httpx.AsyncClient]):
                 f"Failed to setup HTTP connection pool: {e}"
             ) from e
 
+    async def _prewarm(self) -> None:
+        """
+        Open connections ahead of the first requests.
+
+        Sends concurrent ``HEAD`` requests to the base URL; any response,
+        including an error status, leaves a connection in the keep-alive
+        pool. HTTP/2 multiplexes everything over one connection, so a single
+        request is enough. Failures are logged and don't fail startup.
+        """
+        assert self._client is not None
+        if self.http2:
+            count = 1
+        else:
+            count = min(self.prewarm_connections, self.max_keepalive_connections)
+        results = await asyncio.gather(
+            *(self._client.head("") for _ in range(count)), return_exceptions=True
+        )
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.warning(
+                "Pre-warming pool '%s': %d of %d connections failed: %s",
+                self.config.pool_name,
+                len(failures),
+                count,
+                failures[0],
+            )
+        else:
+            logger.debug(
+                "Pre-warmed %d connection(s) for pool '%s'", count, self.config.pool_name
+            )
+
     @asynccontextmanager
     async def get_connection(self) -> AsyncIterator[httpx.AsyncClient]:
         """Get an HTTP connection from the pool."""
@@ -81,13 +231,14 @@ class HTTPConnectionPool(ConnectionPool[httpx.AsyncClient]):
             # Get connection (httpx handles pooling)
             if not self._client:
                 raise TWSConnectionError("HTTP client not available")
-
-            yield self._client
-
         except Exception as e:
             await self.increment_stat("pool_misses")
             logger.error(f"Failed to get HTTP connection: {e}")
             raise TWSConnectionError(f"Failed to acquire HTTP connection: {e}") from e
+
+        try:
+            # Errors from requests made with the client reach the caller as-is
+            yield self._client
         finally:
             wait_time = time.time() - start_time
             await self.update_wait_time(wait_time)
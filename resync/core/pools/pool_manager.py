@@ -172,7 +172,15 @@ class ConnectionPoolManager:
                         health_check_interval=settings.HTTP_POOL_HEALTH_CHECK_INTERVAL,
                         max_lifetime=settings.HTTP_POOL_MAX_LIFETIME,
                     )
-                    http_pool = HTTPConnectionPool(http_config, tws_base_url)
+                    http_pool = HTTPConnectionPool(
+                        http_config,
+                        tws_base_url,
+                        http2=settings.HTTP_POOL_HTTP2,
+                        max_concurrent_streams=settings.HTTP_POOL_MAX_CONCURRENT_STREAMS,
+                        keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY,
+                        max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+                        prewarm_connections=settings.HTTP_POOL_PREWARM_CONNECTIONS,
+                    )
                     await http_pool.initialize()
                     self.pools["tws_http"] = http_pool
 
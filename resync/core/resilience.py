@@ -71,11 +71,13 @@ class CircuitBreaker:
     que provavelmente vão falhar, permitindo recuperação gradual.
     """
 
-    def __init__(self, config: CircuitBreakerConfig):
+    def __init__(self, config: CircuitBreakerConfig, state_store: Any = None):
         self.config = config
         self.state = CircuitBreakerState.CLOSED
         self.metrics = CircuitBreakerMetrics()
         self._lock = asyncio.Lock()
+        # Optional BreakerStateStore sharing this breaker's state across workers
+        self.state_store = state_store
 
         # Properties for compatibility with tests
         self.fail_max = config.failure_threshold
@@ -105,11 +107,17 @@ class CircuitBreaker:
             CircuitBreakerError: Quando circuit breaker está aberto
             Exception: Exceções originais da função
         """
+        probing = False
+        if self.state_store is not None:
+            probing = await self._check_shared_state()
+
         async with self._lock:
             self.metrics.total_calls += 1
 
             if self.state == CircuitBreakerState.OPEN:
-                if not self._should_attempt_reset():
+                # The shared probe lease overrides the local recovery timeout;
+                # rejecting it here would block every worker for another lease
+                if not probing and not self._should_attempt_reset():
                     logger.warning(
                         "Circuit breaker is OPEN, blocking call",
                         name=self.config.name,
@@ -130,8 +138,12 @@ class CircuitBreaker:
             result = await func(*args, **kwargs)
 
             async with self._lock:
+                had_failures = self.metrics.consecutive_failures > 0
                 await self._on_success()
 
+            if self.state_store is not None and (probing or had_failures):
+                await self._report_shared_success()
+
             return result
 
         except self.config.expected_exception as e:
@@ -150,8 +162,75 @@ class CircuitBreaker:
                     state=self.state.value
                 )
 
+            if self.state_store is not None:
+                await self._report_shared_failure()
+
             raise e
 
+    async def _check_shared_state(self) -> bool:
+        """
+        Consult the shared state before a call.
+
+        Returns:
+            True if this call is the half-open probe for all workers.
+
+        Raises:
+            CircuitBreakerError: If the breaker is open in another worker
+        """
+        name = self.config.name
+        try:
+            shared = await self.state_store.get_state(name)
+            if shared.state == "closed":
+                return False
+            if not shared.blocks_calls() and await self.state_store.try_acquire_probe(
+                name, self.config.recovery_timeout
+            ):
+                return True
+        except Exception as e:
+            # Fall back to the local breaker when the shared store is down
+            logger.warning(
+                "Shared circuit breaker state unavailable",
+                name=name,
+                error=str(e),
+            )
+            return False
+
+        async with self._lock:
+            self.metrics.total_calls += 1
+        raise CircuitBreakerError(f"Circuit breaker '{name}' is OPEN")
+
+    async def _report_shared_success(self) -> None:
+        try:
+            await self.state_store.record_success(self.config.name)
+        except Exception as e:
+            logger.warning(
+                "Failed to update shared circuit breaker state",
+                name=self.config.name,
+                error=str(e),
+            )
+
+    async def _report_shared_failure(self) -> None:
+        try:
+            shared = await self.state_store.record_failure(
+                self.config.name,
+                self.config.failure_threshold,
+                self.config.recovery_timeout,
+                window=self.config.recovery_timeout,
+            )
+        except Exception as e:
+            logger.warning(
+                "Failed to update shared circuit breaker state",
+                name=self.config.name,
+                error=str(e),
+            )
+            return
+        if shared.state == "open":
+            logger.error(
+                "Shared circuit breaker opened",
+                name=self.config.name,
+                open_until=shared.open_until,
+            )
+
     def _should_attempt_reset(self) -> bool:
         """Verifica se deve tentar resetar o circuit breaker"""
         if self.metrics.last_failure_time is None:
@@ -229,6 +308,7 @@ class RetryConfig:
     exponential_base: float = 2.0
     jitter: bool = True
     expected_exceptions: tuple = (Exception,)
+    budget: Optional["RetryBudget"] = None
 
 
 @dataclass
@@ -269,6 +349,9 @@ class RetryWithBackoff:
             Exception: Última exceção encontrada
         """
         last_exception = None
+        budget = self.config.budget
+        if budget is not None:
+            budget.record_request()
 
         for attempt in range(self.config.max_retries + 1):
             try:
@@ -300,6 +383,16 @@ class RetryWithBackoff:
                     )
                     raise e
 
+                if budget is not None and not budget.try_acquire_retry():
+                    self.metrics.failed_attempts += 1
+                    logger.warning(
+                        "Retry budget exhausted, not retrying",
+                        budget=budget.name,
+                        attempt=attempt + 1,
+                        error=str(e),
+                    )
+                    raise e
+
                 # Calcular delay com backoff exponencial
                 delay = min(
                     self.config.base_delay * (self.config.exponential_base**attempt),
@@ -428,6 +521,7 @@ def retry_with_backoff(
     exponential_base: float = 2.0,
     jitter: bool = True,
     expected_exceptions: tuple = (Exception,),
+    budget: Optional[str] = None,
 ):
     """
     Decorador para aplicar retry com exponential backoff
@@ -439,6 +533,7 @@ def retry_with_backoff(
         exponential_base: Base para crescimento exponencial
         jitter: Se deve adicionar jitter ao delay
         expected_exceptions: Tipos de exceção que devem ser retentados
+        budget: Nome do retry budget compartilhado do serviço (ex.: "llm")
     """
 
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
@@ -449,6 +544,7 @@ def retry_with_backoff(
             exponential_base=exponential_base,
             jitter=jitter,
             expected_exceptions=expected_exceptions,
+            budget=get_retry_budget(budget) if budget else None,
         )
         retry = RetryWithBackoff(config)
 
@@ -532,8 +628,10 @@ class CircuitBreakerManager:
     """
     Registry-based Circuit Breaker manager (client-side), inspired by Resilience4j's registry.
     """
-    def __init__(self) -> None:
+    def __init__(self, state_store: Any = None) -> None:
         self._breakers: Dict[str, CircuitBreaker] = {}
+        # Optional BreakerStateStore shared by all registered breakers
+        self.state_store = state_store
 
     def register(
         self,
@@ -550,7 +648,7 @@ class CircuitBreakerManager:
                 expected_exception=Exception,
                 name=name,
             )
-            self._breakers[name] = CircuitBreaker(config)
+            self._breakers[name] = CircuitBreaker(config, state_store=self.state_store)
         return self._breakers[name]
 
     def get(self, name: str) -> CircuitBreaker:
@@ -571,6 +669,94 @@ class CircuitBreakerError(pybreaker.CircuitBreakerError):  # re-export for app
     pass
 
 
+# Default retry budget: retries may add at most 10% to the request volume
+DEFAULT_RETRY_BUDGET_RATIO = 0.1
+# Retries available before any requests have been made (absorbs small bursts)
+DEFAULT_RETRY_BUDGET_MAX_TOKENS = 10.0
+
+
+class RetryBudget:
+    """
+    Token-bucket retry budget shared by every call to one downstream service.
+
+    Each request deposits ``ratio`` tokens (up to ``max_tokens``) and each
+    retry spends one, so in steady state retries are capped at ``ratio`` of
+    the request volume no matter how many call sites or retry layers there
+    are. When the bucket is empty, failed calls raise instead of retrying,
+    which keeps a browning-out backend from receiving a multiple of its
+    normal load.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+        max_tokens: float = DEFAULT_RETRY_BUDGET_MAX_TOKENS,
+    ) -> None:
+        self.name = name
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.requests = 0
+        self.retries = 0
+        self.exhausted = 0
+
+    def record_request(self) -> None:
+        """Account for a first attempt."""
+        self.requests += 1
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_acquire_retry(self) -> bool:
+        """Spend one token for a retry; False if the budget is exhausted."""
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.retries += 1
+            return True
+        self.exhausted += 1
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+            "tokens": self.tokens,
+        }
+
+
+_retry_budgets: Dict[str, RetryBudget] = {}
+
+
+def get_retry_budget(name: str) -> RetryBudget:
+    """Return the shared retry budget for downstream ``name`` ("tws", "llm", ...)."""
+    budget = _retry_budgets.get(name)
+    if budget is None:
+        budget = _retry_budgets[name] = RetryBudget(name)
+    return budget
+
+
+def get_retry_budget_metrics() -> Dict[str, Dict[str, Any]]:
+    """Return request/retry/exhausted counters for every retry budget."""
+    return {name: budget.get_stats() for name, budget in _retry_budgets.items()}
+
+
+def generate_retry_budget_prometheus_metrics() -> str:
+    """Generate retry budget metrics in Prometheus text exposition format."""
+    if not _retry_budgets:
+        return ""
+    lines = []
+    for metric, metric_type, attribute in (
+        ("resync_retry_budget_requests_total", "counter", "requests"),
+        ("resync_retry_budget_retries_total", "counter", "retries"),
+        ("resync_retry_budget_exhausted_total", "counter", "exhausted"),
+        ("resync_retry_budget_tokens", "gauge", "tokens"),
+    ):
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for name, budget in sorted(_retry_budgets.items()):
+            lines.append(f'{metric}{{downstream="{name}"}} {getattr(budget, attribute)}')
+    return "\n".join(lines)
+
+
 async def retry_with_backoff_async(
     op: Callable[[], Awaitable[T]],
     *,
@@ -579,10 +765,16 @@ async def retry_with_backoff_async(
     cap: float = 5.0,
     jitter: bool = True,
     retry_on: Iterable[type[BaseException]] = (Exception,),
+    budget: Optional[RetryBudget] = None,
 ) -> T:
     """
     AWS guidance: exponential backoff + jitter + cap.
+
+    With a ``budget``, retries are only attempted while the downstream's
+    shared retry budget has tokens left.
     """
+    if budget is not None:
+        budget.record_request()
     attempt = 0
     while True:
         try:
@@ -591,6 +783,13 @@ async def retry_with_backoff_async(
             attempt += 1
             if attempt > retries:
                 raise
+            if budget is not None and not budget.try_acquire_retry():
+                logger.warning(
+                    "retry budget exhausted budget=%s err=%s",
+                    budget.name,
+                    type(e).__name__,
+                )
+                raise
             delay = min(cap, base_delay * (2 ** (attempt - 1)))
             if jitter:
                 # full jitter
@@ -0,0 +1,125 @@
+"""
+Fixed-size rolling-window statistics backed by NumPy ring buffers.
+
+Monitors that keep a Python list of per-tick records grow with the
+monitoring frequency and recompute aggregates by iterating over every
+record. :class:`RollingMetrics` instead stores one ``(capacity, metrics)``
+float64 ring buffer plus a timestamp column:
+
+- recording a sample and updating the per-metric EWMA is O(1);
+- means and percentiles over the whole window or the last N seconds are
+  single vectorized NumPy reductions;
+- memory is fixed at construction, whatever the sampling interval.
+
+Missing samples are stored as NaN and ignored by the aggregates.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Default smoothing factor of the exponentially weighted moving average
+DEFAULT_EWMA_ALPHA = 0.3
+
+DEFAULT_PERCENTILES: Tuple[float, ...] = (50.0, 95.0, 99.0)
+
+
+class RollingMetrics:
+    """Ring buffer of samples for a fixed set of named metrics."""
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        capacity: int,
+        ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.names: Tuple[str, ...] = tuple(names)
+        self.capacity = capacity
+        self.ewma_alpha = ewma_alpha
+        self._columns = {name: column for column, name in enumerate(self.names)}
+        self._data = np.full((capacity, len(self.names)), np.nan)
+        self._timestamps = np.zeros(capacity)
+        self._ewma = np.full(len(self.names), np.nan)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(
+        self, values: Mapping[str, float], timestamp: Optional[float] = None
+    ) -> None:
+        """Append one sample; metrics missing from ``values`` are left empty."""
+        row = np.array([values.get(name, np.nan) for name in self.names], dtype=float)
+        index = self._next
+        self._data[index] = row
+        self._timestamps[index] = time.time() if timestamp is None else timestamp
+        self._next = (index + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+        present = ~np.isnan(row)
+        first = present & np.isnan(self._ewma)
+        self._ewma[first] = row[first]
+        update = present & ~first
+        alpha = self.ewma_alpha
+        self._ewma[update] = alpha * row[update] + (1 - alpha) * self._ewma[update]
+
+    def _window(self, seconds: Optional[float] = None) -> np.ndarray:
+        """Return the stored rows, optionally only the last ``seconds``."""
+        if self._count < self.capacity:
+            data = self._data[: self._count]
+            timestamps = self._timestamps[: self._count]
+        else:
+            data = self._data
+            timestamps = self._timestamps
+        if seconds is None:
+            return data
+        return data[timestamps >= time.time() - seconds]
+
+    def _column(self, name: str, seconds: Optional[float] = None) -> np.ndarray:
+        column = self._window(seconds)[:, self._columns[name]]
+        return column[~np.isnan(column)]
+
+    def latest(self, name: str) -> Optional[float]:
+        """Return the most recent sample of ``name``."""
+        if not self._count:
+            return None
+        value = self._data[(self._next - 1) % self.capacity, self._columns[name]]
+        return None if np.isnan(value) else float(value)
+
+    def ewma(self, name: str) -> Optional[float]:
+        """Return the exponentially weighted moving average of ``name``."""
+        value = self._ewma[self._columns[name]]
+        return None if np.isnan(value) else float(value)
+
+    def means(self, seconds: Optional[float] = None) -> Dict[str, float]:
+        """Return the mean of every metric over the window (0.0 if empty)."""
+        data = self._window(seconds)
+        present = ~np.isnan(data)
+        counts = present.sum(axis=0)
+        sums = np.where(present, data, 0.0).sum(axis=0)
+        means = np.divide(sums, counts, out=np.zeros(len(self.names)), where=counts > 0)
+        return dict(zip(self.names, means.tolist()))
+
+    def mean(self, name: str, seconds: Optional[float] = None) -> float:
+        """Return the mean of ``name`` over the window (0.0 if empty)."""
+        column = self._column(name, seconds)
+        return float(column.mean()) if column.size else 0.0
+
+    def percentiles(
+        self,
+        name: str,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        seconds: Optional[float] = None,
+    ) -> Dict[float, float]:
+        """Return the requested percentiles of ``name`` (0.0 if empty)."""
+        column = self._column(name, seconds)
+        if not column.size:
+            return {p: 0.0 for p in percentiles}
+        values = np.percentile(column, percentiles)
+        return dict(zip(percentiles, values.tolist()))
@@ -0,0 +1,277 @@
+"""
+Change-feed of TWS workstation and job statuses.
+
+Dashboards used to poll the status endpoints and re-download (and make the
+server re-serialise) every workstation and job on each poll. This module
+diffs consecutive TWS snapshots instead:
+
+- :class:`StatusChangeFeed` compares a snapshot with the previous one by
+  ID and records each added, changed or removed item as a change with a
+  monotonically increasing sequence number, in a bounded change log;
+- :class:`StatusFeedPublisher` polls TWS while at least one WebSocket client
+  is subscribed and pushes only the deltas through
+  :class:`~resync.core.websocket_pool_manager.WebSocketPoolManager`,
+  serialising each delta once for all subscribers.
+
+A client reconnecting with the last sequence number it applied receives only
+the changes it missed, or a full snapshot if they are no longer in the log.
+Clients should ignore changes with a sequence number they already applied.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+from resync.core.status_summary import get_status_summary_service
+
+logger = logging.getLogger(__name__)
+
+# Number of changes kept for reconnecting clients
+DEFAULT_HISTORY_SIZE = 10_000
+
+# Default interval between TWS snapshots while clients are subscribed
+DEFAULT_POLL_INTERVAL = 5.0
+
+WORKSTATIONS = "workstations"
+JOBS = "jobs"
+
+
+def _as_dict(item: Any) -> Dict[str, Any]:
+    return item.model_dump() if hasattr(item, "model_dump") else dict(item)
+
+
+def _workstation_id(record: Dict[str, Any]) -> str:
+    return record["name"]
+
+
+def _job_id(record: Dict[str, Any]) -> str:
+    # TWS notation: workstation#job_stream.job
+    return f"{record['workstation']}#{record['job_stream']}.{record['name']}"
+
+
+_ID_FUNCTIONS = {WORKSTATIONS: _workstation_id, JOBS: _job_id}
+
+
+class StatusChangeFeed:
+    """
+    Sequence-numbered change log over consecutive status snapshots.
+
+    Each change is ``{"seq", "kind", "op", "id", "data"}`` where ``kind`` is
+    ``"workstations"`` or ``"jobs"``, ``op`` is ``"upsert"`` or ``"remove"``
+    and ``data`` is the item (``None`` for removals). The first snapshot only
+    establishes the baseline; it is not recorded as changes.
+    """
+
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE) -> None:
+        self.history_size = history_size
+        self.seq = 0
+        self.initialized = False
+        self._state: Dict[str, Dict[str, Dict[str, Any]]] = {
+            WORKSTATIONS: {},
+            JOBS: {},
+        }
+        self._log: Deque[Dict[str, Any]] = deque()
+        # Sequence number just before the oldest change kept in the log
+        self._base_seq = 0
+
+    def apply_snapshot(
+        self, workstations: Iterable[Any], jobs: Iterable[Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Diff a snapshot against the previous one and record the changes.
+
+        Args:
+            workstations: ``WorkstationStatus`` models or dicts
+            jobs: ``JobStatus`` models or dicts
+
+        Returns:
+            The changes recorded for this snapshot (empty for the baseline).
+        """
+        snapshot = {WORKSTATIONS: workstations, JOBS: jobs}
+        if not self.initialized:
+            for kind, items in snapshot.items():
+                self._state[kind] = self._index(kind, items)
+            self.seq += 1
+            self._base_seq = self.seq
+            self.initialized = True
+            return []
+
+        changes: List[Dict[str, Any]] = []
+        for kind, items in snapshot.items():
+            current = self._index(kind, items)
+            previous = self._state[kind]
+            for item_id, record in current.items():
+                if previous.get(item_id) != record:
+                    changes.append(self._record(kind, "upsert", item_id, record))
+            for item_id in sorted(previous.keys() - current.keys()):
+                changes.append(self._record(kind, "remove", item_id, None))
+            self._state[kind] = current
+
+        while len(self._log) > self.history_size:
+            self._base_seq = self._log.popleft()["seq"]
+        return changes
+
+    def _index(self, kind: str, items: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+        id_of = _ID_FUNCTIONS[kind]
+        records = (_as_dict(item) for item in items)
+        return {id_of(record): record for record in records}
+
+    def _record(
+        self, kind: str, op: str, item_id: str, data: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        self.seq += 1
+        change = {"seq": self.seq, "kind": kind, "op": op, "id": item_id, "data": data}
+        self._log.append(change)
+        return change
+
+    def changes_since(self, last_seq: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the changes after ``last_seq``.
+
+        Returns:
+            The missed changes, or None if they are no longer in the log (or
+            ``last_seq`` is unknown) and the client needs a full snapshot.
+        """
+        if last_seq < self._base_seq or last_seq > self.seq:
+            return None
+        return list(itertools.islice(self._log, last_seq - self._base_seq, None))
+
+    def delta_message(self, changes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build a ``status_delta`` message for ``changes``."""
+        return {"type": "status_delta", "seq": self.seq, "changes": changes}
+
+    def snapshot_message(self) -> Dict[str, Any]:
+        """Build a ``status_snapshot`` message with the full current state."""
+        return {
+            "type": "status_snapshot",
+            "seq": self.seq,
+            WORKSTATIONS: list(self._state[WORKSTATIONS].values()),
+            JOBS: list(self._state[JOBS].values()),
+        }
+
+    def resume(self, last_seq: Optional[int] = None) -> Dict[str, Any]:
+        """Return what a client last at ``last_seq`` needs to catch up."""
+        if last_seq is not None and self.initialized:
+            changes = self.changes_since(last_seq)
+            if changes is not None:
+                return self.delta_message(changes)
+        return self.snapshot_message()
+
+
+class StatusFeedPublisher:
+    """
+    Polls TWS while clients are subscribed and pushes status deltas to them.
+
+    Polling starts with the first subscriber and stops once the last one
+    unsubscribes.
+    """
+
+    def __init__(
+        self,
+        tws_client: Any,
+        feed: Optional[StatusChangeFeed] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        pool_manager: Any = None,
+    ) -> None:
+        self.tws_client = tws_client
+        self.feed = feed or StatusChangeFeed()
+        self.poll_interval = poll_interval
+        self.subscribers: Set[str] = set()
+        self._pool_manager = pool_manager
+        self._task: Optional[asyncio.Task] = None
+
+    async def _get_pool_manager(self):
+        if self._pool_manager is None:
+            from resync.core.websocket_pool_manager import get_websocket_pool_manager
+
+            self._pool_manager = await get_websocket_pool_manager()
+        return self._pool_manager
+
+    async def subscribe(self, client_id: str, last_seq: Optional[int] = None) -> None:
+        """
+        Subscribe a pooled WebSocket client and send it what it missed.
+
+        Args:
+            client_id: ID of a connection in the WebSocket pool
+            last_seq: Last sequence number the client applied, if resuming
+        """
+        pool_manager = await self._get_pool_manager()
+        message = json.dumps(self.feed.resume(last_seq))
+        self.subscribers.add(client_id)
+        await pool_manager.send_personal_message(message, client_id)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def unsubscribe(self, client_id: str) -> None:
+        """Stop pushing changes to ``client_id``."""
+        self.subscribers.discard(client_id)
+
+    async def poll_once(self) -> int:
+        """
+        Take one TWS snapshot and push the resulting changes.
+
+        Returns:
+            The number of changes detected.
+        """
+        workstations, jobs = await asyncio.gather(
+            self.tws_client.get_workstations_status(),
+            self.tws_client.get_jobs_status(),
+        )
+        baseline = not self.feed.initialized
+        changes = self.feed.apply_snapshot(workstations, jobs)
+        # Keep the agent tools' summaries as fresh as the feed
+        get_status_summary_service(self.tws_client).update(workstations, jobs)
+        if baseline:
+            message = self.feed.snapshot_message()
+        elif changes:
+            message = self.feed.delta_message(changes)
+        else:
+            return 0
+
+        if self.subscribers:
+            pool_manager = await self._get_pool_manager()
+            await pool_manager.broadcast(
+                json.dumps(message), client_ids=list(self.subscribers)
+            )
+        return len(changes)
+
+    async def _run(self) -> None:
+        while self.subscribers:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Status feed poll failed: %s", e, exc_info=True)
+            await asyncio.sleep(self.poll_interval)
+
+    async def stop(self) -> None:
+        """Stop polling and drop all subscribers."""
+        self.subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_publishers: Dict[int, StatusFeedPublisher] = {}
+
+
+def get_status_feed_publisher(tws_client: Any) -> StatusFeedPublisher:
+    """Return the shared status feed publisher for ``tws_client``."""
+    publisher = _publishers.get(id(tws_client))
+    if publisher is None or publisher.tws_client is not tws_client:
+        from resync.settings import settings
+
+        publisher = _publishers[id(tws_client)] = StatusFeedPublisher(
+            tws_client, poll_interval=settings.status_feed_poll_interval
+        )
+    return publisher
@@ -0,0 +1,250 @@
+"""
+Materialized TWS status summaries for the agent tools.
+
+``TWSStatusTool`` and ``TWSTroubleshootingTool`` used to fetch the whole
+``SystemStatus`` and rebuild their answer with list comprehensions on every
+call, and an agent may call them several times per conversation turn. This
+module maintains the summaries instead:
+
+- :class:`StatusSummary` applies each status snapshot as a diff against the
+  previous one, keeping per-status counters, the ABEND jobs and the
+  workstations that are not linked up to date without rescanning;
+- the tool answers are rendered once per change and returned as-is until
+  the next change;
+- :class:`StatusSummaryService` refreshes the summary from TWS at most every
+  ``refresh_interval`` seconds, and other status refreshes (such as the
+  status change-feed) can feed it through :meth:`StatusSummaryService.update`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default interval between summary refreshes from TWS
+DEFAULT_REFRESH_INTERVAL = 30.0
+
+ABEND = "ABEND"
+LINKED = "LINKED"
+
+
+def _field(item: Any, name: str) -> Any:
+    return item[name] if isinstance(item, dict) else getattr(item, name)
+
+
+class StatusSummary:
+    """
+    Incrementally maintained counters and lists over TWS statuses.
+
+    Jobs are identified by ``workstation#job_stream.name`` and workstations
+    by name. ``version`` changes whenever a snapshot changes anything, and
+    the rendered texts are cached per version.
+    """
+
+    def __init__(self) -> None:
+        self.workstations: Dict[str, str] = {}
+        # job id -> (name, workstation, status)
+        self.jobs: Dict[str, Tuple[str, str, str]] = {}
+        self.job_status_counts: Counter = Counter()
+        self.workstation_status_counts: Counter = Counter()
+        # Insertion-ordered, so the lists keep the TWS order
+        self.abended_jobs: Dict[str, Tuple[str, str]] = {}
+        self.unlinked_workstations: Dict[str, str] = {}
+        self.version = 0
+        self._rendered: Dict[str, Tuple[int, str]] = {}
+
+    def apply_snapshot(self, workstations: Iterable[Any], jobs: Iterable[Any]) -> int:
+        """
+        Apply a full status snapshot.
+
+        Args:
+            workstations: ``WorkstationStatus`` models or dicts
+            jobs: ``JobStatus`` models or dicts
+
+        Returns:
+            The number of workstations and jobs added, changed or removed.
+        """
+        changed = self._apply_workstations(workstations) + self._apply_jobs(jobs)
+        if changed:
+            self.version += 1
+        return changed
+
+    def _apply_workstations(self, workstations: Iterable[Any]) -> int:
+        changed = 0
+        seen = set()
+        for item in workstations:
+            name = _field(item, "name")
+            status = _field(item, "status")
+            seen.add(name)
+            previous = self.workstations.get(name)
+            if previous == status:
+                continue
+            if previous is not None:
+                self._remove_workstation(name, previous)
+            self.workstations[name] = status
+            self.workstation_status_counts[status] += 1
+            if status.upper() != LINKED:
+                self.unlinked_workstations[name] = status
+            changed += 1
+        for name in [name for name in self.workstations if name not in seen]:
+            self._remove_workstation(name, self.workstations.pop(name))
+            changed += 1
+        return changed
+
+    def _remove_workstation(self, name: str, status: str) -> None:
+        self.workstation_status_counts[status] -= 1
+        if not self.workstation_status_counts[status]:
+            del self.workstation_status_counts[status]
+        self.unlinked_workstations.pop(name, None)
+
+    def _apply_jobs(self, jobs: Iterable[Any]) -> int:
+        changed = 0
+        seen = set()
+        for item in jobs:
+            name = _field(item, "name")
+            workstation = _field(item, "workstation")
+            record = (name, workstation, _field(item, "status"))
+            job_id = f"{workstation}#{_field(item, 'job_stream')}.{name}"
+            seen.add(job_id)
+            previous = self.jobs.get(job_id)
+            if previous == record:
+                continue
+            if previous is not None:
+                self._remove_job(job_id, previous[2])
+            self.jobs[job_id] = record
+            self.job_status_counts[record[2]] += 1
+            if record[2].upper() == ABEND:
+                self.abended_jobs[job_id] = (name, workstation)
+            changed += 1
+        for job_id in [job_id for job_id in self.jobs if job_id not in seen]:
+            self._remove_job(job_id, self.jobs.pop(job_id)[2])
+            changed += 1
+        return changed
+
+    def _remove_job(self, job_id: str, status: str) -> None:
+        self.job_status_counts[status] -= 1
+        if not self.job_status_counts[status]:
+            del self.job_status_counts[status]
+        self.abended_jobs.pop(job_id, None)
+
+    def _cached(self, key: str, render) -> str:
+        cached = self._rendered.get(key)
+        if cached is None or cached[0] != self.version:
+            cached = self._rendered[key] = (self.version, render())
+        return cached[1]
+
+    def status_text(self) -> str:
+        """The ``TWSStatusTool`` answer for the current statuses."""
+        return self._cached("status", self._render_status)
+
+    def failures_text(self) -> str:
+        """The ``TWSTroubleshootingTool`` answer for the current statuses."""
+        return self._cached("failures", self._render_failures)
+
+    def _render_status(self) -> str:
+        workstation_summary = ", ".join(
+            f"{name} ({status})" for name, status in self.workstations.items()
+        )
+        job_summary = ", ".join(
+            f"{name} on {workstation} ({status})"
+            for name, workstation, status in self.jobs.values()
+        )
+        counts = ", ".join(
+            f"{status}: {count}"
+            for status, count in sorted(self.job_status_counts.items())
+        )
+        return (
+            "Situação atual do TWS:\n"
+            f"- Workstations: {workstation_summary or 'Nenhuma encontrada.'}\n"
+            f"- Jobs: {job_summary or 'Nenhum encontrado.'}\n"
+            f"- Jobs por status: {counts or 'Nenhum.'}"
+        )
+
+    def _render_failures(self) -> str:
+        if not self.abended_jobs and not self.unlinked_workstations:
+            return "Nenhuma falha crítica encontrada. O ambiente TWS parece estável."
+
+        analysis = "Análise de Problemas no TWS:\n"
+        if self.abended_jobs:
+            analysis += f"- Jobs com Falha ({len(self.abended_jobs)}): "
+            analysis += ", ".join(
+                f"{name} (workstation: {workstation})"
+                for name, workstation in self.abended_jobs.values()
+            )
+            analysis += "\n"
+
+        if self.unlinked_workstations:
+            analysis += (
+                f"- Workstations com Problemas ({len(self.unlinked_workstations)}): "
+            )
+            analysis += ", ".join(
+                f"{name} (status: {status})"
+                for name, status in self.unlinked_workstations.items()
+            )
+            analysis += "\n"
+
+        return analysis
+
+
+class StatusSummaryService:
+    """
+    Keeps a :class:`StatusSummary` in sync with TWS.
+
+    The summary is refreshed from ``tws_client.get_system_status()`` at most
+    every ``refresh_interval`` seconds; concurrent callers share one refresh.
+    """
+
+    def __init__(
+        self, tws_client: Any, refresh_interval: float = DEFAULT_REFRESH_INTERVAL
+    ) -> None:
+        self.tws_client = tws_client
+        self.refresh_interval = refresh_interval
+        self.summary = StatusSummary()
+        self._refreshed_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def get_summary(self, force_refresh: bool = False) -> StatusSummary:
+        """Return the summary, refreshing it from TWS if it is stale."""
+        if not force_refresh and not self._is_stale():
+            return self.summary
+        async with self._lock:
+            if force_refresh or self._is_stale():
+                status = await self.tws_client.get_system_status()
+                self.update(status.workstations, status.jobs)
+        return self.summary
+
+    def update(self, workstations: Iterable[Any], jobs: Iterable[Any]) -> int:
+        """Apply a status snapshot taken elsewhere and mark the summary fresh."""
+        changed = self.summary.apply_snapshot(workstations, jobs)
+        self._refreshed_at = time.monotonic()
+        if changed:
+            logger.debug("Status summary updated: %d items changed", changed)
+        return changed
+
+    def _is_stale(self) -> bool:
+        return (
+            self._refreshed_at is None
+            or time.monotonic() - self._refreshed_at >= self.refresh_interval
+        )
+
+    async def status_text(self) -> str:
+        return (await self.get_summary()).status_text()
+
+    async def failures_text(self) -> str:
+        return (await self.get_summary()).failures_text()
+
+
+_services: Dict[int, StatusSummaryService] = {}
+
+
+def get_status_summary_service(tws_client: Any) -> StatusSummaryService:
+    """Return the shared status summary service for ``tws_client``."""
+    service = _services.get(id(tws_client))
+    if service is None or service.tws_client is not tws_client:
+        service = _services[id(tws_client)] = StatusSummaryService(tws_client)
+    return service
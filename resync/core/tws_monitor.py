@@ -9,19 +9,34 @@ from __future__ import annotations
 import asyncio
 import time
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import structlog
 
 from resync.core.exceptions import PerformanceError
 from resync.core.interfaces import ITWSClient
+from resync.core.rolling_stats import RollingMetrics
 from resync.core.teams_integration import get_teams_integration
 
 from .shared_utils import TeamsNotification, create_job_status_notification
 
 logger = structlog.get_logger(__name__)
 
+# How much metric history the monitor keeps
+HISTORY_WINDOW_SECONDS = 24 * 3600
+
+# Metrics sampled on every monitoring tick
+MONITOR_METRICS = (
+    "api_response_time",
+    "api_error_rate",
+    "cache_hit_ratio",
+    "llm_calls",
+    "llm_tokens_used",
+    "llm_cost_estimate",
+    "memory_usage_mb",
+)
+
 
 @dataclass
 class PerformanceMetrics:
@@ -77,9 +92,14 @@ class TWSMonitor:
             tws_client: TWS client for data collection
         """
         self.tws_client = tws_client
-        self.metrics_history: List[PerformanceMetrics] = []
         self.alerts: List[Alert] = []
         self.alert_check_interval = 30  # seconds
+        # Fixed-size ring buffer covering HISTORY_WINDOW_SECONDS of ticks
+        self.history = RollingMetrics(
+            MONITOR_METRICS,
+            capacity=HISTORY_WINDOW_SECONDS // self.alert_check_interval,
+        )
+        self.latest_metrics: Optional[PerformanceMetrics] = None
         self._is_monitoring = False
         self._monitoring_task: Optional[asyncio.Task] = None
 
@@ -161,13 +181,18 @@ class TWSMonitor:
                 uptime_seconds=time.time() - start_time,
             )
 
-            self.metrics_history.append(metrics)
-
-            # Keep only last 24 hours of metrics
-            cutoff_time = datetime.now() - timedelta(hours=24)
-            self.metrics_history = [
-                m for m in self.metrics_history if m.timestamp > cutoff_time
-            ]
+            self.latest_metrics = metrics
+            self.history.record(
+                {
+                    "api_response_time": api_response_time,
+                    "api_error_rate": api_error_rate,
+                    "cache_hit_ratio": cache_hit_ratio,
+                    "llm_calls": metrics.llm_calls,
+                    "llm_tokens_used": metrics.llm_tokens_used,
+                    "llm_cost_estimate": metrics.llm_cost_estimate,
+                    "memory_usage_mb": memory_usage,
+                }
+            )
 
         except Exception as e:
             logger.error("error_collecting_metrics", error=str(e), exc_info=True)
@@ -207,19 +232,21 @@ class TWSMonitor:
         return process.memory_info().rss / (1024 * 1024)  # MB
 
     async def _check_alerts(self) -> None:
-        """Check for alert conditions."""
+        """Check for alert conditions.
+
+        Rates are compared using their EWMA and absolute values using the
+        latest sample, so each check is O(1) regardless of history size.
+        """
         alerts_to_add = []
 
-        if not self.metrics_history:
+        if self.latest_metrics is None:
             return
 
-        latest_metrics = self.metrics_history[-1]
+        latest_metrics = self.latest_metrics
 
         # Check API error rate
-        if latest_metrics.api_error_rates:
-            avg_error_rate = sum(latest_metrics.api_error_rates) / len(
-                latest_metrics.api_error_rates
-            )
+        avg_error_rate = self.history.ewma("api_error_rate")
+        if avg_error_rate is not None:
             if avg_error_rate > self.alert_thresholds["api_error_rate"]:
                 alerts_to_add.append(
                     Alert(
@@ -233,10 +260,8 @@ class TWSMonitor:
                 )
 
         # Check cache hit ratio
-        if latest_metrics.cache_hit_ratios:
-            avg_hit_ratio = sum(latest_metrics.cache_hit_ratios) / len(
-                latest_metrics.cache_hit_ratios
-            )
+        avg_hit_ratio = self.history.ewma("cache_hit_ratio")
+        if avg_hit_ratio is not None:
             if avg_hit_ratio < self.alert_thresholds["cache_hit_ratio"]:
                 alerts_to_add.append(
                     Alert(
@@ -373,30 +398,11 @@ class TWSMonitor:
             Dictionary with performance metrics and alerts
         """
         try:
-            # Calculate averages
-            if self.metrics_history:
-                latest_metrics = self.metrics_history[-1]
-                avg_api_response_time = (
-                    (
-                        sum(sum(m.api_response_times) for m in self.metrics_history)
-                        / sum(len(m.api_response_times) for m in self.metrics_history)
-                    )
-                    if any(m.api_response_times for m in self.metrics_history)
-                    else 0.0
-                )
-
-                avg_cache_hit_ratio = (
-                    (
-                        sum(sum(m.cache_hit_ratios) for m in self.metrics_history)
-                        / sum(len(m.cache_hit_ratios) for m in self.metrics_history)
-                    )
-                    if any(m.cache_hit_ratios for m in self.metrics_history)
-                    else 0.0
-                )
-            else:
-                latest_metrics = PerformanceMetrics()
-                avg_api_response_time = 0.0
-                avg_cache_hit_ratio = 0.0
+            # Calculate averages over the whole history window
+            latest_metrics = self.latest_metrics or PerformanceMetrics()
+            averages = self.history.means()
+            response_time_percentiles = self.history.percentiles("api_response_time")
+            response_time_ewma = self.history.ewma("api_response_time") or 0.0
 
             # Get recent alerts
             recent_alerts = [
@@ -408,8 +414,12 @@ class TWSMonitor:
 
             return {
                 "current_metrics": {
-                    "api_response_time_ms": avg_api_response_time * 1000,
-                    "cache_hit_ratio": avg_cache_hit_ratio,
+                    "api_response_time_ms": averages["api_response_time"] * 1000,
+                    "api_response_time_p50_ms": response_time_percentiles[50.0] * 1000,
+                    "api_response_time_p95_ms": response_time_percentiles[95.0] * 1000,
+                    "api_response_time_p99_ms": response_time_percentiles[99.0] * 1000,
+                    "api_response_time_ewma_ms": response_time_ewma * 1000,
+                    "cache_hit_ratio": averages["cache_hit_ratio"],
                     "llm_calls_today": latest_metrics.llm_calls,
                     "llm_cost_today": latest_metrics.llm_cost_estimate,
                     "memory_usage_mb": latest_metrics.memory_usage_mb,
@@ -518,6 +528,10 @@ class TWSMonitorInterface:
             return {
                 "current_metrics": {
                     "api_response_time_ms": 0.0,
+                    "api_response_time_p50_ms": 0.0,
+                    "api_response_time_p95_ms": 0.0,
+                    "api_response_time_p99_ms": 0.0,
+                    "api_response_time_ewma_ms": 0.0,
                     "cache_hit_ratio": 0.0,
                     "llm_calls_today": 0,
                     "llm_cost_today": 0.0,
@@ -103,6 +103,7 @@ def retry_on_exception(
     backoff: float = 2.0,
     exceptions: tuple = (Exception,),
     logger: Optional[logging.Logger] = None,
+    budget: Optional[Any] = None,
 ) -> Callable[[F], F]:
     """
     Decorator to retry a function if specific exceptions are raised.
@@ -116,6 +117,7 @@ def retry_on_exception(
         backoff: Multiplier for delay after each retry
         exceptions: Tuple of exception types to catch
         logger: Logger to use for retry messages
+        budget: Shared ``RetryBudget`` limiting retries of async calls
 
     Returns:
         Decorated function that retries on specified exceptions
@@ -133,12 +135,16 @@ def retry_on_exception(
                 current_delay = kwargs.pop("initial_backoff", delay)
 
                 cleaned_kwargs = kwargs
+                if budget is not None:
+                    budget.record_request()
 
                 for attempt in range(current_max_retries + 1):
                     try:
                         return await func(*args, **cleaned_kwargs)
                     except exceptions as e:
-                        if attempt < current_max_retries:
+                        if attempt < current_max_retries and (
+                            budget is None or budget.try_acquire_retry()
+                        ):
                             logger_instance.info(
                                 f"Attempt {attempt + 1} failed: {e}. "
                                 f"Retrying in {current_delay:.2f} seconds..."
@@ -13,32 +13,23 @@ from litellm.exceptions import (
 
 from ...settings import settings
 from ..exceptions import LLMError
-from ..resilience import circuit_breaker, retry_with_backoff, with_timeout
+from ..resilience import (
+    circuit_breaker,
+    retry_with_backoff,
+    with_timeout,
+)
 from ..structured_logger import get_logger
-from .common_error_handlers import retry_on_exception
 from .llm_factories import LLMFactory
 
 logger = get_logger(__name__)
 
 
 @circuit_breaker(failure_threshold=3, recovery_timeout=60, name="llm_service")
-@retry_with_backoff(max_retries=3, base_delay=1.0, max_delay=30.0, jitter=True)
-@with_timeout(settings.LLM_TIMEOUT)
-@retry_on_exception(
-    max_retries=3,
-    delay=1.0,
-    backoff=2.0,
-    exceptions=(
-        AuthenticationError,
-        RateLimitError,
-        APIError,
-        ConnectionError,
-        TimeoutError,
-        ValueError,
-        Exception,
-    ),
-    logger=logger,
+# Single retry layer, so each call is counted once against the "llm" budget
+@retry_with_backoff(
+    max_retries=3, base_delay=1.0, max_delay=30.0, jitter=True, budget="llm"
 )
+@with_timeout(settings.LLM_TIMEOUT)
 async def call_llm(
     prompt: str,
     model: str,
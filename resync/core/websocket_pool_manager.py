@@ -4,7 +4,7 @@ import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from fastapi import WebSocket, WebSocketDisconnect
 
@@ -350,12 +350,15 @@ class WebSocketPoolManager:
             conn_info.mark_error()
             return False
 
-    async def broadcast(self, message: str) -> int:
+    async def broadcast(
+        self, message: str, client_ids: Optional[Iterable[str]] = None
+    ) -> int:
         """
         Send a message to all connected clients.
 
         Args:
             message: The message to broadcast
+            client_ids: Only send to these connected clients (default: all)
 
         Returns:
             Number of clients that received the message
@@ -364,13 +367,15 @@ class WebSocketPoolManager:
             logger.info("Broadcast requested, but no active WebSocket connections")
             return 0
 
-        logger.info(
-            f"Broadcasting message to {len(self.connections)} WebSocket clients"
-        )
+        if client_ids is None:
+            client_ids = list(self.connections.keys())
+        else:
+            client_ids = [cid for cid in client_ids if cid in self.connections]
+
+        logger.info(f"Broadcasting message to {len(client_ids)} WebSocket clients")
 
         # Create tasks to send messages concurrently
         tasks = []
-        client_ids = list(self.connections.keys())
 
         for client_id in client_ids:
             task = asyncio.create_task(
@@ -2,8 +2,23 @@
 CQRS dispatcher for routing commands and queries to their respective handlers.
 """
 
-from typing import Dict, Type
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
+from resync.core.advanced_cache import advanced_cache_manager
 from resync.cqrs.base import (
     CommandResult,
     ICommand,
@@ -32,9 +47,13 @@ from resync.cqrs.commands import (
     GetWorkstationsStatusCommand,
     UpdateJobStatusCommand,
 )
+from resync.cqrs.metrics import CQRSMetrics, cqrs_metrics
 from resync.cqrs.queries import (
     CheckTWSConnectionQuery,
+    GetBlockingJobsQuery,
     GetCriticalPathStatusQuery,
+    GetDependencyCriticalPathQuery,
+    GetDownstreamJobsQuery,
     GetEventLogQuery,
     GetJobDependenciesQuery,
     GetJobDetailsQuery,
@@ -48,12 +67,23 @@ from resync.cqrs.queries import (
     GetResourceUsageQuery,
     GetSystemHealthQuery,
     GetSystemStatusQuery,
+    GetUpstreamJobsQuery,
     GetWorkstationsStatusQuery,
     SearchJobsQuery,
 )
+from resync.cqrs.query_cache import (
+    CacheInvalidationRule,
+    QueryCachePolicy,
+    QueryResultCache,
+    query_result_cache,
+    resolve_tags,
+)
 from resync.cqrs.query_handlers import (
     CheckTWSConnectionQueryHandler,
+    GetBlockingJobsQueryHandler,
     GetCriticalPathStatusQueryHandler,
+    GetDependencyCriticalPathQueryHandler,
+    GetDownstreamJobsQueryHandler,
     GetEventLogQueryHandler,
     GetJobDependenciesQueryHandler,
     GetJobDetailsQueryHandler,
@@ -67,20 +97,155 @@ from resync.cqrs.query_handlers import (
     GetResourceUsageQueryHandler,
     GetSystemHealthQueryHandler,
     GetSystemStatusQueryHandler,
+    GetUpstreamJobsQueryHandler,
     GetWorkstationsStatusQueryHandler,
     SearchJobsQueryHandler,
 )
+from resync.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryBatchRule:
+    """
+    Describes how keyed queries of one type are coalesced into a batch query.
+
+    Attributes:
+        batch_query_type: Query type whose handler serves the whole batch
+        key: Extracts the batching key from a single query
+        build: Builds the batch query from the collected (unique) keys
+        split: Extracts the single-query result for a key from the batch result
+        window_seconds: How long to collect queries; 0 batches the current
+            event-loop tick only
+        max_batch_size: Flush early once this many distinct keys are pending
+    """
+
+    batch_query_type: Type[IQuery]
+    key: Callable[[IQuery], Hashable]
+    build: Callable[[List[Hashable]], IQuery]
+    split: Callable[[QueryResult, Hashable], QueryResult]
+    window_seconds: float = 0.0
+    max_batch_size: int = 100
+
+
+class _QueryBatcher:
+    """
+    DataLoader-style collector for one batched query type.
+
+    Queries issued before the flush fire share a single batch query;
+    identical keys share a single future.
+    """
+
+    def __init__(self, dispatcher: "CQRSDispatcher", rule: QueryBatchRule):
+        self.dispatcher = dispatcher
+        self.rule = rule
+        self._pending: Dict[Hashable, List[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, query: IQuery) -> QueryResult:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(self.rule.key(query), []).append(future)
+
+        if len(self._pending) >= self.rule.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.rule.window_seconds > 0:
+                self._flush_handle = loop.call_later(
+                    self.rule.window_seconds, self._flush
+                )
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            task = asyncio.ensure_future(self._dispatch(pending))
+            # Keep a reference until the batch completes
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, pending: Dict[Hashable, List[asyncio.Future]]) -> None:
+        try:
+            keys = list(pending)
+            try:
+                handler = self.dispatcher.query_handlers[self.rule.batch_query_type]
+                batch_query = self.rule.build(keys)
+                batch_result = await self.dispatcher._observe(
+                    "query", batch_query, handler.execute(batch_query)
+                )
+            except Exception as e:
+                for futures in pending.values():
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+                return
+
+            if len(keys) > 1:
+                logger.debug(
+                    "Coalesced %d keys into one %s",
+                    len(keys),
+                    self.rule.batch_query_type.__name__,
+                )
+            for key, futures in pending.items():
+                if batch_result.success:
+                    result = self.rule.split(batch_result, key)
+                else:
+                    result = QueryResult(success=False, error=batch_result.error)
+                for future in futures:
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            # A cancelled batch must not leave its callers waiting forever
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.cancel()
 
 
 class CQRSDispatcher:
     """
     Central dispatcher for CQRS commands and queries.
     Routes commands/queries to their appropriate handlers.
+
+    Query types registered with :meth:`register_query_batching` are
+    transparently coalesced: concurrent ``execute_query`` calls within the
+    same event-loop tick (or batching window) are served by one batch query.
+
+    Query types with a :class:`QueryCachePolicy` are served from a shared
+    result cache, and commands with a :class:`CacheInvalidationRule` drop
+    the cached results they affect (see :mod:`resync.cqrs.query_cache`).
+    The same tags are invalidated in the shared advanced cache and passed to
+    every invalidation listener (e.g. the TWS client, which drops its own
+    cached responses), so a query re-run after a command sees fresh data.
+
+    Every dispatch is timed per command/query type (see
+    :mod:`resync.cqrs.metrics`).
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        metrics: Optional[CQRSMetrics] = None,
+        cache: Optional[QueryResultCache] = None,
+    ):
+        self.metrics = metrics or cqrs_metrics
+        self.cache = cache if cache is not None else query_result_cache
+        self.cache_policies: Dict[Type[IQuery], QueryCachePolicy] = {}
+        self.invalidation_rules: Dict[Type[ICommand], CacheInvalidationRule] = {}
+        self.invalidation_listeners: List[
+            Callable[[Tuple[str, ...]], Awaitable[Any]]
+        ] = []
         self.command_handlers: Dict[Type[ICommand], ICommandHandler] = {}
         self.query_handlers: Dict[Type[IQuery], IQueryHandler] = {}
+        self.batch_rules: Dict[Type[IQuery], QueryBatchRule] = {}
+        self._batchers: Dict[Type[IQuery], _QueryBatcher] = {}
+        self.batching_enabled = True
 
     def register_command_handler(
         self, command_type: Type[ICommand], handler: ICommandHandler
@@ -92,6 +257,28 @@ class CQRSDispatcher:
         """Register a query handler for a specific query type."""
         self.query_handlers[query_type] = handler
 
+    def register_query_cache(self, query_type: Type[IQuery], policy: QueryCachePolicy):
+        """Cache results of ``query_type`` according to ``policy``."""
+        self.cache_policies[query_type] = policy
+
+    def register_cache_invalidation(
+        self, command_type: Type[ICommand], rule: CacheInvalidationRule
+    ):
+        """Invalidate cached query results by tag when ``command_type`` runs."""
+        self.invalidation_rules[command_type] = rule
+
+    def register_invalidation_listener(
+        self, listener: Callable[[Tuple[str, ...]], Awaitable[Any]]
+    ):
+        """Call ``listener`` with the tags invalidated by every command."""
+        if listener not in self.invalidation_listeners:
+            self.invalidation_listeners.append(listener)
+
+    def register_query_batching(self, query_type: Type[IQuery], rule: QueryBatchRule):
+        """Coalesce concurrent queries of ``query_type`` according to ``rule``."""
+        self.batch_rules[query_type] = rule
+        self._batchers.pop(query_type, None)
+
     async def execute_command(self, command: ICommand) -> CommandResult:
         """Execute a command by routing it to the appropriate handler."""
         command_type = type(command)
@@ -99,7 +286,32 @@ class CQRSDispatcher:
             raise ValueError(f"No handler registered for command type: {command_type}")
 
         handler = self.command_handlers[command_type]
-        return await handler.execute(command)
+        try:
+            result = await self._observe("command", command, handler.execute(command))
+        except Exception:
+            await self._invalidate_for(command, succeeded=False)
+            raise
+        await self._invalidate_for(command, succeeded=getattr(result, "success", True))
+        return result
+
+    async def _invalidate_for(self, command: ICommand, succeeded: bool) -> None:
+        rule = self.invalidation_rules.get(type(command))
+        if rule is None or not (succeeded or rule.on_failure):
+            return
+        tags = resolve_tags(rule.tags, command)
+        self.cache.invalidate_tags(tags)
+        for tag in tags:
+            await advanced_cache_manager.invalidate_by_tag(tag)
+        for listener in self.invalidation_listeners:
+            try:
+                await listener(tags)
+            except Exception as e:
+                # the command already ran; stale entries still expire by TTL
+                logger.warning(
+                    "Cache invalidation listener failed for %s: %s",
+                    type(command).__name__,
+                    e,
+                )
 
     async def execute_query(self, query: IQuery) -> QueryResult:
         """Execute a query by routing it to the appropriate handler."""
@@ -107,8 +319,45 @@ class CQRSDispatcher:
         if query_type not in self.query_handlers:
             raise ValueError(f"No handler registered for query type: {query_type}")
 
-        handler = self.query_handlers[query_type]
-        return await handler.execute(query)
+        policy = self.cache_policies.get(query_type)
+        if policy is not None:
+            call = self.cache.get_or_load(
+                policy.key(query),
+                policy.ttl_seconds,
+                resolve_tags(policy.tags, query),
+                lambda: self._dispatch_query(query),
+            )
+        else:
+            call = self._dispatch_query(query)
+        return await self._observe("query", query, call)
+
+    async def _dispatch_query(self, query: IQuery) -> QueryResult:
+        """Run ``query`` through its batcher (if any) or its handler."""
+        query_type = type(query)
+        rule = self.batch_rules.get(query_type)
+        if (
+            self.batching_enabled
+            and rule is not None
+            and rule.batch_query_type in self.query_handlers
+        ):
+            batcher = self._batchers.get(query_type)
+            if batcher is None:
+                batcher = self._batchers[query_type] = _QueryBatcher(self, rule)
+            return await batcher.load(query)
+
+        return await self.query_handlers[query_type].execute(query)
+
+    async def _observe(self, kind: str, message: Any, call: Awaitable[Any]) -> Any:
+        """Await ``call`` while recording latency and outcome for ``message``."""
+        name = type(message).__name__
+        started = self.metrics.start(kind, name)
+        outcome = "exception"
+        try:
+            result = await call
+            outcome = "success" if getattr(result, "success", True) else "failure"
+            return result
+        finally:
+            self.metrics.finish(kind, name, started, outcome, message)
 
 
 # Global dispatcher instance
@@ -123,6 +372,12 @@ def initialize_dispatcher(tws_client, tws_monitor):
         tws_client: The TWS client instance
         tws_monitor: The TWS monitor instance
     """
+    dispatcher.metrics.slow_threshold_seconds = (
+        settings.cqrs_slow_query_threshold_ms / 1000
+        if settings.cqrs_slow_query_threshold_ms
+        else None
+    )
+
     # Register command handlers
     dispatcher.register_command_handler(
         GetSystemStatusCommand, GetSystemStatusCommandHandler(tws_client)
@@ -168,6 +423,18 @@ def initialize_dispatcher(tws_client, tws_monitor):
     dispatcher.register_query_handler(
         GetJobStatusBatchQuery, GetJobStatusBatchQueryHandler(tws_client)
     )
+    # Concurrent single-job status lookups share one batch call
+    dispatcher.register_query_batching(
+        GetJobStatusQuery,
+        QueryBatchRule(
+            batch_query_type=GetJobStatusBatchQuery,
+            key=lambda query: query.job_id,
+            build=lambda job_ids: GetJobStatusBatchQuery(job_ids=job_ids),
+            split=lambda result, job_id: QueryResult(
+                success=True, data=(result.data or {}).get(job_id)
+            ),
+        ),
+    )
     dispatcher.register_query_handler(
         GetSystemHealthQuery, GetSystemHealthQueryHandler(tws_monitor)
     )
@@ -201,3 +468,71 @@ def initialize_dispatcher(tws_client, tws_monitor):
     dispatcher.register_query_handler(
         GetEventLogQuery, GetEventLogQueryHandler(tws_client)
     )
+
+    # Plan-wide dependency DAG queries
+    dispatcher.register_query_handler(
+        GetUpstreamJobsQuery, GetUpstreamJobsQueryHandler(tws_client)
+    )
+    dispatcher.register_query_handler(
+        GetDownstreamJobsQuery, GetDownstreamJobsQueryHandler(tws_client)
+    )
+    dispatcher.register_query_handler(
+        GetBlockingJobsQuery, GetBlockingJobsQueryHandler(tws_client)
+    )
+    dispatcher.register_query_handler(
+        GetDependencyCriticalPathQuery,
+        GetDependencyCriticalPathQueryHandler(tws_client),
+    )
+
+    _register_cache_policies()
+    if hasattr(tws_client, "invalidate_cache_tags"):
+        dispatcher.register_invalidation_listener(tws_client.invalidate_cache_tags)
+
+
+def _register_cache_policies():
+    """
+    Configure result caching and tag invalidation for TWS queries.
+
+    Tags: ``jobs``/``workstations``/``plan``/``resources``/``events`` cover
+    plan-wide views, ``job:<id>`` covers a single job's data.
+    """
+    policies = {
+        GetSystemStatusQuery: QueryCachePolicy(30, tags=("jobs", "workstations")),
+        GetWorkstationsStatusQuery: QueryCachePolicy(30, tags=("workstations",)),
+        GetJobsStatusQuery: QueryCachePolicy(30, tags=("jobs",)),
+        SearchJobsQuery: QueryCachePolicy(30, tags=("jobs",)),
+        GetCriticalPathStatusQuery: QueryCachePolicy(30, tags=("jobs", "plan")),
+        GetJobStatusQuery: QueryCachePolicy(
+            30,
+            key=lambda query: f"job_status:{query.job_id}",
+            tags=lambda query: (f"job:{query.job_id}",),
+        ),
+        GetJobDetailsQuery: QueryCachePolicy(
+            300, tags=lambda query: (f"job:{query.job_id}",)
+        ),
+        GetJobHistoryQuery: QueryCachePolicy(
+            300, tags=lambda query: (f"job:{query.job_name}",)
+        ),
+        GetJobLogQuery: QueryCachePolicy(
+            600, tags=lambda query: (f"job:{query.job_id}",)
+        ),
+        GetJobDependenciesQuery: QueryCachePolicy(
+            600, tags=lambda query: ("plan", f"job:{query.job_id}")
+        ),
+        GetPlanDetailsQuery: QueryCachePolicy(60, tags=("plan",)),
+        GetResourceUsageQuery: QueryCachePolicy(300, tags=("resources",)),
+        GetEventLogQuery: QueryCachePolicy(60, tags=("events",)),
+        GetPerformanceMetricsQuery: QueryCachePolicy(60),
+    }
+    for query_type, policy in policies.items():
+        dispatcher.register_query_cache(query_type, policy)
+
+    def _job_tags(command):
+        return ("jobs", "plan", "events", f"job:{command.job_id}")
+
+    dispatcher.register_cache_invalidation(
+        ExecuteJobCommand, CacheInvalidationRule(tags=_job_tags)
+    )
+    dispatcher.register_cache_invalidation(
+        UpdateJobStatusCommand, CacheInvalidationRule(tags=_job_tags)
+    )
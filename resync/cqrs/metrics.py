@@ -0,0 +1,233 @@
+"""
+Per-handler instrumentation for the CQRS dispatcher.
+
+Every command and query dispatched through :class:`CQRSDispatcher` is timed
+and counted per message type:
+
+- a fixed-bucket latency histogram (constant memory, one ``bisect`` per call);
+- an in-flight gauge;
+- error counters, split into raised exceptions and unsuccessful results;
+- an optional slow-query log that records the message parameters.
+
+The dispatcher only runs on the event loop thread, so updates are plain
+attribute writes without locking. Metrics are exported in Prometheus text
+format next to ``runtime_metrics`` by the ``/metrics`` endpoint.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram buckets in seconds (Prometheus client defaults)
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0,
+)
+
+# (metric name, Prometheus type, HandlerStats attribute, help text)
+_SCALAR_METRICS = (
+    (
+        "resync_cqrs_handler_in_flight",
+        "gauge",
+        "in_flight",
+        "CQRS handler calls in flight",
+    ),
+    (
+        "resync_cqrs_handler_exceptions_total",
+        "counter",
+        "exceptions",
+        "CQRS handler calls that raised",
+    ),
+    (
+        "resync_cqrs_handler_failures_total",
+        "counter",
+        "failures",
+        "CQRS handler calls returning success=False",
+    ),
+)
+
+# Longest parameter representation kept in the slow-query log
+_MAX_PARAMS_LENGTH = 500
+
+
+class HandlerStats:
+    """Latency histogram and counters for one command or query type."""
+
+    __slots__ = (
+        "bucket_counts",
+        "total",
+        "count",
+        "in_flight",
+        "exceptions",
+        "failures",
+    )
+
+    def __init__(self, bucket_count: int) -> None:
+        # One extra slot for the +Inf bucket
+        self.bucket_counts = [0] * (bucket_count + 1)
+        self.total = 0.0
+        self.count = 0
+        self.in_flight = 0
+        self.exceptions = 0
+        self.failures = 0
+
+
+class CQRSMetrics:
+    """Collects latency and error metrics for dispatched commands and queries."""
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        slow_threshold_seconds: Optional[float] = None,
+        slow_log_size: int = 100,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.slow_threshold_seconds = slow_threshold_seconds
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=slow_log_size)
+        self._stats: Dict[Tuple[str, str], HandlerStats] = {}
+
+    def _get(self, kind: str, name: str) -> HandlerStats:
+        stats = self._stats.get((kind, name))
+        if stats is None:
+            stats = self._stats[(kind, name)] = HandlerStats(len(self.buckets))
+        return stats
+
+    def start(self, kind: str, name: str) -> float:
+        """Mark a handler call as in flight and return its start time."""
+        self._get(kind, name).in_flight += 1
+        return time.perf_counter()
+
+    def finish(
+        self,
+        kind: str,
+        name: str,
+        started: float,
+        outcome: str,
+        message: Any = None,
+    ) -> float:
+        """
+        Record the end of a handler call.
+
+        Args:
+            kind: ``"command"`` or ``"query"``
+            name: The command/query class name
+            started: Value returned by :meth:`start`
+            outcome: ``"success"``, ``"failure"`` (unsuccessful result) or
+                ``"exception"``
+            message: The command/query, logged if the call was slow
+
+        Returns:
+            The call duration in seconds.
+        """
+        duration = time.perf_counter() - started
+        stats = self._get(kind, name)
+        stats.in_flight -= 1
+        stats.count += 1
+        stats.total += duration
+        stats.bucket_counts[bisect_left(self.buckets, duration)] += 1
+        if outcome == "exception":
+            stats.exceptions += 1
+        elif outcome == "failure":
+            stats.failures += 1
+
+        threshold = self.slow_threshold_seconds
+        if threshold is not None and duration >= threshold:
+            self._record_slow(kind, name, duration, outcome, message)
+        return duration
+
+    def _record_slow(
+        self, kind: str, name: str, duration: float, outcome: str, message: Any
+    ) -> None:
+        params = _describe(message)
+        self.slow_queries.append(
+            {
+                "kind": kind,
+                "type": name,
+                "duration_ms": round(duration * 1000, 3),
+                "outcome": outcome,
+                "params": params,
+                "timestamp": time.time(),
+            }
+        )
+        logger.warning(
+            "Slow CQRS %s %s took %.1f ms (%s): %s",
+            kind,
+            name,
+            duration * 1000,
+            outcome,
+            params,
+        )
+
+    def get_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-type counters and mean latency keyed by ``kind:type``."""
+        return {
+            f"{kind}:{name}": {
+                "count": stats.count,
+                "in_flight": stats.in_flight,
+                "exceptions": stats.exceptions,
+                "failures": stats.failures,
+                "mean_ms": (stats.total / stats.count * 1000) if stats.count else 0.0,
+            }
+            for (kind, name), stats in self._stats.items()
+        }
+
+    def generate_prometheus_metrics(self) -> str:
+        """Generate metrics in Prometheus text exposition format."""
+        if not self._stats:
+            return ""
+        latency = "resync_cqrs_handler_duration_seconds"
+        lines: List[str] = [
+            f"# HELP {latency} CQRS handler latency by command/query type",
+            f"# TYPE {latency} histogram",
+        ]
+        for (kind, name), stats in sorted(self._stats.items()):
+            labels = f'kind="{kind}",type="{name}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, stats.bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'{latency}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{latency}_bucket{{{labels},le="+Inf"}} {stats.count}')
+            lines.append(f"{latency}_sum{{{labels}}} {stats.total}")
+            lines.append(f"{latency}_count{{{labels}}} {stats.count}")
+
+        for metric, metric_type, attribute, help_text in _SCALAR_METRICS:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for (kind, name), stats in sorted(self._stats.items()):
+                lines.append(
+                    f'{metric}{{kind="{kind}",type="{name}"}} {getattr(stats, attribute)}'
+                )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Drop all collected metrics."""
+        self._stats.clear()
+        self.slow_queries.clear()
+
+
+def _describe(message: Any) -> str:
+    """Render command/query parameters for the slow-query log."""
+    if message is None:
+        return ""
+    try:
+        params = (
+            dataclasses.asdict(message)
+            if dataclasses.is_dataclass(message)
+            else vars(message)
+        )
+    except TypeError:
+        params = message
+    text = repr(params)
+    if len(text) > _MAX_PARAMS_LENGTH:
+        text = text[:_MAX_PARAMS_LENGTH] + "..."
+    return text
+
+
+# Global CQRS metrics instance
+cqrs_metrics = CQRSMetrics()
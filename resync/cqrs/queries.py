@@ -3,7 +3,7 @@ Query implementations for TWS operations in the CQRS pattern.
 """
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 from resync.cqrs.base import IQuery
 
@@ -142,6 +142,7 @@ class GetEventLogQuery(IQuery):
     """
 
     last_hours: int = 24
+    event_types: Optional[List[str]] = None
 
 
 @dataclass
@@ -149,3 +150,41 @@ class GetPerformanceMetricsQuery(IQuery):
     """
     Query to retrieve TWS performance metrics.
     """
+
+
+@dataclass
+class GetUpstreamJobsQuery(IQuery):
+    """
+    Query to retrieve every job a TWS job transitively depends on.
+    """
+
+    job_id: str
+    max_depth: Optional[int] = None
+
+
+@dataclass
+class GetDownstreamJobsQuery(IQuery):
+    """
+    Query to retrieve every job transitively depending on a TWS job.
+    """
+
+    job_id: str
+    max_depth: Optional[int] = None
+
+
+@dataclass
+class GetBlockingJobsQuery(IQuery):
+    """
+    Query to find the unfinished upstream jobs blocking a TWS job.
+    """
+
+    job_id: str
+
+
+@dataclass
+class GetDependencyCriticalPathQuery(IQuery):
+    """
+    Query to compute the longest dependency chain in the plan.
+    """
+
+    target_job: Optional[str] = None
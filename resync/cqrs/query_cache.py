@@ -0,0 +1,274 @@
+"""
+Declarative result caching for CQRS queries.
+
+Caching used to be hand-written inside each query handler, with different
+key schemes and TTLs (and some handlers not caching at all). Instead, the
+dispatcher now consults a :class:`QueryResultCache` configured per query
+type with a :class:`QueryCachePolicy`:
+
+- ``ttl_seconds`` and a ``key`` function derived from the query fields;
+- ``tags`` naming the data the result depends on (e.g. ``"jobs"`` or
+  ``"job:<id>"``).
+
+Commands registered with a :class:`CacheInvalidationRule` drop every cached
+result carrying one of their tags once they complete, so e.g. an
+``ExecuteJobCommand`` immediately invalidates the affected job queries.
+Concurrent misses for the same key share one handler call.
+
+This cache is per process and its TTLs are short. Data shared between
+workers lives in the TWS client cache and the advanced cache; the
+dispatcher clears both for the same tags (``advanced_cache.invalidate_by_tag``
+and :meth:`OptimizedTWSClient.invalidate_cache_tags`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from resync.cqrs.base import IQuery, QueryResult
+
+logger = logging.getLogger(__name__)
+
+# Default maximum number of cached query results
+DEFAULT_MAX_ENTRIES = 10_000
+
+TagSpec = Union[Sequence[str], Callable[[Any], Iterable[str]]]
+
+
+def default_query_key(query: IQuery) -> str:
+    """Derive a cache key from the query type and its dataclass fields."""
+    fields = dataclasses.astuple(query) if dataclasses.is_dataclass(query) else ()
+    return f"{type(query).__name__}:{fields!r}"
+
+
+def resolve_tags(spec: TagSpec, message: Any) -> Tuple[str, ...]:
+    """Evaluate a static or callable tag specification for a command/query."""
+    if callable(spec):
+        return tuple(spec(message))
+    return tuple(spec)
+
+
+@dataclass
+class QueryCachePolicy:
+    """
+    Caching configuration for one query type.
+
+    Attributes:
+        ttl_seconds: How long a successful result is served from cache
+        key: Builds the cache key from the query; defaults to the query type
+            plus its field values
+        tags: Static tags, or a function returning tags for a query
+    """
+
+    ttl_seconds: float
+    key: Callable[[IQuery], str] = default_query_key
+    tags: TagSpec = ()
+
+
+@dataclass
+class CacheInvalidationRule:
+    """
+    Tags invalidated when a command completes.
+
+    Attributes:
+        tags: Static tags, or a function returning tags for a command
+        on_failure: Also invalidate when the command reports failure
+    """
+
+    tags: TagSpec
+    on_failure: bool = False
+
+
+@dataclass
+class _Entry:
+    result: QueryResult
+    expires_at: float
+    tags: Tuple[str, ...]
+
+
+class QueryResultCache:
+    """
+    In-process TTL/LRU cache of query results with tag-based invalidation.
+
+    Only successful results are stored. Each tag carries a generation
+    counter; a result whose tags were invalidated while it was being
+    computed is returned to its caller but not cached, so a command racing
+    with a slow query can't leave a stale entry behind.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._generations: Dict[str, int] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[QueryResult]:
+        """Return a fresh cached result, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.result
+
+    def set(
+        self,
+        key: str,
+        result: QueryResult,
+        ttl_seconds: float,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """Store a result under ``key`` with the given tags."""
+        if key in self._entries:
+            self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = _Entry(result, time.monotonic() + ttl_seconds, tags)
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    async def get_or_load(
+        self,
+        key: str,
+        ttl_seconds: float,
+        tags: Tuple[str, ...],
+        loader: Callable[[], Awaitable[QueryResult]],
+    ) -> QueryResult:
+        """Return the cached result for ``key`` or compute it with ``loader``."""
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            try:
+                result = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this waiter itself was cancelled
+                # The loading caller was cancelled; load again
+                continue
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        generations = [self._generations.get(tag, 0) for tag in tags]
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            # Waiters were not cancelled; they retry instead of inheriting it
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        if getattr(result, "success", False) and generations == [
+            self._generations.get(tag, 0) for tag in tags
+        ]:
+            self.set(key, result, ttl_seconds, tags)
+        future.set_result(result)
+        return result
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Drop every cached result carrying one of ``tags``.
+
+        Returns:
+            The number of entries removed.
+        """
+        removed = 0
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            for key in list(self._tag_index.get(tag, ())):
+                self._remove(key)
+                removed += 1
+        self.invalidations += removed
+        if removed:
+            logger.debug("Invalidated %d cached query results", removed)
+        return removed
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+        self._tag_index.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def generate_prometheus_metrics(self) -> str:
+        """Generate metrics in Prometheus text exposition format."""
+        lines: List[str] = []
+        for name, metric_type, value in (
+            ("resync_cqrs_query_cache_entries", "gauge", len(self._entries)),
+            ("resync_cqrs_query_cache_hits_total", "counter", self.hits),
+            ("resync_cqrs_query_cache_misses_total", "counter", self.misses),
+            (
+                "resync_cqrs_query_cache_invalidations_total",
+                "counter",
+                self.invalidations,
+            ),
+        ):
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines)
+
+
+# Global query result cache used by the dispatcher
+query_result_cache = QueryResultCache()
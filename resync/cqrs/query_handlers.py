@@ -1,13 +1,19 @@
 """
 Query handlers for TWS operations in the CQRS pattern.
+
+Handlers go straight to the TWS client; result caching is configured per
+query type in the dispatcher (see ``resync.cqrs.query_cache``).
 """
 
-from resync.core.cache_hierarchy import get_cache_hierarchy
+from resync.core.dependency_graph import get_dependency_graph_service
 from resync.core.interfaces import ITWSClient
 from resync.cqrs.base import IQueryHandler, QueryResult
 from resync.cqrs.queries import (
     CheckTWSConnectionQuery,
+    GetBlockingJobsQuery,
     GetCriticalPathStatusQuery,
+    GetDependencyCriticalPathQuery,
+    GetDownstreamJobsQuery,
     GetEventLogQuery,
     GetJobDependenciesQuery,
     GetJobDetailsQuery,
@@ -21,6 +27,7 @@ from resync.cqrs.queries import (
     GetResourceUsageQuery,
     GetSystemHealthQuery,
     GetSystemStatusQuery,
+    GetUpstreamJobsQuery,
     GetWorkstationsStatusQuery,
     SearchJobsQuery,
 )
@@ -31,23 +38,12 @@ class GetSystemStatusQueryHandler(IQueryHandler[GetSystemStatusQuery, QueryResul
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetSystemStatusQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = "query_system_status"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
             system_status = await self.tws_client.get_system_status()
             result = system_status.dict()
 
-            # Store in cache
-            await self.cache.set(cache_key, result, ttl=30)  # 30 seconds TTL
-
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -60,23 +56,12 @@ class GetWorkstationsStatusQueryHandler(
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetWorkstationsStatusQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = "query_workstations_status"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
             workstations = await self.tws_client.get_workstations_status()
             result = [ws.dict() for ws in workstations]
 
-            # Store in cache
-            await self.cache.set(cache_key, result, ttl=30)  # 30 seconds TTL
-
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -87,23 +72,12 @@ class GetJobsStatusQueryHandler(IQueryHandler[GetJobsStatusQuery, QueryResult]):
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetJobsStatusQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = "query_jobs_status"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
             jobs = await self.tws_client.get_jobs_status()
             result = [job.dict() for job in jobs]
 
-            # Store in cache
-            await self.cache.set(cache_key, result, ttl=30)  # 30 seconds TTL
-
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -116,23 +90,12 @@ class GetCriticalPathStatusQueryHandler(
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetCriticalPathStatusQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = "query_critical_path_status"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
             critical_jobs = await self.tws_client.get_critical_path_status()
             result = [cj.dict() for cj in critical_jobs]
 
-            # Store in cache
-            await self.cache.set(cache_key, result, ttl=30)  # 30 seconds TTL
-
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -143,25 +106,13 @@ class GetJobStatusQueryHandler(IQueryHandler[GetJobStatusQuery, QueryResult]):
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetJobStatusQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = f"query_job_status_{query.job_id}"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS using the batch method
             jobs_status = await self.tws_client.get_job_status_batch([query.job_id])
             job_status = jobs_status.get(query.job_id)
             result = job_status.dict() if job_status else None
 
-            # Store in cache
-            if result:
-                await self.cache.set(cache_key, result, ttl=30)  # 30 seconds TTL
-
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -172,38 +123,13 @@ class GetJobStatusBatchQueryHandler(IQueryHandler[GetJobStatusBatchQuery, QueryR
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetJobStatusBatchQuery) -> QueryResult:
         try:
-            # Process each job ID, checking cache first
+            statuses = await self.tws_client.get_job_status_batch(query.job_ids)
             results = {}
-            uncached_job_ids = []
-
-            # Check cache for each job
-            for job_id in query.job_ids:
-                cache_key = f"query_job_status_{job_id}"
-                cached_result = await self.cache.get(cache_key)
-                if cached_result:
-                    results[job_id] = cached_result
-                else:
-                    uncached_job_ids.append(job_id)
-
-            # Fetch uncached jobs from TWS
-            if uncached_job_ids:
-                uncached_results = await self.tws_client.get_job_status_batch(
-                    uncached_job_ids
-                )
-                for job_id, job_status in uncached_results.items():
-                    if job_status:
-                        result = job_status.dict()
-                        results[job_id] = result
-                        # Cache the individual result
-                        await self.cache.set(
-                            f"query_job_status_{job_id}", result, ttl=30
-                        )
-                    else:
-                        results[job_id] = None
+            for job_id, job_status in statuses.items():
+                results[job_id] = job_status.dict() if job_status else None
 
             return QueryResult(success=True, data=results)
         except Exception as e:
@@ -229,7 +155,6 @@ class SearchJobsQueryHandler(IQueryHandler[SearchJobsQuery, QueryResult]):
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: SearchJobsQuery) -> QueryResult:
         try:
@@ -291,23 +216,12 @@ class GetJobDetailsQueryHandler(IQueryHandler[GetJobDetailsQuery, QueryResult]):
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetJobDetailsQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = f"query_job_details_{query.job_id}"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
             job_details = await self.tws_client.get_job_details(query.job_id)
             result = job_details.dict()
 
-            # Store in cache
-            await self.cache.set(cache_key, result, ttl=300)  # 5 minutes TTL
-
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -318,23 +232,12 @@ class GetJobHistoryQueryHandler(IQueryHandler[GetJobHistoryQuery, QueryResult]):
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetJobHistoryQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = f"query_job_history_{query.job_name}"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
             job_history = await self.tws_client.get_job_history(query.job_name)
             result = [execution.dict() for execution in job_history]
 
-            # Store in cache
-            await self.cache.set(cache_key, result, ttl=300)  # 5 minutes TTL
-
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -345,22 +248,11 @@ class GetJobLogQueryHandler(IQueryHandler[GetJobLogQuery, QueryResult]):
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetJobLogQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = f"query_job_log_{query.job_id}"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
             job_log = await self.tws_client.get_job_log(query.job_id)
 
-            # Store in cache
-            await self.cache.set(cache_key, job_log, ttl=600)  # 10 minutes TTL
-
             return QueryResult(success=True, data=job_log)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -371,23 +263,12 @@ class GetPlanDetailsQueryHandler(IQueryHandler[GetPlanDetailsQuery, QueryResult]
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetPlanDetailsQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = "query_plan_details"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
             plan_details = await self.tws_client.get_plan_details()
             result = plan_details.dict()
 
-            # Store in cache
-            await self.cache.set(cache_key, result, ttl=60)  # 1 minute TTL
-
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -400,23 +281,12 @@ class GetJobDependenciesQueryHandler(
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetJobDependenciesQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = f"query_job_dependencies_{query.job_id}"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
             dependencies = await self.tws_client.get_job_dependencies(query.job_id)
             result = dependencies.dict()
 
-            # Store in cache
-            await self.cache.set(cache_key, result, ttl=600)  # 10 minutes TTL
-
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -427,23 +297,12 @@ class GetResourceUsageQueryHandler(IQueryHandler[GetResourceUsageQuery, QueryRes
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetResourceUsageQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = "query_resource_usage"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
             resources = await self.tws_client.get_resource_usage()
             result = [resource.dict() for resource in resources]
 
-            # Store in cache
-            await self.cache.set(cache_key, result, ttl=300)  # 5 minutes TTL
-
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -454,23 +313,17 @@ class GetEventLogQueryHandler(IQueryHandler[GetEventLogQuery, QueryResult]):
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetEventLogQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = f"query_event_log_{query.last_hours}h"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
-            events = await self.tws_client.get_event_log(query.last_hours)
+            if query.event_types:
+                events = await self.tws_client.get_event_log(
+                    query.last_hours, event_types=query.event_types
+                )
+            else:
+                events = await self.tws_client.get_event_log(query.last_hours)
             result = [event.dict() for event in events]
 
-            # Store in cache
-            await self.cache.set(cache_key, result, ttl=300)  # 5 minutes TTL
-
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -483,23 +336,76 @@ class GetPerformanceMetricsQueryHandler(
 
     def __init__(self, tws_client: ITWSClient):
         self.tws_client = tws_client
-        self.cache = get_cache_hierarchy()
 
     async def execute(self, query: GetPerformanceMetricsQuery) -> QueryResult:
         try:
-            # Try to get from cache first
-            cache_key = "query_performance_metrics"
-            cached_result = await self.cache.get(cache_key)
-            if cached_result:
-                return QueryResult(success=True, data=cached_result)
-
-            # If not in cache, fetch from TWS
             metrics = await self.tws_client.get_performance_metrics()
             result = metrics.dict()
 
-            # Store in cache
-            await self.cache.set(cache_key, result, ttl=60)  # 1 minute TTL
+            return QueryResult(success=True, data=result)
+        except Exception as e:
+            return QueryResult(success=False, error=str(e))
+
 
+class GetUpstreamJobsQueryHandler(IQueryHandler[GetUpstreamJobsQuery, QueryResult]):
+    """Handler for upstream dependency closures, served from the plan DAG."""
+
+    def __init__(self, tws_client: ITWSClient):
+        self.graph_service = get_dependency_graph_service(tws_client)
+
+    async def execute(self, query: GetUpstreamJobsQuery) -> QueryResult:
+        try:
+            jobs = await self.graph_service.upstream(query.job_id, query.max_depth)
+            return QueryResult(
+                success=True, data={"job_id": query.job_id, "upstream": jobs}
+            )
+        except Exception as e:
+            return QueryResult(success=False, error=str(e))
+
+
+class GetDownstreamJobsQueryHandler(
+    IQueryHandler[GetDownstreamJobsQuery, QueryResult]
+):
+    """Handler for downstream dependency closures, served from the plan DAG."""
+
+    def __init__(self, tws_client: ITWSClient):
+        self.graph_service = get_dependency_graph_service(tws_client)
+
+    async def execute(self, query: GetDownstreamJobsQuery) -> QueryResult:
+        try:
+            jobs = await self.graph_service.downstream(query.job_id, query.max_depth)
+            return QueryResult(
+                success=True, data={"job_id": query.job_id, "downstream": jobs}
+            )
+        except Exception as e:
+            return QueryResult(success=False, error=str(e))
+
+
+class GetBlockingJobsQueryHandler(IQueryHandler[GetBlockingJobsQuery, QueryResult]):
+    """Handler for finding what is blocking a job."""
+
+    def __init__(self, tws_client: ITWSClient):
+        self.graph_service = get_dependency_graph_service(tws_client)
+
+    async def execute(self, query: GetBlockingJobsQuery) -> QueryResult:
+        try:
+            result = await self.graph_service.blocking(query.job_id)
+            return QueryResult(success=True, data=result)
+        except Exception as e:
+            return QueryResult(success=False, error=str(e))
+
+
+class GetDependencyCriticalPathQueryHandler(
+    IQueryHandler[GetDependencyCriticalPathQuery, QueryResult]
+):
+    """Handler for the longest dependency chain in the plan."""
+
+    def __init__(self, tws_client: ITWSClient):
+        self.graph_service = get_dependency_graph_service(tws_client)
+
+    async def execute(self, query: GetDependencyCriticalPathQuery) -> QueryResult:
+        try:
+            result = await self.graph_service.critical_path(query.target_job)
             return QueryResult(success=True, data=result)
         except Exception as e:
             return QueryResult(success=False, error=str(e))
@@ -34,6 +34,7 @@ async def _get_rag_components():
         try:
             _rag_embedding_service = EmbeddingService()
             _rag_vector_store = get_default_store()
+            await _rag_vector_store.initialize()
             _rag_retriever = RagRetriever(_rag_embedding_service, _rag_vector_store)
             _rag_ingest_service = IngestService(_rag_embedding_service, _rag_vector_store)
             _rag_initialized = True
@@ -126,6 +126,17 @@ class Event(BaseModel):
     )
 
 
+class PlanDependencyGraph(BaseModel):
+    """Dependency edges for every job in the current plan."""
+
+    dependency_graph: Dict[str, List[str]] = Field(
+        default_factory=dict, description="Job name -> names of its direct dependencies"
+    )
+    durations: Dict[str, float] = Field(
+        default_factory=dict, description="Expected job durations in seconds"
+    )
+
+
 class PerformanceData(BaseModel):
     """Performance metrics for TWS operations."""
 
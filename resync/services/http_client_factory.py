@@ -18,6 +18,7 @@ from resync.core.constants import (
     DEFAULT_READ_TIMEOUT,
     DEFAULT_WRITE_TIMEOUT,
 )
+from resync.core.http_tracing import instrument_client
 from resync.settings import settings
 
 
@@ -50,7 +51,8 @@ def create_async_http_client(
         max_keepalive: Override default max keepalive connections
 
     Returns:
-        Configured httpx.AsyncClient instance with proper timeouts and limits
+        Configured httpx.AsyncClient instance with proper timeouts and limits,
+        instrumented with per-host connection latency metrics
 
     Example:
         ```python
@@ -61,7 +63,7 @@ def create_async_http_client(
         )
         ```
     """
-    return httpx.AsyncClient(
+    client = httpx.AsyncClient(
         base_url=base_url,
         auth=auth,
         verify=verify,
@@ -84,6 +86,7 @@ def create_async_http_client(
             ),
         ),
     )
+    return instrument_client(client)
 
 
 import logging
@@ -98,8 +101,19 @@ def create_tws_http_client(*, base_url: str | None = None, auth=None, verify: bo
     # Enforce TWS-specific verification setting
     verify_param = settings.TWS_VERIFY if verify is None else verify
 
-    # ... timeout and limits config ...
-    return AsyncClient(
+    timeout = httpx.Timeout(
+        connect=getattr(settings, "TWS_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+        read=getattr(settings, "TWS_READ_TIMEOUT", DEFAULT_READ_TIMEOUT),
+        write=getattr(settings, "TWS_WRITE_TIMEOUT", DEFAULT_WRITE_TIMEOUT),
+        pool=getattr(settings, "TWS_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT),
+    )
+    limits = httpx.Limits(
+        max_connections=getattr(settings, "TWS_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS),
+        max_keepalive_connections=getattr(
+            settings, "TWS_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+        ),
+    )
+    client = AsyncClient(
         base_url=final_base,
         auth=auth,
         timeout=timeout,
@@ -107,3 +121,4 @@ def create_tws_http_client(*, base_url: str | None = None, auth=None, verify: bo
         verify=verify_param,  # Apply TWS verification setting
         **kwargs
     )
+    return instrument_client(client)
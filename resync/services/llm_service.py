@@ -10,9 +10,10 @@ import logging
 from typing import AsyncGenerator, Optional, Dict, Any
 from resync.settings import settings
 from resync.core.exceptions import IntegrationError
+from resync.core.http_tracing import instrument_client
 
 try:
-    from openai import AsyncOpenAI
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
@@ -48,7 +49,9 @@ class LLMService:
             
             self.client = AsyncOpenAI(
                 api_key=api_key,
-                base_url=base_url
+                base_url=base_url,
+                # Record per-host connection latency breakdown
+                http_client=instrument_client(DefaultAsyncHttpxClient()),
             )
             
             logger.info(f"LLM service initialized with model: {self.model}")
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+from resync.core.cache_hierarchy import get_cache_hierarchy
+from resync.core.job_log_store import JobLogRange, SegmentedJobLogStore
 from resync.models.tws import (
     CriticalJob,
     DependencyTree,
@@ -15,11 +17,14 @@ from resync.models.tws import (
     JobExecution,
     JobStatus,
     PerformanceData,
+    PlanDependencyGraph,
     PlanDetails,
     ResourceStatus,
     SystemStatus,
     WorkstationStatus,
 )
+from resync.models.tws_bulk import decode_model_list
+from resync.services.synthetic_tws import LatencyProfile, SyntheticTWSEnvironment
 
 logger = logging.getLogger(__name__)
 
@@ -28,21 +33,62 @@ class MockTWSClient:
     """
     A mock client for the HCL Workload Automation (TWS) API, used for
     development and testing without a live TWS connection.
-    It loads static data from a JSON file.
+    It loads static data from a JSON file, or serves a generated
+    :class:`SyntheticTWSEnvironment` for load and performance testing.
 
     Args:
         *args: Additional positional arguments (unused)
+        environment: Optional synthetic environment to serve instead of the
+            static JSON data
+        latency: Optional latency/failure model for simulated calls
+            (defaults to a fixed 100 ms delay)
+        churn_interval: Minimum seconds between status churn ticks applied
+            to the synthetic environment
         **kwargs: Additional keyword arguments (unused)
 
     Attributes:
         mock_data (Dict[str, Any]): The loaded mock data from the JSON file
     """
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        *args: Any,
+        environment: Optional[SyntheticTWSEnvironment] = None,
+        latency: Optional[LatencyProfile] = None,
+        churn_interval: float = 1.0,
+        **kwargs: Any,
+    ) -> None:
         """Initialize the MockTWSClient with default settings."""
         self.mock_data: Dict[str, Any] = {}
-        self._load_mock_data()
-        logger.info("MockTWSClient initialized. Using static mock data.")
+        self.environment = environment
+        self.latency = latency or LatencyProfile()
+        self.churn_interval = churn_interval
+        self._last_churn = time.monotonic()
+        self.job_log_store = SegmentedJobLogStore(
+            get_cache_hierarchy(), key_prefix="mock_job_log"
+        )
+        if environment is not None:
+            self.mock_data = environment.to_mock_data()
+            logger.info(
+                "MockTWSClient initialized. Using synthetic environment with %d jobs.",
+                len(environment.jobs),
+            )
+        else:
+            self._load_mock_data()
+            logger.info("MockTWSClient initialized. Using static mock data.")
+
+    async def _simulate_latency(self, scale: float = 1.0) -> None:
+        """Simulate network latency (and failures) using the latency profile."""
+        await self.latency.apply(scale)
+
+    def _maybe_churn(self) -> None:
+        """Advance synthetic status churn if the churn interval has elapsed."""
+        if self.environment is None:
+            return
+        now = time.monotonic()
+        if now - self._last_churn >= self.churn_interval:
+            self._last_churn = now
+            self.environment.tick()
 
     def _load_mock_data(self) -> None:
         """
@@ -121,7 +167,7 @@ class MockTWSClient:
             >>> print(status)
             True
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
         connection_status = self.mock_data.get("connection_status")
         return bool(connection_status) if connection_status is not None else False
 
@@ -135,7 +181,7 @@ class MockTWSClient:
             ConnectionError: If the mock server is configured as unreachable
             TimeoutError: If the mock server is configured to timeout
         """
-        await asyncio.sleep(0.05)  # Simulate quick network delay
+        await self._simulate_latency(0.5)  # Simulate quick network delay
 
         # Check mock configuration for ping behavior
         ping_config = self.mock_data.get("ping_config", {})
@@ -159,16 +205,14 @@ class MockTWSClient:
         Note:
             Simulates an asynchronous delay with a 0.1 second wait
         """
-        await asyncio.sleep(0.1)
-        workstations_data = self.mock_data.get("workstations_status", [])
-        workstations = []
-        for ws in workstations_data:
-            if isinstance(ws, dict):
-                try:
-                    workstations.append(WorkstationStatus(**ws))
-                except Exception as e:
-                    logger.warning(f"Failed to create WorkstationStatus from data: {e}")
-        return workstations
+        await self._simulate_latency()
+        self._maybe_churn()
+        return decode_model_list(
+            WorkstationStatus,
+            self.mock_data.get("workstations_status", []),
+            trusted=self.environment is not None,
+            skip_invalid=True,
+        )
 
     async def get_jobs_status(self) -> List[JobStatus]:
         """
@@ -180,16 +224,14 @@ class MockTWSClient:
         Note:
             Simulates an asynchronous delay with a 0.1 second wait
         """
-        await asyncio.sleep(0.1)
-        jobs_data = self.mock_data.get("jobs_status", [])
-        jobs = []
-        for job in jobs_data:
-            if isinstance(job, dict):
-                try:
-                    jobs.append(JobStatus(**job))
-                except Exception as e:
-                    logger.warning(f"Failed to create JobStatus from data: {e}")
-        return jobs
+        await self._simulate_latency()
+        self._maybe_churn()
+        return decode_model_list(
+            JobStatus,
+            self.mock_data.get("jobs_status", []),
+            trusted=self.environment is not None,
+            skip_invalid=True,
+        )
 
     async def get_critical_path_status(self) -> List[CriticalJob]:
         """
@@ -201,7 +243,8 @@ class MockTWSClient:
         Note:
             Simulates an asynchronous delay with a 0.1 second wait
         """
-        await asyncio.sleep(0.1)
+        await self._simulate_latency()
+        self._maybe_churn()
         critical_jobs = []
         for job in self.mock_data.get("critical_path_status", []):
             if isinstance(job, dict):
@@ -241,7 +284,7 @@ class MockTWSClient:
         Note:
             Simulates an asynchronous delay and returns mock restart data
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
         return {
             "job_id": job_id,
             "action": "restarted",
@@ -262,7 +305,7 @@ class MockTWSClient:
         Note:
             Simulates an asynchronous delay and returns mock cancellation data
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
         return {
             "job_id": job_id,
             "action": "canceled",
@@ -274,15 +317,17 @@ class MockTWSClient:
         """
         Mocks getting detailed information about a specific job.
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
 
         # Find job data or create mock data
-        jobs_data = self.mock_data.get("jobs_status", [])
         job_data = None
-        for job in jobs_data:
-            if job.get("name") == job_id or job.get("id") == job_id:
-                job_data = job
-                break
+        if self.environment is not None:
+            job_data = self.environment.get_job(job_id)
+        else:
+            for job in self.mock_data.get("jobs_status", []):
+                if job.get("name") == job_id or job.get("id") == job_id:
+                    job_data = job
+                    break
 
         if not job_data:
             # Create mock job data
@@ -326,7 +371,7 @@ class MockTWSClient:
         """
         Mocks getting the execution history for a specific job.
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
 
         # Return mock history data
         return [
@@ -352,15 +397,29 @@ class MockTWSClient:
         """
         Mocks getting the log content for a specific job execution.
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
 
         return f"Mock log content for job {job_id}\nJob started successfully\nProcessing data...\nJob completed"
 
+    async def stream_job_log(
+        self, job_id: str, log_range: Optional[JobLogRange] = None
+    ) -> AsyncIterator[str]:
+        """
+        Mocks streaming the log content for a specific job execution.
+
+        Uses the same segmented cache as the real client so ranged reads
+        behave identically in development.
+        """
+        if await self.job_log_store.get_manifest(job_id) is None:
+            await self.job_log_store.write_text(job_id, await self.get_job_log(job_id))
+        async for chunk in self.job_log_store.read(job_id, log_range):
+            yield chunk
+
     async def get_plan_details(self) -> PlanDetails:
         """
         Mocks getting details about the current TWS plan.
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
 
         return PlanDetails(
             plan_id="CURRENT_PLAN",
@@ -374,7 +433,10 @@ class MockTWSClient:
         """
         Mocks getting the dependency tree for a specific job.
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
+
+        if self.environment is not None:
+            return DependencyTree(**self.environment.dependency_tree(job_id))
 
         return DependencyTree(
             job_id=job_id,
@@ -387,11 +449,34 @@ class MockTWSClient:
             },
         )
 
+    async def get_plan_dependency_graph(self) -> PlanDependencyGraph:
+        """
+        Mocks retrieving the dependency edges of the whole plan.
+        """
+        await self._simulate_latency()
+
+        if self.environment is not None:
+            env = self.environment
+            names = [job["name"] for job in env.jobs]
+            return PlanDependencyGraph(
+                dependency_graph={
+                    name: [names[pred] for pred in env.predecessors[index]]
+                    for index, name in enumerate(names)
+                },
+                durations=dict(zip(names, env.durations)),
+            )
+
+        graph: Dict[str, List[str]] = {}
+        for job in self.mock_data.get("jobs_status", []):
+            if isinstance(job, dict) and job.get("name"):
+                graph[job["name"]] = list(job.get("dependencies", []))
+        return PlanDependencyGraph(dependency_graph=graph)
+
     async def get_resource_usage(self) -> List[ResourceStatus]:
         """
         Mocks getting resource usage information.
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
 
         return [
             ResourceStatus(
@@ -412,11 +497,21 @@ class MockTWSClient:
             ),
         ]
 
-    async def get_event_log(self, last_hours: int = 24) -> List[Event]:
+    async def get_event_log(
+        self, last_hours: int = 24, event_types: Optional[List[str]] = None
+    ) -> List[Event]:
         """
         Mocks getting TWS event log entries.
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
+
+        if self.environment is not None:
+            since = datetime.now() - timedelta(hours=last_hours)
+            return [
+                Event(**event)
+                for event in self.environment.events_since(since)
+                if not event_types or event["event_type"] in event_types
+            ]
 
         events_data = [
             {
@@ -441,13 +536,17 @@ class MockTWSClient:
             },
         ]
 
-        return [Event(**event_data) for event_data in events_data]
+        return [
+            Event(**event_data)
+            for event_data in events_data
+            if not event_types or event_data["event_type"] in event_types
+        ]
 
     async def get_performance_metrics(self) -> PerformanceData:
         """
         Mocks getting TWS performance metrics.
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
 
         return PerformanceData(
             timestamp=datetime.now(),
@@ -472,7 +571,11 @@ class MockTWSClient:
         Note:
             Simulates an asynchronous delay and returns mock job status
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
+        if self.environment is not None:
+            job = self.environment.get_job(job_id)
+            if job is not None:
+                return JobStatus(**job)
         # Find a job that matches the job_id (for simplicity, return first job)
         jobs = self.mock_data.get("jobs_status", [])
         if jobs:
@@ -485,6 +588,31 @@ class MockTWSClient:
             job_stream="STREAM_A",
         )
 
+    async def get_job_status_batch(self, job_ids: List[str]) -> Dict[str, JobStatus]:
+        """
+        Mocks retrieving the status of multiple jobs in a single call.
+
+        Args:
+            job_ids: The IDs of the jobs to get status for
+
+        Returns:
+            Dictionary mapping job_id to JobStatus for the jobs that exist
+        """
+        await self._simulate_latency()  # Simulate network delay
+        results: Dict[str, JobStatus] = {}
+        if self.environment is not None:
+            for job_id in job_ids:
+                job = self.environment.get_job(job_id)
+                if job is not None:
+                    results[job_id] = JobStatus(**job)
+            return results
+
+        jobs_by_name = {job.get("name"): job for job in self.mock_data.get("jobs_status", [])}
+        for job_id in job_ids:
+            if job_id in jobs_by_name:
+                results[job_id] = JobStatus(**jobs_by_name[job_id])
+        return results
+
     async def get_job_history(self, job_id: str) -> List[Dict[str, Any]]:
         """
         Mocks getting the history of a specific job.
@@ -498,7 +626,7 @@ class MockTWSClient:
         Note:
             Simulates an asynchronous delay and returns mock job history
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
+        await self._simulate_latency()  # Simulate network delay
         return [
             {
                 "job_id": str(job_id),
@@ -527,8 +655,12 @@ class MockTWSClient:
         Note:
             Simulates an asynchronous delay and returns filtered mock jobs
         """
-        await asyncio.sleep(0.1)  # Simulate network delay
-        jobs = [JobStatus(**job) for job in self.mock_data.get("jobs_status", [])]
+        await self._simulate_latency()  # Simulate network delay
+        jobs = decode_model_list(
+            JobStatus,
+            self.mock_data.get("jobs_status", []),
+            trusted=self.environment is not None,
+        )
 
         if status_filter:
             jobs = [job for job in jobs if job.status == status_filter]
@@ -551,7 +683,7 @@ class MockTWSClient:
             Dictionary with validation result
         """
         # Simulate validation process
-        await asyncio.sleep(0.05)  # Simulate short network delay for validation
+        await self._simulate_latency(0.5)  # Simulate short network delay for validation
 
         # Get validation config from mock data or default to success
         validation_config = self.mock_data.get("validation_config", {})
@@ -12,7 +12,7 @@ from pathlib import Path
 import httpx
 from pydantic import BaseModel
 
-from resync.core.resilience import CircuitBreakerManager, CircuitBreakerError, retry_with_backoff_async
+from resync.core.resilience import CircuitBreakerManager, CircuitBreakerError, get_retry_budget, retry_with_backoff_async
 from resync.core.structured_logger import get_logger
 from resync.settings import settings
 
@@ -63,6 +63,8 @@ class RAGServiceClient:
         # Centralized circuit breaker manager
         self.cbm = CircuitBreakerManager()
         self.cbm.register("rag_service", fail_max=5, reset_timeout=60, exclude=(ValueError,))
+        # Shared retry budget for the RAG (Qdrant-backed) microservice
+        self.retry_budget = get_retry_budget("rag")
         
         logger.info("RAGServiceClient initialized")
     
@@ -99,7 +101,8 @@ class RAGServiceClient:
             base_delay=self.retry_backoff,
             cap=5.0,
             jitter=True,
-            retry_on=(httpx.RequestError, httpx.TimeoutException)
+            retry_on=(httpx.RequestError, httpx.TimeoutException),
+            budget=self.retry_budget,
         )
         data = resp.json()
         return data["job_id"]
@@ -141,7 +144,8 @@ class RAGServiceClient:
             base_delay=self.retry_backoff,
             cap=5.0,
             jitter=True,
-            retry_on=(httpx.RequestError, httpx.TimeoutException)
+            retry_on=(httpx.RequestError, httpx.TimeoutException),
+            budget=self.retry_budget,
         )
         return job_status
 
@@ -0,0 +1,386 @@
+"""
+Synthetic TWS environment generator for load and performance testing.
+
+The static ``mock_tws_data.json`` only holds a handful of jobs, which is not
+enough to exercise caching, batching or graph code at production scale. This
+module generates large, deterministic TWS plans (100k+ jobs, thousands of
+workstations) with realistic dependency DAGs, applies status churn over time
+and simulates network latency with log-normal distributions, spikes and
+errors. ``MockTWSClient`` serves these environments fully in-process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional
+
+from resync.core.exceptions import TWSConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Job state machine used for status churn: status -> [(next_status, weight)]
+JOB_TRANSITIONS: Dict[str, List[tuple[str, float]]] = {
+    "HOLD": [("READY", 1.0)],
+    "READY": [("EXEC", 1.0)],
+    "EXEC": [("SUCC", 0.95), ("ABEND", 0.05)],
+    "ABEND": [("EXEC", 0.3), ("ABEND", 0.7)],
+    "SUCC": [("SUCC", 1.0)],
+    "CANCEL": [("CANCEL", 1.0)],
+}
+
+EVENT_TYPES = {
+    "EXEC": "JOB_STARTED",
+    "SUCC": "JOB_COMPLETED",
+    "ABEND": "JOB_ABENDED",
+    "READY": "JOB_READY",
+}
+
+
+@dataclass
+class LatencyProfile:
+    """
+    Latency and failure model for simulated TWS calls.
+
+    Latencies follow a log-normal distribution around ``median_seconds``;
+    with probability ``spike_probability`` the sampled latency is multiplied
+    by ``spike_multiplier``, and with probability ``error_rate`` the call
+    fails with :class:`TWSConnectionError`. The defaults reproduce the
+    historical fixed 100 ms delay of ``MockTWSClient``.
+    """
+
+    median_seconds: float = 0.1
+    sigma: float = 0.0
+    spike_probability: float = 0.0
+    spike_multiplier: float = 10.0
+    error_rate: float = 0.0
+    seed: Optional[int] = None
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    def sample(self, scale: float = 1.0) -> float:
+        """Sample a latency in seconds for a single call."""
+        latency = self.median_seconds * scale
+        if self.sigma > 0:
+            latency *= math.exp(self._rng.gauss(0.0, self.sigma))
+        if self.spike_probability and self._rng.random() < self.spike_probability:
+            latency *= self.spike_multiplier
+        return latency
+
+    async def apply(self, scale: float = 1.0) -> None:
+        """
+        Sleep for a sampled latency and possibly raise a simulated failure.
+
+        Raises:
+            TWSConnectionError: With probability ``error_rate``.
+        """
+        latency = self.sample(scale)
+        if latency > 0:
+            await asyncio.sleep(latency)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise TWSConnectionError(
+                "Simulated TWS error", details={"latency_seconds": latency}
+            )
+
+
+@dataclass
+class SyntheticPlanConfig:
+    """Shape of a generated TWS plan."""
+
+    num_jobs: int = 100_000
+    num_workstations: int = 2_000
+    jobs_per_stream: int = 50
+    avg_dependencies: float = 1.5
+    cross_stream_probability: float = 0.1
+    dependency_window: int = 500
+    status_weights: Dict[str, float] = field(
+        default_factory=lambda: {
+            "SUCC": 0.55,
+            "EXEC": 0.05,
+            "READY": 0.15,
+            "HOLD": 0.2,
+            "ABEND": 0.04,
+            "CANCEL": 0.01,
+        }
+    )
+    workstation_status_weights: Dict[str, float] = field(
+        default_factory=lambda: {"LINKED": 0.95, "UNLINKED": 0.04, "DOWN": 0.01}
+    )
+    workstation_types: Dict[str, float] = field(
+        default_factory=lambda: {"FTA": 0.7, "AGENT": 0.25, "MASTER": 0.05}
+    )
+    median_duration_seconds: float = 300.0
+    churn_rate: float = 0.001
+    workstation_flap_rate: float = 0.0005
+    max_events: int = 50_000
+    critical_path_limit: int = 50
+    seed: int = 42
+
+
+class SyntheticTWSEnvironment:
+    """
+    In-memory synthetic TWS plan with a dependency DAG and status churn.
+
+    Jobs are generated in topological order and only depend on jobs with a
+    lower index, which guarantees the dependency graph is acyclic. Job and
+    workstation records are plain dicts shaped like TWS API payloads so they
+    can be served directly by ``MockTWSClient``.
+    """
+
+    def __init__(self, config: Optional[SyntheticPlanConfig] = None) -> None:
+        self.config = config or SyntheticPlanConfig()
+        self._rng = random.Random(self.config.seed)
+        self.created_at = datetime.now()
+        self.workstations: List[Dict[str, Any]] = []
+        self.jobs: List[Dict[str, Any]] = []
+        self.durations: List[float] = []
+        self.predecessors: List[List[int]] = []
+        self.successors: List[List[int]] = []
+        self.job_index: Dict[str, int] = {}
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=self.config.max_events)
+        self.critical_path: List[Dict[str, Any]] = []
+        self.ticks = 0
+        self._event_seq = 0
+
+        started = time.perf_counter()
+        self._generate_workstations()
+        self._generate_jobs()
+        self._compute_critical_path()
+        logger.info(
+            "Synthetic TWS environment generated: %d jobs, %d workstations in %.2fs",
+            len(self.jobs),
+            len(self.workstations),
+            time.perf_counter() - started,
+        )
+
+    def _weighted(self, weights: Dict[str, float], k: int) -> List[str]:
+        return self._rng.choices(list(weights), weights=list(weights.values()), k=k)
+
+    def _generate_workstations(self) -> None:
+        n = self.config.num_workstations
+        statuses = self._weighted(self.config.workstation_status_weights, n)
+        types = self._weighted(self.config.workstation_types, n)
+        self.workstations = [
+            {"name": f"WS{i:05d}", "status": statuses[i], "type": types[i]}
+            for i in range(n)
+        ]
+
+    def _generate_jobs(self) -> None:
+        cfg = self.config
+        rng = self._rng
+        n = cfg.num_jobs
+        statuses = self._weighted(cfg.status_weights, n)
+        # Streams run on a home workstation, as in typical TWS plans
+        num_streams = max(1, math.ceil(n / cfg.jobs_per_stream))
+        stream_ws = [
+            rng.randrange(max(1, cfg.num_workstations)) for _ in range(num_streams)
+        ]
+        log_median = math.log(cfg.median_duration_seconds)
+
+        self.jobs = [None] * n  # type: ignore[list-item]
+        self.durations = [0.0] * n
+        self.predecessors = [[] for _ in range(n)]
+        self.successors = [[] for _ in range(n)]
+
+        for i in range(n):
+            stream = i // cfg.jobs_per_stream
+            name = f"JOB{i:06d}"
+            ws_name = (
+                self.workstations[stream_ws[stream]]["name"]
+                if self.workstations
+                else "CPU_WS"
+            )
+            self.jobs[i] = {
+                "name": name,
+                "workstation": ws_name,
+                "status": statuses[i],
+                "job_stream": f"STREAM{stream:05d}",
+            }
+            self.job_index[name] = i
+            self.durations[i] = rng.lognormvariate(log_median, 0.8)
+
+            if i == 0:
+                continue
+            stream_start = stream * cfg.jobs_per_stream
+            # Poisson-distributed fan-in keeps the average near avg_dependencies
+            k = self._poisson(cfg.avg_dependencies)
+            deps = set()
+            for _ in range(k):
+                if stream_start < i and rng.random() >= cfg.cross_stream_probability:
+                    deps.add(rng.randrange(stream_start, i))
+                else:
+                    deps.add(rng.randrange(max(0, i - cfg.dependency_window), i))
+            for dep in sorted(deps):
+                self.predecessors[i].append(dep)
+                self.successors[dep].append(i)
+
+    def _poisson(self, lam: float) -> int:
+        # Knuth's algorithm, adequate for the small means used here
+        threshold = math.exp(-lam)
+        k = 0
+        p = self._rng.random()
+        while p > threshold:
+            k += 1
+            p *= self._rng.random()
+        return k
+
+    def _compute_critical_path(self) -> None:
+        """Longest duration-weighted path through the DAG (O(jobs + edges))."""
+        n = len(self.jobs)
+        if n == 0:
+            return
+        finish = [0.0] * n
+        parent = [-1] * n
+        for i in range(n):
+            best = 0.0
+            for dep in self.predecessors[i]:
+                if finish[dep] > best:
+                    best = finish[dep]
+                    parent[i] = dep
+            finish[i] = best + self.durations[i]
+
+        node = max(range(n), key=finish.__getitem__)
+        path = []
+        while node != -1:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+
+        start = self.created_at
+        self.critical_path = []
+        for node in path[: self.config.critical_path_limit]:
+            begin = start + timedelta(seconds=finish[node] - self.durations[node])
+            self.critical_path.append(
+                {
+                    "job_id": node,
+                    "job_name": self.jobs[node]["name"],
+                    "status": self.jobs[node]["status"],
+                    "start_time": begin.isoformat(),
+                }
+            )
+
+    def tick(self) -> int:
+        """
+        Apply one round of status churn to jobs and workstations.
+
+        Returns:
+            The number of status changes applied.
+        """
+        cfg = self.config
+        rng = self._rng
+        changes = 0
+        self.ticks += 1
+
+        num_jobs = len(self.jobs)
+        for _ in range(int(num_jobs * cfg.churn_rate)):
+            i = rng.randrange(num_jobs)
+            job = self.jobs[i]
+            transitions = JOB_TRANSITIONS.get(job["status"])
+            if not transitions:
+                continue
+            new_status = rng.choices(
+                [t[0] for t in transitions], weights=[t[1] for t in transitions]
+            )[0]
+            if new_status != job["status"]:
+                job["status"] = new_status
+                changes += 1
+                self._record_event(
+                    EVENT_TYPES.get(new_status, "JOB_STATUS_CHANGED"),
+                    "ERROR" if new_status == "ABEND" else "INFO",
+                    f"Job {job['name']} changed status to {new_status}",
+                    job_id=job["name"],
+                    workstation=job["workstation"],
+                )
+
+        num_ws = len(self.workstations)
+        for _ in range(int(num_ws * cfg.workstation_flap_rate) or 0):
+            ws = self.workstations[rng.randrange(num_ws)]
+            ws["status"] = "UNLINKED" if ws["status"] == "LINKED" else "LINKED"
+            changes += 1
+            self._record_event(
+                f"WORKSTATION_{ws['status']}",
+                "WARNING" if ws["status"] != "LINKED" else "INFO",
+                f"Workstation {ws['name']} is now {ws['status']}",
+                workstation=ws["name"],
+            )
+
+        # Keep critical path statuses in sync with the underlying jobs
+        for entry in self.critical_path:
+            entry["status"] = self.jobs[entry["job_id"]]["status"]
+        return changes
+
+    def _record_event(
+        self,
+        event_type: str,
+        severity: str,
+        message: str,
+        job_id: Optional[str] = None,
+        workstation: Optional[str] = None,
+    ) -> None:
+        self._event_seq += 1
+        self.events.append(
+            {
+                "event_id": f"EVT{self._event_seq:09d}",
+                "timestamp": datetime.now(),
+                "event_type": event_type,
+                "severity": severity,
+                "source": "SYNTHETIC_TWS",
+                "message": message,
+                "job_id": job_id,
+                "workstation": workstation,
+            }
+        )
+
+    def get_job(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return the job record for ``name``, if it exists."""
+        index = self.job_index.get(name)
+        return self.jobs[index] if index is not None else None
+
+    def dependency_tree(self, name: str) -> Dict[str, Any]:
+        """Return direct dependencies/dependents shaped like ``DependencyTree``."""
+        index = self.job_index.get(name)
+        if index is None:
+            return {"job_id": name, "dependencies": [], "dependents": []}
+        dependencies = [self.jobs[d]["name"] for d in self.predecessors[index]]
+        dependents = [self.jobs[d]["name"] for d in self.successors[index]]
+        graph = {name: dependencies}
+        for dependent in dependents:
+            graph[dependent] = [name]
+        return {
+            "job_id": name,
+            "dependencies": dependencies,
+            "dependents": dependents,
+            "dependency_graph": graph,
+        }
+
+    def events_since(self, since: datetime) -> List[Dict[str, Any]]:
+        """Return events newer than ``since`` (events are time-ordered)."""
+        result = []
+        for event in reversed(self.events):
+            if event["timestamp"] < since:
+                break
+            result.append(event)
+        result.reverse()
+        return result
+
+    def to_mock_data(self) -> Dict[str, Any]:
+        """
+        Expose the environment in the ``mock_tws_data.json`` layout.
+
+        The returned lists are the live records, so churn applied through
+        :meth:`tick` is visible without rebuilding the dict.
+        """
+        return {
+            "connection_status": True,
+            "workstations_status": self.workstations,
+            "jobs_status": self.jobs,
+            "critical_path_status": self.critical_path,
+        }
@@ -9,17 +9,22 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
 import re
+import time
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator, Optional, Sequence
 
 import httpx
 from dateutil import parser
 
 from resync.core.cache_hierarchy import get_cache_hierarchy
+from resync.core.circuit_breaker_state import get_breaker_state_store
 from resync.core.connection_pool_manager import get_connection_pool_manager
+from resync.core.event_log_store import EventLogStore
 from resync.core.exceptions import TWSConnectionError
-from resync.core.resilience import CircuitBreakerManager, CircuitBreakerError, retry_with_backoff_async, with_timeout
+from resync.core.job_log_store import JobLogRange, SegmentedJobLogStore
+from resync.core.resilience import CircuitBreakerManager, CircuitBreakerError, get_retry_budget, retry_with_backoff_async, with_timeout
 from resync.models.tws import (
     CriticalJob,
     DependencyTree,
@@ -28,11 +33,13 @@ from resync.models.tws import (
     JobExecution,
     JobStatus,
     PerformanceData,
+    PlanDependencyGraph,
     PlanDetails,
     ResourceStatus,
     SystemStatus,
     WorkstationStatus,
 )
+from resync.models.tws_bulk import decode_model_list
 from resync.services.http_client_factory import create_async_http_client, create_tws_http_client
 from resync.settings import settings  # New import
 
@@ -51,11 +58,37 @@ SAFE_JOB_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
 # --- Constants ---
 # Default timeout for HTTP requests to prevent indefinite hangs
 DEFAULT_TIMEOUT = 30.0
+# Minimum interval between incremental event log fetches
+EVENT_LOG_REFRESH_SECONDS = 15.0
+# Re-fetch this much before the watermark to catch late-arriving events
+EVENT_LOG_OVERLAP_SECONDS = 60.0
 
 
 # --- Caching Mechanism ---
 # CacheEntry and SimpleTTLCache moved to resync.core.async_cache
 # Now using AsyncTTLCache for truly async operations
+# Client cache keys covered by each CQRS invalidation tag (see
+# resync.cqrs.dispatcher._register_cache_policies); "job:<id>" covers the
+# per-job keys below.
+CACHE_KEYS_BY_TAG = {
+    "jobs": ("jobs_status", "critical_path_status"),
+    "workstations": ("workstations_status",),
+    "plan": ("plan_details", "critical_path_status"),
+    "resources": ("resource_usage",),
+}
+JOB_CACHE_KEYS = ("job_status:{}", "job_details:{}", "job_dependencies:{}", "job_history:{}")
+
+
+def cache_keys_for_tags(tags: Sequence[str]) -> list[str]:
+    """Return the client cache keys holding data covered by ``tags``."""
+    keys: dict[str, None] = {}
+    for tag in tags:
+        if tag.startswith("job:"):
+            job_id = tag[len("job:") :]
+            keys.update(dict.fromkeys(key.format(job_id) for key in JOB_CACHE_KEYS))
+        else:
+            keys.update(dict.fromkeys(CACHE_KEYS_BY_TAG.get(tag, ())))
+    return list(keys)
 
 
 # --- TWS Client ---
@@ -74,6 +107,7 @@ class OptimizedTWSClient:
         engine_name: str = "tws-engine",
         engine_owner: str = "tws-owner",
         use_connection_pool: bool = True,
+        trusted_payloads: bool = False,
     ):
         self.hostname = hostname
         self.port = port
@@ -85,6 +119,8 @@ class OptimizedTWSClient:
         self.base_url = f"http://{hostname}:{port}/twsd"
         self.auth = (username, password)
         self.use_connection_pool = use_connection_pool
+        # Skip re-validating list responses whose shape TWS already guarantees
+        self.trusted_payloads = trusted_payloads
         self._pool_manager: Any = None
 
         if use_connection_pool:
@@ -100,10 +136,20 @@ class OptimizedTWSClient:
 
         # Caching layer to reduce redundant API calls - using a direct Redis cache
         self.cache = get_cache_hierarchy()
+        # Job logs are cached as fixed-size segments so ranged reads stay cheap
+        self.job_log_store = SegmentedJobLogStore(self.cache)
+        # Events are stored locally and refreshed incrementally
+        self.event_store = EventLogStore()
+        self._event_log_lock = asyncio.Lock()
+        self._event_log_refreshed_at = 0.0
         logger.info("OptimizedTWSClient initialized for base URL: %s", self.base_url)
 
-        # Initialize centralized resilience manager
-        self.cbm = CircuitBreakerManager()
+        # Retries across all TWS calls draw from one shared budget
+        self.retry_budget = get_retry_budget("tws")
+
+        # Initialize centralized resilience manager; breaker state is shared
+        # across workers when APP_CIRCUIT_BREAKER_SHARED_STATE is enabled
+        self.cbm = CircuitBreakerManager(state_store=get_breaker_state_store())
         # Register circuit breakers for all TWS endpoints
         self.cbm.register("tws_http_client", fail_max=3, reset_timeout=30)
         self.cbm.register("tws_ping", fail_max=5, reset_timeout=60)
@@ -115,32 +161,38 @@ class OptimizedTWSClient:
         self.cbm.register("tws_job_log", fail_max=3, reset_timeout=30)
         self.cbm.register("tws_plan_details", fail_max=3, reset_timeout=30)
         self.cbm.register("tws_job_dependencies", fail_max=3, reset_timeout=30)
+        self.cbm.register("tws_plan_dependencies", fail_max=3, reset_timeout=60)
         self.cbm.register("tws_resource_usage", fail_max=3, reset_timeout=30)
         self.cbm.register("tws_event_log", fail_max=3, reset_timeout=30)
         self.cbm.register("tws_performance_metrics", fail_max=2, reset_timeout=60)
 
-    async def _get_http_client(self) -> Any:
-        """Get HTTP client from connection pool or use direct client."""
+    @asynccontextmanager
+    async def _http_client(self) -> AsyncIterator[Any]:
+        """
+        Yields the HTTP client for one request: the shared client of the
+        ``tws_http`` pool, held for the request's lifetime, or the direct client.
+        """
         if self.use_connection_pool:
             if self._pool_manager is None:
                 self._pool_manager = await get_connection_pool_manager()
-            pool = self._pool_manager.get_pool("tws_http")
+            pool = await self._pool_manager.get_pool("tws_http")
             if pool:
-                return await pool.get_connection()
-            else:
-                logger.warning(
-                    "TWS HTTP connection pool not available, falling back to direct client"
+                async with pool.get_connection() as client:
+                    yield client
+                return
+            logger.warning(
+                "TWS HTTP connection pool not available, falling back to direct client"
+            )
+            # Fallback to direct client if pool not available
+            if not hasattr(self, "client"):
+                self.client = create_async_http_client(
+                    base_url=self.base_url,
+                    auth=self.auth,
+                    verify=True,
                 )
-                # Fallback to direct client if pool not available
-                if not hasattr(self, "client"):
-                    self.client = create_async_http_client(
-                        base_url=self.base_url,
-                        auth=self.auth,
-                        verify=True,
-                    )
-                return self.client
+            yield self.client
         else:
-            return self.client if hasattr(self, "client") else None
+            yield self.client if hasattr(self, "client") else None
 
     async def _make_request(
         self, method: str, url: str, **kwargs: Any
@@ -148,13 +200,12 @@ class OptimizedTWSClient:
         """Makes an HTTP request with retry logic using connection pool."""
         logger.debug("Making request: %s %s", method.upper(), url)
 
-        # Get client from connection pool or use direct client
-        client = await self._get_http_client()
-        if client is None:
-            raise TWSConnectionError("No HTTP client available")
-
         async def _once():
-            response = await client.request(method, url, **kwargs)
+            # Client from the connection pool or the direct client
+            async with self._http_client() as client:
+                if client is None:
+                    raise TWSConnectionError("No HTTP client available")
+                response = await client.request(method, url, **kwargs)
             response.raise_for_status()
             return response
 
@@ -162,16 +213,26 @@ class OptimizedTWSClient:
             resp = await self.cbm.call("tws_http_client", _once)
             return resp
 
-        resp = await retry_with_backoff_async_async(_call, retries=3, base_delay=1.0, cap=10.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+        # The only retry layer for _api_request calls, so each logical TWS
+        # request is counted once against the retry budget
+        resp = await retry_with_backoff_async(_call, retries=3, base_delay=1.0, cap=10.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError), budget=self.retry_budget)
         return resp
 
     @asynccontextmanager
     async def _api_request(
-        self, method: str, url: str, **kwargs: Any
-    ) -> AsyncGenerator[dict[str, Any] | list[Any], None]:
-        """A context manager for making robust API requests."""
+        self, method: str, url: str, raw: bool = False, **kwargs: Any
+    ) -> AsyncGenerator[dict[str, Any] | list[Any] | bytes, None]:
+        """
+        A context manager for making robust API requests.
+
+        With ``raw=True`` the undecoded response body is yielded so large list
+        responses can be decoded in bulk (see ``resync.models.tws_bulk``).
+        """
         try:
             response = await self._make_request(method, url, **kwargs)
+            if raw:
+                yield response.content
+                return
             data = response.json()
             if isinstance(data, (dict, list)):
                 yield data
@@ -210,14 +271,13 @@ class OptimizedTWSClient:
             TWSConnectionError: If the server is unreachable, unresponsive, or times out.
         """
         try:
-            # Get client from connection pool or use direct client
-            client = await self._get_http_client()
-            if client is None:
-                raise TWSConnectionError("No HTTP client available for ping")
-
             # Use a simple HEAD request to the base URL to test connectivity
             async def _once():
-                response = await client.head("", timeout=5.0)
+                # Client from the connection pool or the direct client
+                async with self._http_client() as client:
+                    if client is None:
+                        raise TWSConnectionError("No HTTP client available for ping")
+                    response = await client.head("", timeout=5.0)
                 response.raise_for_status()
                 return response
 
@@ -225,7 +285,7 @@ class OptimizedTWSClient:
                 resp = await self.cbm.call("tws_ping", _once)
                 return resp
 
-            resp = await retry_with_backoff_async_async(_call, retries=2, base_delay=0.5, cap=3.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+            resp = await retry_with_backoff_async(_call, retries=2, base_delay=0.5, cap=3.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError), budget=self.retry_budget)
         except httpx.TimeoutException as e:
             logger.warning("TWS server ping timed out")
             raise TWSConnectionError("TWS server ping timed out", original_exception=e)
@@ -249,7 +309,7 @@ class OptimizedTWSClient:
                 result = await self.cbm.call("tws_check_connection", _once)
                 return result
 
-            result = await retry_with_backoff_async_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+            result = await _call()
             return result
         except TWSConnectionError:
             return False
@@ -263,16 +323,16 @@ class OptimizedTWSClient:
 
         url = f"/model/workstation?engineName={self.engine_name}&engineOwner={self.engine_owner}"
         async def _once():
-            async with self._api_request("GET", url) as data:
-                return [
-                    WorkstationStatus(**ws) for ws in data
-                ] if isinstance(data, list) else []
+            async with self._api_request("GET", url, raw=True) as body:
+                return decode_model_list(
+                    WorkstationStatus, body, trusted=self.trusted_payloads
+                )
 
         async def _call():
             result = await self.cbm.call("tws_workstations", _once)
             return result
 
-        workstations = await retry_with_backoff_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+        workstations = await _call()
         await self.cache.set(
             cache_key, workstations
         )  # ttl not supported in current cache implementation
@@ -287,14 +347,16 @@ class OptimizedTWSClient:
 
         url = f"/model/jobdefinition?engineName={self.engine_name}&engineOwner={self.engine_owner}"
         async def _once():
-            async with self._api_request("GET", url) as data:
-                return [JobStatus(**job) for job in data] if isinstance(data, list) else []
+            async with self._api_request("GET", url, raw=True) as body:
+                return decode_model_list(
+                    JobStatus, body, trusted=self.trusted_payloads
+                )
 
         async def _call():
             result = await self.cbm.call("tws_jobs_status", _once)
             return result
 
-        jobs = await retry_with_backoff_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+        jobs = await _call()
         await self.cache.set(
             cache_key, jobs
         )  # ttl not supported in current cache implementation
@@ -319,7 +381,7 @@ class OptimizedTWSClient:
             result = await self.cbm.call("tws_critical_path", _once)
             return result
 
-        critical_jobs = await retry_with_backoff_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+        critical_jobs = await _call()
         await self.cache.set(
             cache_key, critical_jobs
         )  # ttl not supported in current cache implementation
@@ -409,7 +471,7 @@ class OptimizedTWSClient:
             result = await self.cbm.call("tws_job_details", _once)
             return result
 
-        job_details = await retry_with_backoff_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+        job_details = await _call()
         await self.cache.set(cache_key, job_details.dict())
         return job_details
 
@@ -472,39 +534,105 @@ class OptimizedTWSClient:
             result = await self.cbm.call("tws_job_history", _once)
             return result
 
-        executions = await retry_with_backoff_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+        executions = await _call()
         await self.cache.set(cache_key, [e.dict() for e in executions])
         return executions
 
     async def get_job_log(self, job_id: str) -> str:
         """Retrieves the log content for a specific job execution."""
-        cache_key = f"job_log:{job_id}"
-        cached_data = await self.cache.get(cache_key)
-        if cached_data:
-            return str(cached_data)
+        return "".join([chunk async for chunk in self.stream_job_log(job_id)])
+
+    async def stream_job_log(
+        self, job_id: str, log_range: Optional[JobLogRange] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streams the log content for a specific job execution.
+
+        The log is fetched once and cached as fixed-size segments; subsequent
+        ranged reads (byte range, line range or tail) only load the segments
+        they need.
 
+        Args:
+            job_id: The job whose log should be returned
+            log_range: Optional part of the log to return (defaults to all)
+
+        Yields:
+            Decoded chunks of the selected log content
+        """
         # Validate job_id format
         if not SAFE_JOB_ID_PATTERN.match(job_id):
             logger.warning(f"Invalid job_id format: {job_id}")
             raise ValueError(f"Invalid job_id format: {job_id}")
 
+        if await self.job_log_store.get_manifest(job_id) is None:
+            await self._fetch_job_log_segments(job_id)
+
+        sent = False
+        try:
+            async for chunk in self.job_log_store.read(job_id, log_range):
+                sent = True
+                yield chunk
+        except KeyError as e:
+            if sent:
+                # Part of the log was already sent; a retry would repeat it
+                raise TWSConnectionError(
+                    f"Job log for {job_id} was evicted while being read",
+                    original_exception=e,
+                )
+            # A segment was evicted before anything was sent; refetch once and retry
+            logger.debug(f"Job log segments for {job_id} evicted, refetching")
+            await self._fetch_job_log_segments(job_id)
+            async for chunk in self.job_log_store.read(job_id, log_range):
+                yield chunk
+
+    async def _fetch_job_log_segments(self, job_id: str) -> None:
+        """Streams a job log from TWS directly into the segmented cache."""
         url = f"/model/jobdefinition/{job_id}/log?engineName={self.engine_name}&engineOwner={self.engine_owner}"
+
         async def _once():
-            async with self._api_request("GET", url) as data:
-                log_content = ""
-                if isinstance(data, dict):
-                    log_content = data.get("log_content", "")
-                elif isinstance(data, str):
-                    log_content = data
-                return log_content
+            async with self._http_client() as client:
+                if client is None:
+                    raise TWSConnectionError("No HTTP client available")
+
+                async with client.stream("GET", url) as response:
+                    if response.is_error:
+                        # The error handler logs the body, which a stream has not read yet
+                        await response.aread()
+                    response.raise_for_status()
+                    content_type = response.headers.get("content-type", "")
+                    if "json" in content_type:
+                        # Legacy payload: {"log_content": "..."} must be parsed whole
+                        await response.aread()
+                        data = response.json()
+                        log_content = ""
+                        if isinstance(data, dict):
+                            log_content = data.get("log_content", "")
+                        elif isinstance(data, str):
+                            log_content = data
+                        return await self.job_log_store.write_text(job_id, log_content)
+                    return await self.job_log_store.write(job_id, response.aiter_bytes())
 
         async def _call():
             result = await self.cbm.call("tws_job_log", _once)
             return result
 
-        log_content = await retry_with_backoff_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
-        await self.cache.set(cache_key, log_content)
-        return log_content
+        try:
+            await retry_with_backoff_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError), budget=self.retry_budget)
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                "HTTP error occurred: %s - %s",
+                e.response.status_code,
+                e.response.text,
+            )
+            raise TWSConnectionError(
+                f"HTTP error: {e.response.status_code}", original_exception=e
+            )
+        except httpx.RequestError as e:
+            logger.error("Network error during API request: %s", str(e))
+            raise TWSConnectionError(
+                f"Network error during API request: {e.request.url}",
+                original_exception=e,
+            )
 
     async def get_plan_details(self) -> PlanDetails:
         """Retrieves details about the current TWS plan."""
@@ -552,7 +680,7 @@ class OptimizedTWSClient:
             result = await self.cbm.call("tws_plan_details", _once)
             return result
 
-        plan_details = await retry_with_backoff_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+        plan_details = await _call()
         await self.cache.set(cache_key, plan_details.dict())
         return plan_details
 
@@ -592,10 +720,29 @@ class OptimizedTWSClient:
             result = await self.cbm.call("tws_job_dependencies", _once)
             return result
 
-        dependency_tree = await retry_with_backoff_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+        dependency_tree = await _call()
         await self.cache.set(cache_key, dependency_tree.dict())
         return dependency_tree
 
+    async def get_plan_dependency_graph(self) -> PlanDependencyGraph:
+        """
+        Retrieves the dependency edges of every job in the current plan.
+
+        Used to build the in-memory dependency DAG
+        (``resync.core.dependency_graph``); not cached here because the
+        graph service applies each snapshot incrementally.
+        """
+        url = f"/plan/current/dependencies?engineName={self.engine_name}&engineOwner={self.engine_owner}"
+        async def _once():
+            async with self._api_request("GET", url, raw=True) as body:
+                return PlanDependencyGraph.model_validate_json(body)
+
+        async def _call():
+            result = await self.cbm.call("tws_plan_dependencies", _once)
+            return result
+
+        return await _call()
+
     async def get_resource_usage(self) -> list[ResourceStatus]:
         """Retrieves resource usage information."""
         cache_key = "resource_usage"
@@ -637,22 +784,54 @@ class OptimizedTWSClient:
             result = await self.cbm.call("tws_resource_usage", _once)
             return result
 
-        resources = await retry_with_backoff_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+        resources = await _call()
         await self.cache.set(cache_key, [r.dict() for r in resources])
         return resources
 
-    async def get_event_log(self, last_hours: int = 24) -> list[Event]:
-        """Retrieves TWS event log entries."""
-        cache_key = f"event_log:{last_hours}h"
-        cached_data = await self.cache.get(cache_key)
-        if cached_data:
-            return (
-                [Event(**event) for event in cached_data]
-                if isinstance(cached_data, list)
-                else []
-            )
+    async def get_event_log(
+        self, last_hours: int = 24, event_types: Optional[Sequence[str]] = None
+    ) -> list[Event]:
+        """
+        Retrieves TWS event log entries from the last ``last_hours`` hours.
+
+        Events are kept in a local time-indexed store: the first call loads
+        the whole window, later calls only fetch events newer than the
+        store's watermark (plus a small overlap for late arrivals).
 
-        url = f"/events?since={last_hours}h&engineName={self.engine_name}&engineOwner={self.engine_owner}"
+        Args:
+            last_hours: Size of the time window in hours
+            event_types: Only return events of these types
+        """
+        async with self._event_log_lock:
+            now = time.time()
+            since = now - last_hours * 3600
+            store = self.event_store
+            if not store.covers(since):
+                window = f"{last_hours}h"
+                fetch_from = since
+            elif now - self._event_log_refreshed_at >= EVENT_LOG_REFRESH_SECONDS:
+                fetch_from = store.watermark - EVENT_LOG_OVERLAP_SECONDS
+                window = f"{math.ceil((now - fetch_from) / 60)}m"
+            else:
+                window = None
+
+            if window is not None:
+                events = await self._fetch_events(window)
+                added = store.append(events)
+                store.mark_covered(fetch_from, now)
+                self._event_log_refreshed_at = now
+                logger.debug(
+                    "Event log refresh (since=%s): %d fetched, %d new",
+                    window,
+                    len(events),
+                    added,
+                )
+
+            return store.query(start=since, event_types=event_types)
+
+    async def _fetch_events(self, window: str) -> list[Event]:
+        """Fetches events newer than ``window`` (e.g. ``24h`` or ``5m``)."""
+        url = f"/events?since={window}&engineName={self.engine_name}&engineOwner={self.engine_owner}"
         async def _once():
             async with self._api_request("GET", url) as data:
                 events = []
@@ -688,9 +867,7 @@ class OptimizedTWSClient:
             result = await self.cbm.call("tws_event_log", _once)
             return result
 
-        events = await retry_with_backoff_async(_call, retries=2, base_delay=1.0, cap=5.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
-        await self.cache.set(cache_key, [e.dict() for e in events])
-        return events
+        return await _call()
 
     async def get_performance_metrics(self) -> PerformanceData:
         """Retrieves TWS performance metrics."""
@@ -732,7 +909,7 @@ class OptimizedTWSClient:
             result = await self.cbm.call("tws_performance_metrics", _once)
             return result
 
-        performance_data = await retry_with_backoff_async(_call, retries=3, base_delay=1.0, cap=8.0, jitter=True, retry_on=(httpx.RequestError, httpx.TimeoutException, CircuitBreakerError))
+        performance_data = await _call()
         await self.cache.set(cache_key, performance_data.dict())
         return performance_data
 
@@ -898,6 +1075,20 @@ class OptimizedTWSClient:
                 "port": test_port,
             }
 
+    async def invalidate_cache_tags(self, tags: Sequence[str]) -> int:
+        """
+        Delete the cached responses covered by CQRS invalidation ``tags``, so
+        a query re-run after a command reaches TWS instead of this cache.
+
+        Returns:
+            The number of cache entries deleted.
+        """
+        deleted = 0
+        for key in cache_keys_for_tags(tags):
+            if await self.cache.delete(key):
+                deleted += 1
+        return deleted
+
     async def invalidate_system_cache(self) -> None:
         """Invalidates system-level cache."""
         logger.info("Invalidating system-level TWS cache")
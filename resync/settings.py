@@ -260,6 +260,21 @@ class Settings(BaseSettings):
     )
 
 
+    # Synthetic mock environment (load/performance testing, fully offline)
+    tws_mock_synthetic_jobs: int = Field(
+        default=0,
+        ge=0,
+        description="Generate a synthetic plan with this many jobs (0 = use mock_tws_data.json)"
+    )
+    tws_mock_synthetic_workstations: int = Field(default=2000, ge=1)
+    tws_mock_synthetic_seed: int = Field(default=42)
+    tws_mock_latency_median_ms: float = Field(default=100.0, ge=0)
+    tws_mock_latency_sigma: float = Field(
+        default=0.0, ge=0, description="Log-normal sigma for mock latency (0 = fixed)"
+    )
+    tws_mock_latency_spike_probability: float = Field(default=0.0, ge=0, le=1)
+    tws_mock_error_rate: float = Field(default=0.0, ge=0, le=1)
+
     tws_host: str | None = Field(default=None)
     tws_port: int | None = Field(default=None, ge=1, le=65535)
     tws_user: str | None = Field(
@@ -279,6 +294,29 @@ class Settings(BaseSettings):
     tws_request_timeout: float = Field(
         default=30.0, description="Timeout for TWS requests in seconds"
     )
+    tws_trusted_payloads: bool = Field(
+        default=False,
+        description="Skip Pydantic validation of bulk TWS list responses (trusted source)"
+    )
+    cqrs_slow_query_threshold_ms: float | None = Field(
+        default=None,
+        ge=0,
+        description="Log CQRS commands/queries slower than this (None = disabled)"
+    )
+    circuit_breaker_shared_state: bool = Field(
+        default=False,
+        description="Share circuit breaker state across workers through Redis"
+    )
+    circuit_breaker_state_cache_ttl: float = Field(
+        default=1.0,
+        ge=0,
+        description="Seconds a worker caches shared circuit breaker state"
+    )
+    status_feed_poll_interval: float = Field(
+        default=5.0,
+        gt=0,
+        description="Seconds between TWS snapshots diffed for the status change-feed"
+    )
 
     tws_ca_bundle: str | None = Field(
         default=None, description="CA bundle for TWS TLS verification (ignored if tws_verify=False)"
@@ -292,6 +330,16 @@ class Settings(BaseSettings):
     http_pool_connect_timeout: int = Field(default=10, ge=1)
     http_pool_health_check_interval: int = Field(default=60, ge=10)
     http_pool_max_lifetime: int = Field(default=1800, ge=300)
+    # Below the 30s persistent-connection timeout of the TWS (Liberty) server,
+    # so idle connections are dropped by the client before the server closes them
+    http_pool_keepalive_expiry: float = Field(default=25.0, gt=0)
+    http_pool_max_keepalive: int = Field(default=10, ge=1)
+    http_pool_http2: bool = Field(
+        default=False,
+        description="Multiplex TWS requests over HTTP/2 (requires the h2 package)",
+    )
+    http_pool_max_concurrent_streams: int = Field(default=100, ge=1)
+    http_pool_prewarm_connections: int = Field(default=0, ge=0)
 
     # ============================================================================
     # SEGURANÇA
@@ -357,6 +405,26 @@ class Settings(BaseSettings):
         default_factory=lambda: [Path.cwd() / "resync/RAG/BASE"],
         description="Protected directories that should not be modified"
     )
+    ingestion_pipeline_processes: int = Field(
+        default=0,
+        ge=0,
+        description="Extraction processes for bulk file ingestion (0 = one per CPU)"
+    )
+    ingestion_pipeline_queue_size: int = Field(
+        default=32,
+        ge=1,
+        description="Capacity of each queue between bulk ingestion stages"
+    )
+    ingestion_pipeline_storage_batch_size: int = Field(
+        default=64,
+        ge=1,
+        description="Chunks added to the knowledge graph per storage batch"
+    )
+    ingestion_pipeline_storage_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Concurrent knowledge graph writes per storage batch"
+    )
 
 
     # ============================================================================
@@ -634,6 +702,26 @@ class Settings(BaseSettings):
     def HTTP_POOL_MAX_LIFETIME(self) -> int:
         return self.http_pool_max_lifetime
 
+    @property
+    def HTTP_POOL_KEEPALIVE_EXPIRY(self) -> float:
+        return self.http_pool_keepalive_expiry
+
+    @property
+    def HTTP_POOL_MAX_KEEPALIVE(self) -> int:
+        return self.http_pool_max_keepalive
+
+    @property
+    def HTTP_POOL_HTTP2(self) -> bool:
+        return self.http_pool_http2
+
+    @property
+    def HTTP_POOL_MAX_CONCURRENT_STREAMS(self) -> int:
+        return self.http_pool_max_concurrent_streams
+
+    @property
+    def HTTP_POOL_PREWARM_CONNECTIONS(self) -> int:
+        return self.http_pool_prewarm_connections
+
     # ============================================================================
     # MIGRATION GRADUAL - FEATURE FLAGS
     # ============================================================================
@@ -5,17 +5,30 @@ from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from resync.core.dependency_graph import get_dependency_graph_service
 from resync.core.exceptions import (
     ToolConnectionError,
     ToolExecutionError,
     ToolProcessingError,
     TWSConnectionError,
 )
+from resync.core.status_summary import get_status_summary_service
 from resync.services.tws_service import OptimizedTWSClient
 
 # --- Logging Setup ---
 logger = logging.getLogger(__name__)
 
+# Most job names listed in a dependency answer sent to the LLM
+MAX_LISTED_JOBS = 50
+
+
+def _format_jobs(jobs: list[str], limit: int, separator: str = ", ") -> str:
+    """Join job names, truncating long lists with a "+N mais" suffix."""
+    listed = separator.join(jobs[:limit])
+    if len(jobs) > limit:
+        listed += f" (+{len(jobs) - limit} mais)"
+    return listed
+
 
 class TWSToolReadOnly(BaseModel):
     """
@@ -37,30 +50,17 @@ class TWSStatusTool(TWSToolReadOnly):
 
     async def get_tws_status(self) -> str:
         """
-        Fetches the current status of TWS workstations and jobs.
+        Returns the current status of TWS workstations and jobs.
+
+        The answer is pre-rendered by the shared status summary and only
+        rebuilt when a status refresh changed something.
         """
         if not self.tws_client:
             raise ToolExecutionError("TWS client not available for TWSStatusTool.")
 
         try:
-            logger.info("TWSStatusTool: Fetching system status.")
-            status = await self.tws_client.get_system_status()
-
-            workstation_summary = ", ".join(
-                [f"{ws.name} ({ws.status})" for ws in status.workstations]
-            )
-            job_summary = ", ".join(
-                [
-                    f"{job.name} on {job.workstation} ({job.status})"
-                    for job in status.jobs
-                ]
-            )
-
-            return (
-                "Situação atual do TWS:\n"
-                f"- Workstations: {workstation_summary or 'Nenhuma encontrada.'}\n"
-                f"- Jobs: {job_summary or 'Nenhum encontrado.'}"
-            )
+            logger.info("TWSStatusTool: Reading the status summary.")
+            return await get_status_summary_service(self.tws_client).status_text()
         except TWSConnectionError as e:
             logger.error("TWS connection error in TWSStatusTool: %s", e, exc_info=True)
             raise ToolConnectionError(
@@ -85,6 +85,9 @@ class TWSTroubleshootingTool(TWSToolReadOnly):
     async def analyze_failures(self) -> str:
         """
         Analyzes failed jobs and down workstations to identify root causes.
+
+        ABEND jobs and unlinked workstations are tracked incrementally by the
+        shared status summary.
         """
         if not self.tws_client:
             raise ToolExecutionError(
@@ -92,35 +95,8 @@ class TWSTroubleshootingTool(TWSToolReadOnly):
             )
 
         try:
-            logger.info("TWSTroubleshootingTool: Fetching system status for analysis.")
-            status = await self.tws_client.get_system_status()
-
-            failed_jobs = [j for j in status.jobs if j.status.upper() == "ABEND"]
-            down_workstations = [
-                w for w in status.workstations if w.status.upper() != "LINKED"
-            ]
-
-            if not failed_jobs and not down_workstations:
-                return (
-                    "Nenhuma falha crítica encontrada. O ambiente TWS parece estável."
-                )
-
-            analysis = "Análise de Problemas no TWS:\n"
-            if failed_jobs:
-                analysis += f"- Jobs com Falha ({len(failed_jobs)}): "
-                analysis += ", ".join(
-                    [f"{j.name} (workstation: {j.workstation})" for j in failed_jobs]
-                )
-                analysis += "\n"
-
-            if down_workstations:
-                analysis += f"- Workstations com Problemas ({len(down_workstations)}): "
-                analysis += ", ".join(
-                    [f"{w.name} (status: {w.status})" for w in down_workstations]
-                )
-                analysis += "\n"
-
-            return analysis
+            logger.info("TWSTroubleshootingTool: Reading the failure summary.")
+            return await get_status_summary_service(self.tws_client).failures_text()
 
         except TWSConnectionError as e:
             logger.error(
@@ -147,7 +123,145 @@ class TWSTroubleshootingTool(TWSToolReadOnly):
             ) from e
 
 
+class TWSDependencyTool(TWSToolReadOnly):
+    """
+    A tool for navigating job dependencies across the whole plan.
+
+    Answers come from the in-memory plan DAG instead of one
+    ``get_job_dependencies`` call per hop.
+    """
+
+    def _service(self):
+        if not self.tws_client:
+            raise ToolExecutionError("TWS client not available for TWSDependencyTool.")
+        return get_dependency_graph_service(self.tws_client)
+
+    async def _run(self, description: str, operation):
+        try:
+            return await operation()
+        except KeyError as e:
+            raise ToolProcessingError(f"Job não encontrado no plano: {e}") from e
+        except TWSConnectionError as e:
+            logger.error(
+                "TWS connection error in TWSDependencyTool: %s", e, exc_info=True
+            )
+            raise ToolConnectionError(
+                f"Falha de comunicação com o TWS ao {description}."
+            ) from e
+        except Exception as e:
+            logger.error("Unexpected error in TWSDependencyTool: %s", e, exc_info=True)
+            raise ToolExecutionError(
+                f"Ocorreu um erro inesperado ao {description}."
+            ) from e
+
+    async def get_upstream_jobs(
+        self,
+        job_name: str,
+        max_depth: Optional[int] = None,
+        limit: int = MAX_LISTED_JOBS,
+    ) -> str:
+        """
+        Lists the jobs the given job depends on, directly or indirectly.
+
+        Args:
+            job_name: The job to start from
+            max_depth: Dependency levels to follow (all by default)
+            limit: Most job names listed, nearest first
+        """
+        service = self._service()
+
+        async def _operation():
+            jobs = await service.upstream(job_name, max_depth)
+            if not jobs:
+                return f"O job {job_name} não possui dependências."
+            return f"Dependências de {job_name} ({len(jobs)}): " + _format_jobs(
+                jobs, limit
+            )
+
+        return await self._run("obter as dependências do job", _operation)
+
+    async def get_downstream_jobs(
+        self,
+        job_name: str,
+        max_depth: Optional[int] = None,
+        limit: int = MAX_LISTED_JOBS,
+    ) -> str:
+        """
+        Lists the jobs impacted if the given job does not complete.
+
+        Args:
+            job_name: The job to start from
+            max_depth: Dependency levels to follow (all by default)
+            limit: Most job names listed, nearest first
+        """
+        service = self._service()
+
+        async def _operation():
+            jobs = await service.downstream(job_name, max_depth)
+            if not jobs:
+                return f"Nenhum job depende de {job_name}."
+            return f"Jobs impactados por {job_name} ({len(jobs)}): " + _format_jobs(
+                jobs, limit
+            )
+
+        return await self._run("obter os jobs dependentes", _operation)
+
+    async def whats_blocking(self, job_name: str, limit: int = MAX_LISTED_JOBS) -> str:
+        """
+        Explains which unfinished upstream jobs are blocking the given job.
+
+        Args:
+            job_name: The blocked job
+            limit: Most blocking jobs (and root causes) listed
+        """
+        service = self._service()
+
+        async def _operation():
+            result = await service.blocking(job_name)
+            if not result["blocking"]:
+                return f"Nenhum job está bloqueando {job_name}."
+            blockers = _format_jobs(
+                [f"{item['job']} ({item['status']})" for item in result["blocking"]],
+                limit,
+            )
+            roots = _format_jobs(
+                [f"{item['job']} ({item['status']})" for item in result["root_causes"]],
+                limit,
+            )
+            return (
+                f"Jobs bloqueando {job_name} ({len(result['blocking'])}): {blockers}\n"
+                f"- Causa raiz provável: {roots or 'não identificada'}"
+            )
+
+        return await self._run("analisar os bloqueios do job", _operation)
+
+    async def get_critical_path(
+        self, job_name: Optional[str] = None, limit: int = MAX_LISTED_JOBS
+    ) -> str:
+        """
+        Returns the longest dependency chain in the plan (or ending at a job).
+
+        Args:
+            job_name: Job the chain must end at (whole plan by default)
+            limit: Most jobs of the chain listed, from its start
+        """
+        service = self._service()
+
+        async def _operation():
+            result = await service.critical_path(job_name)
+            if not result["path"]:
+                return "Nenhum caminho crítico encontrado no plano."
+            return (
+                f"Caminho crítico ({len(result['path'])} jobs, "
+                f"{result['duration']:.0f}s): "
+                + _format_jobs(result["path"], limit, separator=" -> ")
+            )
+
+        return await self._run("calcular o caminho crítico", _operation)
+
+
 # --- Tool Instantiation ---
 # Create single, reusable instances of the tools.
 tws_status_tool = TWSStatusTool()
 tws_troubleshooting_tool = TWSTroubleshootingTool()
+tws_dependency_tool = TWSDependencyTool()
@@ -0,0 +1,167 @@
+"""
+Tests for circuit breaker state shared across workers.
+"""
+
+import time
+
+import pytest
+
+from resync.core.circuit_breaker_state import (
+    BreakerStateStore,
+    SharedBreakerState,
+)
+from resync.core.resilience import CircuitBreakerError, CircuitBreakerManager
+
+
+class InMemoryBreakerStateStore(BreakerStateStore):
+    """Store with the same transitions as the Redis Lua scripts."""
+
+    def __init__(self, cache_ttl=0.0):
+        super().__init__(cache_ttl)
+        self.states = {}
+        self.failures = {}
+        self.backend_calls = 0
+
+    async def _fetch(self, name):
+        self.backend_calls += 1
+        return self.states.get(name, SharedBreakerState())
+
+    async def _record_failure(self, name, threshold, recovery_timeout, window):
+        self.backend_calls += 1
+        state = self.states.get(name, SharedBreakerState())
+        failures = self.failures[name] = self.failures.get(name, 0) + 1
+        if state.state == "half_open" or (
+            state.state == "closed" and failures >= threshold
+        ):
+            state = self.states[name] = SharedBreakerState(
+                "open", time.time() + recovery_timeout
+            )
+            self.failures[name] = 0
+        return state
+
+    async def _record_success(self, name):
+        self.backend_calls += 1
+        self.failures[name] = 0
+        state = self.states.get(name, SharedBreakerState())
+        if state.state == "half_open":
+            state = self.states[name] = SharedBreakerState()
+        return state
+
+    async def _acquire_probe(self, name, recovery_timeout):
+        self.backend_calls += 1
+        state = self.states.get(name, SharedBreakerState())
+        if state.state != "closed" and time.time() >= state.open_until:
+            self.states[name] = SharedBreakerState(
+                "half_open", time.time() + recovery_timeout
+            )
+            return True
+        return False
+
+
+async def _fail():
+    raise ConnectionError("TWS down")
+
+
+async def _ok():
+    return "ok"
+
+
+def _workers(store, count=2, fail_max=3, reset_timeout=60):
+    breakers = []
+    for _ in range(count):
+        manager = CircuitBreakerManager(state_store=store)
+        manager.register("tws", fail_max=fail_max, reset_timeout=reset_timeout)
+        breakers.append(manager)
+    return breakers
+
+
+class TestSharedCircuitBreakerState:
+    """Test cases for breakers sharing state through a BreakerStateStore."""
+
+    @pytest.mark.asyncio
+    async def test_failures_from_all_workers_open_everywhere(self):
+        """Failures are pooled, and an open breaker blocks every worker."""
+        store = InMemoryBreakerStateStore()
+        worker_a, worker_b = _workers(store)
+
+        for worker in (worker_a, worker_b, worker_a):
+            with pytest.raises(ConnectionError):
+                await worker.call("tws", _fail)
+
+        with pytest.raises(CircuitBreakerError):
+            await worker_b.call("tws", _ok)
+        assert worker_b.state("tws") == "closed"
+
+    @pytest.mark.asyncio
+    async def test_single_probe_after_recovery_timeout(self):
+        """Only one worker probes, and its success closes the breaker."""
+        store = InMemoryBreakerStateStore()
+        worker_a, worker_b = _workers(store)
+        store.states["tws"] = SharedBreakerState("open", time.time() - 1)
+
+        assert await worker_a.call("tws", _ok) == "ok"
+        assert store.states["tws"].state == "closed"
+        assert await worker_b.call("tws", _ok) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_shared_probe_overrides_local_open_breaker(self):
+        """A worker whose local breaker is still open can send the shared probe."""
+        store = InMemoryBreakerStateStore()
+        (worker,) = _workers(store, count=1)
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                await worker.call("tws", _fail)
+        assert worker.state("tws") == "open"
+        # shared recovery timeout expired before the local one
+        store.states["tws"] = SharedBreakerState("open", time.time() - 1)
+
+        assert await worker.call("tws", _ok) == "ok"
+        assert worker.state("tws") == "closed"
+        assert store.states["tws"].state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens(self):
+        """A failing probe re-opens the breaker for everyone."""
+        store = InMemoryBreakerStateStore()
+        worker_a, worker_b = _workers(store)
+        store.states["tws"] = SharedBreakerState("open", time.time() - 1)
+
+        with pytest.raises(ConnectionError):
+            await worker_a.call("tws", _fail)
+
+        assert store.states["tws"].state == "open"
+        with pytest.raises(CircuitBreakerError):
+            await worker_b.call("tws", _ok)
+
+    @pytest.mark.asyncio
+    async def test_happy_path_uses_cached_state(self):
+        """Successful calls don't touch the backend while the cache is fresh."""
+        store = InMemoryBreakerStateStore(cache_ttl=60)
+        (worker,) = _workers(store, count=1)
+
+        for _ in range(5):
+            await worker.call("tws", _ok)
+
+        assert store.backend_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_store_errors_fall_back_to_local_breaker(self):
+        """An unavailable store doesn't block calls."""
+
+        class BrokenStore(InMemoryBreakerStateStore):
+            async def _fetch(self, name):
+                raise ConnectionError("redis down")
+
+        (worker,) = _workers(BrokenStore(), count=1)
+
+        assert await worker.call("tws", _ok) == "ok"
+
+    def test_incomplete_store_cannot_be_created(self):
+        """Stores missing backend primitives fail at construction."""
+
+        class FetchOnlyStore(BreakerStateStore):
+            async def _fetch(self, name):
+                return SharedBreakerState()
+
+        with pytest.raises(TypeError):
+            FetchOnlyStore()
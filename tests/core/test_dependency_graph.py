@@ -0,0 +1,144 @@
+"""
+Tests for the in-memory plan dependency DAG.
+"""
+
+import pytest
+
+from resync.core.dependency_graph import DependencyGraphService, JobDependencyGraph
+from resync.models.tws import JobStatus, PlanDependencyGraph
+
+#   A -> B -> D
+#   A -> C -> D -> E
+GRAPH = {"A": [], "B": ["A"], "C": ["A"], "D": ["B", "C"], "E": ["D"]}
+
+
+@pytest.fixture
+def graph():
+    dag = JobDependencyGraph()
+    dag.apply_snapshot(GRAPH, {"A": 10, "B": 5, "C": 30, "D": 1, "E": 2})
+    return dag
+
+
+class TestJobDependencyGraph:
+    """Test cases for JobDependencyGraph."""
+
+    def test_closures(self, graph):
+        """Upstream and downstream closures are ordered nearest first."""
+        assert graph.upstream("D") == ["B", "C", "A"]
+        assert graph.upstream("E", max_depth=1) == ["D"]
+        assert graph.downstream("A") == ["B", "C", "D", "E"]
+        assert graph.downstream("E") == []
+        assert graph.edge_count == 5
+
+    def test_unknown_job_raises_key_error(self, graph):
+        """Queries for jobs outside the plan raise KeyError."""
+        with pytest.raises(KeyError):
+            graph.upstream("MISSING")
+
+    def test_critical_path_uses_durations(self, graph):
+        """The longest path follows the slowest branch."""
+        result = graph.critical_path()
+        assert result == {"path": ["A", "C", "D", "E"], "duration": 43.0}
+        assert graph.critical_path("B")["path"] == ["A", "B"]
+
+    def test_blocking_stops_at_finished_jobs(self, graph):
+        """Only unfinished upstream jobs block, and root causes are reported."""
+        statuses = {"A": "SUCC", "B": "SUCC", "C": "ABEND", "D": "WAIT"}
+
+        result = graph.blocking("E", statuses)
+
+        assert [item["job"] for item in result["blocking"]] == ["D", "C"]
+        assert result["root_causes"] == [{"job": "C", "status": "ABEND"}]
+
+    def test_cancelled_jobs_do_not_block(self, graph):
+        """Cancelled predecessors (CANCEL, as emitted by TWS) are finished."""
+        statuses = {"A": "SUCC", "B": "CANCEL", "C": "SUCC", "D": "SUCC"}
+
+        assert graph.blocking("E", statuses)["blocking"] == []
+
+    def test_incremental_snapshot_keeps_ids(self, graph):
+        """Re-applying a snapshot only touches changed jobs and keeps IDs."""
+        ids = dict(graph.index)
+        updated = {**GRAPH, "E": ["B"], "F": ["E"]}
+
+        changed = graph.apply_snapshot(updated)
+
+        assert changed == 2
+        assert all(graph.index[name] == node for name, node in ids.items())
+        assert graph.downstream("D") == []
+        assert graph.upstream("F") == ["E", "B", "A"]
+
+    def test_removed_jobs_drop_their_edges(self, graph):
+        """Jobs missing from a snapshot are removed with their edges."""
+        snapshot = {name: deps for name, deps in GRAPH.items() if name != "E"}
+
+        graph.apply_snapshot(snapshot)
+
+        assert "E" not in graph
+        assert graph.downstream("D") == []
+        assert graph.critical_path()["path"] == ["A", "C", "D"]
+
+    def test_removed_job_ids_are_compacted(self):
+        """IDs of removed jobs are reclaimed once they outnumber live jobs."""
+        dag = JobDependencyGraph()
+        for generation in range(5):
+            # each refresh replaces the whole plan with new job names
+            dag.apply_snapshot(
+                {f"G{generation}_{i}": ([f"G{generation}_{i - 1}"] if i else []) for i in range(10)}
+            )
+
+        assert len(dag) == 10
+        assert len(dag.names) < 30
+        assert sorted(dag.index.values()) == list(range(len(dag.names)))
+        assert dag.upstream("G4_9") == [f"G4_{i}" for i in range(8, -1, -1)]
+        assert dag.critical_path()["path"] == [f"G4_{i}" for i in range(10)]
+
+    def test_cycles_are_excluded_from_ordering(self):
+        """Cyclic jobs are left out instead of looping forever."""
+        dag = JobDependencyGraph()
+        dag.apply_snapshot({"A": [], "B": ["A", "C"], "C": ["B"]})
+
+        assert [dag.names[node] for node in dag.topological_order()] == ["A"]
+
+
+class FakeTWSClient:
+    """TWS client stub serving a fixed plan."""
+
+    def __init__(self):
+        self.snapshots = 0
+
+    async def get_plan_dependency_graph(self):
+        self.snapshots += 1
+        return PlanDependencyGraph(dependency_graph=GRAPH)
+
+    async def get_jobs_status(self):
+        return [
+            JobStatus(name="A", workstation="WS", status="ABEND", job_stream="S"),
+            JobStatus(name="B", workstation="WS", status="HOLD", job_stream="S"),
+        ]
+
+
+class TestDependencyGraphService:
+    """Test cases for DependencyGraphService."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_reused_until_stale(self):
+        """The plan snapshot is fetched once per refresh interval."""
+        client = FakeTWSClient()
+        service = DependencyGraphService(client, refresh_interval=60)
+
+        assert await service.upstream("E") == ["D", "B", "C", "A"]
+        assert await service.downstream("C") == ["D", "E"]
+        assert client.snapshots == 1
+
+        await service.get_graph(force_refresh=True)
+        assert client.snapshots == 2
+
+    @pytest.mark.asyncio
+    async def test_blocking_uses_current_statuses(self):
+        """Blocking analysis combines the DAG with live job statuses."""
+        service = DependencyGraphService(FakeTWSClient())
+
+        result = await service.blocking("B")
+
+        assert result["root_causes"] == [{"job": "A", "status": "ABEND"}]
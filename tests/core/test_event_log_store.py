@@ -0,0 +1,103 @@
+"""
+Tests for the incremental, time-indexed event log store.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from resync.core.event_log_store import EventLogStore
+from resync.models.tws import Event
+
+
+def _event(event_id, minutes_ago, event_type="JOB_STARTED", now=None):
+    now = now or datetime.now()
+    return Event(
+        event_id=event_id,
+        timestamp=now - timedelta(minutes=minutes_ago),
+        event_type=event_type,
+        severity="INFO",
+        source="TWS_ENGINE",
+        message=f"event {event_id}",
+    )
+
+
+class TestEventLogStore:
+    """Test cases for EventLogStore."""
+
+    def test_append_deduplicates_events(self):
+        """Events already stored are skipped on re-fetch."""
+        store = EventLogStore()
+        events = [_event("E1", 10), _event("E2", 5)]
+
+        assert store.append(events) == 2
+        assert store.append(events + [_event("E3", 1)]) == 1
+        assert len(store) == 3
+
+    def test_query_is_time_ordered_with_late_events(self):
+        """Late events are inserted at their timestamp position."""
+        store = EventLogStore()
+        store.append([_event("E1", 30), _event("E3", 10)])
+        store.append([_event("E2", 20)])
+
+        assert [e.event_id for e in store.query()] == ["E1", "E2", "E3"]
+
+    def test_range_and_type_filters(self):
+        """Range queries and type filters only return matching events."""
+        now = datetime.now()
+        store = EventLogStore()
+        store.append(
+            [
+                _event("E1", 120, "JOB_STARTED", now),
+                _event("E2", 90, "JOB_ABEND", now),
+                _event("E3", 30, "JOB_STARTED", now),
+                _event("E4", 20, "JOB_ABEND", now),
+                _event("E5", 10, "JOB_COMPLETED", now),
+            ]
+        )
+        start = (now - timedelta(minutes=60)).timestamp()
+
+        assert [e.event_id for e in store.query(start=start)] == ["E3", "E4", "E5"]
+        assert [
+            e.event_id for e in store.query(event_types=["JOB_ABEND", "JOB_COMPLETED"])
+        ] == ["E2", "E4", "E5"]
+        assert [
+            e.event_id for e in store.query(start=start, event_types=["JOB_ABEND"])
+        ] == ["E4"]
+        assert store.query(event_types=["UNKNOWN"]) == []
+
+    def test_last_hours(self):
+        """last_hours answers from local data."""
+        store = EventLogStore()
+        store.append([_event("OLD", 180), _event("NEW", 30)])
+
+        assert [e.event_id for e in store.last_hours(1)] == ["NEW"]
+
+    def test_coverage_and_watermark(self):
+        """The store tracks the complete window and the watermark."""
+        store = EventLogStore()
+        now = time.time()
+        assert not store.covers(now - 3600)
+
+        store.mark_covered(now - 24 * 3600, now)
+
+        assert store.covers(now - 3600)
+        assert not store.covers(now - 48 * 3600)
+        assert store.watermark == now
+
+    def test_max_events_trims_oldest(self):
+        """The size bound drops the oldest events and shrinks coverage."""
+        store = EventLogStore(max_events=3)
+        store.mark_covered(time.time() - 24 * 3600, time.time())
+        store.append([_event(f"E{i}", 60 - i) for i in range(5)])
+
+        assert [e.event_id for e in store.query()] == ["E2", "E3", "E4"]
+        assert not store.covers(time.time() - 24 * 3600)
+        # Trimmed events are forgotten, so they are accepted again if re-fetched
+        assert store.append([_event("E0", 60)]) == 1
+
+    def test_rejects_invalid_max_events(self):
+        """max_events must be positive."""
+        with pytest.raises(ValueError):
+            EventLogStore(max_events=0)
@@ -0,0 +1,113 @@
+"""
+Tests for HTTP connection pool tuning: HTTP/2 options and pre-warming.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from resync.core.pools import http_pool
+from resync.core.pools.base_pool import ConnectionPoolConfig
+from resync.core.pools.http_pool import HTTPConnectionPool, _StreamLimitedTransport
+
+_RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}"
+
+
+class _StreamedBody(httpx.AsyncByteStream):
+    """Body read lazily like a network response, unlike ``Response(json=...)``."""
+
+    async def __aiter__(self):
+        yield b"{}"
+
+
+@pytest_asyncio.fixture
+async def server():
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                # HEAD responses carry no body
+                writer.write(_RESPONSE[:-2] if head.startswith(b"HEAD") else _RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", connections
+    server.close()
+
+
+class TestHTTPConnectionPool:
+    """Test cases for HTTPConnectionPool tuning options."""
+
+    @pytest.mark.asyncio
+    async def test_prewarm_opens_connections(self, server):
+        """Pre-warmed connections are reused by later requests."""
+        url, connections = server
+        pool = HTTPConnectionPool(
+            ConnectionPoolConfig(pool_name="tws_http", min_size=1, max_size=10),
+            url,
+            keepalive_expiry=30,
+            max_keepalive_connections=5,
+            prewarm_connections=3,
+        )
+        await pool.initialize()
+        try:
+            assert len(connections) == 3
+            async with pool.get_connection() as client:
+                await asyncio.gather(*(client.get("/") for _ in range(3)))
+            assert len(connections) == 3
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_prewarm_failure_does_not_fail_startup(self):
+        """An unreachable host only logs a warning."""
+        pool = HTTPConnectionPool(
+            ConnectionPoolConfig(pool_name="tws_http", connection_timeout=1),
+            "http://127.0.0.1:1",
+            prewarm_connections=2,
+        )
+        await pool.initialize()
+        await pool.close()
+
+    def test_http2_falls_back_without_h2(self, monkeypatch):
+        """HTTP/2 is disabled when the h2 package is missing."""
+        monkeypatch.setattr(http_pool, "HTTP2_AVAILABLE", False)
+        pool = HTTPConnectionPool(
+            ConnectionPoolConfig(pool_name="tws_http"), "http://tws", http2=True
+        )
+
+        assert pool.http2 is False
+        assert pool.keepalive_expiry == 300
+        assert pool.max_keepalive_connections == 10
+
+    @pytest.mark.asyncio
+    async def test_stream_limit(self):
+        """No more than max_streams responses are open at once."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, stream=_StreamedBody())
+
+        transport = _StreamLimitedTransport(httpx.MockTransport(handler), 4)
+        async with httpx.AsyncClient(transport=transport) as client:
+            responses = await asyncio.gather(
+                *(client.get("http://tws/job") for _ in range(20))
+            )
+
+        assert all(r.status_code == 200 for r in responses)
+        assert peak == 4
+        assert transport._slots._value == 4
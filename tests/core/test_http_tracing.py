@@ -0,0 +1,88 @@
+"""
+Tests for the outbound HTTP latency breakdown.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from resync.core.http_tracing import HTTPLatencyMetrics, _RequestTrace, instrument_client
+
+_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: 2\r\n"
+    b"\r\n"
+    b"{}"
+)
+
+
+@pytest_asyncio.fixture
+async def server_url():
+    async def handle(reader, writer):
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(_RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+    server.close()
+
+
+class TestHTTPTracing:
+    """Test cases for instrumented httpx clients."""
+
+    @pytest.mark.asyncio
+    async def test_phases_recorded_per_host(self, server_url):
+        """New connections record connect; reused ones only pool/ttfb/body."""
+        metrics = HTTPLatencyMetrics()
+        async with instrument_client(httpx.AsyncClient(), metrics) as client:
+            for _ in range(2):
+                response = await client.get(server_url)
+                assert response.json() == {}
+
+        phases = metrics.get_snapshot()["127.0.0.1"]
+        assert phases["connect"]["count"] == 1
+        for phase in ("pool_wait", "ttfb", "body_read"):
+            assert phases[phase]["count"] == 2
+        assert "tls" not in phases
+
+    @pytest.mark.asyncio
+    async def test_tls_phase_from_trace_events(self):
+        """TLS handshakes are timed from the start_tls events."""
+        metrics = HTTPLatencyMetrics()
+        trace = _RequestTrace(metrics, "tws.example.com")
+
+        for event in (
+            "connection.connect_tcp.started",
+            "connection.connect_tcp.complete",
+            "connection.start_tls.started",
+            "connection.start_tls.complete",
+            "http11.send_request_headers.started",
+            "http11.receive_response_headers.failed",
+        ):
+            await trace(event, {})
+
+        phases = metrics.get_snapshot()["tws.example.com"]
+        assert set(phases) == {"pool_wait", "connect", "tls"}
+
+    def test_prometheus_export(self):
+        """Histograms are exported with host and phase labels."""
+        metrics = HTTPLatencyMetrics(buckets=(0.01, 1.0))
+        metrics.observe("tws", "ttfb", 0.5)
+
+        text = metrics.generate_prometheus_metrics()
+
+        labels = 'host="tws",phase="ttfb"'
+        assert (
+            f'resync_http_client_phase_duration_seconds_bucket{{{labels},le="1.0"}} 1'
+            in text
+        )
+        assert f"resync_http_client_phase_duration_seconds_count{{{labels}}} 1" in text
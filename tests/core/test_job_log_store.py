@@ -0,0 +1,121 @@
+"""
+Tests for segmented job log storage and ranged reads.
+"""
+
+import pytest
+
+from resync.core.job_log_store import JobLogRange, SegmentedJobLogStore
+
+
+class DictCache:
+    """Minimal async cache recording which keys were read."""
+
+    def __init__(self):
+        self.data = {}
+        self.reads = []
+
+    async def get(self, key):
+        self.reads.append(key)
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl_seconds=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        return self.data.pop(key, None) is not None
+
+
+LOG = "".join(f"line {i:03d}\n" for i in range(100))
+
+
+async def _collect(store, job_id, log_range=None):
+    return "".join([chunk async for chunk in store.read(job_id, log_range)])
+
+
+class TestSegmentedJobLogStore:
+    """Test cases for SegmentedJobLogStore."""
+
+    @pytest.mark.asyncio
+    async def test_write_splits_into_segments(self):
+        """Logs are stored as fixed-size segments plus a manifest."""
+        cache = DictCache()
+        store = SegmentedJobLogStore(cache, segment_size=64)
+
+        manifest = await store.write_text("JOB1", LOG)
+
+        assert manifest["size"] == len(LOG)
+        assert manifest["segments"] == -(-len(LOG) // 64)
+        assert sum(manifest["line_counts"]) == 100
+        assert await _collect(store, "JOB1") == LOG
+
+    @pytest.mark.asyncio
+    async def test_tail_only_reads_last_segments(self):
+        """Tail reads touch only the segments holding the last lines."""
+        cache = DictCache()
+        store = SegmentedJobLogStore(cache, segment_size=64)
+        await store.write_text("JOB1", LOG)
+        cache.reads.clear()
+
+        result = await _collect(store, "JOB1", JobLogRange(tail=3))
+
+        assert result == "line 097\nline 098\nline 099\n"
+        segment_reads = [k for k in cache.reads if ":seg:" in k]
+        assert len(set(segment_reads)) <= 2
+
+    @pytest.mark.asyncio
+    async def test_tail_without_trailing_newline(self):
+        """The last line counts even without a terminating newline."""
+        store = SegmentedJobLogStore(DictCache(), segment_size=4)
+        await store.write_text("JOB1", "a\nb\nc")
+
+        assert await _collect(store, "JOB1", JobLogRange(tail=2)) == "b\nc"
+        assert await _collect(store, "JOB1", JobLogRange(tail=10)) == "a\nb\nc"
+
+    @pytest.mark.asyncio
+    async def test_line_and_byte_ranges(self):
+        """Line and byte ranges return the expected slices."""
+        store = SegmentedJobLogStore(DictCache(), segment_size=50)
+        await store.write_text("JOB1", LOG)
+        lines = LOG.splitlines(keepends=True)
+
+        assert await _collect(
+            store, "JOB1", JobLogRange(start_line=10, end_line=13)
+        ) == "".join(lines[10:13])
+        assert await _collect(
+            store, "JOB1", JobLogRange(start_byte=45, end_byte=140)
+        ) == LOG[45:140]
+
+    @pytest.mark.asyncio
+    async def test_multibyte_characters_across_segments(self):
+        """UTF-8 characters split across segments are decoded correctly."""
+        text = "ação concluída\n" * 20
+        store = SegmentedJobLogStore(DictCache(), segment_size=7)
+        await store.write_text("JOB1", text)
+
+        assert await _collect(store, "JOB1") == text
+
+    @pytest.mark.asyncio
+    async def test_missing_log_raises_key_error(self):
+        """Reading an uncached log raises KeyError."""
+        store = SegmentedJobLogStore(DictCache())
+
+        with pytest.raises(KeyError):
+            await _collect(store, "MISSING")
+
+    @pytest.mark.asyncio
+    async def test_invalidate_removes_segments(self):
+        """Invalidation removes the manifest and every segment."""
+        cache = DictCache()
+        store = SegmentedJobLogStore(cache, segment_size=64)
+        await store.write_text("JOB1", LOG)
+
+        await store.invalidate("JOB1")
+
+        assert cache.data == {}
+
+    def test_range_rejects_multiple_selectors(self):
+        """Only one range selector may be used at a time."""
+        with pytest.raises(ValueError):
+            JobLogRange(tail=5, start_line=1)
+        with pytest.raises(ValueError):
+            JobLogRange(start_byte=-1)
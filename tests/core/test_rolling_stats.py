@@ -0,0 +1,85 @@
+"""
+Tests for the NumPy-backed rolling metrics and their use in TWSMonitor.
+"""
+
+import time
+
+import pytest
+
+from resync.core.rolling_stats import RollingMetrics
+from resync.core.tws_monitor import TWSMonitor
+
+
+class TestRollingMetrics:
+    """Test cases for RollingMetrics."""
+
+    def test_ring_buffer_keeps_only_capacity_samples(self):
+        """Old samples are overwritten once the buffer is full."""
+        metrics = RollingMetrics(["latency"], capacity=3)
+        for value in (1.0, 2.0, 3.0, 4.0, 5.0):
+            metrics.record({"latency": value})
+
+        assert len(metrics) == 3
+        assert metrics.latest("latency") == 5.0
+        assert metrics.mean("latency") == 4.0
+        assert metrics.percentiles("latency", (0, 100)) == {0: 3.0, 100: 5.0}
+
+    def test_missing_samples_are_ignored(self):
+        """Metrics absent from a sample don't affect their aggregates."""
+        metrics = RollingMetrics(["a", "b"], capacity=4)
+        metrics.record({"a": 1.0, "b": 10.0})
+        metrics.record({"a": 3.0})
+
+        assert metrics.means() == {"a": 2.0, "b": 10.0}
+        assert metrics.latest("b") is None
+        assert metrics.ewma("b") == 10.0
+
+    def test_ewma(self):
+        """The EWMA starts at the first sample and is updated in place."""
+        metrics = RollingMetrics(["a"], capacity=2, ewma_alpha=0.5)
+        assert metrics.ewma("a") is None
+
+        for value in (4.0, 8.0, 0.0):
+            metrics.record({"a": value})
+
+        assert metrics.ewma("a") == 3.0
+
+    def test_time_window(self):
+        """Aggregates can be restricted to the last N seconds."""
+        metrics = RollingMetrics(["a"], capacity=10)
+        now = time.time()
+        metrics.record({"a": 100.0}, timestamp=now - 3600)
+        metrics.record({"a": 1.0}, timestamp=now)
+
+        assert metrics.mean("a", seconds=60) == 1.0
+        assert metrics.mean("a") == 50.5
+
+    def test_empty_window(self):
+        """An empty buffer reports zeros."""
+        metrics = RollingMetrics(["a"], capacity=2)
+
+        assert metrics.means() == {"a": 0.0}
+        assert metrics.percentiles("a", (95,)) == {95: 0.0}
+
+
+class FakeTWSClient:
+    async def check_connection(self):
+        return True
+
+
+class TestTWSMonitorHistory:
+    """Test cases for TWSMonitor's rolling history."""
+
+    @pytest.mark.asyncio
+    async def test_report_uses_rolling_history(self):
+        """Collected ticks feed the report's averages and percentiles."""
+        monitor = TWSMonitor(FakeTWSClient())
+        for _ in range(3):
+            await monitor._collect_metrics()
+
+        report = monitor.get_performance_report()["current_metrics"]
+
+        assert len(monitor.history) == 3
+        assert monitor.history.capacity == 24 * 3600 // monitor.alert_check_interval
+        assert report["cache_hit_ratio"] == pytest.approx(0.85)
+        assert report["api_response_time_p95_ms"] >= report["api_response_time_p50_ms"]
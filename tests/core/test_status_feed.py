@@ -0,0 +1,143 @@
+"""
+Tests for the workstation/job status change-feed.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from resync.core.status_feed import StatusChangeFeed, StatusFeedPublisher
+from resync.models.tws import JobStatus, WorkstationStatus
+
+
+def _ws(name, status="LINKED"):
+    return WorkstationStatus(name=name, status=status, type="FTA")
+
+
+def _job(name, status="SUCC"):
+    return JobStatus(name=name, workstation="WS1", status=status, job_stream="S")
+
+
+@pytest.fixture
+def feed():
+    feed = StatusChangeFeed(history_size=3)
+    feed.apply_snapshot([_ws("WS1"), _ws("WS2")], [_job("A"), _job("B")])
+    return feed
+
+
+class TestStatusChangeFeed:
+    """Test cases for StatusChangeFeed."""
+
+    def test_baseline_records_no_changes(self, feed):
+        """The first snapshot only sets the baseline."""
+        assert feed.seq == 1
+        assert feed.changes_since(1) == []
+        assert len(feed.snapshot_message()["jobs"]) == 2
+
+    def test_diff_reports_only_changed_items(self, feed):
+        """Changed, added and removed items become sequenced changes."""
+        changes = feed.apply_snapshot(
+            [_ws("WS1"), _ws("WS2", "UNLINKED")],
+            [_job("A", "ABEND"), _job("C")],
+        )
+
+        assert [(c["seq"], c["op"], c["id"]) for c in changes] == [
+            (2, "upsert", "WS2"),
+            (3, "upsert", "WS1#S.A"),
+            (4, "upsert", "WS1#S.C"),
+            (5, "remove", "WS1#S.B"),
+        ]
+        assert changes[1]["data"]["status"] == "ABEND"
+        assert feed.apply_snapshot(
+            [_ws("WS1"), _ws("WS2", "UNLINKED")], [_job("A", "ABEND"), _job("C")]
+        ) == []
+
+    def test_resume_returns_missed_changes(self, feed):
+        """A client resuming within the log gets only what it missed."""
+        feed.apply_snapshot([_ws("WS1", "DOWN"), _ws("WS2")], [_job("A"), _job("B")])
+        feed.apply_snapshot([_ws("WS1"), _ws("WS2")], [_job("A"), _job("B")])
+
+        message = feed.resume(2)
+
+        assert message["type"] == "status_delta"
+        assert message["seq"] == 3
+        assert [c["seq"] for c in message["changes"]] == [3]
+
+    def test_resume_falls_back_to_snapshot(self, feed):
+        """Evicted or unknown sequence numbers get a full snapshot."""
+        for status in ("DOWN", "LINKED", "DOWN", "LINKED"):
+            feed.apply_snapshot([_ws("WS1", status), _ws("WS2")], [])
+
+        assert feed.changes_since(1) is None
+        assert feed.resume(1)["type"] == "status_snapshot"
+        assert feed.resume(99)["type"] == "status_snapshot"
+        assert feed.resume(None)["type"] == "status_snapshot"
+        assert [c["seq"] for c in feed.resume(4)["changes"]] == [5, 6, 7]
+
+
+class FakePoolManager:
+    """Pool manager stub recording sent messages per client."""
+
+    def __init__(self):
+        self.sent = {}
+
+    async def send_personal_message(self, message, client_id):
+        self.sent.setdefault(client_id, []).append(json.loads(message))
+        return True
+
+    async def broadcast(self, message, client_ids=None):
+        for client_id in client_ids:
+            self.sent.setdefault(client_id, []).append(json.loads(message))
+        return len(client_ids)
+
+
+class FakeTWSClient:
+    def __init__(self):
+        self.jobs = [_job("A", "EXEC")]
+
+    async def get_workstations_status(self):
+        return [_ws("WS1")]
+
+    async def get_jobs_status(self):
+        return list(self.jobs)
+
+
+class TestStatusFeedPublisher:
+    """Test cases for StatusFeedPublisher."""
+
+    @pytest.mark.asyncio
+    async def test_subscribers_receive_snapshot_then_deltas(self):
+        """Subscribers get the baseline snapshot and then only deltas."""
+        client = FakeTWSClient()
+        pool = FakePoolManager()
+        publisher = StatusFeedPublisher(client, poll_interval=60, pool_manager=pool)
+
+        await publisher.subscribe("c1")
+        while not publisher.feed.initialized:
+            # Let the background poll take the baseline snapshot
+            await asyncio.sleep(0)
+        client.jobs = [_job("A", "SUCC")]
+        assert await publisher.poll_once() == 1
+        assert await publisher.poll_once() == 0
+        await publisher.stop()
+
+        types = [message["type"] for message in pool.sent["c1"]]
+        assert types == ["status_snapshot", "status_snapshot", "status_delta"]
+        delta = pool.sent["c1"][-1]
+        assert delta["changes"][0]["data"]["status"] == "SUCC"
+
+    @pytest.mark.asyncio
+    async def test_unsubscribed_clients_get_nothing(self):
+        """Deltas are only pushed to subscribed clients."""
+        client = FakeTWSClient()
+        pool = FakePoolManager()
+        publisher = StatusFeedPublisher(client, pool_manager=pool)
+        await publisher.poll_once()
+        publisher.subscribers.add("c1")
+        publisher.unsubscribe("c1")
+
+        client.jobs = [_job("A", "SUCC")]
+        await publisher.poll_once()
+
+        assert pool.sent == {}
@@ -0,0 +1,104 @@
+"""
+Tests for the materialized TWS status summaries used by the agent tools.
+"""
+
+import pytest
+
+from resync.core.status_summary import StatusSummary, StatusSummaryService
+from resync.models.tws import SystemStatus
+
+
+def _job(name, workstation, status, stream="JS1"):
+    return {"name": name, "workstation": workstation, "status": status, "job_stream": stream}
+
+
+WORKSTATIONS = [
+    {"name": "CPU1", "status": "LINKED", "type": "FTA"},
+    {"name": "CPU2", "status": "DOWN", "type": "FTA"},
+]
+JOBS = [_job("JOB1", "CPU1", "SUCC"), _job("JOB2", "CPU2", "ABEND")]
+
+
+class FakeTWSClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_system_status(self):
+        self.calls += 1
+        return SystemStatus(workstations=WORKSTATIONS, jobs=JOBS, critical_jobs=[])
+
+
+class TestStatusSummary:
+    """Test cases for StatusSummary."""
+
+    def test_texts_match_tool_format(self):
+        """The rendered answers keep the tools' wording."""
+        summary = StatusSummary()
+        summary.apply_snapshot(WORKSTATIONS, JOBS)
+
+        status = summary.status_text()
+        assert status.startswith("Situação atual do TWS:")
+        assert "CPU1 (LINKED), CPU2 (DOWN)" in status
+        assert "JOB1 on CPU1 (SUCC), JOB2 on CPU2 (ABEND)" in status
+        assert "Jobs por status: ABEND: 1, SUCC: 1" in status
+
+        failures = summary.failures_text()
+        assert "Jobs com Falha (1): JOB2 (workstation: CPU2)" in failures
+        assert "Workstations com Problemas (1): CPU2 (status: DOWN)" in failures
+
+    def test_incremental_updates(self):
+        """Status changes and removals update counters and lists."""
+        summary = StatusSummary()
+        summary.apply_snapshot(WORKSTATIONS, JOBS)
+
+        changed = summary.apply_snapshot(
+            [{"name": "CPU1", "status": "LINKED"}, {"name": "CPU2", "status": "LINKED"}],
+            [_job("JOB2", "CPU2", "SUCC"), _job("JOB3", "CPU1", "ABEND")],
+        )
+
+        assert changed == 4
+        assert summary.job_status_counts == {"SUCC": 1, "ABEND": 1}
+        assert summary.workstation_status_counts == {"LINKED": 2}
+        assert list(summary.abended_jobs.values()) == [("JOB3", "CPU1")]
+        assert summary.unlinked_workstations == {}
+
+    def test_rendering_cached_until_change(self):
+        """Unchanged snapshots return the same pre-rendered text."""
+        summary = StatusSummary()
+        summary.apply_snapshot(WORKSTATIONS, JOBS)
+        text = summary.failures_text()
+
+        assert summary.apply_snapshot(WORKSTATIONS, JOBS) == 0
+        assert summary.failures_text() is text
+
+        summary.apply_snapshot(WORKSTATIONS[:1], JOBS[:1])
+        assert summary.failures_text() == (
+            "Nenhuma falha crítica encontrada. O ambiente TWS parece estável."
+        )
+
+
+class TestStatusSummaryService:
+    """Test cases for StatusSummaryService."""
+
+    @pytest.mark.asyncio
+    async def test_refreshes_only_when_stale(self):
+        """Repeated tool calls within the interval don't hit TWS."""
+        client = FakeTWSClient()
+        service = StatusSummaryService(client, refresh_interval=60)
+
+        for _ in range(3):
+            assert "JOB2" in await service.failures_text()
+            await service.status_text()
+
+        assert client.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_external_update_marks_fresh(self):
+        """Snapshots from other refreshes feed the summary without a fetch."""
+        client = FakeTWSClient()
+        service = StatusSummaryService(client, refresh_interval=60)
+
+        service.update(WORKSTATIONS[:1], JOBS[:1])
+
+        assert "estável" in await service.failures_text()
+        assert client.calls == 0
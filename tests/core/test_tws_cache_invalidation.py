@@ -0,0 +1,58 @@
+"""
+Tests for CQRS-driven invalidation of the OptimizedTWSClient cache.
+"""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from resync.core.cache_hierarchy import CacheHierarchy
+from resync.services.tws_service import OptimizedTWSClient, cache_keys_for_tags
+
+
+def test_tags_map_to_client_cache_keys():
+    """Plan-wide and per-job tags name the client cache keys they cover."""
+    keys = cache_keys_for_tags(("jobs", "plan", "job:JOB1"))
+
+    assert keys == [
+        "jobs_status",
+        "critical_path_status",
+        "plan_details",
+        "job_status:JOB1",
+        "job_details:JOB1",
+        "job_dependencies:JOB1",
+        "job_history:JOB1",
+    ]
+    assert cache_keys_for_tags(("events",)) == []
+
+
+@pytest.mark.asyncio
+async def test_invalidated_jobs_are_fetched_again():
+    """After a jobs invalidation the client goes back to TWS."""
+    status = ["SUCC"]
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(
+            200,
+            json=[{"name": "JOB1", "workstation": "WS1", "status": status[0], "job_stream": "S"}],
+        )
+
+    client = OptimizedTWSClient(
+        hostname="tws.example", port=31111, username="user", password="secret"
+    )
+    client.use_connection_pool = False
+    client.client = httpx.AsyncClient(
+        base_url=client.base_url, transport=httpx.MockTransport(handler)
+    )
+    client.cache = CacheHierarchy()
+
+    assert (await client.get_jobs_status())[0].status == "SUCC"
+    status[0] = "ABEND"
+    assert (await client.get_jobs_status())[0].status == "SUCC"
+
+    assert await client.invalidate_cache_tags(("jobs", "job:JOB1")) == 1
+    assert (await client.get_jobs_status())[0].status == "ABEND"
+    assert len(requests) == 2
@@ -0,0 +1,81 @@
+"""
+Tests for OptimizedTWSClient requests going through the ``tws_http`` pool.
+"""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from resync.core.exceptions import TWSConnectionError
+from resync.core.pools.base_pool import ConnectionPoolConfig
+from resync.core.pools.http_pool import HTTPConnectionPool
+from resync.services.tws_service import OptimizedTWSClient
+
+
+class _PoolManager:
+    """Stand-in for the connection pool manager with a single pool."""
+
+    def __init__(self, pool: HTTPConnectionPool) -> None:
+        self.pool = pool
+
+    async def get_pool(self, pool_name: str):
+        return self.pool if pool_name == "tws_http" else None
+
+
+async def _pooled_client(handler) -> tuple[OptimizedTWSClient, HTTPConnectionPool]:
+    pool = HTTPConnectionPool(
+        ConnectionPoolConfig(pool_name="tws_http"), "http://tws.example:31111/twsd"
+    )
+    await pool.initialize()
+    await pool._client.aclose()
+    pool._client = httpx.AsyncClient(
+        base_url=pool.base_url, transport=httpx.MockTransport(handler)
+    )
+    client = OptimizedTWSClient(
+        hostname="tws.example",
+        port=31111,
+        username="user",
+        password="secret",
+    )
+    assert client.use_connection_pool
+    client._pool_manager = _PoolManager(pool)
+    return client, pool
+
+
+@pytest.mark.asyncio
+async def test_requests_use_the_pool_client():
+    """API calls are sent through the shared client of the pool."""
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        return httpx.Response(200, json=[])
+
+    client, pool = await _pooled_client(handler)
+    try:
+        assert await client.get_workstations_status() == []
+        await client.ping()
+    finally:
+        await pool.close()
+
+    assert paths == ["/twsd/model/workstation", "/twsd/"]
+    assert pool.stats.pool_hits == 2
+    assert pool.stats.pool_misses == 0
+
+
+@pytest.mark.asyncio
+async def test_http_errors_are_not_counted_as_pool_misses():
+    """An error response is reported as such, not as a failed acquisition."""
+
+    def handler(request):
+        return httpx.Response(404, json={"error": "not found"})
+
+    client, pool = await _pooled_client(handler)
+    try:
+        with pytest.raises(TWSConnectionError, match="HTTP error: 404"):
+            await client.get_jobs_status()
+    finally:
+        await pool.close()
+
+    assert pool.stats.pool_misses == 0
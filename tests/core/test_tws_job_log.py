@@ -0,0 +1,108 @@
+"""
+Tests for OptimizedTWSClient job log streaming.
+"""
+
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from resync.core.exceptions import TWSConnectionError
+from resync.core.job_log_store import SegmentedJobLogStore
+from resync.services.tws_service import OptimizedTWSClient
+
+
+class DictCache:
+    """Minimal async cache for the job log store."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl_seconds=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        return self.data.pop(key, None) is not None
+
+
+class _ErrorHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"engine unavailable"
+        self.send_response(503)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def error_server():
+    """Real HTTP server answering every request with 503."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ErrorHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(port: int) -> OptimizedTWSClient:
+    client = OptimizedTWSClient(
+        hostname="127.0.0.1",
+        port=port,
+        username="user",
+        password="secret",
+    )
+    # Direct client over a real socket transport (no MockTransport)
+    client.use_connection_pool = False
+    client.client = httpx.AsyncClient(base_url=client.base_url, auth=client.auth)
+    client.job_log_store = SegmentedJobLogStore(DictCache(), segment_size=16)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_http_error_on_streamed_log_raises_tws_connection_error(error_server):
+    """Error responses of the streamed request are read before being logged."""
+    client = _client(error_server.server_address[1])
+
+    with pytest.raises(TWSConnectionError, match="HTTP error: 503"):
+        await client.get_job_log("JOB1")
+
+
+class _EvictingStore(SegmentedJobLogStore):
+    """Store whose second read of a segment finds it evicted."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads = 0
+
+    async def _read_segment(self, job_id, index):
+        self.reads += 1
+        if self.reads == 2:
+            raise KeyError(f"Missing segment {index} for job log {job_id}")
+        return await super()._read_segment(job_id, index)
+
+
+@pytest.mark.asyncio
+async def test_eviction_after_partial_read_does_not_repeat_chunks():
+    """A log evicted mid-stream raises instead of resending its prefix."""
+    client = _client(port=1)
+    store = _EvictingStore(DictCache(), segment_size=16)
+    client.job_log_store = store
+    await store.write_text("JOB1", "".join(f"line {i:03d}\n" for i in range(10)))
+
+    chunks = []
+    with pytest.raises(TWSConnectionError, match="evicted"):
+        async for chunk in client.stream_job_log("JOB1"):
+            chunks.append(chunk)
+
+    assert chunks == ["line 000\nline 00"]
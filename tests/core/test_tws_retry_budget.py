@@ -0,0 +1,47 @@
+"""
+Tests for retry budget accounting in OptimizedTWSClient.
+"""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from resync.core.resilience import RetryBudget
+from resync.services.tws_service import OptimizedTWSClient
+
+
+def _client(handler) -> OptimizedTWSClient:
+    client = OptimizedTWSClient(
+        hostname="tws.example",
+        port=31111,
+        username="user",
+        password="secret",
+    )
+    client.use_connection_pool = False
+    client.client = httpx.AsyncClient(
+        base_url=client.base_url, transport=httpx.MockTransport(handler)
+    )
+    client.retry_budget = RetryBudget("tws-test")
+    return client
+
+
+@pytest.mark.asyncio
+async def test_each_call_is_counted_once_against_the_budget():
+    """A logical TWS request records one request and retries at one level."""
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.url.path)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("reset", request=request)
+        return httpx.Response(200, json={"dependency_graph": {"B": ["A"]}})
+
+    client = _client(handler)
+
+    graph = await client.get_plan_dependency_graph()
+
+    assert graph.dependency_graph == {"B": ["A"]}
+    assert client.retry_budget.requests == 1
+    assert client.retry_budget.retries == 1
+    assert len(attempts) == 2
@@ -5,9 +5,10 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from resync.core.exceptions import ToolProcessingError
-from resync.models.tws import SystemStatus
+from resync.models.tws import JobStatus, PlanDependencyGraph, SystemStatus
 from resync.services.tws_service import OptimizedTWSClient
 from resync.tool_definitions.tws_tools import (
+    TWSDependencyTool,
     TWSStatusTool,
     TWSTroubleshootingTool,
 )
@@ -160,3 +161,65 @@ async def test_tool_handles_client_exception(mock_tws_client):
     ) as excinfo_trouble:
         await trouble_tool.analyze_failures()
     assert excinfo_trouble.value.__cause__ is original_exception
+
+
+@pytest.mark.asyncio
+async def test_dependency_tool_truncates_long_job_lists(mock_tws_client):
+    """
+    Tests that long transitive closures are truncated before reaching the LLM.
+    """
+    # Arrange: a chain JOB00 <- JOB01 <- ... <- JOB59
+    chain = {f"JOB{i:02d}": ([f"JOB{i - 1:02d}"] if i else []) for i in range(60)}
+    mock_tws_client.get_plan_dependency_graph = AsyncMock(
+        return_value=PlanDependencyGraph(dependency_graph=chain)
+    )
+    tool = TWSDependencyTool(tws_client=mock_tws_client)
+
+    # Act
+    upstream = await tool.get_upstream_jobs("JOB59", limit=3)
+    downstream = await tool.get_downstream_jobs("JOB00", max_depth=2)
+
+    # Assert
+    assert upstream == "Dependências de JOB59 (59): JOB58, JOB57, JOB56 (+56 mais)"
+    assert downstream == "Jobs impactados por JOB00 (2): JOB01, JOB02"
+
+
+@pytest.mark.asyncio
+async def test_critical_path_is_truncated(mock_tws_client):
+    """
+    Tests that a long critical path is truncated before reaching the LLM.
+    """
+    chain = {f"JOB{i:02d}": ([f"JOB{i - 1:02d}"] if i else []) for i in range(60)}
+    mock_tws_client.get_plan_dependency_graph = AsyncMock(
+        return_value=PlanDependencyGraph(dependency_graph=chain)
+    )
+    tool = TWSDependencyTool(tws_client=mock_tws_client)
+
+    result = await tool.get_critical_path(limit=3)
+
+    assert result == "Caminho crítico (60 jobs, 60s): JOB00 -> JOB01 -> JOB02 (+57 mais)"
+
+
+@pytest.mark.asyncio
+async def test_blocking_jobs_are_truncated(mock_tws_client):
+    """
+    Tests that a long list of blocking jobs is truncated before reaching the LLM.
+    """
+    chain = {f"JOB{i:02d}": ([f"JOB{i - 1:02d}"] if i else []) for i in range(60)}
+    mock_tws_client.get_plan_dependency_graph = AsyncMock(
+        return_value=PlanDependencyGraph(dependency_graph=chain)
+    )
+    mock_tws_client.get_jobs_status = AsyncMock(
+        return_value=[
+            JobStatus(name=f"JOB{i:02d}", workstation="WS1", status="HOLD", job_stream="S")
+            for i in range(60)
+        ]
+    )
+    tool = TWSDependencyTool(tws_client=mock_tws_client)
+
+    result = await tool.whats_blocking("JOB59", limit=2)
+
+    assert result == (
+        "Jobs bloqueando JOB59 (59): JOB58 (HOLD), JOB57 (HOLD) (+57 mais)\n"
+        "- Causa raiz provável: JOB00 (HOLD)"
+    )
@@ -0,0 +1,170 @@
+"""
+Tests for DataLoader-style query batching in the CQRS dispatcher.
+"""
+
+import asyncio
+
+import pytest
+
+from resync.cqrs.base import IQueryHandler, QueryResult
+from resync.cqrs.dispatcher import CQRSDispatcher, QueryBatchRule
+from resync.cqrs.queries import GetJobStatusBatchQuery, GetJobStatusQuery
+
+
+class RecordingBatchHandler(IQueryHandler):
+    """Batch handler recording the job IDs of each call."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    async def execute(self, query):
+        self.calls.append(list(query.job_ids))
+        if self.fail:
+            return QueryResult(success=False, error="TWS unavailable")
+        return QueryResult(
+            success=True,
+            data={
+                job_id: {"name": job_id}
+                for job_id in query.job_ids
+                if job_id != "MISSING"
+            },
+        )
+
+
+class BlockingBatchHandler(IQueryHandler):
+    """Batch handler that waits until its task is cancelled."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+
+    async def execute(self, query):
+        self.started.set()
+        await asyncio.Event().wait()
+
+
+class SingleHandler(IQueryHandler):
+    """Single-job handler that must not be used while batching is on."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, query):
+        self.calls += 1
+        return QueryResult(success=True, data={"name": query.job_id})
+
+
+def _dispatcher(batch_handler, **rule_kwargs):
+    dispatcher = CQRSDispatcher()
+    single = SingleHandler()
+    dispatcher.register_query_handler(GetJobStatusQuery, single)
+    dispatcher.register_query_handler(GetJobStatusBatchQuery, batch_handler)
+    dispatcher.register_query_batching(
+        GetJobStatusQuery,
+        QueryBatchRule(
+            batch_query_type=GetJobStatusBatchQuery,
+            key=lambda query: query.job_id,
+            build=lambda job_ids: GetJobStatusBatchQuery(job_ids=job_ids),
+            split=lambda result, job_id: QueryResult(
+                success=True, data=result.data.get(job_id)
+            ),
+            **rule_kwargs,
+        ),
+    )
+    return dispatcher, single
+
+
+class TestQueryBatching:
+    """Test cases for dispatcher query batching."""
+
+    @pytest.mark.asyncio
+    async def test_same_tick_queries_share_one_batch(self):
+        """Concurrent queries are coalesced and deduplicated."""
+        batch = RecordingBatchHandler()
+        dispatcher, single = _dispatcher(batch)
+
+        results = await asyncio.gather(
+            dispatcher.execute_query(GetJobStatusQuery(job_id="A")),
+            dispatcher.execute_query(GetJobStatusQuery(job_id="B")),
+            dispatcher.execute_query(GetJobStatusQuery(job_id="A")),
+            dispatcher.execute_query(GetJobStatusQuery(job_id="MISSING")),
+        )
+
+        assert batch.calls == [["A", "B", "MISSING"]]
+        assert single.calls == 0
+        assert [r.data for r in results] == [
+            {"name": "A"},
+            {"name": "B"},
+            {"name": "A"},
+            None,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_sequential_queries_are_not_delayed(self):
+        """A lone query is dispatched on the next tick as a batch of one."""
+        batch = RecordingBatchHandler()
+        dispatcher, _ = _dispatcher(batch)
+
+        await dispatcher.execute_query(GetJobStatusQuery(job_id="A"))
+        await dispatcher.execute_query(GetJobStatusQuery(job_id="B"))
+
+        assert batch.calls == [["A"], ["B"]]
+
+    @pytest.mark.asyncio
+    async def test_window_and_max_batch_size(self):
+        """Queries within the window are batched up to max_batch_size."""
+        batch = RecordingBatchHandler()
+        dispatcher, _ = _dispatcher(batch, window_seconds=0.01, max_batch_size=2)
+
+        async def delayed(job_id, delay):
+            await asyncio.sleep(delay)
+            return await dispatcher.execute_query(GetJobStatusQuery(job_id=job_id))
+
+        await asyncio.gather(delayed("A", 0), delayed("B", 0), delayed("C", 0.002))
+
+        assert batch.calls == [["A", "B"], ["C"]]
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_is_propagated(self):
+        """A failed batch fails every coalesced query."""
+        dispatcher, _ = _dispatcher(RecordingBatchHandler(fail=True))
+
+        results = await asyncio.gather(
+            dispatcher.execute_query(GetJobStatusQuery(job_id="A")),
+            dispatcher.execute_query(GetJobStatusQuery(job_id="B")),
+        )
+
+        assert all(not r.success and r.error == "TWS unavailable" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_batch_releases_waiters(self):
+        """Cancelling the batch task cancels every coalesced query."""
+        batch = BlockingBatchHandler()
+        dispatcher, _ = _dispatcher(batch)
+
+        queries = [
+            asyncio.ensure_future(
+                dispatcher.execute_query(GetJobStatusQuery(job_id=job_id))
+            )
+            for job_id in ("A", "B")
+        ]
+        await batch.started.wait()
+        for task in dispatcher._batchers[GetJobStatusQuery]._tasks:
+            task.cancel()
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*queries, return_exceptions=True), timeout=1
+        )
+        assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_batching_can_be_disabled(self):
+        """With batching disabled the single-query handler is used."""
+        batch = RecordingBatchHandler()
+        dispatcher, single = _dispatcher(batch)
+        dispatcher.batching_enabled = False
+
+        await dispatcher.execute_query(GetJobStatusQuery(job_id="A"))
+
+        assert single.calls == 1
+        assert batch.calls == []
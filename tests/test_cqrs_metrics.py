@@ -0,0 +1,112 @@
+"""
+Tests for CQRS dispatcher instrumentation.
+"""
+
+import asyncio
+
+import pytest
+
+from resync.cqrs.base import (
+    CommandResult,
+    ICommandHandler,
+    IQueryHandler,
+    QueryResult,
+)
+from resync.cqrs.commands import ExecuteJobCommand
+from resync.cqrs.dispatcher import CQRSDispatcher
+from resync.cqrs.metrics import CQRSMetrics
+from resync.cqrs.queries import GetJobStatusQuery, GetSystemStatusQuery
+
+
+class SlowQueryHandler(IQueryHandler):
+    """Query handler that waits on an event before answering."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def execute(self, query):
+        await self.release.wait()
+        return QueryResult(success=True, data={})
+
+
+class FailingQueryHandler(IQueryHandler):
+    async def execute(self, query):
+        raise RuntimeError("boom")
+
+
+class UnsuccessfulCommandHandler(ICommandHandler):
+    async def execute(self, command):
+        return CommandResult(success=False, message="rejected")
+
+
+@pytest.fixture
+def metrics():
+    return CQRSMetrics(buckets=(0.01, 1.0), slow_threshold_seconds=None)
+
+
+class TestCQRSMetrics:
+    """Test cases for per-handler dispatcher metrics."""
+
+    @pytest.mark.asyncio
+    async def test_in_flight_and_latency_recorded(self, metrics):
+        """In-flight calls are gauged and completed calls observed."""
+        dispatcher = CQRSDispatcher(metrics=metrics)
+        handler = SlowQueryHandler()
+        dispatcher.register_query_handler(GetSystemStatusQuery, handler)
+
+        task = asyncio.create_task(dispatcher.execute_query(GetSystemStatusQuery()))
+        await asyncio.sleep(0)
+        assert metrics.get_snapshot()["query:GetSystemStatusQuery"]["in_flight"] == 1
+
+        handler.release.set()
+        await task
+
+        stats = metrics.get_snapshot()["query:GetSystemStatusQuery"]
+        assert stats["in_flight"] == 0
+        assert stats["count"] == 1
+        assert stats["exceptions"] == stats["failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted(self, metrics):
+        """Exceptions and unsuccessful results are counted separately."""
+        dispatcher = CQRSDispatcher(metrics=metrics)
+        dispatcher.register_query_handler(GetSystemStatusQuery, FailingQueryHandler())
+        dispatcher.register_command_handler(
+            ExecuteJobCommand, UnsuccessfulCommandHandler()
+        )
+
+        with pytest.raises(RuntimeError):
+            await dispatcher.execute_query(GetSystemStatusQuery())
+        await dispatcher.execute_command(ExecuteJobCommand(job_id="JOB1"))
+
+        snapshot = metrics.get_snapshot()
+        assert snapshot["query:GetSystemStatusQuery"]["exceptions"] == 1
+        assert snapshot["command:ExecuteJobCommand"]["failures"] == 1
+
+    def test_slow_query_log_records_parameters(self, metrics):
+        """Calls above the threshold are logged with their parameters."""
+        metrics.slow_threshold_seconds = 0.0
+        started = metrics.start("query", "GetJobStatusQuery")
+
+        metrics.finish(
+            "query", "GetJobStatusQuery", started, "success", GetJobStatusQuery("JOB1")
+        )
+
+        entry = metrics.slow_queries[-1]
+        assert entry["type"] == "GetJobStatusQuery"
+        assert "JOB1" in entry["params"]
+
+    def test_prometheus_histogram_export(self, metrics):
+        """The export contains cumulative buckets, sum and count."""
+        for duration in (0.005, 0.5, 2.0):
+            started = metrics.start("query", "Q") - duration
+            metrics.finish("query", "Q", started, "success")
+
+        text = metrics.generate_prometheus_metrics()
+
+        assert "# TYPE resync_cqrs_handler_duration_seconds histogram" in text
+        prefix = 'resync_cqrs_handler_duration_seconds_bucket{kind="query",type="Q"'
+        assert f'{prefix},le="0.01"}} 1' in text
+        assert f'{prefix},le="1.0"}} 2' in text
+        assert f'{prefix},le="+Inf"}} 3' in text
+        assert 'resync_cqrs_handler_in_flight{kind="query",type="Q"} 0' in text
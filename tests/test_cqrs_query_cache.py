@@ -0,0 +1,255 @@
+"""
+Tests for declarative query result caching in the CQRS dispatcher.
+"""
+
+import asyncio
+
+import pytest
+
+from resync.cqrs.base import (
+    CommandResult,
+    ICommandHandler,
+    IQueryHandler,
+    QueryResult,
+)
+from resync.cqrs.commands import ExecuteJobCommand
+from resync.cqrs.dispatcher import CQRSDispatcher
+from resync.cqrs.queries import GetJobStatusQuery, GetSystemStatusQuery
+from resync.cqrs.query_cache import (
+    CacheInvalidationRule,
+    QueryCachePolicy,
+    QueryResultCache,
+)
+
+
+class CountingQueryHandler(IQueryHandler):
+    """Query handler counting its calls, optionally waiting on an event."""
+
+    def __init__(self, success=True):
+        self.calls = 0
+        self.success = success
+        self.release = None
+
+    async def execute(self, query):
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        return QueryResult(success=self.success, data={"call": self.calls})
+
+
+class ExecuteJobHandler(ICommandHandler):
+    def __init__(self, success=True):
+        self.success = success
+
+    async def execute(self, command):
+        return CommandResult(success=self.success)
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = CQRSDispatcher(cache=QueryResultCache())
+    dispatcher.register_query_cache(
+        GetJobStatusQuery,
+        QueryCachePolicy(60, tags=lambda query: (f"job:{query.job_id}",)),
+    )
+    dispatcher.register_query_cache(
+        GetSystemStatusQuery, QueryCachePolicy(60, tags=("jobs",))
+    )
+    dispatcher.register_cache_invalidation(
+        ExecuteJobCommand,
+        CacheInvalidationRule(tags=lambda command: ("jobs", f"job:{command.job_id}")),
+    )
+    return dispatcher
+
+
+class TestQueryResultCache:
+    """Test cases for dispatcher-level query caching."""
+
+    @pytest.mark.asyncio
+    async def test_results_are_cached_per_key(self, dispatcher):
+        """Repeated queries are served from cache; other keys miss."""
+        handler = CountingQueryHandler()
+        dispatcher.register_query_handler(GetJobStatusQuery, handler)
+
+        first = await dispatcher.execute_query(GetJobStatusQuery(job_id="A"))
+        second = await dispatcher.execute_query(GetJobStatusQuery(job_id="A"))
+        await dispatcher.execute_query(GetJobStatusQuery(job_id="B"))
+
+        assert first is second
+        assert handler.calls == 2
+        assert dispatcher.cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self):
+        """Entries are not served past their TTL."""
+        cache = QueryResultCache()
+        cache.set("key", QueryResult(success=True), ttl_seconds=0)
+
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self, dispatcher):
+        """Concurrent queries for the same key run the handler once."""
+        handler = CountingQueryHandler()
+        handler.release = asyncio.Event()
+        dispatcher.register_query_handler(GetSystemStatusQuery, handler)
+
+        tasks = [
+            asyncio.create_task(dispatcher.execute_query(GetSystemStatusQuery()))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        handler.release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert handler.calls == 1
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_loader_does_not_cancel_waiters(self):
+        """A waiter whose loading caller is cancelled loads the result itself."""
+        cache = QueryResultCache()
+        release = asyncio.Event()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await release.wait()
+            return QueryResult(success=True, data={"call": len(calls)})
+
+        first = asyncio.create_task(cache.get_or_load("key", 60, (), loader))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_or_load("key", 60, (), loader))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        result = await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert result.data == {"call": 2}
+        assert cache.get("key") is result
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, dispatcher):
+        """Unsuccessful results are returned but not stored."""
+        handler = CountingQueryHandler(success=False)
+        dispatcher.register_query_handler(GetSystemStatusQuery, handler)
+
+        await dispatcher.execute_query(GetSystemStatusQuery())
+        await dispatcher.execute_query(GetSystemStatusQuery())
+
+        assert handler.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_command_invalidates_tagged_results(self, dispatcher):
+        """A successful command drops only the results carrying its tags."""
+        job_handler = CountingQueryHandler()
+        dispatcher.register_query_handler(GetJobStatusQuery, job_handler)
+        dispatcher.register_command_handler(ExecuteJobCommand, ExecuteJobHandler())
+
+        for job_id in ("A", "B"):
+            await dispatcher.execute_query(GetJobStatusQuery(job_id=job_id))
+        await dispatcher.execute_command(ExecuteJobCommand(job_id="A"))
+        for job_id in ("A", "B"):
+            await dispatcher.execute_query(GetJobStatusQuery(job_id=job_id))
+
+        assert job_handler.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_command_keeps_cache(self, dispatcher):
+        """Failed commands do not invalidate unless configured to."""
+        handler = CountingQueryHandler()
+        dispatcher.register_query_handler(GetSystemStatusQuery, handler)
+        dispatcher.register_command_handler(
+            ExecuteJobCommand, ExecuteJobHandler(success=False)
+        )
+
+        await dispatcher.execute_query(GetSystemStatusQuery())
+        await dispatcher.execute_command(ExecuteJobCommand(job_id="A"))
+        await dispatcher.execute_query(GetSystemStatusQuery())
+
+        assert handler.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_result_racing_an_invalidation_is_not_cached(self, dispatcher):
+        """A result computed across an invalidation is not stored."""
+        handler = CountingQueryHandler()
+        handler.release = asyncio.Event()
+        dispatcher.register_query_handler(GetSystemStatusQuery, handler)
+        dispatcher.register_command_handler(ExecuteJobCommand, ExecuteJobHandler())
+
+        task = asyncio.create_task(dispatcher.execute_query(GetSystemStatusQuery()))
+        await asyncio.sleep(0)
+        await dispatcher.execute_command(ExecuteJobCommand(job_id="A"))
+        handler.release.set()
+        await task
+
+        assert len(dispatcher.cache) == 0
+
+
+class CachingClient:
+    """TWS client stand-in with its own response cache."""
+
+    def __init__(self):
+        self.cache = {}
+        self.status = "SUCC"
+        self.fetches = 0
+
+    async def get_job_status(self, job_id):
+        key = f"job_status:{job_id}"
+        if key not in self.cache:
+            self.fetches += 1
+            self.cache[key] = self.status
+        return self.cache[key]
+
+    async def invalidate_cache_tags(self, tags):
+        for tag in tags:
+            if tag.startswith("job:"):
+                self.cache.pop(f"job_status:{tag[4:]}", None)
+
+
+class ClientJobStatusHandler(IQueryHandler):
+    def __init__(self, client):
+        self.client = client
+
+    async def execute(self, query):
+        return QueryResult(success=True, data=await self.client.get_job_status(query.job_id))
+
+
+class TestClientCacheInvalidation:
+    """Commands also clear the caches below the query cache."""
+
+    @pytest.mark.asyncio
+    async def test_command_clears_client_cache(self, dispatcher):
+        """After a command the query reaches the backend, not the client cache."""
+        client = CachingClient()
+        dispatcher.register_query_handler(GetJobStatusQuery, ClientJobStatusHandler(client))
+        dispatcher.register_command_handler(ExecuteJobCommand, ExecuteJobHandler())
+        dispatcher.register_invalidation_listener(client.invalidate_cache_tags)
+        dispatcher.register_invalidation_listener(client.invalidate_cache_tags)
+
+        assert (await dispatcher.execute_query(GetJobStatusQuery(job_id="A"))).data == "SUCC"
+        client.status = "EXEC"
+        await dispatcher.execute_command(ExecuteJobCommand(job_id="A"))
+
+        assert (await dispatcher.execute_query(GetJobStatusQuery(job_id="A"))).data == "EXEC"
+        assert client.fetches == 2
+        assert len(dispatcher.invalidation_listeners) == 1
+
+    @pytest.mark.asyncio
+    async def test_command_invalidates_advanced_cache_tags(self, dispatcher):
+        """Entries tagged in the shared advanced cache are dropped too."""
+        from resync.core.advanced_cache import advanced_cache_manager
+
+        dispatcher.register_command_handler(ExecuteJobCommand, ExecuteJobHandler())
+        await advanced_cache_manager.set("job_view:A", {"status": "SUCC"}, tags=["job:A"])
+        await advanced_cache_manager.set("job_view:B", {"status": "SUCC"}, tags=["job:B"])
+
+        await dispatcher.execute_command(ExecuteJobCommand(job_id="A"))
+
+        assert "job_view:A" not in advanced_cache_manager.memory_cache
+        assert "job_view:B" in advanced_cache_manager.memory_cache
+        await advanced_cache_manager.invalidate("job_view:B")
@@ -0,0 +1,159 @@
+"""
+Tests for the staged bulk ingestion pipeline.
+"""
+
+import json
+from pathlib import Path
+
+import openpyxl
+import pypdf
+import pytest
+
+from resync.core.file_ingestor import (
+    chunk_text,
+    read_excel,
+    read_excel_sheet,
+    read_pdf,
+    read_pdf_pages,
+)
+from resync.core.ingestion_pipeline import (
+    IngestionPipeline,
+    IngestionPipelineMetrics,
+    extraction_units,
+)
+
+BENCHMARK_PDF = Path(__file__).resolve().parents[1] / "benchmark_files" / "test_1.pdf"
+
+
+class RecordingKnowledgeGraph:
+    """Knowledge graph stub keeping every added chunk."""
+
+    def __init__(self, fail_on=None):
+        self.added = []
+        self.fail_on = fail_on
+
+    async def add_content(self, content, metadata):
+        if self.fail_on and self.fail_on in content:
+            raise ValueError("rejected")
+        self.added.append((content, metadata))
+
+
+def _write_pdf(path: Path, pages: int) -> Path:
+    source = pypdf.PdfReader(BENCHMARK_PDF)
+    writer = pypdf.PdfWriter()
+    for _ in range(pages):
+        writer.add_page(source.pages[0])
+    with path.open("wb") as fh:
+        writer.write(fh)
+    return path
+
+
+def _write_workbook(path: Path, sheets: int) -> Path:
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for n in range(sheets):
+        sheet = workbook.create_sheet(f"Jobs{n}")
+        sheet.append(["job", "status"])
+        for row in range(5):
+            sheet.append([f"JOB_{n}_{row}", "SUCC" if row % 2 else None])
+    workbook.save(path)
+    return path
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    _write_pdf(tmp_path / "manual.pdf", 20)
+    _write_workbook(tmp_path / "plan.xlsx", 3)
+    (tmp_path / "record.json").write_text(json.dumps({"id": 7, "name": "x" * 2500}))
+    (tmp_path / "notes.txt").write_text("workstation WS01 unlinked")
+    (tmp_path / "image.bin").write_bytes(b"\x00\x01")
+    (tmp_path / ".hidden.txt").write_text("ignored")
+    return tmp_path
+
+
+def test_page_and_sheet_units_match_whole_file_readers(corpus):
+    pdf = corpus / "manual.pdf"
+    separator, units = extraction_units(pdf, 4)
+    assert len(units) > 1
+    assert separator.join(reader(*args) for reader, args in units) == read_pdf(pdf)
+    assert read_pdf_pages(pdf, 0, 5) + read_pdf_pages(pdf, 5, 20) == read_pdf(pdf)
+
+    workbook = corpus / "plan.xlsx"
+    separator, units = extraction_units(workbook, 4)
+    assert len(units) == 3
+    assert separator.join(reader(*args) for reader, args in units) == read_excel(workbook)
+    assert read_excel_sheet(workbook, "Jobs1").startswith("Sheet: Jobs1\n")
+
+    # um processo só: o arquivo inteiro, sem dividir
+    assert len(extraction_units(pdf, 1)[1]) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("processes", [1, 2])
+async def test_pipeline_stores_all_chunks_in_order(corpus, processes):
+    graph = RecordingKnowledgeGraph()
+    pipeline = IngestionPipeline(
+        graph,
+        processes=processes,
+        queue_size=2,
+        storage_batch_size=3,
+        storage_concurrency=2,
+        metrics=IngestionPipelineMetrics(),
+    )
+
+    stats = await pipeline.run([corpus], knowledge_base_only=False)
+
+    expected = {
+        "manual.pdf": list(chunk_text(read_pdf(corpus / "manual.pdf"))),
+        "plan.xlsx": list(chunk_text(read_excel(corpus / "plan.xlsx"))),
+        "notes.txt": ["workstation WS01 unlinked"],
+    }
+    stored = {}
+    for content, metadata in graph.added:
+        stored.setdefault(metadata["source_file"], []).append((metadata, content))
+
+    assert set(stored) == {"manual.pdf", "plan.xlsx", "record.json", "notes.txt"}
+    for name in ("manual.pdf", "plan.xlsx", "notes.txt"):
+        assert [content for _, content in stored[name]] == expected[name]
+    for entries in stored.values():
+        total = len(entries)
+        assert [m["chunk_index"] for m, _ in entries] == list(range(1, total + 1))
+        assert all(m["total_chunks"] == total for m, _ in entries)
+
+    assert stats.files == 4
+    assert stats.chunks == len(graph.added)
+    assert stats.stages["discovery"].items == 4
+    assert stats.stages["extraction"].items == 4
+    assert stats.stages["chunking"].items == len(graph.added)
+    assert stats.stages["storage"].items == len(graph.added)
+    for stage in stats.stages.values():
+        assert stage.max_queue_depth <= 2
+        assert stage.throughput >= 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_counts_storage_errors(corpus):
+    graph = RecordingKnowledgeGraph(fail_on="WS01")
+    metrics = IngestionPipelineMetrics()
+    pipeline = IngestionPipeline(graph, processes=1, metrics=metrics)
+
+    stats = await pipeline.run([corpus / "notes.txt"], knowledge_base_only=False)
+
+    assert stats.files == 0
+    assert stats.stages["storage"].errors == 1
+    assert metrics.runs == 1
+    assert metrics.last_run is stats
+    output = metrics.generate_prometheus_metrics()
+    assert 'resync_ingestion_stage_items_total{stage="extraction"} 1' in output
+    assert 'resync_ingestion_stage_errors_total{stage="storage"} 1' in output
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_files_outside_knowledge_base(corpus):
+    graph = RecordingKnowledgeGraph()
+    pipeline = IngestionPipeline(graph, processes=1, metrics=IngestionPipelineMetrics())
+
+    stats = await pipeline.run([corpus])
+
+    assert stats.files == 0
+    assert graph.added == []
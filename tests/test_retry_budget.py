@@ -0,0 +1,74 @@
+"""
+Tests for the shared retry budget.
+"""
+
+import pytest
+
+from resync.core.resilience import (
+    RetryBudget,
+    generate_retry_budget_prometheus_metrics,
+    get_retry_budget,
+    retry_with_backoff_async,
+)
+
+
+def _failing(counter):
+    async def op():
+        counter.append(1)
+        raise ConnectionError("down")
+
+    return op
+
+
+class TestRetryBudget:
+    """Test cases for RetryBudget."""
+
+    def test_retries_limited_to_ratio_of_requests(self):
+        """In steady state only ``ratio`` retries per request are allowed."""
+        budget = RetryBudget("test", ratio=0.1, max_tokens=1.0)
+        assert budget.try_acquire_retry()
+
+        granted = 0
+        for _ in range(100):
+            budget.record_request()
+            granted += budget.try_acquire_retry()
+
+        assert granted == 9
+        assert budget.exhausted == 91
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_stops_retrying(self):
+        """Once the bucket is empty, failures are raised without retrying."""
+        budget = RetryBudget("test", ratio=0.0, max_tokens=2.0)
+        attempts = []
+
+        with pytest.raises(ConnectionError):
+            await retry_with_backoff_async(
+                _failing(attempts), retries=5, base_delay=0, budget=budget
+            )
+
+        assert len(attempts) == 3
+        assert budget.retries == 2
+        assert budget.exhausted == 1
+
+    @pytest.mark.asyncio
+    async def test_successful_calls_refill_the_budget(self):
+        """Successful requests earn back retry tokens."""
+        budget = RetryBudget("test", ratio=0.5, max_tokens=1.0)
+        budget.tokens = 0.0
+
+        async def ok():
+            return "ok"
+
+        for _ in range(2):
+            assert await retry_with_backoff_async(ok, budget=budget) == "ok"
+
+        assert budget.tokens == 1.0
+
+    def test_budgets_are_shared_and_exported(self):
+        """Budgets are shared per downstream and exported to Prometheus."""
+        budget = get_retry_budget("test_downstream")
+        assert get_retry_budget("test_downstream") is budget
+
+        text = generate_retry_budget_prometheus_metrics()
+        assert 'resync_retry_budget_exhausted_total{downstream="test_downstream"}' in text
@@ -0,0 +1,105 @@
+"""
+Tests for the synthetic TWS environment generator and its MockTWSClient integration.
+"""
+
+import pytest
+
+from resync.core.exceptions import TWSConnectionError
+from resync.services.mock_tws_service import MockTWSClient
+from resync.services.synthetic_tws import (
+    LatencyProfile,
+    SyntheticPlanConfig,
+    SyntheticTWSEnvironment,
+)
+
+
+@pytest.fixture
+def environment():
+    """Small but non-trivial synthetic plan."""
+    return SyntheticTWSEnvironment(
+        SyntheticPlanConfig(num_jobs=2_000, num_workstations=50, seed=7)
+    )
+
+
+class TestSyntheticTWSEnvironment:
+    """Test cases for SyntheticTWSEnvironment."""
+
+    def test_generates_requested_shape(self, environment):
+        """Jobs and workstations are generated with TWS-shaped records."""
+        assert len(environment.jobs) == 2_000
+        assert len(environment.workstations) == 50
+        assert set(environment.jobs[0]) == {"name", "workstation", "status", "job_stream"}
+        assert set(environment.workstations[0]) == {"name", "status", "type"}
+
+    def test_dependencies_form_a_dag(self, environment):
+        """Every job only depends on jobs generated before it."""
+        for index, preds in enumerate(environment.predecessors):
+            assert all(dep < index for dep in preds)
+        edges = sum(len(preds) for preds in environment.predecessors)
+        assert edges > 0
+
+    def test_generation_is_deterministic(self):
+        """The same seed yields the same plan."""
+        config = SyntheticPlanConfig(num_jobs=500, num_workstations=10, seed=3)
+        first = SyntheticTWSEnvironment(config)
+        second = SyntheticTWSEnvironment(config)
+        assert first.jobs == second.jobs
+        assert first.predecessors == second.predecessors
+
+    def test_critical_path_is_a_dependency_chain(self, environment):
+        """Consecutive critical path jobs are linked by dependencies."""
+        path = [entry["job_id"] for entry in environment.critical_path]
+        assert path
+        for prev, node in zip(path, path[1:]):
+            assert prev in environment.predecessors[node]
+
+    def test_tick_applies_churn_and_records_events(self, environment):
+        """Status churn changes job statuses and emits events."""
+        environment.config.churn_rate = 0.05
+        changes = sum(environment.tick() for _ in range(5))
+        assert changes > 0
+        assert len(environment.events) > 0
+
+
+class TestLatencyProfile:
+    """Test cases for LatencyProfile."""
+
+    def test_default_profile_is_fixed_delay(self):
+        """The default profile reproduces the historical 100 ms delay."""
+        assert LatencyProfile().sample() == pytest.approx(0.1)
+
+    def test_spikes_multiply_latency(self):
+        """Spikes apply the configured multiplier."""
+        profile = LatencyProfile(
+            median_seconds=0.01, spike_probability=1.0, spike_multiplier=5.0
+        )
+        assert profile.sample() == pytest.approx(0.05)
+
+    @pytest.mark.asyncio
+    async def test_errors_raise_tws_connection_error(self):
+        """Simulated errors surface as TWSConnectionError."""
+        profile = LatencyProfile(median_seconds=0.0, error_rate=1.0)
+        with pytest.raises(TWSConnectionError):
+            await profile.apply()
+
+
+class TestMockTWSClientSynthetic:
+    """Test cases for MockTWSClient serving a synthetic environment."""
+
+    @pytest.mark.asyncio
+    async def test_serves_synthetic_jobs(self, environment):
+        """The mock client serves jobs and dependencies from the environment."""
+        client = MockTWSClient(
+            environment=environment, latency=LatencyProfile(median_seconds=0.0)
+        )
+
+        jobs = await client.get_jobs_status()
+        assert len(jobs) == len(environment.jobs)
+
+        name = environment.jobs[100]["name"]
+        tree = await client.get_job_dependencies(name)
+        expected = [environment.jobs[d]["name"] for d in environment.predecessors[100]]
+        assert tree.dependencies == expected
+
+        batch = await client.get_job_status_batch([name, "MISSING"])
+        assert list(batch) == [name]
@@ -0,0 +1,88 @@
+"""
+Tests for bulk decoding of TWS list responses.
+"""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from resync.models.tws import JobStatus, WorkstationStatus
+from resync.models.tws_bulk import decode_model_list
+
+JOBS = [
+    {"name": f"JOB{i}", "workstation": "WS1", "status": "SUCC", "job_stream": "STREAM"}
+    for i in range(5)
+]
+
+
+class TestDecodeModelList:
+    """Test cases for decode_model_list."""
+
+    def test_decodes_raw_json_bytes(self):
+        """Raw JSON bytes are validated into models in one pass."""
+        jobs = decode_model_list(JobStatus, json.dumps(JOBS).encode())
+
+        assert jobs == [JobStatus(**job) for job in JOBS]
+
+    def test_decodes_parsed_list(self):
+        """Already parsed lists are accepted too."""
+        assert decode_model_list(JobStatus, JOBS) == [JobStatus(**job) for job in JOBS]
+
+    def test_non_list_payload_returns_empty(self):
+        """A JSON object instead of an array yields no models."""
+        assert decode_model_list(JobStatus, b'{"error": "x"}') == []
+        assert decode_model_list(JobStatus, b'{"error": "x"}', trusted=True) == []
+
+    def test_invalid_item_raises_by_default(self):
+        """Invalid items raise unless skip_invalid is set."""
+        payload = JOBS + [{"name": "BROKEN"}]
+        with pytest.raises(ValidationError):
+            decode_model_list(JobStatus, payload)
+
+    def test_skip_invalid_salvages_valid_items(self):
+        """With skip_invalid only the invalid items are dropped."""
+        payload = JOBS + [{"name": "BROKEN"}, "not-a-dict"]
+
+        jobs = decode_model_list(JobStatus, payload, skip_invalid=True)
+
+        assert [job.name for job in jobs] == [job["name"] for job in JOBS]
+
+    def test_trusted_matches_validated_models(self):
+        """Trusted construction produces models equal to validated ones."""
+        raw = json.dumps(JOBS).encode()
+
+        trusted = decode_model_list(JobStatus, raw, trusted=True)
+
+        assert trusted == decode_model_list(JobStatus, raw)
+        assert trusted[0].model_dump() == JOBS[0]
+
+    def test_trusted_models_accept_assignment_and_copy(self):
+        """Trusted models can be updated like validated ones."""
+        first, second = decode_model_list(JobStatus, json.dumps(JOBS).encode(), trusted=True)[:2]
+
+        first.status = "ABEND"
+        copied = second.model_copy(update={"status": "EXEC"})
+
+        assert first.status == "ABEND"
+        assert copied.status == "EXEC"
+        assert second.status == "SUCC"
+        assert first.model_fields_set is not second.model_fields_set
+
+    def test_trusted_does_not_alias_caller_dicts(self):
+        """Trusted construction copies dicts the caller still owns."""
+        records = [dict(job) for job in JOBS]
+
+        jobs = decode_model_list(JobStatus, records, trusted=True)
+        records[0]["status"] = "ABEND"
+
+        assert jobs[0].status == "SUCC"
+
+    def test_trusted_incomplete_record_uses_defaults(self):
+        """Records missing fields fall back to model_construct."""
+        ws = decode_model_list(
+            WorkstationStatus, [{"name": "WS1", "status": "LINKED"}], trusted=True
+        )
+
+        assert ws[0].name == "WS1"
+        assert ws[0].model_fields_set == {"name", "status"}